@@ -6,6 +6,8 @@ from __future__ import division
 from __future__ import print_function
 
 import os
+import sys
+import importlib
 from datmo.core.util.logger import DatmoLogger
 from datmo.config import Config
 
@@ -23,7 +25,18 @@ config.set_home(os.getcwd())
 log = DatmoLogger.get_logger(__name__)
 log.info("handling command %s", config.home)
 
-import datmo.snapshot
-import datmo.logger
-import datmo.config
-import datmo.monitoring
+# The public interfaces are imported on first access (e.g. datmo.snapshot), so the
+# CLI and scripts only pay for the imports of the ones they use
+_submodules = ("snapshot", "logger", "config", "monitoring")
+
+
+def __getattr__(name):
+    if name in _submodules:
+        return importlib.import_module("datmo." + name)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+if sys.version_info < (3, 7):
+    # Module __getattr__ is not supported before python 3.7
+    for _submodule in _submodules:
+        importlib.import_module("datmo." + _submodule)
@@ -5,9 +5,11 @@ from datmo.core.util.i18n import get as __
 from datmo.core.util.exceptions import ClassMethodNotFound, PathDoesNotExist
 from datmo.cli.parser import get_datmo_parser
 from datmo.core.controller.task import TaskController
+from datmo.core.controller.scheduler import SchedulerController
 from datmo.core.util.logger import DatmoLogger
 from datmo.core.util.misc_functions import parameterized, parse_paths
 
+
 class BaseCommand(object):
     def __init__(self, cli_helper):
         self.home = Config().home
@@ -98,7 +100,12 @@ class BaseCommand(object):
         method_result = method(**command_args)
         return method_result
 
-    def task_run_helper(self, task_dict, snapshot_dict, error_identifier, data_paths=None):
+    def task_run_helper(self,
+                        task_dict,
+                        snapshot_dict,
+                        error_identifier,
+                        data_paths=None,
+                        queue=False):
         """
         Run task with given parameters and provide error identifier
 
@@ -112,12 +119,15 @@ class BaseCommand(object):
             identifier to print error
         data_paths : list
             list of data paths being passed for task run
+        queue : bool
+            if True, queue the task to be run by the scheduler and return without
+            waiting for it to complete
 
         Returns
         -------
         Task or False
-            the Task object which completed its run with updated parameters.
-            returns False if an error occurs
+            the Task object which completed its run with updated parameters (or
+            was queued). returns False if an error occurs
         """
         self.task_controller = TaskController()
         task_obj = self.task_controller.create()
@@ -136,14 +146,26 @@ class BaseCommand(object):
                     command = task_dict.get('command', None)
                     command_list = task_dict.get('command_list', None)
                     interactive = task_dict.get('interactive', False)
-                    self.task_controller.update(task_obj.id,
-                                                workspace=workspace,
-                                                command=command,
-                                                command_list=command_list,
-                                                interactive=interactive)
-                    self.cli_helper.echo(__("error", "cli.run.parse.paths", str(e)))
+                    self.task_controller.update(
+                        task_obj.id,
+                        workspace=workspace,
+                        command=command,
+                        command_list=command_list,
+                        interactive=interactive)
+                    self.cli_helper.echo(
+                        __("error", "cli.run.parse.paths", str(e)))
                     return False
 
+            if queue:
+                updated_task_obj = self.task_controller.submit(
+                    task_obj.id,
+                    snapshot_dict=snapshot_dict,
+                    task_dict=task_dict)
+                SchedulerController().start()
+                status = "QUEUED"
+                self.cli_helper.echo(
+                    __("info", "cli.run.run.queued", task_obj.id))
+                return updated_task_obj
             updated_task_obj = self.task_controller.run(
                 task_obj.id, snapshot_dict=snapshot_dict, task_dict=task_dict)
             status = "SUCCESS"
@@ -155,8 +177,9 @@ class BaseCommand(object):
             self.cli_helper.echo(__("error", error_identifier, task_obj.id))
             return False
         finally:
-            self.task_controller.stop(
-                task_id=updated_task_obj.id, status=status)
+            if status != "QUEUED":
+                self.task_controller.stop(
+                    task_id=updated_task_obj.id, status=status)
         self.cli_helper.echo(
             __("info", "cli.run.run.complete", updated_task_obj.id))
 
@@ -3,12 +3,10 @@ import os
 from datmo import __version__
 from datmo.core.util.i18n import get as __
 from datmo.core.util.json_store import JSONStore
-from datmo.core.util.remote_api import RemoteAPI
 from datmo.cli.driver.helper import Helper
 from datmo.cli.command.base import BaseCommand
 from datmo.core.controller.project import ProjectController
 from datmo.core.controller.environment.environment import EnvironmentController
-from datmo.dashboard.app import app
 
 
 class ProjectCommand(BaseCommand):
@@ -169,9 +167,12 @@ class ProjectCommand(BaseCommand):
                     "Enter API key for datmo")
 
             # Initialize remote API to get master ip address
-            remote_api = RemoteAPI(datmo_api_key)
+            from datmo.core.util.remote_api import get_remote_api
+            remote_api = get_remote_api(datmo_api_key)
             response = remote_api.get_deployment_info()
-            master_system_info = response['body']['master_system_info']
+            # The local backend has no master server until deployment info is set
+            body = response.get('body') or {}
+            master_system_info = body.get('master_system_info')
             master_server_ip = str(master_system_info.get('datmo_master_ip')) if isinstance(master_system_info, dict)\
                 else None
 
@@ -284,6 +285,8 @@ class ProjectCommand(BaseCommand):
             self.cli_helper.echo(
                 "Please initialize datmo before using this command")
             return False
+        # flask is only imported to serve the dashboard
+        from datmo.dashboard.app import app
         dir_path = os.path.dirname(os.path.abspath(__file__))
         os.chdir(os.path.join(dir_path, "../../dashboard"))
         app.run(host='0.0.0.0')
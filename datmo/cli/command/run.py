@@ -2,6 +2,7 @@ from __future__ import print_function
 
 import os
 import sys
+import json
 import shlex
 import platform
 from datetime import datetime
@@ -53,13 +54,67 @@ class RunCommand(ProjectCommand):
         data_paths = kwargs['data']
         # Run task and return Task object result
         task_obj = self.task_run_helper(
-            task_dict, snapshot_dict, "cli.run.run", data_paths=data_paths)
+            task_dict,
+            snapshot_dict,
+            "cli.run.run",
+            data_paths=data_paths,
+            queue=kwargs.get('queue', False))
         if not task_obj:
             return False
         # Creating the run object
         run_obj = Run(task_obj)
         return run_obj
 
+    @Helper.notify_environment_active(TaskController)
+    @Helper.notify_no_project_found
+    def sweep(self, **kwargs):
+        self.cli_helper.echo(__("info", "cli.run.sweep"))
+        try:
+            grid = json.loads(kwargs['grid']) if kwargs.get('grid') else None
+            random_spec = json.loads(
+                kwargs['random_spec']) if kwargs.get('random_spec') else None
+        except ValueError as e:
+            self.cli_helper.echo(__("error", "cli.run.sweep.spec", str(e)))
+            return False
+        # Create input dictionaries
+        snapshot_dict = {}
+        # Environment
+        if kwargs.get("environment_id", None) or kwargs.get(
+                "environment_paths", None):
+            mutually_exclusive_args = ["environment_id", "environment_paths"]
+            mutually_exclusive(mutually_exclusive_args, kwargs, snapshot_dict)
+        samples = kwargs.get('samples', None)
+        if random_spec is not None and samples is None:
+            samples = 10
+        task_dict = {"mem_limit": kwargs.get('mem_limit', None)}
+        if platform.system() == "Windows":
+            task_dict['command'] = kwargs['cmd']
+        else:
+            task_dict['command_list'] = shlex.split(kwargs['cmd'])
+        self.task_controller = TaskController()
+        try:
+            task_objs = self.task_controller.run_many(
+                grid=grid,
+                random_spec=random_spec,
+                samples=samples,
+                seed=kwargs.get('seed', None),
+                snapshot_dict=snapshot_dict,
+                task_dict=task_dict,
+                workers=kwargs.get('workers', None))
+        except Exception as e:
+            self.logger.error("%s %s" % (e, task_dict))
+            self.cli_helper.echo(__("error", "cli.run.sweep", str(e)))
+            return False
+        for task_obj in task_objs:
+            self.cli_helper.echo(
+                __("info", "cli.run.run.complete", task_obj.id))
+        failed = len([
+            task_obj for task_obj in task_objs if task_obj.status != "SUCCESS"
+        ])
+        self.cli_helper.echo(
+            __("info", "cli.run.sweep.complete", (len(task_objs), failed)))
+        return Run.from_tasks(task_objs)
+
     @Helper.notify_no_project_found
     def ls(self, **kwargs):
         print_format = kwargs.get('format', "table")
@@ -68,16 +123,18 @@ class RunCommand(ProjectCommand):
         # Get all task meta information
         self.task_controller = TaskController()
         task_objs = self.task_controller.list(
-            sort_key="created_at", sort_order="descending")
+            sort_key="created_at",
+            sort_order="descending",
+            limit=kwargs.get('limit', None),
+            offset=kwargs.get('offset', None))
         header_list = [
             "id", "command", "type", "status", "config", "results",
             "created at"
         ]
         item_dict_list = []
         run_obj_list = []
-        for task_obj in task_objs:
-            # Create a new Run Object from Task Object
-            run_obj = Run(task_obj)
+        # Create Run Objects from Task Objects, with their snapshots fetched together
+        for run_obj in Run.from_tasks(task_objs):
             task_results_printable = printable_object(run_obj.results)
             snapshot_config_printable = printable_object(run_obj.config)
             item_dict_list.append({
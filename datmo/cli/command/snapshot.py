@@ -178,12 +178,13 @@ class SnapshotCommand(ProjectCommand):
         download_path = kwargs.get('download_path', None)
         current_snapshot_obj = self.snapshot_controller.current_snapshot()
         current_snapshot_id = current_snapshot_obj.id if current_snapshot_obj else None
-        if show_all:
-            snapshot_objs = self.snapshot_controller.list(
-                sort_key="created_at", sort_order="descending")
-        else:
-            snapshot_objs = self.snapshot_controller.list(
-                visible=True, sort_key="created_at", sort_order="descending")
+        snapshot_objs = self.snapshot_controller.list(
+            visible=None if show_all else True,
+            sort_key="created_at",
+            sort_order="descending",
+            filter=kwargs.get('filter', None),
+            limit=kwargs.get('limit', None),
+            offset=kwargs.get('offset', None))
         item_dict_list = []
         if detailed_info:
             header_list = [
@@ -255,6 +256,15 @@ class SnapshotCommand(ProjectCommand):
                 __("info", "cli.snapshot.checkout.success", snapshot_id))
         return self.snapshot_controller.checkout(snapshot_id)
 
+    @Helper.notify_no_project_found
+    def backfill(self, **kwargs):
+        self.snapshot_controller = SnapshotController()
+        self.cli_helper.echo(__("info", "cli.snapshot.backfill"))
+        result = self.snapshot_controller.backfill_fingerprints()
+        self.cli_helper.echo(
+            __("info", "cli.snapshot.backfill.success", str(result)))
+        return result
+
     @Helper.notify_no_project_found
     def diff(self, **kwargs):
         self.snapshot_controller = SnapshotController()
@@ -685,6 +685,16 @@ class TestSnapshotCommand():
         assert result
         assert created_snapshot_obj in result
 
+        # Test filter and pagination
+        self.snapshot_command.parse(
+            ["snapshot", "ls", "--filter", "test", "--limit", "1"])
+        result = self.snapshot_command.execute()
+        assert result == [created_snapshot_obj]
+
+        self.snapshot_command.parse(["snapshot", "ls", "--offset", "1"])
+        result = self.snapshot_command.execute()
+        assert result == []
+
         # Test failure (format)
         failed = False
         try:
@@ -835,3 +845,14 @@ class TestSnapshotCommand():
         assert "Files" in result
         assert "Config" in result
         assert "Stats" in result
+
+    def test_snapshot_backfill(self):
+        self.__set_variables()
+        self.snapshot_command.parse(
+            ["snapshot", "create", "-m", "my test snapshot"])
+        snapshot_obj = self.snapshot_command.execute()
+        # Nothing to backfill for snapshots created with fingerprints
+        self.snapshot_command.parse(["snapshot", "backfill"])
+        result = self.snapshot_command.execute()
+        assert result == 0
+        assert snapshot_obj.fingerprint
@@ -152,8 +152,8 @@ class Helper():
         return [
             "init", "version", "--version", "-v", "status", "cleanup",
             "configure", "dashboard", "snapshot", "notebook", "jupyterlab",
-            "terminal", "rstudio", "environment", "run", "rerun", "stop",
-            "delete", "ls", "deploy"
+            "terminal", "rstudio", "environment", "run", "sweep", "rerun",
+            "stop", "delete", "ls", "deploy"
         ]
 
     def prompt_available_options(self, available_options, option_type):
@@ -308,6 +308,6 @@ class TestHelper():
         assert self.cli.get_command_choices() == [
             "init", "version", "--version", "-v", "status", "cleanup",
             "configure", "dashboard", "snapshot", "notebook", "jupyterlab",
-            "terminal", "rstudio", "environment", "run", "rerun", "stop",
-            "delete", "ls", "deploy"
+            "terminal", "rstudio", "environment", "run", "sweep", "rerun",
+            "stop", "delete", "ls", "deploy"
         ]
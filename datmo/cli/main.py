@@ -57,7 +57,7 @@ def main():
         elif command_name == "rerun":
             command_name = "run"
             sys.argv[1] = "rerun"
-        elif command_name == "run":
+        elif command_name in ["run", "sweep"]:
             if len(sys.argv) == 2:
                 command_name = "run"
                 sys.argv.append("--help")
@@ -250,6 +250,13 @@ def get_datmo_parser():
         dest="interactive",
         action="store_true",
         help="run the environment in interactive mode (keeps STDIN open)")
+    run_parser.add_argument(
+        "--queue",
+        dest="queue",
+        action="store_true",
+        help=
+        "queue the run to be started by the project scheduler and return immediately"
+    )
     run_parser.add_argument(
         "cmd",
         nargs="?",
@@ -286,6 +293,18 @@ def get_datmo_parser():
         help=
         "checked only if download is specified. saves output to location specified"
     )
+    ls_runs_parser.add_argument(
+        "--limit",
+        dest="limit",
+        type=int,
+        default=None,
+        help="maximum number of runs to list")
+    ls_runs_parser.add_argument(
+        "--offset",
+        dest="offset",
+        type=int,
+        default=None,
+        help="number of runs to skip")
 
     # Stop runs
     stop_run_parser = subparsers.add_parser("stop", help="stop runs")
@@ -302,6 +321,74 @@ def get_datmo_parser():
     delete_run_parser = subparsers.add_parser("delete", help="delete runs")
     delete_run_parser.add_argument("id", default=None, help="run id to delete")
 
+    # Sweep
+    sweep_parser = subparsers.add_parser(
+        "sweep", help="run a script for each config of a parameter sweep")
+    sweep_parser.add_argument(
+        "--grid",
+        dest="grid",
+        default=None,
+        type=str,
+        help=
+        "JSON parameter grid, a run is made for every combination (e.g. '{\"lr\": [0.1, 0.01], \"batch_size\": [32, 64]}')"
+    )
+    sweep_parser.add_argument(
+        "--random",
+        dest="random_spec",
+        default=None,
+        type=str,
+        help=
+        "JSON random spec of lists of values or distributions uniform, loguniform and randint, sampled for each run (e.g. '{\"lr\": {\"loguniform\": [0.0001, 0.1]}}')"
+    )
+    sweep_parser.add_argument(
+        "--samples",
+        "-n",
+        dest="samples",
+        default=None,
+        type=int,
+        help=
+        "number of runs sampled from the random spec (default is 10), not allowed with --grid which runs every combination"
+    )
+    sweep_parser.add_argument(
+        "--seed",
+        dest="seed",
+        default=None,
+        type=int,
+        help="seed used to sample the runs from the random spec")
+    sweep_parser.add_argument(
+        "--parallel",
+        "-j",
+        dest="workers",
+        default=None,
+        type=int,
+        help="number of runs at a time (default is the number of cpus)")
+    sweep_parser.add_argument(
+        "--environment-id",
+        dest="environment_id",
+        default=None,
+        help="environment id from environment object")
+    sweep_parser.add_argument(
+        "--environment-paths",
+        dest="environment_paths",
+        default=None,
+        action="append",
+        type=str,
+        help=
+        "list of absolute or relative filepaths and/or dirpaths to collect; can specify destination names with '>' (e.g. /path/to/file>hello, /path/to/file2, /path/to/dir>newdir)"
+    )
+    sweep_parser.add_argument(
+        "--mem-limit",
+        "-m",
+        dest="mem_limit",
+        default=None,
+        type=str,
+        help="maximum amount of memory each run can use (e.g. 4g)")
+    sweep_parser.add_argument(
+        "cmd",
+        help=
+        "command to run within environment, where {name} is replaced by the value of the parameter (e.g. 'python train.py --lr {lr}'). the config of each run is also available in /task/config.json"
+    )
+
     # Rerun
     rerun_parser = subparsers.add_parser(
         "rerun", help="To rerun an experiment")
@@ -669,6 +756,23 @@ def get_datmo_parser():
         dest="show_all",
         action="store_true",
         help="show all visible and hidden snapshots")
+    snapshot_ls.add_argument(
+        "--filter",
+        dest="filter",
+        default=None,
+        help="only list snapshots with the string in their message or label")
+    snapshot_ls.add_argument(
+        "--limit",
+        dest="limit",
+        type=int,
+        default=None,
+        help="maximum number of snapshots to list")
+    snapshot_ls.add_argument(
+        "--offset",
+        dest="offset",
+        type=int,
+        default=None,
+        help="number of snapshots to skip")
     snapshot_ls.add_argument(
         "--format",
         dest="format",
@@ -702,4 +806,8 @@ def get_datmo_parser():
         "inspect", help="inspect a snapshot by id")
     snapshot_inspect.add_argument("id", default=None, help="snapshot id")
 
+    snapshot_backfill = snapshot_subcommand_parsers.add_parser(
+        "backfill",
+        help="store fingerprints for snapshots created by older versions")
+
     return parser
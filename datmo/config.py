@@ -18,6 +18,7 @@ class Config(object):
     damto_directory_name : str
         datmo directory name
     remote_credentials : tuple
+    remote_backend : tuple
 
     Returns
     -------
@@ -78,6 +79,43 @@ class Config(object):
 
             return MASTER_SERVER_IP, DATMO_API_KEY, END_POINT
 
+        @property
+        def remote_backend(self):
+            """
+            Returns the backend serving the remote requests, e.g. of monitoring
+
+            Returns
+            -------
+            DATMO_REMOTE_BACKEND : str
+                "remote" for the Datmo services (default) or "local" for a
+                database on this machine
+            DATMO_REMOTE_DATABASE : str
+                filepath of the database of the local backend, default is
+                ~/.datmo/remote.sqlite
+            """
+            # 1) Load from the environment if datmo config not already saved globally
+            DATMO_REMOTE_BACKEND = os.environ.get('DATMO_REMOTE_BACKEND', None)
+            DATMO_REMOTE_DATABASE = os.environ.get('DATMO_REMOTE_DATABASE',
+                                                   None)
+
+            # 2) loading the datmo config if present
+            datmo_config_filepath = os.path.join(
+                os.path.expanduser("~"), ".datmo", "config")
+            if os.path.isfile(datmo_config_filepath):
+                config_dict = JSONStore(datmo_config_filepath).to_dict()
+                if DATMO_REMOTE_BACKEND is None:
+                    DATMO_REMOTE_BACKEND = config_dict.get(
+                        'DATMO_REMOTE_BACKEND', None)
+                if DATMO_REMOTE_DATABASE is None:
+                    DATMO_REMOTE_DATABASE = config_dict.get(
+                        'DATMO_REMOTE_DATABASE', None)
+
+            if DATMO_REMOTE_DATABASE is None:
+                DATMO_REMOTE_DATABASE = os.path.join(
+                    os.path.expanduser("~"), ".datmo", "remote.sqlite")
+
+            return DATMO_REMOTE_BACKEND or "remote", DATMO_REMOTE_DATABASE
+
         def set_home(self, home_path):
             self._home = home_path
 
@@ -94,8 +132,7 @@ class Config(object):
                 return self.data_cache.get(cache_key)
             # expire item and return None
             else:
-                self.data_cache.remove(cache_expire_key)
-                self.data_cache.remove(cache_key)
+                self.data_cache.remove_many([cache_expire_key, cache_key])
                 return None
 
         def set_cache_item(self, key, value, duration=60):
@@ -103,8 +140,10 @@ class Config(object):
             cache_key = 'cache_key.' + key
             expire_val = (duration * 60) + int(
                 datetime.datetime.now().strftime('%s'))
-            self.data_cache.save(cache_expire_key, expire_val)
-            self.data_cache.save(cache_key, value)
+            self.data_cache.save_many({
+                cache_expire_key: expire_val,
+                cache_key: value
+            })
 
     def __new__(cls):  # __new__ always a classmethod
         if not Config.instance:
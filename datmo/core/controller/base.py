@@ -5,6 +5,7 @@ from datmo.core.util.logger import DatmoLogger
 from datmo.core.util import get_class_contructor
 from datmo.core.util.json_store import JSONStore
 from datmo.core.util.exceptions import (InvalidProjectPath)
+from datmo.core.controller.session import get_session
 from datmo.config import Config
 
 
@@ -20,6 +21,9 @@ class BaseController(object):
     ----------
     home : str
         absolute filepath for the location of the project
+    session : datmo.core.controller.session.ControllerSession
+        the dal and drivers of the project, shared with the other controllers of the
+        project in the process
     config : JSONStore
         this is the set of configurations used to create a project
     dal : datmo.core.storage.DAL
@@ -37,6 +41,14 @@ class BaseController(object):
         Returns value adn sets to default if no value present
     config_loader(key)
         Return the config dictionary based on key
+    construct(key)
+        Return a new instance of the dal or driver for the key of the config
+    clear_session()
+        Remove the dal and drivers of the session of the project
+    project_lock()
+        Hold the lock of the project while writing its records
+    get_project_config_value(key, default_value=None)
+        Return the value set in the project config or the default if not present
     get_config_defaults()
         Return the configuration defaults
     """
@@ -47,6 +59,7 @@ class BaseController(object):
             raise InvalidProjectPath(
                 __("error", "controller.base.__init__", self.home))
         self.logger = DatmoLogger.get_logger(__name__)
+        self.session = get_session(self.home)
         # property caches and initial values
         self._is_initialized = False
         self._dal = None
@@ -54,40 +67,38 @@ class BaseController(object):
         self._code_driver = None
         self._file_driver = None
         self._environment_driver = None
+        self._project_config_store = None
 
     @property
     def file_driver(self):
         if self._file_driver == None:
-            module_details = self.config_loader("controller.file.driver")
-            self._file_driver = module_details["constructor"](
-                **module_details["options"])
+            self._file_driver = self.session.get(
+                "controller.file.driver",
+                lambda: self.construct("controller.file.driver"))
         return self._file_driver
 
     @property
-    # Controller objects are only in sync if the data drivers are the same between objects
-    # Currently pass dal_driver down from controller to controller to ensure syncing dals
-    # TODO: To fix dal from different controllers so they sync within one session; they do NOT currently
+    # Controllers of a project share the dal of their session, so they are in sync
     def dal(self):
         if self._dal == None:
-            dal_dict = self.config_loader("storage.local")
-            self._dal = dal_dict["constructor"](**dal_dict["options"])
+            self._dal = self.session.get(
+                "storage.local", lambda: self.construct("storage.local"))
         return self._dal
 
     @property
     def code_driver(self):
         if self._code_driver == None:
-            module_details = self.config_loader("controller.code.driver")
-            self._code_driver = module_details["constructor"](
-                **module_details["options"])
+            self._code_driver = self.session.get(
+                "controller.code.driver",
+                lambda: self.construct("controller.code.driver"))
         return self._code_driver
 
     @property
     def environment_driver(self):
         if self._environment_driver == None:
-            module_details = self.config_loader(
-                "controller.environment.driver")
-            self._environment_driver = module_details["constructor"](
-                **module_details["options"])
+            self._environment_driver = self.session.get(
+                "controller.environment.driver",
+                lambda: self.construct("controller.environment.driver"))
         return self._environment_driver
 
     @property
@@ -106,10 +117,31 @@ class BaseController(object):
         if not self.dal.is_initialized:
             self._model = None
         else:
-            models = self.dal.model.query({})
-            self._model = models[0] if models else None
+            # The model is cached by the dal until it is written
+            self._model = self.dal.model.get_current()
         return self._model
 
+    def clear_session(self):
+        """Remove the dal and drivers of the session of the project, for them to be
+        created again, e.g. once the project is removed"""
+        self.session.clear()
+        self._dal = None
+        self._code_driver = None
+        self._file_driver = None
+        self._environment_driver = None
+        self._is_initialized = False
+
+    def project_lock(self):
+        """Hold the lock of the project while writing its records. The database,
+        file index and object store are not safe to write from several processes
+        at once, e.g. the workers of the scheduler
+
+        Returns
+        -------
+        context manager
+        """
+        return self.session.project_lock()
+
     def config_loader(self, key):
         defaults = self.get_config_defaults()
         module_details = defaults[key]
@@ -117,14 +149,57 @@ class BaseController(object):
             module_details["class_constructor"])
         return module_details
 
+    def construct(self, key):
+        """Return a new instance of the dal or driver for the key of the config"""
+        module_details = self.config_loader(key)
+        return module_details["constructor"](**module_details["options"])
+
+    def get_project_config_value(self, key, default_value=None):
+        config_filepath = os.path.join(self.home,
+                                       Config().datmo_directory_name,
+                                       ".config")
+        # JSONStore creates its directory, so only read once the project exists
+        if not os.path.isfile(config_filepath):
+            return default_value
+        # The store keeps the parsed file while it does not change, so reading the
+        # defaults of each driver parses it once
+        if self._project_config_store is None:
+            self._project_config_store = JSONStore(config_filepath)
+        value = self._project_config_store.get(key)
+        return default_value if value is None else value
+
     def get_config_defaults(self):
+        object_compression = self.get_project_config_value(
+            "object_compression")
+        materialize_mode = self.get_project_config_value(
+            "materialize_mode", "reflink")
+        database_connection_string = os.path.join(
+            self.home,
+            Config().datmo_directory_name, "database")
+        if self.get_project_config_value("database_driver") == "sqlite":
+            dal_options = {
+                "driver_type": "sqlite",
+                "driver_options": {
+                    "connection_string": database_connection_string
+                }
+            }
+        else:
+            dal_options = {
+                "driver_type": "blitzdb",
+                "driver_options": {
+                    "driver_type": "file",
+                    "connection_string": database_connection_string,
+                    "cached": True
+                }
+            }
         return {
             "controller.code.driver": {
                 "class_constructor":
                     "datmo.core.controller.code.driver.file.FileCodeDriver",
                 "options": {
                     "root": self.home,
-                    "datmo_directory_name": Config().datmo_directory_name
+                    "datmo_directory_name": Config().datmo_directory_name,
+                    "object_compression": object_compression
                 }
             },
             "controller.file.driver": {
@@ -132,7 +207,9 @@ class BaseController(object):
                     "datmo.core.controller.file.driver.local.LocalFileDriver",
                 "options": {
                     "root": self.home,
-                    "datmo_directory_name": Config().datmo_directory_name
+                    "datmo_directory_name": Config().datmo_directory_name,
+                    "object_compression": object_compression,
+                    "materialize_mode": materialize_mode
                 }
             },
             "controller.environment.driver": {
@@ -146,16 +223,6 @@ class BaseController(object):
             },
             "storage.local": {
                 "class_constructor": "datmo.core.storage.local.dal.LocalDAL",
-                "options": {
-                    "driver_type": "blitzdb",
-                    "driver_options": {
-                        "driver_type":
-                            "file",
-                        "connection_string":
-                            os.path.join(self.home,
-                                         Config().datmo_directory_name,
-                                         "database")
-                    }
-                }
+                "options": dal_options
             },
         }
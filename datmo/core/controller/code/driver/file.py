@@ -1,16 +1,18 @@
 import os
+import json
+import stat
 import shutil
-import errno
 import pathspec
-import tempfile
-import hashlib
-import checksumdir
 try:
     to_unicode = unicode
 except NameError:
     to_unicode = str
 
 from datmo.core.util.misc_functions import list_all_filepaths
+from datmo.core.util.file_index import FileIndex
+from datmo.core.util.checkout_engine import CheckoutEngine
+from datmo.core.util.file_hasher import FileHasher
+from datmo.core.util.object_store import ObjectStore
 from datmo.core.util.i18n import get as __
 from datmo.core.util.exceptions import (PathDoesNotExist, FileIOError,
                                         UnstagedChanges, CodeNotInitialized,
@@ -20,9 +22,23 @@ from datmo.core.controller.code.driver import CodeDriver
 
 class FileCodeDriver(CodeDriver):
     """File-based Code Driver handles source control management for the project with files
+
+    The contents of committed files are kept in the project object store
+    (shared with file collections), so each unique file is only stored once. The
+    permissions of the files are kept by commit, as the objects are shared
+
+    Parameters
+    ----------
+    root : str
+        absolute path of the project
+    datmo_directory_name : str
+        name of the datmo directory within the project
+    object_compression : str, optional
+        compression for new objects in the object store, one of None, "zlib" or "zstd"
+        (default is None, which means objects are stored uncompressed)
     """
 
-    def __init__(self, root, datmo_directory_name):
+    def __init__(self, root, datmo_directory_name, object_compression=None):
         super(FileCodeDriver, self).__init__()
         self.root = root
         # Check if filepath exists
@@ -33,7 +49,17 @@ class FileCodeDriver(CodeDriver):
         self._datmo_directory_path = os.path.join(self.root,
                                                   self._datmo_directory_name)
         self._code_filepath = os.path.join(self._datmo_directory_path, "code")
+        self._modes_filepath = os.path.join(self._datmo_directory_path,
+                                            "code_modes")
         self._datmo_ignore_filepath = os.path.join(self.root, ".datmoignore")
+        self._file_hasher = FileHasher()
+        self._file_index = FileIndex(self.root,
+                                     os.path.join(self._datmo_directory_path,
+                                                  "cache", "code_index.json"),
+                                     self._file_hasher.get_filehashes)
+        self._object_store = ObjectStore(
+            os.path.join(self._datmo_directory_path, "objects"),
+            compression=object_compression)
         self._is_initialized = self.is_initialized
         self.type = "file"
 
@@ -84,51 +110,45 @@ class FileCodeDriver(CodeDriver):
         return list(
             all_files - dot_datmo_files - dot_git_files - datmoignore_files)
 
+    def _calculate_filehashes(self, tracked_files):
+        """Return the content hash of each tracked file
+
+        Files are looked up in the persistent file index first, so only files
+        which have changed since the last call are read and hashed again
+
+        Parameters
+        ----------
+        tracked_files : list
+            list of filepaths relative to the root of the repo
+
+        Returns
+        -------
+        dict
+            relative filepath -> file hash
+        """
+        filehashes = self._file_index.get_filehashes(tracked_files)
+        self._file_index.prune(tracked_files)
+        self._file_index.save()
+        return filehashes
+
+    @staticmethod
+    def _reduce_filehashes(filehashes):
+        """Combine file hashes into a single hash. This is the same reduction used by
+        checksumdir.dirhash, so the result is equal to hashing a copy of the files"""
+        return FileHasher.reduce_filehashes(filehashes)
+
     def _calculate_commit_hash(self, tracked_files):
         """Return the commit hash of the repository"""
-        # Move tracked files to temp directory within _code_filepath
-        # Hash files and return hash
-        try:
-            temp_dir = tempfile.mkdtemp(dir=self._code_filepath)
-            for rel_filepath in tracked_files:
-                # Ensure new directory will exist in the temp dir
-                filename = os.path.basename(rel_filepath)
-                rel_dirpath = rel_filepath.replace(filename, "")
-                new_dirpath = os.path.join(temp_dir, rel_dirpath)
-                # Ensure directory exists
-                if not os.path.isdir(new_dirpath):
-                    os.makedirs(new_dirpath)
-                # Move individual file from old_filepath to new_filepath
-                old_filepath = os.path.join(self.root, rel_filepath)
-                new_filepath = os.path.join(new_dirpath, filename)
-                shutil.copy2(old_filepath, new_filepath)
-            return self._get_dirhash(temp_dir)
-        finally:
-            try:
-                shutil.rmtree(temp_dir)  # delete directory
-            except OSError as exc:
-                if exc.errno != errno.ENOENT:  # ENOENT - no such file or directory
-                    raise  # re-raise exception
+        filehashes = self._calculate_filehashes(tracked_files)
+        return self._reduce_filehashes(filehashes.values())
 
     @staticmethod
     def _get_filehash(absolute_filepath):
-        if not os.path.isfile(absolute_filepath):
-            raise PathDoesNotExist(
-                __("error", "util.misc_functions.get_filehash",
-                   absolute_filepath))
-        BUFF_SIZE = 65536
-        sha1 = hashlib.md5()
-        with open(absolute_filepath, "rb") as f:
-            while True:
-                data = f.read(BUFF_SIZE)
-                if not data:
-                    break
-                sha1.update(data)
-        return sha1.hexdigest()
+        return FileHasher().get_filehash(absolute_filepath)
 
     @staticmethod
     def _get_dirhash(absolute_dirpath):
-        return checksumdir.dirhash(absolute_dirpath)
+        return FileHasher().get_dirhash(absolute_dirpath)
 
     def _has_unstaged_changes(self):
         """Return whether there are unstaged changes"""
@@ -183,30 +203,43 @@ class FileCodeDriver(CodeDriver):
             return commit_id
         # Find all tracked files (_get_tracked_files)
         tracked_filepaths = self._get_tracked_files()
-        # Create the hash of the files (_calculate_commit_hash)
-        commit_hash = self._calculate_commit_hash(tracked_filepaths)
+        # Create the hash of the files from the hash of each file
+        filehashes = self._calculate_filehashes(tracked_filepaths)
+        commit_hash = self._reduce_filehashes(filehashes.values())
         # Check if the hash already exists with exists_ref
         if self.exists_ref(commit_hash):
             return commit_hash
-        # Create a new file with the commit hash if it is new, else ERROR (no changes)
+        # Add the content of each file to the object store, only writing new
+        # content, and write the commit file as lines of "filepath,filehash"
+        for tracked_filepath in tracked_filepaths:
+            self._object_store.add(
+                os.path.join(self.root, tracked_filepath),
+                filehashes[tracked_filepath])
+        # Write to a temp file first so a partial commit is never listed as a ref
         commit_filepath = os.path.join(self._code_filepath, commit_hash)
-        with open(commit_filepath, "a+") as f:
-            # Loop through the tracked files
+        temp_dirpath = os.path.join(self._datmo_directory_path, "cache")
+        if not os.path.isdir(temp_dirpath):
+            os.makedirs(temp_dirpath)
+        # The permissions are written before the commit, so a commit has them
+        modes = {}
+        for tracked_filepath in tracked_filepaths:
+            modes[tracked_filepath] = stat.S_IMODE(
+                os.stat(os.path.join(self.root, tracked_filepath)).st_mode)
+        if not os.path.isdir(self._modes_filepath):
+            os.makedirs(self._modes_filepath)
+        temp_modes_filepath = os.path.join(temp_dirpath,
+                                           commit_hash + ".modes")
+        with open(temp_modes_filepath, "w") as f:
+            f.write(to_unicode(json.dumps(modes)))
+        os.rename(temp_modes_filepath,
+                  os.path.join(self._modes_filepath, commit_hash))
+        temp_commit_filepath = os.path.join(temp_dirpath, commit_hash)
+        with open(temp_commit_filepath, "w") as f:
             for tracked_filepath in tracked_filepaths:
-                absolute_filepath = os.path.join(self.root, tracked_filepath)
-                absolute_dirpath = os.path.join(self._code_filepath,
-                                                tracked_filepath)
-                # 1) create dir for file (use path name from tracked files list) -- if already exists skip
-                if not os.path.isdir(absolute_dirpath):
-                    os.makedirs(absolute_dirpath)
-                # 2) hash the file
-                filehash = self._get_filehash(absolute_filepath)
-                # 3) add file with file hash as name to folder for the file (if already exists, will overwrite file -- new ts)
-                new_absolute_filepath = os.path.join(absolute_dirpath,
-                                                     filehash)
-                shutil.copy2(absolute_filepath, new_absolute_filepath)
-                # 4) append a line into the new file for the commit hash with the following "filepath, filehash"
-                f.write(tracked_filepath + "," + filehash + "\n")
+                f.write(
+                    to_unicode(tracked_filepath + "," +
+                               filehashes[tracked_filepath] + "\n"))
+        os.rename(temp_commit_filepath, commit_filepath)
         # Return commit hash if success else ERROR
         return commit_hash
 
@@ -297,6 +330,9 @@ class FileCodeDriver(CodeDriver):
                 __("error", "controller.code.driver.file.delete_ref"))
         commit_filepath = os.path.join(self._code_filepath, commit_id)
         os.remove(commit_filepath)
+        modes_filepath = os.path.join(self._modes_filepath, commit_id)
+        if os.path.isfile(modes_filepath):
+            os.remove(modes_filepath)
         return True
 
     def list_refs(self):
@@ -356,19 +392,33 @@ class FileCodeDriver(CodeDriver):
         tracked_filepaths = self._get_tracked_files()
         if self._calculate_commit_hash(tracked_filepaths) == commit_id:
             return True
-        # Remove all tracked files from repository
-        for tracked_filepath in self._get_tracked_files():
-            absolute_filepath = os.path.join(self.root, tracked_filepath)
-            os.remove(absolute_filepath)
-        # Add in files from the commit
+        # Only write the tracked files which differ from the commit
         commit_filepath = os.path.join(self._code_filepath, commit_id)
+        manifest = {}
         with open(commit_filepath, "r") as f:
             for line in f:
                 tracked_filepath, filehash = line.rstrip().split(",")
-                source_absolute_filepath = os.path.join(
-                    self._code_filepath, tracked_filepath, filehash)
-                destination_absolute_filepath = os.path.join(
-                    self.root, tracked_filepath)
-                shutil.copy2(source_absolute_filepath,
-                             destination_absolute_filepath)
+                manifest[tracked_filepath] = filehash
+        # Commits created before the permissions were kept get those of the objects
+        modes = {}
+        modes_filepath = os.path.join(self._modes_filepath, commit_id)
+        if os.path.isfile(modes_filepath):
+            with open(modes_filepath, "r") as f:
+                modes = json.load(f)
+
+        def write_file(tracked_filepath, filehash, destination_filepath):
+            if self._object_store.exists(filehash):
+                return self._object_store.copy(
+                    filehash,
+                    destination_filepath,
+                    mode=modes.get(tracked_filepath))
+            # Commits created before the object store kept a copy of
+            # each file at .datmo/code/<filepath>/<filehash>
+            source_absolute_filepath = os.path.join(self._code_filepath,
+                                                    tracked_filepath, filehash)
+            shutil.copy2(source_absolute_filepath, destination_filepath)
+            return os.path.getsize(destination_filepath)
+
+        CheckoutEngine(self.root, self._file_index).checkout(
+            manifest, write_file, rel_filepaths=tracked_filepaths)
         return True
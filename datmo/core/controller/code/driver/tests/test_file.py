@@ -135,6 +135,25 @@ class TestFileCodeDriver():
             tracked_filepaths)
         # Assert the correct commit hash was returned
         assert result == "69a329523ce1ec88bf63061863d9cb14"
+        # Assert no copy of the files was made and the file index was saved
+        assert os.listdir(self.file_code_driver._code_filepath) == []
+        assert os.path.isfile(self.file_code_driver._file_index.filepath)
+        # Test if the hash matches the hash of a copy of nested files
+        os.makedirs(os.path.join(self.temp_dir, "dir"))
+        with open(os.path.join(self.temp_dir, "dir", "test2.txt"), "wb") as f:
+            f.write(to_bytes("world"))
+        tracked_filepaths = self.file_code_driver._get_tracked_files()
+        result = self.file_code_driver._calculate_commit_hash(
+            tracked_filepaths)
+        copy_dirpath = tempfile.mkdtemp(dir=self.temp_dir)
+        shutil.copy2(
+            os.path.join(self.temp_dir, "test.txt"),
+            os.path.join(copy_dirpath, "test.txt"))
+        os.makedirs(os.path.join(copy_dirpath, "dir"))
+        shutil.copy2(
+            os.path.join(self.temp_dir, "dir", "test2.txt"),
+            os.path.join(copy_dirpath, "dir", "test2.txt"))
+        assert result == self.file_code_driver._get_dirhash(copy_dirpath)
 
     def test_current_hash(self):
         self.__setup()
@@ -174,16 +193,26 @@ class TestFileCodeDriver():
         commit_filepath = os.path.join(self.file_code_driver._code_filepath,
                                        result)
         assert os.path.isfile(commit_filepath)
-        # Assert only the tracked files were added in the correct locations
+        # Assert the content of each tracked file was added to the object store
+        object_store = self.file_code_driver._object_store
         tracked_filepaths = self.file_code_driver._get_tracked_files()
         for tracked_filepath in tracked_filepaths:
-            absolute_dirpath = os.path.join(
-                self.file_code_driver._code_filepath, tracked_filepath)
-            assert os.path.isdir(absolute_dirpath)
-            assert len(os.listdir(absolute_dirpath)) == 1
-            file_line_str = tracked_filepath + "," + os.listdir(
-                absolute_dirpath)[0]
+            filehash = self.file_code_driver._get_filehash(
+                os.path.join(self.temp_dir, tracked_filepath))
+            assert object_store.exists(filehash)
+            file_line_str = tracked_filepath + "," + filehash
             assert file_line_str in open(commit_filepath).read()
+        # Assert only the commit file is present in the code directory
+        assert os.listdir(self.file_code_driver._code_filepath) == [result]
+        # Test identical content is only stored once
+        with open(os.path.join(self.temp_dir, "test_copy.txt"), "wb") as f:
+            f.write(open(os.path.join(self.temp_dir, "test.txt"), "rb").read())
+        num_objects = sum(
+            len(filenames) for _, _, filenames in os.walk(object_store.root))
+        result_2 = self.file_code_driver.create_ref()
+        assert result_2 != result
+        assert num_objects == sum(
+            len(filenames) for _, _, filenames in os.walk(object_store.root))
 
     def test_current_ref(self):
         # Test failure, not initialized
@@ -367,3 +396,43 @@ class TestFileCodeDriver():
                     destination_absolute_filepath)
         # Check that files in the latest commit are not present
         assert not os.path.isfile(os.path.join(self.temp_dir, "test2.txt"))
+
+    def test_checkout_ref_mode(self):
+        if platform.system() == "Windows":
+            return
+        self.__setup()
+        filepath = os.path.join(self.temp_dir, "test.txt")
+        os.chmod(filepath, 0o644)
+        # The object is shared with a collection, with other permissions
+        self.file_code_driver._object_store.add(
+            filepath,
+            self.file_code_driver._get_filehash(filepath),
+            mode=0o755)
+        commit_hash = self.file_code_driver.create_ref()
+        os.remove(filepath)
+        _ = self.file_code_driver.create_ref()
+        self.file_code_driver.checkout_ref(commit_id=commit_hash)
+        assert os.stat(filepath).st_mode & 0o777 == 0o644
+
+    def test_checkout_ref_legacy(self):
+        self.__setup()
+        commit_hash = self.file_code_driver.create_ref()
+        # Move the objects to the layout used before the object store
+        commit_filepath = os.path.join(self.file_code_driver._code_filepath,
+                                       commit_hash)
+        with open(commit_filepath, "r") as f:
+            for line in f:
+                tracked_filepath, filehash = line.rstrip().split(",")
+                legacy_dirpath = os.path.join(
+                    self.file_code_driver._code_filepath, tracked_filepath)
+                os.makedirs(legacy_dirpath)
+                shutil.copy2(
+                    os.path.join(self.temp_dir, tracked_filepath),
+                    os.path.join(legacy_dirpath, filehash))
+        shutil.rmtree(self.file_code_driver._object_store.root)
+        os.remove(os.path.join(self.temp_dir, "test.txt"))
+        _ = self.file_code_driver.create_ref()
+        result = self.file_code_driver.checkout_ref(commit_id=commit_hash)
+        assert result
+        assert os.path.isfile(os.path.join(self.temp_dir, "test.txt"))
+        assert self.file_code_driver.current_ref() == commit_hash
@@ -204,7 +204,7 @@ class EnvironmentDriver(with_metaclass(ABCMeta, object)):
         pass
 
     @abstractmethod
-    def run(self, name, options, log_filepath):
+    def run(self, name, options, log_filepath, results=None):
         """Run and log an instance of the environment with the options given
 
         Parameters
@@ -226,7 +226,11 @@ class EnvironmentDriver(with_metaclass(ABCMeta, object)):
             stdin_open : bool
             tty : bool
         log_filepath : str
-            filepath to the log file
+            filepath to the log file, compressed if it ends with ".gz"
+            (see datmo.core.util.log_stream.LogWriter)
+        results : dict, optional
+            dictionary updated with the results of the lines of the logs of the
+            form "key:value" as they arrive
 
         Returns
         -------
@@ -235,7 +239,8 @@ class EnvironmentDriver(with_metaclass(ABCMeta, object)):
         run_id : str
             identification for run of the environment
         logs : str
-            string version of output logs for the container
+            last lines of the output logs for the container, the full logs are
+            in the log file
         """
         pass
 
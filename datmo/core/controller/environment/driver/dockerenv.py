@@ -27,6 +27,7 @@ from docker import DockerClient
 from docker import errors
 
 from datmo.core.util.i18n import get as __
+from datmo.core.util.log_stream import LogWriter
 from datmo.core.util.exceptions import (
     PathDoesNotExist, EnvironmentInitFailed, EnvironmentConnectFailed,
     EnvironmentExecutionError, FileAlreadyExistsError,
@@ -278,7 +279,7 @@ class DockerEnvironmentDriver(EnvironmentDriver):
         return self.build_image(name, path, workspace)
 
     # running daemon needed
-    def run(self, name, options, log_filepath):
+    def run(self, name, options, log_filepath, results=None):
         if "gpu" in options:
             gpu_ready = self.gpu_enabled()
             if options["gpu"] is True:
@@ -291,7 +292,7 @@ class DockerEnvironmentDriver(EnvironmentDriver):
             image_name=name, **options)
 
         log_return_code, logs = self.log_container(
-            run_id, filepath=log_filepath)
+            run_id, filepath=log_filepath, results=results)
 
         final_return_code = run_return_code and log_return_code
         return final_return_code, run_id, logs
@@ -762,7 +763,12 @@ class DockerEnvironmentDriver(EnvironmentDriver):
         return True
 
     # running daemon needed
-    def log_container(self, container_id, filepath, api=False, follow=True):
+    def log_container(self,
+                      container_id,
+                      filepath,
+                      api=False,
+                      follow=True,
+                      results=None):
         """Log capture at a particular point `docker logs`. Can also use `--follow` for real time logs
 
         Parameters
@@ -770,25 +776,31 @@ class DockerEnvironmentDriver(EnvironmentDriver):
         container_id : str
             Docker container id
         filepath : str
-            Filepath to store log file
+            Filepath to store log file, compressed if it ends with ".gz"
         api : bool
             True to use the docker python api
         follow : bool
             Tail the output
+        results : dict, optional
+            dictionary updated with the results of the lines of the form
+            "key:value" as they arrive
 
         Returns
         -------
         return_code : str
             Process return code for the container
         logs : str
-            Output logs read into a string format
+            Last lines of the output logs, the full logs are streamed to the
+            log file as they arrive and never held in memory
         """
         # TODO: Fix function to better accomodate all logs in the same way
         if api:  # calling the docker client via the API
-            with open(filepath, "wb") as log_file:
+            with LogWriter(filepath, results=results) as log_writer:
                 for line in self.client.containers.get(container_id).logs(
                         stream=True):
-                    log_file.write(to_bytes(line.strip() + os.linesep))
+                    if not isinstance(line, str):
+                        line = line.decode("utf-8", "replace")
+                    log_writer.write(line.strip())
         else:
             command = list(self.prefix)
             if follow:
@@ -797,20 +809,16 @@ class DockerEnvironmentDriver(EnvironmentDriver):
                 command.extend(["logs", str(container_id)])
             process = subprocess.Popen(
                 command, stdout=subprocess.PIPE, universal_newlines=True)
-            with open(filepath, "wb") as log_file:
+            with LogWriter(filepath, results=results) as log_writer:
                 while True:
                     output = process.stdout.readline()
                     if output == "" and process.poll() is not None:
                         break
                     if output:
                         printable_output = output.strip().replace("\x08", " ")
-                        log_file.write(to_bytes(printable_output + os.linesep))
+                        log_writer.write(printable_output)
             return_code = process.poll()
-            with open(filepath, "rb") as log_file:
-                logs = log_file.read()
-                if type(logs) != str:  # handle for python 3x
-                    logs = logs.decode("utf-8")
-            return return_code, logs
+            return return_code, log_writer.get_tail()
 
     # running daemon needed
     def stop_remove_containers_by_term(self, term, force=False):
@@ -330,7 +330,7 @@ class EnvironmentController(BaseController):
         """
         return self.environment_driver.extract_workspace_url(name, workspace)
 
-    def run(self, environment_id, options, log_filepath):
+    def run(self, environment_id, options, log_filepath, results=None):
         """Run and log an instance of the environment with the options given
 
         Parameters
@@ -356,6 +356,9 @@ class EnvironmentController(BaseController):
             tty : bool, optional
         log_filepath : str
             filepath to the log file
+        results : dict, optional
+            dictionary updated with the results of the lines of the logs of the
+            form "key:value" as they arrive
 
         Returns
         -------
@@ -369,7 +372,8 @@ class EnvironmentController(BaseController):
         self.environment_driver.init()
         # TODO: Check hardware info here if different from creation time
         final_return_code, run_id, logs = \
-            self.environment_driver.run(environment_id, options, log_filepath)
+            self.environment_driver.run(environment_id, options, log_filepath,
+                                        results=results)
         return final_return_code, run_id, logs
 
     def list(self):
@@ -557,41 +561,34 @@ class EnvironmentController(BaseController):
         # Check if unstaged changes exist
         if self._has_unstaged_changes():
             raise UnstagedChanges()
-        # Check if environment has is same as current
-        results = self.dal.environment.query({"id": environment_id})
-        environment_obj = results[0]
-        environment_hash = environment_obj.unique_hash
-
-        if self._calculate_project_environment_hash() == environment_hash:
-            return True
-        # Remove all content from project environment directory
-        for file in os.listdir(
-                self.environment_driver.environment_directory_path):
-            file_path = os.path.join(
-                self.environment_driver.environment_directory_path, file)
-            try:
-                if os.path.isfile(file_path):
-                    os.remove(file_path)
-                elif os.path.isdir(file_path):
-                    shutil.rmtree(file_path)
-            except Exception as e:
-                print(e)
-        # Add in files for that environment id
+        self._checkout(environment_id)
+        return True
+
+    def _checkout(self, environment_id):
+        """Checkout to specific environment id without checking for unstaged
+        changes, only writing the files which differ from the project environment
+        directory. The datmo specific files of the environment are not checked out
+
+        Returns
+        -------
+        dict
+            checkout stats, see LocalFileDriver.checkout_collection
+        """
+        environment_obj = self.dal.environment.get_by_id(environment_id)
         file_collection_obj = self.dal.file_collection.\
             get_by_id(environment_obj.file_collection_id)
-        environment_definition_path = os.path.join(self.home,
-                                                   file_collection_obj.path)
-        # Copy to temp folder and remove files that are datmo specific
-        _temp_env_dir = get_datmo_temp_path(self.home)
-        self.file_driver.copytree(environment_definition_path, _temp_env_dir)
-        for filename in self.environment_driver.get_datmo_definition_filenames(
-        ):
-            os.remove(os.path.join(_temp_env_dir, filename))
-        # Copy from temp folder to project environment directory
-        self.file_driver.copytree(
-            _temp_env_dir, self.environment_driver.environment_directory_path)
-        shutil.rmtree(_temp_env_dir)
-        return True
+        environment_directory_path = \
+            self.environment_driver.environment_directory_path
+        if not os.path.isdir(environment_directory_path):
+            os.makedirs(environment_directory_path)
+        stats = self.file_driver.checkout_collection(
+            file_collection_obj.filehash,
+            environment_directory_path,
+            exclude=self.environment_driver.get_datmo_definition_filenames())
+        self.logger.debug(
+            "checkout of environment %s wrote %d bytes and deleted %d bytes" %
+            (environment_id, stats["bytes_written"], stats["bytes_deleted"]))
+        return stats
 
     def _setup_compatible_environment(self,
                                       create_dict,
@@ -653,6 +650,19 @@ class EnvironmentController(BaseController):
         str
             unique hash of the project environment directory
         """
+        env_hash, env_hash_no_hardware = \
+            self._calculate_project_environment_hashes()
+        return env_hash if save_hardware_file else env_hash_no_hardware
+
+    def _calculate_project_environment_hashes(self):
+        """Return the environment hashes from contents in project environment directory,
+        both with and without the hardware info file, hashing the files only once
+
+        Returns
+        -------
+        tuple
+            (hash including the hardware info file, hash without the hardware info file)
+        """
         # Populate paths from the project environment directory
         paths = []
         if os.path.isdir(self.environment_driver.environment_directory_path):
@@ -674,25 +684,24 @@ class EnvironmentController(BaseController):
             },
             paths,
             _temp_dir,
-            save_hardware_file=save_hardware_file)
-
-        # Create new temp directory
-        _temp_dir_2 = get_datmo_temp_path(self.home)
+            save_hardware_file=True)
 
-        # Hash the paths of the environment with a different temp dir
-        dirhash = self.file_driver.calculate_hash_paths(paths, _temp_dir_2)
-
-        # Remove both temporary directories
-        shutil.rmtree(_temp_dir)
-        shutil.rmtree(_temp_dir_2)
-
-        return dirhash
+        # Hash the files in place, the hardware info file is the last path added
+        try:
+            filehashes = self.file_driver.calculate_filehashes_paths(paths)
+        finally:
+            shutil.rmtree(_temp_dir)
+        hardware_info_filename = os.path.basename(paths[-1])
+        env_hash = self.file_driver.reduce_filehashes(filehashes.values())
+        filehashes.pop(hardware_info_filename)
+        env_hash_no_hardware = self.file_driver.reduce_filehashes(
+            filehashes.values())
+        return env_hash, env_hash_no_hardware
 
     def _has_unstaged_changes(self):
         """Return whether there are unstaged changes"""
-        env_hash = self._calculate_project_environment_hash()
-        env_hash_no_hardware = self._calculate_project_environment_hash(
-            save_hardware_file=False)
+        env_hash, env_hash_no_hardware = \
+            self._calculate_project_environment_hashes()
         environment_files = list_all_filepaths(
             self.environment_driver.environment_directory_path)
         if self.exists(environment_unique_hash=env_hash) or self.exists(
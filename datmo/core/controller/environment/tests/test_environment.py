@@ -1041,6 +1041,20 @@ class TestEnvironmentController():
         assert result == "1e32ff083520f792cbe4bafdc2de2a01"
         assert result == environment_obj_1.unique_hash
 
+    def test_calculate_project_environment_hashes(self):
+        # Setup
+        self.__setup()
+        env_hash, env_hash_no_hardware = \
+            self.environment_controller._calculate_project_environment_hashes()
+        assert env_hash == self.environment_controller._calculate_project_environment_hash(
+        )
+        assert env_hash_no_hardware == "1e32ff083520f792cbe4bafdc2de2a01"
+        assert env_hash != env_hash_no_hardware
+        # Test hashes are the same as those of create
+        environment_obj = self.environment_controller.create({})
+        self.environment_ids.append(environment_obj.id)
+        assert env_hash == environment_obj.unique_hash
+
     def test_has_unstaged_changes(self):
         # Setup
         self.__setup()
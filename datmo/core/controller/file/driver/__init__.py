@@ -172,6 +172,22 @@ class FileDriver(with_metaclass(ABCMeta, object)):
             unique hash of the directory
         """
 
+    @staticmethod
+    @abstractmethod
+    def reduce_filehashes(filehashes):
+        """Return the hash of a directory from the hashes of its files
+
+        Parameters
+        ----------
+        filehashes : list
+            hashes of each of the files in the directory
+
+        Returns
+        -------
+        str
+            unique hash of the directory
+        """
+
     @abstractmethod
     def create_collection(self, paths):
         """Takes a list of user given paths and aggregates into collection
@@ -190,7 +206,7 @@ class FileDriver(with_metaclass(ABCMeta, object)):
         pass
 
     @abstractmethod
-    def calculate_hash_paths(self, paths, directory):
+    def calculate_hash_paths(self, paths, directory=None):
         """Takes a list of user given paths, copies to directory, and returns hash
 
         Parameters
@@ -198,8 +214,9 @@ class FileDriver(with_metaclass(ABCMeta, object)):
         paths : list
             list of absolute or relative filepaths and/or dirpaths to collect with destination names
             (e.g. "/path/to/file>hello", "/path/to/file2", "/path/to/dir>newdir")
-        directory : str
-            directory to aggregate paths
+        directory : str, optional
+            directory to aggregate paths (default is None, the hash is calculated
+            from the source paths without copying them)
 
         Returns
         -------
@@ -207,6 +224,23 @@ class FileDriver(with_metaclass(ABCMeta, object)):
             hash of all of the paths in a directory
         """
 
+    @abstractmethod
+    def calculate_filehashes_paths(self, paths):
+        """Takes a list of user given paths and returns the hash of each file within
+        them by destination, without copying them
+
+        Parameters
+        ----------
+        paths : list
+            list of absolute or relative filepaths and/or dirpaths to collect with destination names
+            (e.g. "/path/to/file>hello", "/path/to/file2", "/path/to/dir>newdir")
+
+        Returns
+        -------
+        dict
+            relative destination filepath -> hash of the file
+        """
+
     @abstractmethod
     def get_collection_path(self, filehash):
         """Return the collection path by filehash
@@ -289,4 +323,26 @@ class FileDriver(with_metaclass(ABCMeta, object)):
         bool
             True if successful
         """
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def checkout_collection(self, filehash, dst_dirpath, exclude=None):
+        """Makes the contents of the absolute dst path equal to the collection,
+        only adding, replacing or deleting the files which differ
+
+        Parameters
+        ----------
+        filehash : str
+            hash representing the files in the collection
+        dst_dirpath : str
+            absolute dirpath to checkout the collection contents to
+        exclude : list, optional
+            relative filepaths within the collection which are not checked out
+
+        Returns
+        -------
+        dict
+            "added", "replaced" and "deleted" number of files, "bytes_written" and
+            "bytes_deleted"
+        """
+        pass
@@ -1,9 +1,8 @@
 import os
 import stat
+import hashlib
 import shutil
 import glob
-import hashlib
-import checksumdir
 from io import open
 try:
     to_unicode = unicode
@@ -15,15 +14,44 @@ from datmo.core.util.exceptions import (
     PathDoesNotExist, FileIOError, FileStructureError, FileAlreadyExistsError,
     DirAlreadyExistsError)
 from datmo.core.controller.file.driver import FileDriver
-from datmo.core.util.misc_functions import get_datmo_temp_path, parse_paths
+from datmo.core.util.misc_functions import get_datmo_temp_path, parse_paths, \
+    list_all_filepaths
+from datmo.core.util.object_store import ObjectStore
+from datmo.core.util.materializer import Materializer
+from datmo.core.util.file_hasher import FileHasher
+from datmo.core.util.file_index import FileIndex
+from datmo.core.util.checkout_engine import CheckoutEngine
 
 
 class LocalFileDriver(FileDriver):
     """
     This FileDriver ensures that the .datmo directory and file based components are present
+
+    The contents of file collections are kept in the project object store (shared with
+    the file code driver) and hard linked into each collection, so each unique file is
+    only stored once
+
+    Parameters
+    ----------
+    root : str
+        absolute path of the project
+    datmo_directory_name : str
+        name of the datmo directory within the project
+    object_compression : str, optional
+        compression for new objects in the object store, one of None, "zlib" or "zstd"
+        (default is None). Compressed objects cannot be hard linked, so collection
+        files are written out in full
+    materialize_mode : str, optional
+        how files are written by copytree, copyfile and transfer_collection, one of
+        "copy", "reflink" or "hardlink" (default is "reflink"). See
+        datmo.core.util.materializer.Materializer
     """
 
-    def __init__(self, root, datmo_directory_name):
+    def __init__(self,
+                 root,
+                 datmo_directory_name,
+                 object_compression=None,
+                 materialize_mode="reflink"):
         super(LocalFileDriver, self).__init__()
         self.root = root
         # Check if root exists
@@ -40,6 +68,21 @@ class LocalFileDriver(FileDriver):
         self.files_directory_name = "files"
         self.files_directory = os.path.join(
             self.root, self.datmo_directory_name, self.files_directory_name)
+        self._object_store = ObjectStore(
+            os.path.join(self.datmo_directory, "objects"),
+            compression=object_compression)
+        self._materializer = Materializer(mode=materialize_mode)
+        # Staged files are moved into the object store, so they must never share
+        # their content with the project files
+        self._staging_materializer = Materializer(mode="reflink")
+        self._file_hasher = FileHasher()
+        self._cache_directory = os.path.join(self.datmo_directory, "cache")
+        # Collections are immutable, so the hashes of their files are cached
+        collection_index_filepath = os.path.join(self._cache_directory,
+                                                 "collection_index.json")
+        self._collection_index = FileIndex(self.root,
+                                           collection_index_filepath,
+                                           self._file_hasher.get_filehashes)
         self._is_initialized = self.is_initialized
         self.type = "local"
 
@@ -69,8 +112,23 @@ class LocalFileDriver(FileDriver):
         else:
             return dst_filepath
 
-    @staticmethod
-    def copytree(src_dirpath, dst_dirpath, symlinks=False, ignore=None):
+    def copytree(self, src_dirpath, dst_dirpath, symlinks=False, ignore=None):
+        self.materialize(src_dirpath, dst_dirpath, symlinks, ignore)
+        return True
+
+    def materialize(self,
+                    src_dirpath,
+                    dst_dirpath,
+                    symlinks=False,
+                    ignore=None):
+        """Write the contents of the source directory into the destination directory,
+        replacing items which already exist, with the materialize mode of the driver
+
+        Returns
+        -------
+        int
+            number of bytes written (files which share data with the source are 0)
+        """
         if not os.path.isdir(src_dirpath):
             raise PathDoesNotExist(
                 __("error", "controller.file.driver.local.copytree.core",
@@ -79,21 +137,25 @@ class LocalFileDriver(FileDriver):
             raise PathDoesNotExist(
                 __("error", "controller.file.driver.local.copytree.dst",
                    dst_dirpath))
+        bytes_written = 0
         for item in os.listdir(src_dirpath):
             src_filepath = os.path.join(src_dirpath, item)
             dst_filepath = os.path.join(dst_dirpath, item)
             if os.path.isdir(src_filepath):
                 if os.path.exists(dst_filepath):
                     shutil.rmtree(dst_filepath)
-                shutil.copytree(src_filepath, dst_filepath, symlinks, ignore)
+                os.makedirs(dst_filepath)
+                bytes_written += self._materializer.tree(
+                    src_filepath, dst_filepath, symlinks, ignore)
+                shutil.copystat(src_filepath, dst_filepath)
             else:
                 if os.path.exists(dst_filepath):
                     os.remove(dst_filepath)
-                shutil.copy2(src_filepath, dst_filepath)
-        return True
+                bytes_written += self._materializer.file(
+                    src_filepath, dst_filepath)
+        return bytes_written
 
-    @staticmethod
-    def copyfile(filepath, dst_dirpath):
+    def copyfile(self, filepath, dst_dirpath):
         if not os.path.isfile(filepath):
             raise PathDoesNotExist(
                 __("error", "controller.file.driver.local.copyfile.core",
@@ -104,7 +166,7 @@ class LocalFileDriver(FileDriver):
                    dst_dirpath))
         dst_filepath = LocalFileDriver.get_safe_dst_filepath(
             filepath, dst_dirpath)
-        shutil.copy2(filepath, dst_filepath)
+        self._materializer.file(filepath, dst_filepath)
         return True
 
     @property
@@ -231,22 +293,50 @@ class LocalFileDriver(FileDriver):
             #     "exception": "File collection with id already exists."
             # })
         os.makedirs(collection_path)
-        self.copytree(temp_collection_path, collection_path)
 
         # Change permissions to read only for collection_path. File collection is immutable
         mode = stat.S_IRWXU | stat.S_IRGRP | stat.S_IXGRP | stat.S_IROTH | stat.S_IXOTH
 
-        for root, dirs, files in os.walk(collection_path, topdown=False):
+        # Files are linked to objects, shared with other collections and code refs,
+        # so they get their permissions from the object store rather than chmod
+        self._link_tree_from_objects(
+            temp_collection_path, collection_path, mode=mode)
+        for root, dirs, _ in os.walk(collection_path, topdown=False):
             for dir in [os.path.join(root, d) for d in dirs]:
                 os.chmod(dir, mode)
-            for file in [os.path.join(root, f) for f in files]:
-                os.chmod(file, mode)
 
         # Removing temp collection path
         shutil.rmtree(temp_collection_path)
         return filehash, files_rel, dirs_rel
 
-    def calculate_hash_paths(self, paths, directory):
+    def _link_tree_from_objects(self, src_dirpath, dst_dirpath, mode=None):
+        """Move each file in the source directory into the object store and link
+        it back into the same relative location in the destination directory, with
+        the permissions given if any"""
+        rel_filepaths = []
+        for root, dirs, files in os.walk(src_dirpath):
+            rel_dirpath = os.path.relpath(root, src_dirpath)
+            for dir in dirs:
+                os.makedirs(os.path.join(dst_dirpath, rel_dirpath, dir))
+            rel_filepaths.extend(
+                [os.path.join(rel_dirpath, file) for file in files])
+        filehashes = self._file_hasher.get_filehashes([
+            os.path.join(src_dirpath, rel_filepath)
+            for rel_filepath in rel_filepaths
+        ])
+        for rel_filepath, filehash in zip(rel_filepaths, filehashes):
+            self._object_store.add(
+                os.path.join(src_dirpath, rel_filepath),
+                filehash,
+                move=True,
+                mode=mode)
+            self._object_store.link(
+                filehash, os.path.join(dst_dirpath, rel_filepath), mode=mode)
+
+    def calculate_hash_paths(self, paths, directory=None):
+        if directory is None:
+            return FileHasher.reduce_filehashes(
+                self.calculate_filehashes_paths(paths).values())
         try:
             files, dirs, _, _ = parse_paths(self.root, paths, directory)
         except PathDoesNotExist as e:
@@ -264,7 +354,8 @@ class LocalFileDriver(FileDriver):
                        "controller.file.driver.create_collection.file_exists",
                        dest_abs_filepath))
             # File is copied over to the new destination path
-            shutil.copy2(src_abs_filepath, dest_abs_filepath)
+            self._staging_materializer.file(src_abs_filepath,
+                                            dest_abs_filepath)
 
         for dir_tuple in dirs:
             src_abs_dirpath, dest_abs_dirpath = dir_tuple
@@ -275,30 +366,80 @@ class LocalFileDriver(FileDriver):
                        dest_abs_dirpath))
             os.makedirs(dest_abs_dirpath)
             # All contents of directory is copied over to the new directory path
-            self.copytree(src_abs_dirpath, dest_abs_dirpath)
+            self._staging_materializer.tree(src_abs_dirpath, dest_abs_dirpath)
 
         # Hash the files to find filehash
-        return self.get_dirhash(directory)
+        return self._file_hasher.get_dirhash(directory)
+
+    def calculate_filehashes_paths(self, paths):
+        try:
+            _, _, files_rel, dirs_rel = parse_paths(self.root, paths, "")
+        except PathDoesNotExist as e:
+            raise PathDoesNotExist(
+                __("error",
+                   "controller.file.driver.local.create_collection.filepath",
+                   str(e)))
+
+        # Resolve the destinations from left to right in lists, with the same
+        # checks as if they were copied into an empty directory
+        dest_rel_dirpaths = set()
+        src_abs_filepaths = {}
+        for src_abs_filepath, dest_rel_filepath in files_rel:
+            if dest_rel_filepath in src_abs_filepaths:
+                raise FileAlreadyExistsError(
+                    __("error",
+                       "controller.file.driver.create_collection.file_exists",
+                       dest_rel_filepath))
+            src_abs_filepaths[dest_rel_filepath] = src_abs_filepath
+
+        for src_abs_dirpath, dest_rel_dirpath in dirs_rel:
+            if dest_rel_dirpath in src_abs_filepaths or \
+                    dest_rel_dirpath in dest_rel_dirpaths:
+                raise DirAlreadyExistsError(
+                    __("error",
+                       "controller.file.driver.create_collection.dir_exists",
+                       dest_rel_dirpath))
+            dest_rel_dirpaths.add(dest_rel_dirpath)
+            for rel_filepath in self._list_tree_filepaths(src_abs_dirpath):
+                src_abs_filepaths[os.path.join(
+                    dest_rel_dirpath, rel_filepath)] = os.path.join(
+                        src_abs_dirpath, rel_filepath)
+
+        dest_rel_filepaths = list(src_abs_filepaths)
+        filehashes = self._file_hasher.get_filehashes([
+            src_abs_filepaths[dest_rel_filepath]
+            for dest_rel_filepath in dest_rel_filepaths
+        ])
+        return dict(zip(dest_rel_filepaths, filehashes))
+
+    @staticmethod
+    def _list_tree_filepaths(absolute_dirpath):
+        """Return the relative filepaths of the files which copying the directory
+        would create, following symlinks like copytree does"""
+        rel_filepaths = []
+        for item in os.listdir(absolute_dirpath):
+            absolute_path = os.path.join(absolute_dirpath, item)
+            if os.path.isdir(absolute_path):
+                rel_filepaths.extend([
+                    os.path.join(item, rel_filepath)
+                    for rel_filepath in LocalFileDriver._list_tree_filepaths(
+                        absolute_path)
+                ])
+            else:
+                rel_filepaths.append(item)
+        return rel_filepaths
 
     @staticmethod
     def get_filehash(absolute_filepath):
-        if not os.path.isfile(absolute_filepath):
-            raise PathDoesNotExist(
-                __("error", "util.misc_functions.get_filehash",
-                   absolute_filepath))
-        BUFF_SIZE = 65536
-        sha1 = hashlib.md5()
-        with open(absolute_filepath, "rb") as f:
-            while True:
-                data = f.read(BUFF_SIZE)
-                if not data:
-                    break
-                sha1.update(data)
-        return sha1.hexdigest()
+        return FileHasher().get_filehash(absolute_filepath)
 
     @staticmethod
     def get_dirhash(absolute_dirpath):
-        return checksumdir.dirhash(absolute_dirpath)
+        return FileHasher().get_dirhash(absolute_dirpath)
+
+    @staticmethod
+    def reduce_filehashes(filehashes):
+        return FileHasher.reduce_filehashes(filehashes)
 
     def get_absolute_collection_path(self, filehash):
         return os.path.join(self.datmo_directory, "collections", filehash)
@@ -339,6 +480,59 @@ class LocalFileDriver(FileDriver):
                                        filehash)
         return self.copytree(collection_path, dst_dirpath)
 
+    def checkout_collection(self, filehash, dst_dirpath, exclude=None):
+        if not self.exists_collection(filehash):
+            raise PathDoesNotExist(
+                __("error", "controller.file.driver.local.transfer_collection",
+                   filehash))
+        if not os.path.isdir(dst_dirpath):
+            raise PathDoesNotExist(
+                __("error",
+                   "controller.file.driver.local.transfer_collection.dst",
+                   dst_dirpath))
+        collection_path = self.get_absolute_collection_path(filehash)
+        collection_rel_path = os.path.relpath(collection_path, self.root)
+        exclude = set(exclude or [])
+        rel_filepaths = [
+            rel_filepath
+            for rel_filepath in list_all_filepaths(collection_path)
+            if rel_filepath not in exclude
+        ]
+        # Hash the files of the collection, keyed by their path in the project
+        filehashes = self._collection_index.get_filehashes([
+            os.path.join(collection_rel_path, rel_filepath)
+            for rel_filepath in rel_filepaths
+        ])
+        # Collections checked out before may have been deleted since
+        self._collection_index.save(prune_missing=True)
+        manifest = {}
+        for rel_filepath in rel_filepaths:
+            manifest[rel_filepath] = filehashes[os.path.join(
+                collection_rel_path, rel_filepath)]
+        rel_dirpaths = [
+            os.path.relpath(os.path.join(dirpath, dirname), collection_path)
+            for dirpath, dirnames, _ in os.walk(collection_path)
+            for dirname in dirnames
+        ]
+
+        def write_file(rel_filepath, _, dst_filepath):
+            return self._materializer.file(
+                os.path.join(collection_path, rel_filepath), dst_filepath)
+
+        checkout_engine = CheckoutEngine(dst_dirpath,
+                                         self._get_checkout_index(dst_dirpath))
+        return checkout_engine.checkout(
+            manifest, write_file, rel_dirpaths=rel_dirpaths)
+
+    def _get_checkout_index(self, dst_dirpath):
+        """Return the file index of a directory collections are checked out to"""
+        rel_dirpath = os.path.relpath(dst_dirpath, self.root)
+        index_filepath = os.path.join(
+            self._cache_directory, "checkout",
+            hashlib.md5(rel_dirpath.encode("utf-8")).hexdigest() + ".json")
+        return FileIndex(dst_dirpath, index_filepath,
+                         self._file_hasher.get_filehashes)
+
     # Datmo base directory (hidden dir .datmo)
     def create_hidden_datmo_dir(self):
         if not os.path.isdir(self.datmo_directory):
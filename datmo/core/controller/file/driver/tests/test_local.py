@@ -25,7 +25,8 @@ except TypeError:
 
 from datmo.core.util.misc_functions import get_datmo_temp_path
 from datmo.core.controller.file.driver.local import LocalFileDriver
-from datmo.core.util.exceptions import PathDoesNotExist
+from datmo.core.util.exceptions import (
+    PathDoesNotExist, FileAlreadyExistsError, DirAlreadyExistsError)
 from datmo.config import Config
 
 
@@ -94,6 +95,35 @@ class TestLocalFileDriver():
         assert os.path.isdir(os.path.join(dst_dirpath)) and \
             os.path.isfile(dst_filepath) == True
 
+    def test_materialize(self):
+        self.local_file_driver.create(
+            os.path.join("src", "dirpath1"), directory=True)
+        with open(
+                os.path.join(self.temp_dir, "src", "dirpath1", "test"),
+                "wb") as f:
+            f.write(to_bytes("hello"))
+        self.local_file_driver.create(
+            os.path.join("dst", "dirpath1"), directory=True)
+        self.local_file_driver.create(os.path.join("dst", "dirpath1", "old"))
+        src_dirpath = os.path.join(self.temp_dir, "src")
+        dst_dirpath = os.path.join(self.temp_dir, "dst")
+        result = self.local_file_driver.materialize(src_dirpath, dst_dirpath)
+        # Reflinked files are not written
+        assert result in [0, 5]
+        # Existing items in the destination are replaced
+        assert os.listdir(os.path.join(dst_dirpath, "dirpath1")) == ["test"]
+        # Hard linked files are not written
+        local_file_driver = LocalFileDriver(
+            root=self.temp_dir,
+            datmo_directory_name=Config().datmo_directory_name,
+            materialize_mode="hardlink")
+        result = local_file_driver.materialize(src_dirpath, dst_dirpath)
+        if not platform.system() == "Windows":
+            assert result == 0
+            assert os.path.samefile(
+                os.path.join(src_dirpath, "dirpath1", "test"),
+                os.path.join(dst_dirpath, "dirpath1", "test"))
+
     def test_copyfile(self):
         # Create first file to copy
         relative_filepath = "test.json"
@@ -395,6 +425,40 @@ class TestLocalFileDriver():
 
         self.local_file_driver.delete_collection(filehash)
 
+    def test_create_collection_dedup(self):
+        self.local_file_driver.init()
+        self.local_file_driver.create("dirpath1", directory=True)
+        self.local_file_driver.create(os.path.join("dirpath1", "filepath1"))
+        self.local_file_driver.create("filepath2")
+        with open(os.path.join(self.temp_dir, "dirpath1", "filepath1"),
+                  "wb") as f:
+            f.write(to_bytes("hello"))
+        with open(os.path.join(self.temp_dir, "filepath2"), "wb") as f:
+            f.write(to_bytes("hello"))
+        dirpath1 = os.path.join(self.temp_dir, "dirpath1")
+        filepath2 = os.path.join(self.temp_dir, "filepath2")
+        filehash, _, _ = self.local_file_driver.create_collection([dirpath1])
+        filehash_2, _, _ = self.local_file_driver.create_collection(
+            [dirpath1, filepath2])
+        assert filehash != filehash_2
+        # Identical content is stored once and linked into each collection
+        object_filepaths = []
+        for root, _, files in os.walk(
+                self.local_file_driver._object_store.root):
+            object_filepaths.extend(os.path.join(root, f) for f in files)
+        assert len(object_filepaths) == 1
+        collection_path_2 = self.local_file_driver.get_collection_path(
+            filehash_2)
+        for rel_filepath in [
+                os.path.join("dirpath1", "filepath1"), "filepath2"
+        ]:
+            collection_filepath = os.path.join(collection_path_2, rel_filepath)
+            with open(collection_filepath, "rb") as f:
+                assert f.read() == to_bytes("hello")
+            if not platform.system() == "Windows":
+                assert os.path.samefile(collection_filepath,
+                                        object_filepaths[0])
+
     def test_calculate_hash_paths_simple(self):
         self.local_file_driver.init()
 
@@ -444,6 +508,56 @@ class TestLocalFileDriver():
         assert result == "74be16979710d4c4e7c6647856088456"
         shutil.rmtree(temp_dir)
 
+    def test_calculate_hash_paths_no_copy(self):
+        self.local_file_driver.init()
+        self.local_file_driver.create(
+            os.path.join("dirpath1", "dirpath2"), directory=True)
+        self.local_file_driver.create(os.path.join("dirpath1", "filepath1"))
+        self.local_file_driver.create(
+            os.path.join("dirpath1", "dirpath2", "filepath2"))
+        self.local_file_driver.create("filepath3")
+        with open(os.path.join(self.temp_dir, "filepath3"), "wb") as f:
+            f.write(to_bytes("hello\n"))
+
+        dirpath1 = os.path.join(self.local_file_driver.root, "dirpath1")
+        filepath3 = os.path.join(self.local_file_driver.root, "filepath3")
+        paths = [filepath3 + ">renamed", dirpath1 + ">newdir"]
+        temp_dir = get_datmo_temp_path(self.local_file_driver.root)
+        expected = self.local_file_driver.calculate_hash_paths(paths, temp_dir)
+        shutil.rmtree(temp_dir)
+        num_items = len(os.listdir(self.local_file_driver.datmo_directory))
+        result = self.local_file_driver.calculate_hash_paths(paths)
+        assert result == expected
+        # Nothing is staged within the datmo directory
+        assert len(os.listdir(
+            self.local_file_driver.datmo_directory)) == num_items
+
+        # Each file is keyed by its destination
+        result = self.local_file_driver.calculate_filehashes_paths(paths)
+        assert result == {
+            "renamed":
+                "b1946ac92492d2347c6235b4d2611184",
+            os.path.join("newdir", "filepath1"):
+                "d41d8cd98f00b204e9800998ecf8427e",
+            os.path.join("newdir", "dirpath2", "filepath2"):
+                "d41d8cd98f00b204e9800998ecf8427e"
+        }
+
+        # Conflicting destinations fail like they do when copied
+        failed = False
+        try:
+            self.local_file_driver.calculate_hash_paths([filepath3, filepath3])
+        except FileAlreadyExistsError:
+            failed = True
+        assert failed
+        failed = False
+        try:
+            self.local_file_driver.calculate_hash_paths(
+                [filepath3 + ">dirpath1", dirpath1])
+        except DirAlreadyExistsError:
+            failed = True
+        assert failed
+
     def test_calculate_hash_paths_single_line(self):
         self.local_file_driver.init()
 
@@ -619,3 +733,46 @@ class TestLocalFileDriver():
                                           "dirpath2")) and \
                os.path.isfile(os.path.join(dst_dirpath,
                                            "filepath1"))
+
+    def test_checkout_collection(self):
+        self.local_file_driver.create("dirpath1", directory=True)
+        self.local_file_driver.create(os.path.join("dirpath1", "filepath2"))
+        self.local_file_driver.create("filepath1")
+        with open(os.path.join(self.temp_dir, "filepath1"), "wb") as f:
+            f.write(to_bytes("hello"))
+        dirpath1 = os.path.join(self.temp_dir, "dirpath1")
+        filepath1 = os.path.join(self.temp_dir, "filepath1")
+        self.local_file_driver.init()
+        filehash, _, _ = self.local_file_driver. \
+            create_collection([dirpath1, filepath1])
+        dst_dirpath = os.path.join(self.temp_dir, "new_dir")
+        self.local_file_driver.create(dst_dirpath, directory=True)
+        with open(os.path.join(dst_dirpath, "filepath1"), "wb") as f:
+            f.write(to_bytes("world"))
+        with open(os.path.join(dst_dirpath, "filepath3"), "wb") as f:
+            f.write(to_bytes("extra"))
+
+        stats = self.local_file_driver.checkout_collection(
+            filehash, dst_dirpath, exclude=[os.path.join("dirpath1", "none")])
+        assert stats["added"] == 1
+        assert stats["replaced"] == 1
+        assert stats["deleted"] == 1
+        assert stats["bytes_deleted"] == 10
+        with open(os.path.join(dst_dirpath, "filepath1"), "rb") as f:
+            assert f.read() == to_bytes("hello")
+        assert os.path.isfile(
+            os.path.join(dst_dirpath, "dirpath1", "filepath2"))
+        assert not os.path.exists(os.path.join(dst_dirpath, "filepath3"))
+
+        # Nothing is written when the contents are the same
+        stats = self.local_file_driver.checkout_collection(
+            filehash, dst_dirpath)
+        assert stats["added"] == stats["replaced"] == stats["deleted"] == 0
+        assert stats["bytes_written"] == 0
+
+        # Excluded files are not checked out
+        os.remove(os.path.join(dst_dirpath, "filepath1"))
+        stats = self.local_file_driver.checkout_collection(
+            filehash, dst_dirpath, exclude=["filepath1"])
+        assert stats["added"] == 0
+        assert not os.path.exists(os.path.join(dst_dirpath, "filepath1"))
@@ -1,9 +1,8 @@
 import os
-import shutil
 
 from datmo.core.util.i18n import get as __
 from datmo.core.controller.base import BaseController
-from datmo.core.util.misc_functions import list_all_filepaths, get_datmo_temp_path
+from datmo.core.util.misc_functions import list_all_filepaths
 from datmo.core.entity.file_collection import FileCollection
 from datmo.core.util.exceptions import PathDoesNotExist, EnvironmentInitFailed, FileNotInitialized, UnstagedChanges
 
@@ -185,16 +184,8 @@ class FileCollectionController(BaseController):
                                  self.file_driver.files_directory)
             ])
 
-        # Create a temp dir to use for calculating the hash
-        _temp_dir = get_datmo_temp_path(self.home)
-
-        # Hash the paths of the files
-        dirhash = self.file_driver.calculate_hash_paths(paths, _temp_dir)
-
-        # Remove temporary directory
-        shutil.rmtree(_temp_dir)
-
-        return dirhash
+        # Hash the paths of the files in place
+        return self.file_driver.calculate_hash_paths(paths)
 
     def _has_unstaged_changes(self):
         """Return whether there are unstaged changes"""
@@ -252,27 +243,25 @@ class FileCollectionController(BaseController):
                 __("error", "controller.file_collection.checkout_file"))
         # Check if unstaged changes exist
         self.check_unstaged_changes()
-        # Check if environment has is same as current
-        results = self.dal.file_collection.query({"id": file_collection_id})
-        file_collection_obj = results[0]
-        file_hash = file_collection_obj.filehash
-
-        if self._calculate_project_files_hash() == file_hash:
-            return True
-        # Remove all content from `datmo_file` folder
-        # TODO Use datmo environment path as a class attribute
-        for file in os.listdir(self.file_driver.files_directory):
-            file_path = os.path.join(self.file_driver.files_directory, file)
-            try:
-                if os.path.isfile(file_path):
-                    os.remove(file_path)
-                elif os.path.isdir(file_path):
-                    shutil.rmtree(file_path)
-            except Exception as e:
-                print(e)
-        # Add in files for that file collection id
-        file_collection_path = os.path.join(self.home,
-                                            file_collection_obj.path)
-        self.file_driver.copytree(file_collection_path,
-                                  self.file_driver.files_directory)
+        self._checkout(file_collection_id)
         return True
+
+    def _checkout(self, file_collection_id):
+        """Checkout to specific file collection id without checking for unstaged
+        changes, only writing the files which differ from the project files
+
+        Returns
+        -------
+        dict
+            checkout stats, see LocalFileDriver.checkout_collection
+        """
+        file_collection_obj = self.dal.file_collection.get_by_id(
+            file_collection_id)
+        self.file_driver.ensure_files_dir()
+        stats = self.file_driver.checkout_collection(
+            file_collection_obj.filehash, self.file_driver.files_directory)
+        self.logger.debug(
+            "checkout of file collection %s wrote %d bytes and deleted %d bytes"
+            % (file_collection_id, stats["bytes_written"],
+               stats["bytes_deleted"]))
+        return stats
@@ -4,6 +4,7 @@ from datmo.config import Config
 from datmo.core.util.validation import validate
 from datmo.core.util.i18n import get as __
 from datmo.core.controller.base import BaseController
+from datmo.core.controller.session import init_project_id
 from datmo.core.controller.code.code import CodeController
 from datmo.core.controller.environment.environment import EnvironmentController
 from datmo.core.controller.file.file_collection import FileCollectionController
@@ -62,6 +63,7 @@ class ProjectController(BaseController):
             # Initialize File Driver if needed
             if not self.file_driver.is_initialized:
                 self.file_driver.init()
+            init_project_id(self.home)
 
             # Initialize the dal
             if not self.dal.is_initialized:
@@ -174,6 +176,8 @@ class ProjectController(BaseController):
             self.logger.warning(
                 __("warn", "controller.project.cleanup.environment"))
 
+        # The dal and drivers of the removed project are not used again
+        self.clear_session()
         return True
 
     def status(self):
@@ -0,0 +1,292 @@
+import os
+import sys
+import time
+import subprocess
+import multiprocessing
+
+from datmo.config import Config
+from datmo.core.controller.base import BaseController
+from datmo.core.controller.task import TaskController
+from datmo.core.util.run_queue import parse_mem_limit
+from datmo.core.util.file_lock import FileLock
+from datmo.core.util.exceptions import DoesNotExist
+
+
+class SchedulerController(BaseController):
+    """SchedulerController runs the tasks submitted to the run queue of the project,
+    each in its own worker process, with as many tasks at a time as fit within the
+    budgets of the scheduler. Tasks are started in the order they were submitted.
+    The workers write the records of their runs one at a time, holding the lock of
+    the project (see BaseController.project_lock)
+
+    The scheduler serving the queue, and the worker of each running job, hold a lock
+    on a file while they are alive (the pid file of the scheduler and the lock file
+    of the job), so a scheduler is started if and only if none is alive, and the
+    jobs of a scheduler which was killed are only failed once their worker is gone
+
+    The budgets are read from the project config if they are not given
+    (`scheduler_max_tasks` and `scheduler_mem_budget`)
+
+    Parameters
+    ----------
+    max_tasks : int, optional
+        maximum number of tasks running at a time (default is the number of cpus)
+    mem_budget : str or int, optional
+        total memory of the tasks running at a time, as the sum of their `mem_limit`
+        (default is the physical memory of the machine). A task larger than the
+        budget is run on its own
+
+    Attributes
+    ----------
+    task : datmo.core.controller.task.TaskController
+    max_tasks : int
+    mem_budget : int or None
+    pid_filepath : str
+        file holding the pid of the scheduler serving the queue, locked while it
+        serves it
+
+    Methods
+    -------
+    schedule()
+        reap finished tasks and start the queued tasks which fit within the budgets
+    serve(idle_timeout=10, poll_interval=1)
+        schedule tasks until the queue has been empty for idle_timeout seconds
+    is_serving()
+        return whether a scheduler is serving the queue
+    start()
+        start a scheduler daemon for the project if none is serving the queue
+    run_job(name)
+        run a claimed job, within a worker process
+    """
+
+    def __init__(self, max_tasks=None, mem_budget=None):
+        super(SchedulerController, self).__init__()
+        self.task = TaskController()
+        self.max_tasks = max_tasks or self.get_project_config_value(
+            "scheduler_max_tasks") or self.__get_cpu_count()
+        self.mem_budget = parse_mem_limit(
+            mem_budget or self.get_project_config_value("scheduler_mem_budget")
+        ) or self.__get_total_memory()
+        self.pid_filepath = os.path.join(self.task.queue.dirpath,
+                                         "scheduler.pid")
+        self._pid_lock = FileLock(self.pid_filepath)
+        # task id -> (job, worker process), the process being None for the jobs
+        # of a scheduler which was killed, whose worker is still running
+        self._running = {}
+
+    @staticmethod
+    def __get_cpu_count():
+        try:
+            return multiprocessing.cpu_count()
+        except NotImplementedError:
+            return 1
+
+    @staticmethod
+    def __get_total_memory():
+        try:
+            return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+        except (AttributeError, ValueError, OSError):
+            # Not available on Windows, the memory is then not budgeted
+            return None
+
+    def schedule(self):
+        """Reap the finished worker processes and start the queued tasks which fit
+        within the budgets
+
+        Returns
+        -------
+        int
+            number of tasks running
+        """
+        for task_id, (job, process) in list(self._running.items()):
+            if process is None:
+                if not self.__reap_orphan(job):
+                    continue
+            elif process.poll() is None:
+                continue
+            else:
+                self.__remove_job(job)
+                if process.returncode != 0:
+                    self.__fail_task(task_id)
+            del self._running[task_id]
+        for job in self.task.queue.list():
+            if not self.__fits(job):
+                # Later jobs wait for the first one, so it is not starved
+                break
+            if not self.task.queue.claim(job):
+                continue
+            self._running[job["task_id"]] = (job, self.__start_worker(job))
+        return len(self._running)
+
+    def __fits(self, job):
+        if not self._running:
+            return True
+        if len(self._running) >= self.max_tasks:
+            return False
+        if self.mem_budget is None:
+            return True
+        mem_used = sum(running_job["mem_limit"] or 0
+                       for running_job, _ in self._running.values())
+        return mem_used + (job["mem_limit"] or 0) <= self.mem_budget
+
+    def __remove_job(self, job):
+        job_lock = FileLock(self.task.queue.get_lock_filepath(job["name"]))
+        locked = job_lock.acquire()
+        self.task.queue.remove(job)
+        # A lock file held by a process left by the worker is left in place
+        if locked:
+            job_lock.release(remove=True)
+
+    def __reap_orphan(self, job):
+        """Remove a job claimed by a scheduler which was killed once its worker is
+        gone, failing its task if the worker did not complete it
+
+        Returns
+        -------
+        bool
+            True if the worker is gone and the job was removed
+        """
+        job_lock = FileLock(self.task.queue.get_lock_filepath(job["name"]))
+        if not job_lock.acquire():
+            return False
+        try:
+            # Holding the lock, a worker which did not start yet finds the job
+            # removed and does not run it
+            self.task.queue.remove(job)
+            self.__fail_task(job["task_id"])
+        finally:
+            job_lock.release(remove=True)
+        return True
+
+    def __start_worker(self, job):
+        return subprocess.Popen(
+            [
+                sys.executable, "-m", "datmo.core.controller.scheduler",
+                "worker", job["name"]
+            ],
+            cwd=self.home)
+
+    def __fail_task(self, task_id):
+        with self.task.project_lock():
+            task_obj = self.task.get(task_id)
+            if task_obj.status in ["QUEUED", "RUNNING"]:
+                self.task.dal.task.update({"id": task_id, "status": "FAILED"})
+
+    def serve(self, idle_timeout=10, poll_interval=1):
+        """Schedule the queued tasks until there has been nothing to run for
+        idle_timeout seconds
+
+        Returns
+        -------
+        bool
+            False if another scheduler is already serving the queue
+        """
+        served = False
+        while self._pid_lock.acquire():
+            served = True
+            self._pid_lock.write(str(os.getpid()))
+            try:
+                self.__serve(idle_timeout, poll_interval)
+            finally:
+                self._pid_lock.release()
+            # A job submitted once the scheduler was idle, but before it released
+            # the pid file, did not start another scheduler
+            if not self.task.queue.list():
+                break
+        return served
+
+    def __serve(self, idle_timeout, poll_interval):
+        # Jobs claimed by a scheduler which was killed, which are failed once
+        # their worker is gone
+        for job in self.task.queue.list(running=True):
+            if job["task_id"] not in self._running:
+                self._running[job["task_id"]] = (job, None)
+        idle_since = time.time()
+        while True:
+            if self.schedule() or self.task.queue.list():
+                idle_since = time.time()
+            elif time.time() - idle_since >= idle_timeout:
+                return
+            time.sleep(poll_interval)
+
+    def is_serving(self):
+        """Return whether a scheduler process is serving the queue, i.e. holds the
+        lock of the pid file"""
+        return self._pid_lock.locked or FileLock(self.pid_filepath).is_locked()
+
+    def start(self):
+        """Start a scheduler daemon for the project, detached from this process,
+        unless one is already serving the queue
+
+        Returns
+        -------
+        bool
+            True if a scheduler was started
+        """
+        if self.is_serving():
+            return False
+        options = {"cwd": self.home, "close_fds": True}
+        if hasattr(os, "setsid"):
+            options["preexec_fn"] = os.setsid
+        with open(os.devnull, "r+") as devnull:
+            subprocess.Popen(
+                [
+                    sys.executable, "-m", "datmo.core.controller.scheduler",
+                    "serve"
+                ],
+                stdin=devnull,
+                stdout=devnull,
+                stderr=devnull,
+                **options)
+        return True
+
+    def run_job(self, name):
+        """Run the task of a claimed job from the snapshot taken when it was
+        submitted
+
+        Parameters
+        ----------
+        name : str
+            name of the job
+
+        Returns
+        -------
+        datmo.core.entity.task.Task
+            the task which completed its run
+        """
+        # Held until the worker exits, so the job is not failed while it runs
+        job_lock = FileLock(self.task.queue.get_lock_filepath(name))
+        job_lock.acquire(blocking=True)
+        try:
+            job = self.task.queue.get(name, running=True)
+        except DoesNotExist:
+            # Failed by a scheduler which found the scheduler of the job killed
+            job_lock.release(remove=True)
+            raise
+        job["worker_pid"] = os.getpid()
+        self.task.queue.update(job)
+        try:
+            return self.task.run(
+                job["task_id"],
+                snapshot_dict=job["snapshot_dict"],
+                task_dict=job["task_dict"],
+                before_snapshot_id=job.get("before_snapshot_id"))
+        except Exception:
+            self.__fail_task(job["task_id"])
+            raise
+
+
+def main(argv=None):
+    """Entry point of the scheduler daemon and its worker processes, run from the
+    project directory"""
+    argv = sys.argv[1:] if argv is None else argv
+    Config().set_home(os.getcwd())
+    scheduler_controller = SchedulerController()
+    if argv[0] == "serve":
+        scheduler_controller.serve()
+    elif argv[0] == "worker":
+        scheduler_controller.run_job(argv[1])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import os
+import uuid
+import errno
+import threading
+from contextlib import contextmanager
+
+from datmo.config import Config
+from datmo.core.util.file_lock import FileLock
+
+# File of the datmo directory with the id of the project
+PROJECT_ID_FILENAME = ".project_id"
+# File of the datmo directory locked while writing the records of the project
+PROJECT_LOCK_FILENAME = "project.lock"
+
+# Sessions of the current process by project home, cleared in forked processes
+_sessions = {}
+_sessions_pid = None
+_sessions_lock = threading.Lock()
+
+
+class ControllerSession(object):
+    """ControllerSession holds the dal and drivers of a project, shared by all of the
+    controllers of the project within a process so they read and write through the
+    same dal and see each other's writes. The threads of the process share them
+    too, the dal drivers serializing their calls with a lock
+
+    Parameters
+    ----------
+    home : str
+        absolute filepath of the project
+    signature : tuple or None
+        identity of the datmo directory of the project when the session was created
+
+    Attributes
+    ----------
+    home : str
+    signature : tuple or None
+
+    Methods
+    -------
+    get(key, create)
+        return the object of the session for the key, created on first use
+    clear()
+        remove all objects of the session, to be created again on their next use
+    project_lock()
+        hold the lock of the project, across threads and processes
+    """
+
+    def __init__(self, home, signature=None):
+        self.home = home
+        self.signature = signature
+        self._objects = {}
+        self._lock = threading.RLock()
+        self._project_thread_lock = threading.RLock()
+        self._project_file_lock = FileLock(
+            os.path.join(home,
+                         Config().datmo_directory_name, PROJECT_LOCK_FILENAME))
+        self._project_lock_depth = 0
+
+    def get(self, key, create):
+        """Return the object of the session for the key
+
+        Parameters
+        ----------
+        key : str
+            key of the object, e.g. "storage.local"
+        create : function
+            function returning the object, called if the session has none yet
+
+        Returns
+        -------
+        object
+        """
+        with self._lock:
+            if key not in self._objects:
+                self._objects[key] = create()
+            return self._objects[key]
+
+    def clear(self):
+        with self._lock:
+            self._objects = {}
+
+    @contextmanager
+    def project_lock(self):
+        """Hold the lock of the project, excluding the other threads of the process
+        and the other processes. A thread holding it may take it again, e.g. a
+        snapshot created while running a task"""
+        with self._project_thread_lock:
+            if not self._project_lock_depth:
+                self._project_file_lock.acquire(blocking=True)
+            self._project_lock_depth += 1
+            try:
+                yield
+            finally:
+                self._project_lock_depth -= 1
+                if not self._project_lock_depth:
+                    self._project_file_lock.release()
+
+
+def init_project_id(home):
+    """Write the id of the project to its datmo directory, unless already written,
+    so a project removed and initialized again is told apart from the one before"""
+    filepath = os.path.join(home,
+                            Config().datmo_directory_name, PROJECT_ID_FILENAME)
+    try:
+        fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+    except OSError as e:
+        if e.errno == errno.EEXIST:
+            return
+        raise
+    with os.fdopen(fd, "w") as f:
+        f.write(uuid.uuid4().hex)
+
+
+def get_signature(home):
+    """Return the identity of the datmo directory of the project, or None if it does
+    not exist, which changes if the project is removed and initialized again"""
+    datmo_dirpath = os.path.join(home, Config().datmo_directory_name)
+    try:
+        stat = os.stat(datmo_dirpath)
+    except OSError:
+        return None
+    # The inode of a removed directory may be reused by the next one, so the id
+    # written once on init is part of the identity (None for projects initialized
+    # before ids were written)
+    try:
+        with open(os.path.join(datmo_dirpath, PROJECT_ID_FILENAME)) as f:
+            project_id = f.read() or None
+    except (IOError, OSError):
+        project_id = None
+    return stat.st_dev, stat.st_ino, project_id
+
+
+def get_session(home):
+    """Return the session of the project in the current process, a new one if there
+    is none or if the datmo directory of the project was replaced since it was
+    created
+
+    Parameters
+    ----------
+    home : str
+        filepath of the project
+
+    Returns
+    -------
+    ControllerSession
+    """
+    global _sessions_pid
+    home = os.path.abspath(home)
+    signature = get_signature(home)
+    with _sessions_lock:
+        if _sessions_pid != os.getpid():
+            # Objects of the parent process (e.g. open files) are not shared
+            _sessions.clear()
+            _sessions_pid = os.getpid()
+        session = _sessions.get(home)
+        if session is not None and is_initialized_from(session.signature,
+                                                       signature):
+            # The project was initialized since, by the controllers of the session
+            session.signature = signature
+        elif session is None or session.signature != signature:
+            session = ControllerSession(home, signature)
+            _sessions[home] = session
+        return session
+
+
+def is_initialized_from(signature, new_signature):
+    """Return whether the datmo directory with the new signature was initialized
+    from the one with the signature, i.e. created, or given its id"""
+    if new_signature is None or signature == new_signature:
+        return False
+    return signature is None or (signature[2] is None
+                                 and signature[:2] == new_signature[:2])
+
+
+def clear_sessions():
+    """Remove the sessions of all projects of the current process"""
+    with _sessions_lock:
+        _sessions.clear()
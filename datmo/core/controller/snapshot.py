@@ -1,4 +1,5 @@
 import os
+import re
 
 from datmo.core.controller.base import BaseController
 from datmo.core.controller.code.code import CodeController
@@ -8,9 +9,10 @@ from datmo.core.entity.snapshot import Snapshot
 from datmo.core.util.i18n import get as __
 from datmo.core.util.validation import validate
 from datmo.core.util.json_store import JSONStore
-from datmo.core.util.exceptions import (
-    FileIOError, RequiredArgumentMissing, ProjectNotInitialized,
-    EntityNotFound, TaskNotComplete, DoesNotExist, UnstagedChanges)
+from datmo.core.util.exceptions import (FileIOError, RequiredArgumentMissing,
+                                        ProjectNotInitialized, EntityNotFound,
+                                        TaskNotComplete, DoesNotExist,
+                                        UnstagedChanges, InvalidArgumentType)
 
 
 class SnapshotController(BaseController):
@@ -39,6 +41,8 @@ class SnapshotController(BaseController):
         super(SnapshotController, self).__init__()
         self.code_controller = CodeController()
         self.file_collection_controller = FileCollectionController()
+        # The controllers share the dal of the session, so the records of a snapshot
+        # are written in one transaction
         self.environment_controller = EnvironmentController()
         if not self.is_initialized:
             raise ProjectNotInitialized(
@@ -174,6 +178,12 @@ class SnapshotController(BaseController):
         FileIOError
             if files are not present or there is an error in File IO
         """
+        # The transaction spans the hashing of the files and the environment build,
+        # so the commits of other processes meanwhile would be overwritten
+        with self.project_lock(), self.dal.transaction():
+            return self._create(dictionary)
+
+    def _create(self, dictionary):
         # Validate Inputs
         create_dict = {
             "model_id": self.model.id,
@@ -206,12 +216,7 @@ class SnapshotController(BaseController):
         # If snapshot object with required args already exists, return it
         # DO NOT create a new snapshot with the same required arguments
         results = self.dal.snapshot.query({
-            "model_id": create_dict["model_id"],
-            "code_id": create_dict['code_id'],
-            "environment_id": create_dict['environment_id'],
-            "file_collection_id": create_dict['file_collection_id'],
-            "config": create_dict['config'],
-            "stats": create_dict['stats']
+            "fingerprint": Snapshot.get_fingerprint(create_dict)
         })
         if results: return results[0]
 
@@ -302,6 +307,17 @@ class SnapshotController(BaseController):
 
         return self.dal.snapshot.update(snapshot_update_dict)
 
+    def backfill_fingerprints(self):
+        """Store the fingerprints of snapshots created before fingerprints were
+        stored, so they are found when creating a snapshot with the same components
+
+        Returns
+        -------
+        int
+            number of snapshots updated
+        """
+        return self.dal.snapshot.backfill_fingerprints()
+
     def check_unstaged_changes(self):
         """Checks if there exists any unstaged changes for the snapshot in the project.
 
@@ -341,23 +357,156 @@ class SnapshotController(BaseController):
         # Checkout code to the relevant commit ref
         code_checkout_success = self.code_controller.checkout(code_obj.id)
 
-        # Checkout environment to relevant environment id
-        environment_checkout_success = self.environment_controller.checkout(
+        # Checkout environment and files, only writing the files which differ
+        # as the unstaged changes have already been checked
+        environment_stats = self.environment_controller._checkout(
             environment_obj.id)
-
-        # Checkout files to relevant file collection id
-        file_checkout_success = self.file_collection_controller.checkout(
+        file_stats = self.file_collection_controller._checkout(
             file_collection_obj.id)
+        self.logger.debug(
+            "checkout of snapshot %s wrote %d bytes and deleted %d bytes" %
+            (snapshot_id,
+             environment_stats["bytes_written"] + file_stats["bytes_written"],
+             environment_stats["bytes_deleted"] + file_stats["bytes_deleted"]))
+
+        return code_checkout_success
+
+    def list(self,
+             visible=None,
+             sort_key=None,
+             sort_order=None,
+             filter=None,
+             label=None,
+             message=None,
+             config=None,
+             stats=None,
+             created_after=None,
+             created_before=None,
+             limit=None,
+             offset=None,
+             cursor=None):
+        """List the snapshots matching all of the filters given, which are
+        evaluated by the database
 
-        return (code_checkout_success and environment_checkout_success
-                and file_checkout_success)
+        Parameters
+        ----------
+        visible : bool, optional
+            only list visible or hidden snapshots (default is both)
+        sort_key : str, optional
+            key to sort the snapshots by
+        sort_order : str, optional
+            either "ascending" or "descending"
+        filter : str, optional
+            only list snapshots with the string in their message or label
+        label : str, optional
+            only list snapshots with this label
+        message : str, optional
+            only list snapshots with the string in their message
+        config : dict, optional
+            only list snapshots with these config values, given either as a value or
+            as a (low, high) tuple for an inclusive range, where None is unbounded
+        stats : dict, optional
+            only list snapshots with these stats values, as for config
+        created_after : datetime.datetime, optional
+            only list snapshots created at or after this time
+        created_before : datetime.datetime, optional
+            only list snapshots created before this time
+        limit : int, optional
+            maximum number of snapshots to return (default is all)
+        offset : int, optional
+            number of snapshots to skip (default is 0)
+        cursor : datetime.datetime, optional
+            created_at time of the last snapshot of the previous page. Only the
+            snapshots after it are listed, sorted by created_at (descending unless
+            sort_order is given)
 
-    def list(self, visible=None, sort_key=None, sort_order=None):
-        query = {}
+        Returns
+        -------
+        list
+            list of Snapshot objects
+
+        Raises
+        ------
+        InvalidArgumentType
+            if a cursor is given while sorting by another key
+        """
+        conditions = []
         if visible is not None and isinstance(visible, bool):
-            query['visible'] = visible
+            conditions.append({'visible': visible})
+        if filter:
+            substring = '(?s).*' + re.escape(filter)
+            conditions.append({
+                '$or': [{
+                    'message': {
+                        '$regex': substring
+                    }
+                }, {
+                    'label': {
+                        '$regex': substring
+                    }
+                }]
+            })
+        if label is not None:
+            conditions.append({'label': label})
+        if message:
+            conditions.append({
+                'message': {
+                    '$regex': '(?s).*' + re.escape(message)
+                }
+            })
+        for prefix, values in [('config', config), ('stats', stats)]:
+            for key, value in (values or {}).items():
+                conditions.extend(
+                    self.__get_value_conditions(prefix + "." + key, value))
+        if created_after is not None:
+            conditions.append({
+                'created_at': {
+                    '$gte': self.__format_datetime(created_after)
+                }
+            })
+        if created_before is not None:
+            conditions.append({
+                'created_at': {
+                    '$lt': self.__format_datetime(created_before)
+                }
+            })
+        if cursor is not None:
+            if sort_key is not None and sort_key != 'created_at':
+                raise InvalidArgumentType(
+                    __("error", "controller.snapshot.list.cursor", sort_key))
+            sort_key = 'created_at'
+            sort_order = sort_order or 'descending'
+            operator = '$lt' if sort_order == 'descending' else '$gt'
+            conditions.append({
+                'created_at': {
+                    operator: self.__format_datetime(cursor)
+                }
+            })
 
-        return self.dal.snapshot.query(query, sort_key, sort_order)
+        # Each operator is given in a separate condition, as BlitzDB only supports
+        # a single operator for each field
+        if len(conditions) > 1:
+            query = {'$and': conditions}
+        else:
+            query = conditions[0] if conditions else {}
+        return self.dal.snapshot.query(query, sort_key, sort_order, limit,
+                                       offset)
+
+    @staticmethod
+    def __get_value_conditions(key, value):
+        if isinstance(value, tuple):
+            low, high = value
+            conditions = []
+            if low is not None:
+                conditions.append({key: {'$gte': low}})
+            if high is not None:
+                conditions.append({key: {'$lte': high}})
+            return conditions or [{key: {'$exists': True}}]
+        return [{key: value}]
+
+    @staticmethod
+    def __format_datetime(value):
+        return value.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
 
     def update(self,
                snapshot_id,
@@ -3,14 +3,27 @@ import time
 import shlex
 import threading
 import webbrowser
+import multiprocessing
+from multiprocessing.pool import ThreadPool
 from datetime import datetime
+try:
+    basestring
+except NameError:
+    basestring = str
 
+from datmo.config import Config
 from datmo.core.controller.base import BaseController
 from datmo.core.controller.snapshot import SnapshotController
 from datmo.core.controller.environment.environment import EnvironmentController
 from datmo.core.entity.task import Task
 from datmo.core.util.validation import validate
 from datmo.core.util.spinner import Spinner
+from datmo.core.util.run_queue import RunQueue
+from datmo.core.util.sweep import expand_grid, sample_random, format_command
+from datmo.core.util.json_store import JSONStore
+from datmo.core.util.log_stream import LogReader, parse_result_line
+from datmo.core.util.metric_store import MetricStore
+from datmo.core.storage.driver.query import check_page
 from datmo.core.util.i18n import get as __
 from datmo.core.util.exceptions import (
     TaskRunError, RequiredArgumentMissing, ProjectNotInitialized,
@@ -28,6 +41,8 @@ class TaskController(BaseController):
         used to create environment if new definition file
     snapshot : datmo.core.controller.snapshot.SnapshotController
         used to create snapshots before and after tasks
+    queue : datmo.core.util.run_queue.RunQueue
+        queue of the task runs submitted to be run by the scheduler
 
     Methods
     -------
@@ -37,8 +52,17 @@ class TaskController(BaseController):
         helper for run to start environment and run with the appropriate parameters
     run(self, id, dictionary=None)
         runs the task and tracks the run, logs, inputs and outputs
+    submit(task_id, snapshot_dict=None, task_dict=None)
+        queues the task to be run by the scheduler and returns immediately
+    run_many(grid=None, random_spec=None, samples=None, seed=None, snapshot_dict=None,
+             task_dict=None, workers=None)
+        runs a task for each config of a parameter sweep, in parallel
     list(sort_key=None, sort_order=None)
         lists all tasks within the project given filters
+    get_logs(task_id, offset=0, limit=None)
+        returns a page of the lines of the logs of a task
+    get_metrics(task_id, keys=None)
+        returns the metrics logged by a task as NumPy arrays
     delete(id)
         deletes the specified task from the project
     """
@@ -48,11 +72,20 @@ class TaskController(BaseController):
         self.environment = EnvironmentController()
         self.snapshot = SnapshotController()
         self.spinner = Spinner()
+        self._queue = None
 
         if not self.is_initialized:
             raise ProjectNotInitialized(
                 __("error", "controller.task.__init__"))
 
+    @property
+    def queue(self):
+        if self._queue is None:
+            self._queue = RunQueue(
+                os.path.join(self.home,
+                             Config().datmo_directory_name, "queue"))
+        return self._queue
+
     def create(self):
         """Create Task object
 
@@ -75,7 +108,12 @@ class TaskController(BaseController):
             self.spinner.stop()
         return task_obj
 
-    def _run_helper(self, environment_id, options, log_filepath):
+    def _run_helper(self,
+                    environment_id,
+                    options,
+                    log_filepath,
+                    build=True,
+                    results=None):
         """Run environment with parameters
 
         Parameters
@@ -102,6 +140,12 @@ class TaskController(BaseController):
             tty : bool
         log_filepath : str
             absolute filepath to the log file
+        build : bool, optional
+            if False, the environment is expected to be built already
+            (default is True)
+        results : dict, optional
+            dictionary updated with the results of the lines of the logs of the
+            form "key:value" as they arrive
 
         Returns
         -------
@@ -126,7 +170,8 @@ class TaskController(BaseController):
             "api": False,
         }
         workspace = options.get('workspace', None)
-        self.environment.build(environment_id, workspace)
+        if build:
+            self.environment.build(environment_id, workspace)
         # Start a daemon to run workspace on web browser
         name = options.get('name', None)
         if workspace is not None:
@@ -137,7 +182,7 @@ class TaskController(BaseController):
 
         # Run container with environment
         return_code, run_id, logs = self.environment.run(
-            environment_id, run_options, log_filepath)
+            environment_id, run_options, log_filepath, results=results)
 
         return return_code, run_id, logs
 
@@ -168,8 +213,8 @@ class TaskController(BaseController):
 
         Parameters
         ----------
-        logs : str
-            raw string value of output logs
+        logs : str or iterable
+            raw string value of output logs, or the lines of the logs
 
         Returns
         -------
@@ -177,10 +222,11 @@ class TaskController(BaseController):
             dictionary to represent results from task
         """
         results = {}
-        for line in logs.split("\n"):
-            split_line = line.split(":")
-            if len(split_line) == 2:
-                results[split_line[0].strip()] = split_line[1].strip()
+        lines = logs.split("\n") if isinstance(logs, basestring) else logs
+        for line in lines:
+            result = parse_result_line(line)
+            if result is not None:
+                results[result[0]] = result[1]
         if results == {}:
             results = None
         return results
@@ -256,7 +302,11 @@ class TaskController(BaseController):
                     environment_run_option["volumes"] = data_volume
         return environment_run_option
 
-    def run(self, task_id, snapshot_dict=None, task_dict=None):
+    def run(self,
+            task_id,
+            snapshot_dict=None,
+            task_dict=None,
+            before_snapshot_id=None):
         """Run a task with parameters. If dictionary specified, create a new task with new run parameters.
         Snapshot objects are created before and after the task to keep track of the state. During the run,
         you can access task outputs using environment variable DATMO_TASK_DIR or `/task` which points to
@@ -275,6 +325,9 @@ class TaskController(BaseController):
         task_dict : dict
             set of parameters to characterize the task run
             (default is None, which translate to {}, see datmo.core.entity.task.Task for more details on inputs)
+        before_snapshot_id : str, optional
+            id of a snapshot already taken, e.g. when the task was submitted, which the
+            task is run from instead of a new before snapshot (default is None)
 
         Returns
         -------
@@ -294,6 +347,40 @@ class TaskController(BaseController):
 
         if not task_dict:
             task_dict = {}
+        # Only the records are written under the lock, not the run itself
+        with self.project_lock():
+            before_snapshot_obj = self.snapshot.get(before_snapshot_id) \
+                if before_snapshot_id else None
+            task_obj, before_snapshot_obj = self._prepare_run(
+                task_id,
+                snapshot_dict,
+                task_dict,
+                before_snapshot_obj=before_snapshot_obj)
+
+        return_code, run_id, logs = 0, None, None
+        results = {}
+        try:
+            return_code, run_id, logs = self._execute_run(
+                task_obj, before_snapshot_obj, results=results)
+        finally:
+            with self.project_lock():
+                return self._finish_run(task_obj, before_snapshot_obj,
+                                        snapshot_dict, return_code, run_id,
+                                        logs, results)
+
+    def _prepare_run(self,
+                     task_id,
+                     snapshot_dict,
+                     task_dict,
+                     before_snapshot_obj=None):
+        """Validate the task, create its before snapshot (unless given) and its
+        directory with the files of the snapshot, and mark it as running
+
+        Returns
+        -------
+        task_obj : Task
+        before_snapshot_obj : Snapshot
+        """
         # Obtain Task to run
         task_obj = self.dal.task.get_by_id(task_id)
 
@@ -306,7 +393,7 @@ class TaskController(BaseController):
                 __("error", "controller.task.run.arg",
                    " or ".join(important_task_args)))
 
-        if task_obj.status is None:
+        if task_obj.status in [None, "QUEUED"]:
             task_obj.status = "RUNNING"
         else:
             raise TaskRunError(
@@ -318,72 +405,93 @@ class TaskController(BaseController):
         except Exception:
             raise TaskRunError(
                 __("error", "controller.task.run", task_dirpath))
-        # Create the before snapshot prior to execution
-        before_snapshot_dict = snapshot_dict.copy()
-        before_snapshot_dict[
-            'message'] = "autogenerated snapshot created before task %s is run" % task_obj.id
-        before_snapshot_obj = self.snapshot.create(before_snapshot_dict)
-        # Update the task with pre-execution parameters, prefer list first then look for string command
-        # List command will overwrite a string command if given
-        if task_dict.get('command_list', task_obj.command_list):
-            task_dict['command'] = " ".join(
-                task_dict.get('command_list', task_obj.command_list))
-        else:
-            if task_dict.get('command', task_obj.command):
-                task_dict['command_list'] = shlex.split(
-                    task_dict.get('command', task_obj.command))
-            elif not task_dict.get('interactive', task_obj.interactive):
-                # If it's not interactive then there is not expected task
-                raise TaskNoCommandGiven()
-
-        validate("create_task", task_dict)
-        task_obj = self.dal.task.update({
-            "id":
-                task_obj.id,
-            "before_snapshot_id":
-                task_dict.get('before_snapshot_id', before_snapshot_obj.id),
-            "command":
-                task_dict.get('command', task_obj.command),
-            "command_list":
-                task_dict.get('command_list', task_obj.command_list),
-            "gpu":
-                task_dict.get('gpu', False),
-            "mem_limit":
-                task_dict.get('mem_limit', None),
-            "workspace":
-                task_dict.get('workspace', None),
-            "data_file_path_map":
-                task_dict.get('data_file_path_map',
-                              task_obj.data_file_path_map),
-            "data_directory_path_map":
-                task_dict.get('data_directory_path_map',
-                              task_obj.data_directory_path_map),
-            "interactive":
-                task_dict.get('interactive', task_obj.interactive),
-            "detach":
-                task_dict.get('detach', task_obj.detach),
-            "ports":
-                task_dict.get('ports', task_obj.ports),
-            "task_dirpath":
-                task_dict.get('task_dirpath', task_dirpath),
-            "log_filepath":
-                task_dict.get('log_filepath',
-                              os.path.join(task_dirpath, "task.log")),
-            "start_time":
-                task_dict.get('start_time', datetime.utcnow()),
-            "status":
-                task_obj.status
-        })
+        # Write the before snapshot and the task in one transaction
+        with self.dal.transaction():
+            # Create the before snapshot prior to execution
+            if before_snapshot_obj is None:
+                before_snapshot_dict = snapshot_dict.copy()
+                before_snapshot_dict[
+                    'message'] = "autogenerated snapshot created before task %s is run" % task_obj.id
+                before_snapshot_obj = self.snapshot.create(
+                    before_snapshot_dict)
+            # Update the task with pre-execution parameters, prefer list first then look for string command
+            # List command will overwrite a string command if given
+            if task_dict.get('command_list', task_obj.command_list):
+                task_dict['command'] = " ".join(
+                    task_dict.get('command_list', task_obj.command_list))
+            else:
+                if task_dict.get('command', task_obj.command):
+                    task_dict['command_list'] = shlex.split(
+                        task_dict.get('command', task_obj.command))
+                elif not task_dict.get('interactive', task_obj.interactive):
+                    # If it's not interactive then there is not expected task
+                    raise TaskNoCommandGiven()
+
+            validate("create_task", task_dict)
+            task_obj = self.dal.task.update({
+                "id":
+                    task_obj.id,
+                "before_snapshot_id":
+                    task_dict.get('before_snapshot_id',
+                                  before_snapshot_obj.id),
+                "command":
+                    task_dict.get('command', task_obj.command),
+                "command_list":
+                    task_dict.get('command_list', task_obj.command_list),
+                "gpu":
+                    task_dict.get('gpu', False),
+                "mem_limit":
+                    task_dict.get('mem_limit', None),
+                "workspace":
+                    task_dict.get('workspace', None),
+                "data_file_path_map":
+                    task_dict.get('data_file_path_map',
+                                  task_obj.data_file_path_map),
+                "data_directory_path_map":
+                    task_dict.get('data_directory_path_map',
+                                  task_obj.data_directory_path_map),
+                "interactive":
+                    task_dict.get('interactive', task_obj.interactive),
+                "detach":
+                    task_dict.get('detach', task_obj.detach),
+                "ports":
+                    task_dict.get('ports', task_obj.ports),
+                "task_dirpath":
+                    task_dict.get('task_dirpath', task_dirpath),
+                "log_filepath":
+                    task_dict.get('log_filepath',
+                                  os.path.join(task_dirpath, "task.log.gz")),
+                "start_time":
+                    task_dict.get('start_time', datetime.utcnow()),
+                "status":
+                    task_obj.status
+            })
 
         # Copy over files from the before_snapshot file collection to task dir
         file_collection_obj =  \
             self.dal.file_collection.get_by_id(before_snapshot_obj.file_collection_id)
-        self.file_driver.copytree(
+        bytes_written = self.file_driver.materialize(
             os.path.join(self.home, file_collection_obj.path),
             os.path.join(self.home, task_obj.task_dirpath))
+        self.logger.debug("task %s files materialized, wrote %d bytes" %
+                          (task_obj.id, bytes_written))
+        return task_obj, before_snapshot_obj
+
+    def _execute_run(self,
+                     task_obj,
+                     before_snapshot_obj,
+                     build=True,
+                     results=None):
+        """Run the command of a prepared task in its environment, updating the
+        results given with those of its logs as they arrive
 
+        Returns
+        -------
+        return_code : int
+        run_id : str
+        logs : str
+        """
         return_code, run_id, logs = 0, None, None
-
         try:
             # Set the parameters set in the task
             if task_obj.detach and task_obj.interactive:
@@ -423,12 +531,34 @@ class TaskController(BaseController):
             return_code, run_id, logs =  \
                 self._run_helper(before_snapshot_obj.environment_id,
                                  environment_run_options,
-                                 os.path.join(self.home, task_obj.log_filepath))
+                                 os.path.join(self.home, task_obj.log_filepath),
+                                 build=build,
+                                 results=results)
 
         except Exception as e:
             return_code = 1
-            logs += "Error running task: %" % e.message
-        finally:
+            logs = (logs or "") + "Error running task: %s" % e
+        return return_code, run_id, logs
+
+    def _finish_run(self,
+                    task_obj,
+                    before_snapshot_obj,
+                    snapshot_dict,
+                    return_code,
+                    run_id,
+                    logs,
+                    results=None):
+        """Create the after snapshot of a task with the files of its directory and
+        the results parsed from its logs as they arrived, and record the end of the
+        run
+
+        Returns
+        -------
+        Task
+            the Task object which completed its run with updated parameters
+        """
+        # Write the after snapshot and the task in one transaction
+        with self.dal.transaction():
             # Create the after snapshot after execution is completed with new paths
             after_snapshot_dict = snapshot_dict.copy()
             after_snapshot_dict[
@@ -461,26 +591,292 @@ class TaskController(BaseController):
                 "end_time": end_time,
                 "duration": duration
             }
-            if logs is not None:
+            absolute_log_filepath = os.path.join(self.home,
+                                                 task_obj.log_filepath)
+            if results:
+                update_task_dict["results"] = dict(results)
+            elif logs is not None and \
+                    not os.path.isfile(absolute_log_filepath):
+                # Without a log file, the logs given are all of the logs
                 update_task_dict["results"] = self._parse_logs_for_results(
                     logs)
-                if update_task_dict["results"] is not None:
-                    snapshot_update_dict = dict({'id': after_snapshot_obj.id})
-                    if after_snapshot_obj.stats:
-                        after_snapshot_obj.stats.update(
-                            update_task_dict["results"])
-                    else:
-                        after_snapshot_obj.stats = update_task_dict["results"]
-                    snapshot_update_dict[
-                        "stats"] = after_snapshot_obj.stats.copy()
-                    self.dal.snapshot.update(snapshot_update_dict)
+            if update_task_dict.get("results") is not None:
+                snapshot_update_dict = dict({'id': after_snapshot_obj.id})
+                if after_snapshot_obj.stats:
+                    after_snapshot_obj.stats.update(
+                        update_task_dict["results"])
+                else:
+                    after_snapshot_obj.stats = update_task_dict["results"]
+                snapshot_update_dict["stats"] = after_snapshot_obj.stats.copy()
+                self.dal.snapshot.update(snapshot_update_dict)
             if run_id is not None:
                 update_task_dict["run_id"] = run_id
             return self.dal.task.update(update_task_dict)
 
-    def list(self, sort_key=None, sort_order=None):
+    def submit(self, task_id, snapshot_dict=None, task_dict=None):
+        """Queue a task to be run by the scheduler with the same parameters as run,
+        and return without waiting for it. The task status is QUEUED until the
+        scheduler runs it, then RUNNING and finally SUCCESS or FAILED. The before
+        snapshot is taken now, so changes made to the code, environment or files
+        while the task is queued are not part of its run
+
+        Parameters
+        ----------
+        task_id : str
+            id for the task you would like to run
+        snapshot_dict : dict
+            set of parameters to create a snapshot (see run)
+        task_dict : dict
+            set of parameters to characterize the task run (see run)
+
+        Returns
+        -------
+        Task
+            the Task object which was queued
+
+        Raises
+        ------
+        TaskRunError
+            if the task has already been run or queued, or is interactive
+        """
+        task_dict = task_dict or {}
+        task_obj = self.dal.task.get_by_id(task_id)
+        important_task_args = ["command", "command_list"]
+        if not task_dict.get('command', task_obj.command) and \
+                not task_dict.get('command_list', task_obj.command_list):
+            raise RequiredArgumentMissing(
+                __("error", "controller.task.run.arg",
+                   " or ".join(important_task_args)))
+        if task_dict.get('interactive', task_obj.interactive):
+            raise TaskRunError(
+                __("error", "controller.task.submit.interactive"))
+        if task_obj.status is not None:
+            raise TaskRunError(
+                __("error", "cli.run.run.already_running", task_obj.id))
+        before_snapshot_dict = dict(snapshot_dict or {})
+        before_snapshot_dict['visible'] = False
+        before_snapshot_dict[
+            'message'] = "autogenerated snapshot created before task %s is run" % task_obj.id
+        with self.project_lock(), self.dal.transaction():
+            before_snapshot_obj = self.snapshot.create(before_snapshot_dict)
+            task_obj = self.dal.task.update({
+                "id": task_id,
+                "status": "QUEUED"
+            })
+        self.queue.put(
+            task_id,
+            snapshot_dict,
+            task_dict,
+            before_snapshot_id=before_snapshot_obj.id)
+        return task_obj
+
+    def run_many(self,
+                 grid=None,
+                 random_spec=None,
+                 samples=None,
+                 seed=None,
+                 snapshot_dict=None,
+                 task_dict=None,
+                 workers=None):
+        """Run a task for each config of a parameter sweep, given either as a grid or
+        as a random spec. The code, environment and files are snapshotted once for all
+        runs, which share the same before snapshot, and the environment is built once.
+        The runs are then executed in parallel, each with its config
+
+            * written to `config.json` in its task directory (`/task/config.json`)
+            * substituted for the {name} placeholders in the command
+            * recorded as the config of its after snapshot
+
+        The stats of each run (from `stats.json` in its task directory and from its
+        logs) are recorded in its after snapshot
+
+        Parameters
+        ----------
+        grid : dict, optional
+            parameter name -> list of values, a run is made for every combination
+            (see datmo.core.util.sweep.expand_grid)
+        random_spec : dict, optional
+            parameter name -> list of values or distribution, a run is made for each
+            config sampled (see datmo.core.util.sweep.sample_random)
+        samples : int, optional
+            number of configs sampled from the random spec, which cannot be given
+            with a grid as every combination of the grid is run
+        seed : int, optional
+            seed used to sample the configs from the random spec
+        snapshot_dict : dict, optional
+            set of parameters to create the before snapshot (see run)
+        task_dict : dict
+            set of parameters to characterize the task runs (see run). must
+            include a command or command_list
+        workers : int, optional
+            number of runs executed at a time (default is the number of cpus)
+
+        Returns
+        -------
+        list
+            the Task objects which completed their run, in the order of the configs
+
+        Raises
+        ------
+        RequiredArgumentMissing
+            if neither a grid nor a random spec with samples is given, or if there is
+            no command to run
+        TooManyArgumentsFound
+            if both a grid and a random spec are given, or a grid and samples
+        TaskRunError
+            if the task is interactive
+        """
+        if grid is not None and random_spec is not None:
+            raise TooManyArgumentsFound()
+        if grid is not None and samples is not None:
+            raise TooManyArgumentsFound(
+                __("error", "controller.task.run_many.grid.samples"))
+        if grid is not None:
+            configs = expand_grid(grid)
+        elif random_spec is not None and samples:
+            configs = sample_random(random_spec, samples, seed=seed)
+        else:
+            raise RequiredArgumentMissing(
+                __("error", "controller.task.run_many.arg"))
+        task_dict = dict(task_dict or {})
+        if task_dict.get('interactive', False):
+            raise TaskRunError(
+                __("error", "controller.task.run_many.interactive"))
+        if not task_dict.get('command_list'):
+            if not task_dict.get('command'):
+                raise RequiredArgumentMissing(
+                    __("error", "controller.task.run.arg",
+                       "command or command_list"))
+            task_dict['command_list'] = shlex.split(task_dict['command'])
+        task_dict.pop('command', None)
+        snapshot_dict = dict(snapshot_dict or {})
+        snapshot_dict['visible'] = False
+
+        # Snapshot and build the shared state once for all runs
+        before_snapshot_dict = snapshot_dict.copy()
+        before_snapshot_dict[
+            'message'] = "autogenerated snapshot created before sweep of %d runs" % len(
+                configs)
+        with self.project_lock():
+            before_snapshot_obj = self.snapshot.create(before_snapshot_dict)
+        self.environment.build(before_snapshot_obj.environment_id)
+
+        # Each run has its own results, parsed as its logs arrive
+        runs = []
+        with self.project_lock(), self.dal.transaction():
+            for config in configs:
+                run_snapshot_dict = snapshot_dict.copy()
+                run_snapshot_dict['config'] = config
+                run_task_dict = task_dict.copy()
+                run_task_dict['command_list'] = format_command(
+                    task_dict['command_list'], config)
+                task_obj, _ = self._prepare_run(
+                    self.create().id,
+                    run_snapshot_dict,
+                    run_task_dict,
+                    before_snapshot_obj=before_snapshot_obj)
+                JSONStore(
+                    os.path.join(self.home, task_obj.task_dirpath,
+                                 "config.json")).to_file(config)
+                runs.append((task_obj, run_snapshot_dict, {}))
+
+        if not workers:
+            try:
+                workers = multiprocessing.cpu_count()
+            except NotImplementedError:
+                workers = 1
+        pool = ThreadPool(min(workers, len(runs)))
+        try:
+            # Only the containers run in parallel, records are written here
+            executed_runs = pool.imap(
+                lambda run: self._execute_run(run[0], before_snapshot_obj,
+                                              build=False, results=run[2]),
+                runs)
+            task_objs = []
+            for (task_obj, run_snapshot_dict, results), \
+                    (return_code, run_id, logs) in zip(runs, executed_runs):
+                with self.project_lock():
+                    task_objs.append(
+                        self._finish_run(task_obj, before_snapshot_obj,
+                                         run_snapshot_dict, return_code,
+                                         run_id, logs, results))
+            return task_objs
+        finally:
+            pool.close()
+            pool.join()
+
+    def get_logs(self, task_id, offset=0, limit=None):
+        """Get a page of the lines of the logs of a task. Only the blocks of the
+        compressed log file holding the page are read, so pages of large logs are
+        cheap to get
+
+        Parameters
+        ----------
+        task_id : str
+            id for the task
+        offset : int, optional
+            number of lines to skip (default is 0)
+        limit : int, optional
+            maximum number of lines to return (default is None, for all lines)
+
+        Returns
+        -------
+        list
+            lines of the logs, without line endings
+
+        Raises
+        ------
+        DoesNotExist
+            if the task does not exist
+        InvalidArgumentType
+            if the offset or limit is not a non-negative integer
+        """
+        check_page(limit, offset)
+        task_obj = self.get(task_id)
+        offset = offset or 0
+        if task_obj.log_filepath:
+            absolute_log_filepath = os.path.join(self.home,
+                                                 task_obj.log_filepath)
+            if os.path.isfile(absolute_log_filepath):
+                return LogReader(absolute_log_filepath).read(
+                    offset=offset, limit=limit)
+        # Logs of a task which did not run to a log file
+        lines = task_obj.logs.splitlines() if task_obj.logs else []
+        return lines[offset:] if limit is None else \
+            lines[offset:offset + limit]
+
+    def get_metrics(self, task_id, keys=None):
+        """Get the metrics logged by a task during its run (see
+        datmo.logger.Logger.log_metric). NumPy is required
+
+        Parameters
+        ----------
+        task_id : str
+            id for the task
+        keys : list, optional
+            keys of the metrics to return (default is all metrics)
+
+        Returns
+        -------
+        dict
+            key -> dict of "step", "timestamp" and "value" NumPy arrays, ordered
+            by step. empty if the task did not log any metric
+
+        Raises
+        ------
+        DoesNotExist
+            if the task does not exist
+        """
+        task_obj = self.get(task_id)
+        if not task_obj.task_dirpath:
+            return {}
+        return MetricStore(
+            os.path.join(self.home, task_obj.task_dirpath,
+                         "metrics")).read(keys)
+
+    def list(self, sort_key=None, sort_order=None, limit=None, offset=None):
         query = {}
-        return self.dal.task.query(query, sort_key, sort_order)
+        return self.dal.task.query(query, sort_key, sort_order, limit, offset)
 
     def get(self, task_id):
         """Get task object and return
@@ -626,6 +1022,14 @@ class TaskController(BaseController):
             except DoesNotExist:
                 time.sleep(1)
                 task_obj = self.get(task_id)
+            if task_obj.status == "QUEUED":
+                # Not started yet, so it only has to be removed from the queue
+                with self.project_lock():
+                    for job in self.queue.list():
+                        if job["task_id"] == task_id:
+                            self.queue.remove(job)
+                    self.dal.task.update({"id": task_id, "status": status})
+                return True
             task_match_string = "datmo-task-" + self.model.id + "-" + task_id
             # Get the environment id associated with the task
             kwargs = {'match_string': task_match_string}
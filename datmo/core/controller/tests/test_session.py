@@ -0,0 +1,110 @@
+"""
+Tests for session.py
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import shutil
+import tempfile
+import platform
+import threading
+
+from datmo.config import Config
+from datmo.core.controller.session import ControllerSession, get_session, \
+    clear_sessions, init_project_id, PROJECT_LOCK_FILENAME
+from datmo.core.util.file_lock import FileLock
+
+
+class TestControllerSession():
+    def setup_method(self):
+        # provide mountable tmp directory for docker
+        tempfile.tempdir = "/tmp" if not platform.system(
+        ) == "Windows" else None
+        test_datmo_dir = os.environ.get('TEST_DATMO_DIR',
+                                        tempfile.gettempdir())
+        self.temp_dir = tempfile.mkdtemp(dir=test_datmo_dir)
+
+    def teardown_method(self):
+        clear_sessions()
+
+    def test_get(self):
+        session = ControllerSession(self.temp_dir)
+        created = []
+
+        def create():
+            created.append(object())
+            return created[-1]
+
+        first = session.get("storage.local", create)
+        assert session.get("storage.local", create) is first
+        assert len(created) == 1
+        session.clear()
+        assert session.get("storage.local", create) is not first
+        assert len(created) == 2
+
+    def test_project_lock(self):
+        os.makedirs(os.path.join(self.temp_dir, Config().datmo_directory_name))
+        session = ControllerSession(self.temp_dir)
+        file_lock = FileLock(
+            os.path.join(self.temp_dir,
+                         Config().datmo_directory_name, PROJECT_LOCK_FILENAME))
+        acquired = []
+
+        def acquire():
+            with session.project_lock():
+                acquired.append(True)
+
+        with session.project_lock():
+            # The lock is taken again by the thread holding it
+            with session.project_lock():
+                assert file_lock.is_locked()
+            assert file_lock.is_locked()
+            # Other threads wait for it
+            thread = threading.Thread(target=acquire)
+            thread.start()
+            thread.join(0.1)
+            assert acquired == []
+        thread.join()
+        assert acquired == [True]
+        assert not file_lock.is_locked()
+
+    def test_get_session(self):
+        session = get_session(self.temp_dir)
+        assert session.home == self.temp_dir
+        assert session.signature is None
+        assert get_session(self.temp_dir) is session
+        assert get_session(os.path.join(self.temp_dir, ".")) is session
+        assert get_session(tempfile.mkdtemp()) is not session
+
+    def test_get_session_project_changed(self):
+        datmo_dirpath = os.path.join(self.temp_dir,
+                                     Config().datmo_directory_name)
+        session = get_session(self.temp_dir)
+        # The session of a project is kept once initialized
+        os.makedirs(datmo_dirpath)
+        init_project_id(self.temp_dir)
+        assert get_session(self.temp_dir) is session
+        assert session.signature[2]
+        # and when entries are added to the datmo directory
+        os.makedirs(os.path.join(datmo_dirpath, "cache"))
+        init_project_id(self.temp_dir)
+        assert get_session(self.temp_dir) is session
+        # A project removed and initialized again has a new session
+        shutil.rmtree(datmo_dirpath)
+        os.makedirs(datmo_dirpath)
+        init_project_id(self.temp_dir)
+        new_session = get_session(self.temp_dir)
+        assert new_session is not session
+        assert get_session(self.temp_dir) is new_session
+
+    def test_get_session_without_project_id(self):
+        # Projects initialized before ids were written
+        datmo_dirpath = os.path.join(self.temp_dir,
+                                     Config().datmo_directory_name)
+        os.makedirs(datmo_dirpath)
+        session = get_session(self.temp_dir)
+        assert session.signature[2] is None
+        init_project_id(self.temp_dir)
+        assert get_session(self.temp_dir) is session
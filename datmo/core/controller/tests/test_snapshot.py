@@ -758,6 +758,92 @@ class TestSnapshotController():
                snapshot_obj_1 in result and \
                snapshot_obj_2 in result
 
+    def test_list_filters(self):
+        self.__setup()
+        snapshot_obj_1 = self.__default_create()
+        with open(
+                os.path.join(self.snapshot_controller.home, "test.txt"),
+                "wb") as f:
+            f.write(to_bytes(str("test")))
+        snapshot_obj_2 = self.__default_create()
+        with open(
+                os.path.join(self.snapshot_controller.home, "test2.txt"),
+                "wb") as f:
+            f.write(to_bytes(str("test2")))
+        snapshot_obj_3 = self.__default_create()
+        self.snapshot_controller.update(
+            snapshot_obj_1.id,
+            config={"lr": 0.1},
+            stats={"acc": 0.5},
+            message="first baseline",
+            label="baseline")
+        self.snapshot_controller.update(
+            snapshot_obj_2.id,
+            config={"lr": 0.01},
+            stats={"acc": 0.8},
+            message="second try",
+            label="best run")
+        self.snapshot_controller.update(
+            snapshot_obj_3.id,
+            config={"lr": 0.001},
+            stats={"acc": 0.7},
+            message="third try")
+
+        # Substring of the message or label
+        result = self.snapshot_controller.list(filter="run")
+        assert [item.id for item in result] == [snapshot_obj_2.id]
+        result = self.snapshot_controller.list(
+            filter="try", sort_key="created_at", sort_order="ascending")
+        assert [item.id for item in result] == \
+               [snapshot_obj_2.id, snapshot_obj_3.id]
+        result = self.snapshot_controller.list(message="baseline")
+        assert [item.id for item in result] == [snapshot_obj_1.id]
+        result = self.snapshot_controller.list(label="baseline")
+        assert [item.id for item in result] == [snapshot_obj_1.id]
+
+        # Config and stats values and ranges
+        result = self.snapshot_controller.list(config={"lr": 0.01})
+        assert [item.id for item in result] == [snapshot_obj_2.id]
+        result = self.snapshot_controller.list(
+            config={"lr": (None, 0.01)},
+            stats={"acc": (0.75, None)},
+            sort_key="created_at",
+            sort_order="ascending")
+        assert [item.id for item in result] == [snapshot_obj_2.id]
+
+        # Time window
+        result = self.snapshot_controller.list(
+            created_after=snapshot_obj_2.created_at,
+            created_before=snapshot_obj_3.created_at)
+        assert [item.id for item in result] == [snapshot_obj_2.id]
+
+        # Pages with an offset or a cursor
+        result = self.snapshot_controller.list(
+            sort_key="created_at", sort_order="descending", limit=2)
+        assert [item.id for item in result] == \
+               [snapshot_obj_3.id, snapshot_obj_2.id]
+        result = self.snapshot_controller.list(
+            sort_key="created_at", sort_order="descending", limit=2, offset=2)
+        assert [item.id for item in result] == [snapshot_obj_1.id]
+        result = self.snapshot_controller.list(
+            limit=2, cursor=snapshot_obj_2.created_at)
+        assert [item.id for item in result] == [snapshot_obj_1.id]
+        result = self.snapshot_controller.list(
+            sort_order="ascending", cursor=snapshot_obj_1.created_at)
+        assert [item.id for item in result] == \
+               [snapshot_obj_2.id, snapshot_obj_3.id]
+
+        # A cursor can only be used when sorting by created_at
+        failed = False
+        try:
+            _ = self.snapshot_controller.list(
+                sort_key="message",
+                sort_order="ascending",
+                cursor=snapshot_obj_2.created_at)
+        except InvalidArgumentType:
+            failed = True
+        assert failed
+
     def test_update(self):
         self.__setup()
         test_config = {"config_foo": "bar"}
@@ -909,3 +995,23 @@ class TestSnapshotController():
 
         assert result == True and \
             thrown == True
+
+    def test_backfill_fingerprints(self):
+        self.__setup()
+        snapshot_obj = self.__default_create()
+        # Remove the fingerprint as if created before fingerprints were stored
+        dict_obj = snapshot_obj.to_dictionary()
+        del dict_obj['fingerprint']
+        self.snapshot_controller.dal.driver.set("snapshot", dict_obj)
+
+        result = self.snapshot_controller.backfill_fingerprints()
+        assert result == 1
+        snapshot_obj_1 = self.snapshot_controller.get(snapshot_obj.id)
+        assert snapshot_obj_1.fingerprint == snapshot_obj.fingerprint
+        assert self.snapshot_controller.backfill_fingerprints() == 0
+
+        # The existing snapshot is found when looking for duplicates
+        results = self.snapshot_controller.dal.snapshot.query({
+            "fingerprint": snapshot_obj.fingerprint
+        })
+        assert [result.id for result in results] == [snapshot_obj.id]
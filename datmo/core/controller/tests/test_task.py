@@ -6,6 +6,10 @@ import uuid
 import tempfile
 import platform
 from io import open, TextIOWrapper
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 try:
     to_unicode = unicode
 except NameError:
@@ -186,6 +190,15 @@ class TestTaskController():
         assert result['validation'] == "0.32"
         assert result['model_type'] == "logistic regression"
 
+        # Lines of the logs are parsed as they are iterated
+        result = self.task_controller._parse_logs_for_results(
+            iter(test_logs.split("\n")))
+        assert result == {
+            "accuracy": "0.94",
+            "validation": "0.32",
+            "model_type": "logistic regression"
+        }
+
         test_logs = """test"""
         result = self.task_controller._parse_logs_for_results(test_logs)
         assert result is None
@@ -642,6 +655,204 @@ class TestTaskController():
             os.path.join(self.project_controller.home, "dirpath1", "file.txt"),
             "r").read()
 
+    @pytest_docker_environment_failed_instantiation(test_datmo_dir)
+    def test_get_logs(self):
+        self.__setup()
+        task_obj = self.task_controller.create()
+
+        # Create environment definition
+        env_def_path = os.path.join(self.project_controller.home, "Dockerfile")
+        with open(env_def_path, "wb") as f:
+            f.write(to_bytes("FROM python:3.5-alpine"))
+        task_dict = {
+            "command_list": ["sh", "-c", "seq 1 2500 && echo accuracy:0.45"]
+        }
+        updated_task_obj = self.task_controller.run(
+            task_obj.id, task_dict=task_dict)
+        after_snapshot_obj = self.task_controller.dal.snapshot.get_by_id(
+            updated_task_obj.after_snapshot_id)
+        self.environment_ids.append(after_snapshot_obj.environment_id)
+
+        # The full logs are compressed on disk and parsed for results
+        assert updated_task_obj.log_filepath.endswith(".gz")
+        assert updated_task_obj.results == {"accuracy": "0.45"}
+        assert self.task_controller.get_logs(
+            task_obj.id, limit=2) == ["1", "2"]
+        assert self.task_controller.get_logs(
+            task_obj.id, offset=1999, limit=2) == ["2000", "2001"]
+        assert self.task_controller.get_logs(
+            task_obj.id, offset=2500) == ["accuracy:0.45"]
+        assert len(self.task_controller.get_logs(task_obj.id)) == 2501
+
+        failed = False
+        try:
+            self.task_controller.get_logs(task_obj.id, offset=-1)
+        except InvalidArgumentType:
+            failed = True
+        assert failed
+
+    @pytest_docker_environment_failed_instantiation(test_datmo_dir)
+    def test_run_many(self):
+        self.__setup()
+        # 1) Test failure without a grid or random spec
+        # 2) Test failure with both a grid and a random spec
+        # 3) Test success with a grid
+        # 4) Test success with a random spec
+
+        # Create environment definition
+        env_def_path = os.path.join(self.project_controller.home, "Dockerfile")
+        with open(env_def_path, "wb") as f:
+            f.write(to_bytes("FROM python:3.5-alpine"))
+        task_dict = {
+            "command_list": [
+                "sh", "-c",
+                "test -f /task/config.json && echo accuracy:{accuracy}"
+            ]
+        }
+
+        # 1) Test option 1
+        failed = False
+        try:
+            self.task_controller.run_many(task_dict=task_dict)
+        except RequiredArgumentMissing:
+            failed = True
+        assert failed
+
+        # 2) Test option 2
+        failed = False
+        try:
+            self.task_controller.run_many(
+                grid={"accuracy": [0.45]},
+                random_spec={"accuracy": [0.45]},
+                task_dict=task_dict)
+        except TooManyArgumentsFound:
+            failed = True
+        assert failed
+        # Samples are only taken from a random spec
+        failed = False
+        try:
+            self.task_controller.run_many(
+                grid={"accuracy": [0.45]}, samples=3, task_dict=task_dict)
+        except TooManyArgumentsFound:
+            failed = True
+        assert failed
+
+        # 3) Test option 3
+        task_objs = self.task_controller.run_many(
+            grid={"accuracy": [0.45, 0.55],
+                  "epochs": 10},
+            task_dict=task_dict,
+            workers=2)
+        assert len(task_objs) == 2
+        # The runs share the before snapshot
+        assert task_objs[0].before_snapshot_id == task_objs[
+            1].before_snapshot_id
+        for task_obj, accuracy in zip(task_objs, ["0.45", "0.55"]):
+            assert task_obj.status == "SUCCESS"
+            assert task_obj.command_list == [
+                "sh", "-c",
+                "test -f /task/config.json && echo accuracy:%s" % accuracy
+            ]
+            after_snapshot_obj = self.task_controller.dal.snapshot.get_by_id(
+                task_obj.after_snapshot_id)
+            assert after_snapshot_obj.config == {
+                "accuracy": float(accuracy),
+                "epochs": 10
+            }
+            assert after_snapshot_obj.stats == {"accuracy": accuracy}
+            self.environment_ids.append(after_snapshot_obj.environment_id)
+
+        # 4) Test option 4
+        task_objs = self.task_controller.run_many(
+            random_spec={"accuracy": {
+                "uniform": [0, 1]
+            }},
+            samples=3,
+            seed=1,
+            task_dict=task_dict)
+        assert len(task_objs) == 3
+        for task_obj in task_objs:
+            assert task_obj.status == "SUCCESS"
+
+    def test_submit(self):
+        self.__setup()
+        # 1) Test required arguments not provided
+        # 2) Test interactive task
+        # 3) Test success
+        # 4) Test task already queued
+        task_obj = self.task_controller.create()
+
+        # 1) Test option 1
+        failed = False
+        try:
+            self.task_controller.submit(task_obj.id)
+        except RequiredArgumentMissing:
+            failed = True
+        assert failed
+
+        # 2) Test option 2
+        failed = False
+        try:
+            self.task_controller.submit(
+                task_obj.id,
+                task_dict={
+                    "command_list": ["python", "test.py"],
+                    "interactive": True
+                })
+        except TaskRunError:
+            failed = True
+        assert failed
+
+        # 3) Test option 3
+        task_dict = {"command_list": ["python", "test.py"], "mem_limit": "4g"}
+        queued_task_obj = self.task_controller.submit(
+            task_obj.id,
+            snapshot_dict={"message": "test"},
+            task_dict=task_dict)
+        assert queued_task_obj.status == "QUEUED"
+        jobs = self.task_controller.queue.list()
+        assert len(jobs) == 1
+        assert jobs[0]["task_id"] == task_obj.id
+        assert jobs[0]["snapshot_dict"] == {"message": "test"}
+        assert jobs[0]["task_dict"] == task_dict
+        assert jobs[0]["mem_limit"] == 4 * 1024**3
+        # The before snapshot is taken on submit
+        before_snapshot_obj = self.task_controller.snapshot.get(
+            jobs[0]["before_snapshot_id"])
+        assert before_snapshot_obj.visible == False
+
+        # 4) Test option 4
+        failed = False
+        try:
+            self.task_controller.submit(task_obj.id, task_dict=task_dict)
+        except TaskRunError:
+            failed = True
+        assert failed
+
+        # Stopping a queued task removes it from the queue
+        assert self.task_controller.stop(task_id=task_obj.id)
+        assert self.task_controller.queue.list() == []
+        assert self.task_controller.get(task_obj.id).status == "STOPPED"
+
+    def test_project_lock(self):
+        self.__setup()
+        lock_filepath = os.path.join(self.temp_dir,
+                                     Config().datmo_directory_name,
+                                     "project.lock")
+        with self.task_controller.project_lock():
+            if fcntl is not None:
+                # Another holder of the lock has to wait for it
+                with open(lock_filepath, "ab") as f:
+                    failed = False
+                    try:
+                        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except (IOError, OSError):
+                        failed = True
+                    assert failed
+        # The lock is released once the block exits
+        with self.task_controller.project_lock():
+            pass
+
     def test_list(self):
         self.__setup()
         # Create tasks in the project
@@ -13,6 +13,12 @@ class Run():
     ----------
     task_entity : datmo.core.entity.task.Task
         core task entity to reference
+    core_snapshots : dict, optional
+        snapshot id -> core snapshot entity, snapshots already fetched for the run
+        (default is None, snapshots are fetched when needed)
+    snapshot_controller : datmo.core.controller.snapshot.SnapshotController, optional
+        controller used to fetch snapshots (default is None, one is created for the
+        run when needed)
 
     Attributes
     ----------
@@ -47,6 +53,8 @@ class Run():
 
     Methods
     -------
+    from_tasks(task_entities, snapshot_controller=None)
+        Returns the runs of the tasks, with the snapshots of all runs fetched together
     get_files(mode="r")
         Returns a list of file objects for the run
 
@@ -55,11 +63,20 @@ class Run():
     InvalidArgumentType
     """
 
-    def __init__(self, task_entity):
+    # Maximum number of snapshots fetched in a query, within the number of parameters
+    # of a sqlite statement
+    prefetch_batch_size = 500
+
+    def __init__(self,
+                 task_entity,
+                 core_snapshots=None,
+                 snapshot_controller=None):
         if not isinstance(task_entity, CoreTask):
             raise InvalidArgumentType()
 
         self._core_task = task_entity
+        self._core_snapshots = core_snapshots or {}
+        self._snapshot_controller = snapshot_controller
 
         self.id = self._core_task.id
         self.model_id = self._core_task.model_id
@@ -157,6 +174,55 @@ class Run():
         self._files = self.get_files()
         return self._files
 
+    @classmethod
+    def from_tasks(cls, task_entities, snapshot_controller=None):
+        """Returns the runs of the tasks, with the snapshot of every run fetched in a
+        single query (per prefetch_batch_size snapshots) instead of one query for each
+        property read of each run
+
+        Parameters
+        ----------
+        task_entities : list
+            list of datmo.core.entity.task.Task
+        snapshot_controller : datmo.core.controller.snapshot.SnapshotController, optional
+            controller used to fetch the snapshots (default is None, one is created
+            and shared by the runs)
+
+        Returns
+        -------
+        list
+            list of Run objects, in the order of the tasks
+        """
+        task_entities = list(task_entities)
+        snapshot_ids = sorted(
+            set(task_entity.after_snapshot_id or task_entity.before_snapshot_id
+                for task_entity in task_entities
+                if task_entity.after_snapshot_id
+                or task_entity.before_snapshot_id))
+        core_snapshots = {}
+        if snapshot_ids:
+            snapshot_controller = snapshot_controller or SnapshotController()
+            batch_size = cls.prefetch_batch_size
+            for index in range(0, len(snapshot_ids), batch_size):
+                batch_ids = snapshot_ids[index:index + batch_size]
+                for snapshot_obj in snapshot_controller.dal.snapshot.query({
+                        "id": {
+                            "$in": batch_ids
+                        }
+                }):
+                    core_snapshots[snapshot_obj.id] = snapshot_obj
+        return [
+            cls(task_entity,
+                core_snapshots=core_snapshots,
+                snapshot_controller=snapshot_controller)
+            for task_entity in task_entities
+        ]
+
+    def __get_snapshot_controller(self):
+        if self._snapshot_controller is None:
+            self._snapshot_controller = SnapshotController()
+        return self._snapshot_controller
+
     def __get_core_task(self):
         """Returns the latest core task object for id
 
@@ -175,9 +241,10 @@ class Run():
         datmo.core.entity.snapshot.Snapshot or None
             core snapshot object for the Snapshot
         """
-        snapshot_controller = SnapshotController()
         snapshot_id = self.after_snapshot_id if self.after_snapshot_id else self.before_snapshot_id
-        snapshot_obj = snapshot_controller.get(
+        if snapshot_id in self._core_snapshots:
+            return self._core_snapshots[snapshot_id]
+        snapshot_obj = self.__get_snapshot_controller().get(
             snapshot_id) if snapshot_id else None
         return snapshot_obj
 
@@ -217,9 +284,8 @@ class Run():
         list or None
             list of file objects associated with the task
         """
-        snapshot_controller = SnapshotController()
         self._core_snapshot = self.__get_core_snapshot()
-        return snapshot_controller.get_files(
+        return self.__get_snapshot_controller().get_files(
             self._core_snapshot.id, mode=mode) if self._core_snapshot else None
 
     def __eq__(self, other):
@@ -1,4 +1,6 @@
 import os
+import json
+import hashlib
 from datetime import datetime
 
 from datmo.core.util.json_store import JSONStore
@@ -51,6 +53,9 @@ class Snapshot():
         visible : bool, optional
             True if visible to user via list command else False
             (default is True to show users unless otherwise specified)
+        fingerprint : str, optional
+            hash of the model, code, environment, file collection, config and stats
+            (default is None, the DAL sets it when the snapshot is stored)
         created_at : datetime.datetime, optional
             (default is datetime.utcnow(), at time of instantiation)
         updated_at : datetime.datetime, optional
@@ -80,6 +85,8 @@ class Snapshot():
         short description of snapshot
     visible : bool
         True if visible to user via list command else False
+    fingerprint : str or None
+        hash of the model, code, environment, file collection, config and stats
     created_at : datetime.datetime
     updated_at : datetime.datetime
     """
@@ -98,6 +105,7 @@ class Snapshot():
         self.task_id = dictionary.get('task_id', None)
         self.label = dictionary.get('label', None)
         self.visible = dictionary.get('visible', True)
+        self.fingerprint = dictionary.get('fingerprint', None)
 
         self.created_at = dictionary.get('created_at', datetime.utcnow())
         self.updated_at = dictionary.get('updated_at', self.created_at)
@@ -132,6 +140,31 @@ class Snapshot():
     def __repr__(self):
         return self.__str__()
 
+    @staticmethod
+    def get_fingerprint(dictionary):
+        """Return a hash of the components which make a snapshot unique. Equal
+        components always give the same hash, regardless of the order of the keys
+        within config and stats
+
+        Parameters
+        ----------
+        dictionary : dict
+            with model_id, code_id, environment_id, file_collection_id, config
+            and stats
+
+        Returns
+        -------
+        str
+        """
+        components = [
+            dictionary['model_id'], dictionary['code_id'],
+            dictionary['environment_id'], dictionary['file_collection_id'],
+            dictionary['config'], dictionary['stats']
+        ]
+        serialized_components = json.dumps(
+            components, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha1(serialized_components.encode("utf-8")).hexdigest()
+
     def save_config(self, filepath):
         JSONStore(os.path.join(filepath, 'config.json'), self.config)
         return
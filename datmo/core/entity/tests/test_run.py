@@ -1,8 +1,24 @@
 """
 Tests for Run
 """
+import os
+import tempfile
+import platform
+
 from datmo.core.entity.task import Task as CoreTask
+from datmo.core.entity.snapshot import Snapshot as CoreSnapshot
 from datmo.core.entity.run import Run
+from datmo.core.storage.local.dal import LocalDAL
+
+
+class SnapshotControllerStub():
+    """Holds the dal used by Run.from_tasks, without an initialized project"""
+
+    def __init__(self, dal):
+        self.dal = dal
+
+    def get(self, snapshot_id):
+        raise AssertionError("snapshot %s was not prefetched" % snapshot_id)
 
 
 class TestRun():
@@ -17,4 +33,76 @@ class TestRun():
         task_obj = CoreTask(self.task_dict)
         result = Run(task_obj)
         assert result
-        assert isinstance(result, Run)
\ No newline at end of file
+        assert isinstance(result, Run)
+
+    def test_from_tasks(self):
+        # provide mountable tmp directory for docker
+        tempfile.tempdir = "/tmp" if not platform.system(
+        ) == "Windows" else None
+        test_datmo_dir = os.environ.get('TEST_DATMO_DIR',
+                                        tempfile.gettempdir())
+        for driver_type, driver_options in [("blitzdb", {
+                "driver_type": "file"
+        }), ("sqlite", {})]:
+            driver_options["connection_string"] = tempfile.mkdtemp(
+                dir=test_datmo_dir)
+            dal = LocalDAL(driver_type, driver_options)
+            dal.init()
+            task_objs = []
+            for index in range(5):
+                snapshot_dict = {
+                    "model_id": "my_model",
+                    "message": "run %d" % index,
+                    "code_id": "code_id",
+                    "environment_id": "environment_%d" % index,
+                    "file_collection_id": "file_collection_id",
+                    "config": {
+                        "index": index
+                    },
+                    "stats": {
+                        "accuracy": index / 10.0
+                    }
+                }
+                before_snapshot_obj = dal.snapshot.create(
+                    CoreSnapshot(snapshot_dict))
+                after_snapshot_obj = dal.snapshot.create(
+                    CoreSnapshot(snapshot_dict))
+                task_dict = dict(self.task_dict, id="task_%d" % index)
+                task_dict["before_snapshot_id"] = before_snapshot_obj.id
+                # The last task has not finished
+                if index < 4:
+                    task_dict["after_snapshot_id"] = after_snapshot_obj.id
+                task_objs.append(CoreTask(task_dict))
+            task_objs.append(CoreTask(dict(self.task_dict, id="no_snapshot")))
+
+            # Snapshots are queried in batches
+            prefetch_batch_size = Run.prefetch_batch_size
+            Run.prefetch_batch_size = 2
+            queries = []
+            snapshot_query = dal.driver.query
+
+            def query(collection, query_params, *args):
+                queries.append(collection)
+                return snapshot_query(collection, query_params, *args)
+
+            dal.driver.query = query
+            try:
+                runs = Run.from_tasks(
+                    task_objs, snapshot_controller=SnapshotControllerStub(dal))
+            finally:
+                Run.prefetch_batch_size = prefetch_batch_size
+            assert queries == ["snapshot"] * 3
+            assert [run.id for run in runs] == [
+                task_obj.id for task_obj in task_objs
+            ]
+            for index, run in enumerate(runs[:5]):
+                assert run.config == {"index": index}
+                assert run.results == {"accuracy": index / 10.0}
+                assert run.environment_id == "environment_%d" % index
+                assert run.core_snapshot_id == (
+                    task_objs[index].after_snapshot_id
+                    or task_objs[index].before_snapshot_id)
+            assert runs[-1].config == {}
+            assert runs[-1].core_snapshot_id is None
+            # No snapshot was fetched after the prefetch
+            assert queries == ["snapshot"] * 3
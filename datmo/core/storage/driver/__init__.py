@@ -1,4 +1,5 @@
 from abc import ABCMeta, abstractmethod
+from contextlib import contextmanager
 from future.utils import with_metaclass
 
 
@@ -13,10 +14,14 @@ class DALDriver(with_metaclass(ABCMeta, object)):
         create entity object in collection
     exists(collection, entity_id)
         checks if entity exists in collection
-    query(collection, query_params)
+    query(collection, query_params, sort_key=None, sort_order=None, limit=None, offset=None)
         find entities in collection matching params
     delete(collection, entity_id)
         delete entity from collection
+    set_many(collection, objs)
+        create or update entity objects in collection within one transaction
+    transaction()
+        context in which all writes are committed together
     """
 
     @abstractmethod
@@ -81,7 +86,13 @@ class DALDriver(with_metaclass(ABCMeta, object)):
         pass
 
     @abstractmethod
-    def query(self, collection, query_params):
+    def query(self,
+              collection,
+              query_params,
+              sort_key=None,
+              sort_order=None,
+              limit=None,
+              offset=None):
         """
         find entities in collection matching params
 
@@ -91,6 +102,14 @@ class DALDriver(with_metaclass(ABCMeta, object)):
             name of the collection
         query_params : dict
             query dictionary for driver
+        sort_key : str, optional
+            key to sort the entities by, given along with sort_order
+        sort_order : str, optional
+            either "ascending" or "descending"
+        limit : int, optional
+            maximum number of entities to return (default is None, all of them)
+        offset : int, optional
+            number of matching entities to skip (default is None, none of them)
 
         Returns
         -------
@@ -118,3 +137,31 @@ class DALDriver(with_metaclass(ABCMeta, object)):
             True if successful delete
         """
         pass
+
+    def set_many(self, collection, objs):
+        """
+        create or update entity objects in collection within one transaction
+
+        Parameters
+        ----------
+        collection : str
+            name of the collection
+        objs : list
+            normalized python representations of entities to save
+
+        Returns
+        -------
+        list
+            normalized python representations of the entities, in the same order
+        """
+        with self.transaction():
+            return [self.set(collection, obj) for obj in objs]
+
+    @contextmanager
+    def transaction(self):
+        """
+        context in which all writes are committed together when it exits, or
+        discarded if an exception is raised. Transactions can be nested, only the
+        outermost one commits. Drivers without transactions commit every write
+        """
+        yield
@@ -1,21 +1,125 @@
-from blitzdb import Document, queryset
+import os
+import copy
+import pickle
+import functools
+import threading
+from io import open
+from contextlib import contextmanager
+from blitzdb import Document, FileBackend, queryset
+from blitzdb.backends.file.index import Index
 from datetime import datetime
+try:
+    import fcntl
+except ImportError:
+    # Windows, concurrent commits may then share a generation
+    fcntl = None
+try:
+    to_unicode = unicode
+except NameError:
+    to_unicode = str
 
 from datmo.core.util.exceptions import (
     EntityNotFound, EntityCollectionNotFound, IncorrectType,
     InvalidArgumentType, RequiredArgumentMissing, MoreThanOneEntityFound)
 from datmo.core.storage.driver import DALDriver
+from datmo.core.storage.driver.query import match_document, slice_results
+
+
+def synchronized(method):
+    """Hold the lock of the driver for the call, as its backend and the indexes it
+    keeps in memory are shared by the threads of the process"""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class CachedFileBackend(FileBackend):
+    """FileBackend which holds a cache of the normalized entities read from it,
+    keyed by collection and store key, and clears the entries of documents which
+    are written or deleted through it. Its indexes are kept up to date in memory
+    by the writes through it, so they are not loaded again after a commit"""
+
+    def __init__(self, *args, **kwargs):
+        self.entity_cache = {}
+        super(CachedFileBackend, self).__init__(*args, **kwargs)
+
+    def save(self, obj, call_hook=True):
+        collection = self.get_collection_for_obj(obj)
+        pk_index = self.get_pk_index(collection)
+        store_keys = pk_index.get_keys_for(
+            obj.pk, include_uncommitted=True) if obj.pk is not None else []
+        # A transactional index only adds the new values of a document written
+        # again on commit, so its previous values are removed here. The pk does
+        # not change, and its index gives the store key of the document
+        for store_key in store_keys:
+            for index in self.get_collection_indexes(collection).values():
+                if index is not pk_index:
+                    Index.remove_key(index, store_key)
+        obj = super(CachedFileBackend, self).save(obj, call_hook=call_hook)
+        for store_key in self.get_pk_index(collection).get_keys_for(
+                obj.pk, include_uncommitted=True):
+            self.entity_cache.pop((collection, store_key), None)
+        return obj
+
+    def delete_by_store_keys(self, collection, store_keys):
+        for store_key in store_keys:
+            self.entity_cache.pop((collection, store_key), None)
+        return super(CachedFileBackend, self).delete_by_store_keys(
+            collection, store_keys)
+
+    def rollback(self, transaction=None):
+        self.entity_cache = {}
+        return super(CachedFileBackend, self).rollback(transaction)
 
 
 class BlitzDBDALDriver(DALDriver):
-    def __init__(self, driver_type, connection_string):
+    """DALDriver backed by BlitzDB, using either files or MongoDB
+
+    Parameters
+    ----------
+    driver_type : str
+        "file" or "mongo"
+    connection_string : str
+        directory of the database for file, connection uri for mongo
+    cached : bool, optional
+        for file, keep documents and indexes in memory between calls and only
+        reload them when another client committed to the database, as told by
+        the generation file every commit increments (default is False, reload
+        from disk on every call)
+
+    Calls are serialized by a lock, and a transaction holds it until it ends, so the
+    driver is shared by the threads of a process
+    """
+
+    generation_filename = "generation"
+
+    def __init__(self, driver_type, connection_string, cached=False):
         super(BlitzDBDALDriver, self).__init__()
         self.database_name = 'datmo_db'
         self.driver_type = driver_type
         self.connection_string = connection_string
+        self.cached = cached
+        self._lock = threading.RLock()
+        # Documents written within the current transaction, by collection and pk,
+        # None if deleted. BlitzDB only finds documents once they are committed
+        self._transaction_depth = 0
+        self._pending_documents = {}
+        self.__load()
+
+    def __load(self):
+        """Create the backend, loading the database from disk"""
+        self._generation = None
         if self.driver_type == "file":
-            from blitzdb import FileBackend
-            self.backend = FileBackend(self.connection_string)
+            if self.cached:
+                # Read first, so commits while loading are reloaded next time
+                self._generation = self.__read_generation()
+                self.backend = CachedFileBackend(self.connection_string)
+            else:
+                self.backend = FileBackend(self.connection_string)
         elif self.driver_type == "mongo":
             from pymongo import MongoClient
             from blitzdb.backends.mongo import Backend as MongoBackend
@@ -51,37 +155,178 @@ class BlitzDBDALDriver(DALDriver):
         class Meta(Document.Meta):
             collection = 'user'
 
+    def __read_generation(self):
+        """Return the generation of the file database, which every commit changes"""
+        try:
+            with open(self.__get_generation_filepath(), "r") as f:
+                return f.read() or None
+        except (IOError, OSError):
+            return None
+
+    def __get_generation_filepath(self):
+        return os.path.join(self.connection_string, self.generation_filename)
+
+    def __increment_generation(self):
+        """Increment the generation of the file database, returning the generation
+        before and after. It is written in place under a lock, so each commit of
+        concurrent processes gets its own generation"""
+        with open(self.__get_generation_filepath(), "a+") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            f.seek(0)
+            previous_generation = f.read() or None
+            try:
+                generation = str(int(previous_generation) + 1)
+            except (TypeError, ValueError):
+                generation = "1"
+            f.seek(0)
+            f.truncate()
+            f.write(to_unicode(generation))
+        return previous_generation, generation
+
+    def __commit(self):
+        self.backend.commit()
+        if self.driver_type != "file":
+            return
+        previous_generation, generation = self.__increment_generation()
+        if not self.cached:
+            return
+        if previous_generation == self._generation:
+            # The indexes in memory were updated by the commit
+            self._generation = generation
+        else:
+            # Another client committed since the database was loaded
+            self._generation = None
+
     def __reload(self):
+        if self._transaction_depth:
+            # Reloading would discard the writes of the transaction
+            return
+        if self.cached:
+            if self.__read_generation() != self._generation:
+                self.__load()
+            return
         if hasattr(self.backend, "indexes"):
+
             for _, nested_index in self.backend.indexes.items():
                 for index, _ in nested_index.items():
                     # Only load from store if storage exists
                     if nested_index[index]._store:
                         nested_index[index].load_from_store()
-            self.__init__(self.driver_type, self.connection_string)
+            self.__load()
+
+    def __normalize_results(self, collection, results):
+        """Return the normalized entities for the query results, using the entity
+        cache of the backend when cached"""
+        if not self.cached:
+            return [
+                normalize_entity(item.attributes.copy()) for item in results
+            ]
+        entities = []
+        for i, store_key in enumerate(results.keys):
+            cache_key = (collection, store_key)
+            if cache_key not in self.backend.entity_cache:
+                self.backend.entity_cache[cache_key] = pickle.dumps(
+                    normalize_entity(results[i].attributes.copy()), -1)
+            # Unpickle a new copy every time so callers can modify it freely
+            entities.append(pickle.loads(self.backend.entity_cache[cache_key]))
+        return entities
+
+    @contextmanager
+    def transaction(self):
+        # The writes of other threads would be part of the transaction
+        with self._lock:
+            if not self._transaction_depth:
+                self.__reload()
+            self._transaction_depth += 1
+            try:
+                yield
+            except Exception:
+                self._transaction_depth -= 1
+                if not self._transaction_depth:
+                    self._pending_documents = {}
+                    # Discard the uncommitted writes held by the backend
+                    self.__load()
+                raise
+            self._transaction_depth -= 1
+            if not self._transaction_depth:
+                self._pending_documents = {}
+                self.__commit()
+
+    def __get_pending(self, collection):
+        """Return the documents written within the transaction to the collection,
+        by pk"""
+        pending = {}
+        for (pending_collection, pk), document in \
+                self._pending_documents.items():
+            if pending_collection == collection:
+                pending[pk] = document
+        return pending
 
+    def __merge_pending(self,
+                        collection,
+                        entities,
+                        query_params,
+                        sort_key=None,
+                        sort_order=None):
+        """Replace the committed entities with the documents written within the
+        transaction which match the query params"""
+        pending = self.__get_pending(collection)
+        if not pending:
+            return entities
+        entities = [
+            entity for entity in entities if entity['id'] not in pending
+        ]
+        for document in pending.values():
+            if document is not None and match_document(document, query_params):
+                entities.append(normalize_entity(copy.deepcopy(document)))
+        if sort_key is not None:
+
+            def get_sort_value(entity):
+                return entity.get(sort_key) is None, entity.get(sort_key)
+
+            try:
+                entities.sort(
+                    key=get_sort_value, reverse=sort_order == 'descending')
+            except TypeError:
+                # Values of different types are left in the committed order
+                pass
+        return entities
+
+    @synchronized
     def get(self, collection, entity_id):
+        pending = self.__get_pending(collection)
+        if entity_id in pending:
+            if pending[entity_id] is None:
+                raise EntityNotFound()
+            return normalize_entity(copy.deepcopy(pending[entity_id]))
         self.__reload()
         try:
             results = self.backend.filter(collection, {'pk': entity_id})
             if len(results) == 1:
-                item_dict = results[0].attributes
-                return normalize_entity(item_dict)
+                return self.__normalize_results(collection, results)[0]
             else:
                 raise EntityNotFound()
         except AttributeError as err:
             raise EntityCollectionNotFound(err.message)
 
+    @synchronized
     def get_by_shortened_id(self, collection, shortened_entity_id):
         self.__reload()
         try:
-            results = self.backend.filter(
-                collection, {'pk': {
+            results = self.backend.filter(collection, {
+                'pk': {
+                    '$regex': '^%s' % shortened_entity_id
+                }
+            })
+            results = self.__normalize_results(collection, results)
+            results = self.__merge_pending(collection, results, {
+                'pk': {
                     '$regex': '^%s' % shortened_entity_id
-                }})
+                }
+            })
             if len(results) == 1:
-                item_dict = results[0].attributes
-                return normalize_entity(item_dict)
+                return results[0]
             elif len(results) > 1:
                 raise MoreThanOneEntityFound()
             else:
@@ -89,6 +334,7 @@ class BlitzDBDALDriver(DALDriver):
         except AttributeError as err:
             raise EntityCollectionNotFound(err.message)
 
+    @synchronized
     def set(self, collection, obj):
         self.__reload()
         compatible_obj = denormalize_entity(obj)
@@ -109,47 +355,67 @@ class BlitzDBDALDriver(DALDriver):
         else:
             raise EntityCollectionNotFound(collection)
         self.backend.save(item)
-        self.backend.commit()
+        if self._transaction_depth:
+            self._pending_documents[(collection, item.pk)] = copy.deepcopy(
+                self.backend.serialize(item.attributes))
+        else:
+            self.__commit()
         return self.get(collection, item.pk)
 
+    @synchronized
     def exists(self, collection, entity_id):
+        pending = self.__get_pending(collection)
+        if entity_id in pending:
+            return pending[entity_id] is not None
         self.__reload()
         results = self.backend.filter(collection, {'pk': entity_id})
         return len(results) == 1
 
-    def query(self, collection, query_params, sort_key=None, sort_order=None):
+    @synchronized
+    def query(self,
+              collection,
+              query_params,
+              sort_key=None,
+              sort_order=None,
+              limit=None,
+              offset=None):
         self.__reload()
         if query_params.get('id', None) is not None:
             query_params['pk'] = query_params['id']
             del query_params['id']
         if sort_key is not None and sort_order is not None:
             if sort_order == 'ascending':
-                return list(
-                    map(normalize_entity, [
-                        item.attributes.copy() for item in self.backend.filter(
-                            collection, query_params).sort(
-                                sort_key, queryset.QuerySet.ASCENDING)
-                    ]))
+                results = self.backend.filter(collection, query_params).sort(
+                    sort_key, queryset.QuerySet.ASCENDING)
             elif sort_order == 'descending':
-                return list(
-                    map(normalize_entity, [
-                        item.attributes.copy() for item in self.backend.filter(
-                            collection, query_params).sort(
-                                sort_key, queryset.QuerySet.DESCENDING)
-                    ]))
+                results = self.backend.filter(collection, query_params).sort(
+                    sort_key, queryset.QuerySet.DESCENDING)
             else:
                 raise InvalidArgumentType()
         else:
             if sort_key is not None and sort_order is None or \
                 sort_key is None and sort_order is not None:
                 raise RequiredArgumentMissing()
-            return list(
-                map(normalize_entity, [
-                    item.attributes.copy()
-                    for item in self.backend.filter(collection, query_params)
-                ]))
+            results = self.backend.filter(collection, query_params)
+        if self.__get_pending(collection):
+            entities = self.__normalize_results(collection, results)
+            entities = self.__merge_pending(collection, entities, query_params,
+                                            sort_key, sort_order)
+            return slice_results(entities, limit, offset)
+        # Only the documents within the page are loaded from the store
+        results = slice_results(results, limit, offset)
+        return self.__normalize_results(collection, results)
 
+    @synchronized
     def delete(self, collection, entity_id):
+        if self._transaction_depth:
+            if not self.exists(collection, entity_id):
+                raise EntityNotFound()
+            store_keys = self.backend.get_pk_index(collection).get_keys_for(
+                entity_id, include_uncommitted=True)
+            self.backend.delete_by_store_keys(collection, store_keys)
+            self._pending_documents[(collection, entity_id)] = None
+            return True
         self.__reload()
         results = self.backend.filter(collection, {'pk': entity_id})
         if len(results) == 1:
@@ -157,7 +423,7 @@ class BlitzDBDALDriver(DALDriver):
         else:
             raise EntityNotFound()
         self.backend.delete(document)
-        self.backend.commit()
+        self.__commit()
         return True
 
 
@@ -0,0 +1,124 @@
+import re
+from numbers import Integral
+
+from datmo.core.util.exceptions import InvalidArgumentType
+
+# Values which can be compared by the database itself, e.g. bound to a sqlite statement
+try:
+    SCALAR_TYPES = (str, unicode, int, long, float, bool)
+    STRING_TYPES = (str, unicode)
+except NameError:
+    SCALAR_TYPES = (str, int, float, bool)
+    STRING_TYPES = (str, )
+
+# Returned when a field is not within a document
+MISSING = object()
+
+comparison_operators = ["$gt", "$gte", "$lt", "$lte"]
+
+
+def get_field_value(document, field):
+    value = document
+    for part in field.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return MISSING
+        value = value[part]
+    return value
+
+
+def match_value(value, query_value):
+    """Match a document value with a query value, with the same semantics as
+    BlitzDB: a list value matches if it is equal to or contains the query value"""
+    if isinstance(query_value, dict) and query_value and \
+            all(operator.startswith("$") for operator in query_value):
+        return all(
+            match_operator(value, operator, operand)
+            for operator, operand in query_value.items())
+    if value is MISSING:
+        return False
+    if isinstance(value, list) and not isinstance(query_value, list):
+        return query_value in value
+    return value == query_value
+
+
+def match_operator(value, operator, operand):
+    if operator == "$exists":
+        return (value is not MISSING) == bool(operand)
+    if operator == "$ne":
+        return not match_value(value, operand)
+    if operator == "$in":
+        return any(match_value(value, item) for item in operand)
+    if operator == "$nin":
+        return not any(match_value(value, item) for item in operand)
+    if operator == "$all":
+        return isinstance(value, list) and all(item in value
+                                               for item in operand)
+    if value is MISSING:
+        return False
+    if operator == "$regex":
+        # As BlitzDB, only string values (or items of a list) are matched
+        values = value if isinstance(value, list) else [value]
+        return any(
+            isinstance(item, STRING_TYPES) and re.match(operand, item)
+            for item in values)
+    if operator in comparison_operators:
+        values = value if isinstance(value, list) else [value]
+        for item in values:
+            try:
+                if operator == "$gt" and item > operand or \
+                        operator == "$gte" and item >= operand or \
+                        operator == "$lt" and item < operand or \
+                        operator == "$lte" and item <= operand:
+                    return True
+            except TypeError:
+                # Values of different types do not match
+                pass
+        return False
+    raise InvalidArgumentType()
+
+
+def match_document(document, query_params):
+    """Check if a denormalized document matches all of the query params"""
+    for key, query_value in query_params.items():
+        if key == "$and":
+            if not all(match_document(document, item) for item in query_value):
+                return False
+        elif key == "$or":
+            if not any(match_document(document, item) for item in query_value):
+                return False
+        elif key.startswith("$"):
+            raise InvalidArgumentType()
+        elif not match_value(get_field_value(document, key), query_value):
+            return False
+    return True
+
+
+def check_page(limit=None, offset=None):
+    """Check the limit and offset of a page of results
+
+    Raises
+    ------
+    InvalidArgumentType
+        if the limit or offset is not a non-negative integer
+    """
+    for value in [limit, offset]:
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, Integral) or \
+                value < 0:
+            raise InvalidArgumentType()
+
+
+def slice_results(results, limit=None, offset=None):
+    """Return the page of results after skipping offset results, with at most limit
+    results
+
+    Raises
+    ------
+    InvalidArgumentType
+        if the limit or offset is not a non-negative integer
+    """
+    check_page(limit, offset)
+    start = offset or 0
+    end = start + limit if limit is not None else None
+    return results[start:end]
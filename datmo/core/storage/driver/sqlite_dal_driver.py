@@ -0,0 +1,389 @@
+import os
+import re
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from builtins import chr
+
+from datmo.core.util.exceptions import (
+    EntityNotFound, EntityCollectionNotFound, InvalidArgumentType,
+    RequiredArgumentMissing, MoreThanOneEntityFound)
+from datmo.core.util.misc_functions import create_unique_hash
+from datmo.core.storage.driver import DALDriver
+from datmo.core.storage.driver.blitzdb_dal_driver import normalize_entity, \
+    denormalize_entity
+from datmo.core.storage.driver.query import SCALAR_TYPES, STRING_TYPES, \
+    match_document, check_page
+
+
+class SQLiteDALDriver(DALDriver):
+    """SQLiteDALDriver stores entities in a sqlite database with a table for each
+    collection. Each document is stored as json, along with columns for the fields
+    which are commonly queried and sorted on so those are backed by indexes
+
+    Conditions on indexed fields, and on other fields with scalar values, as well
+    as sorts and pages of results are run within sqlite. The remaining conditions
+    (e.g. on list or dict values) are matched on the documents returned, with the
+    same semantics as the BlitzDBDALDriver.
+
+    Parameters
+    ----------
+    connection_string : str
+        directory of the database, created if it does not exist
+
+    Attributes
+    ----------
+    connection_string : str
+    database_filepath : str
+    connection : sqlite3.Connection
+    """
+
+    database_filename = "datmo.sqlite"
+    collections = [
+        "model", "code", "environment", "file_collection", "task", "snapshot",
+        "user"
+    ]
+    # Fields stored in their own columns and indexed, they are expected to hold
+    # scalar values. The pk column is the primary key, which also serves lookups
+    # by id prefix
+    indexed_fields = [
+        "model_id", "code_id", "environment_id", "file_collection_id",
+        "created_at", "fingerprint"
+    ]
+    comparison_operators = {"$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}
+    busy_timeout = 30
+
+    def __init__(self, connection_string):
+        super(SQLiteDALDriver, self).__init__()
+        self.connection_string = connection_string
+        if not os.path.isdir(self.connection_string):
+            os.makedirs(self.connection_string)
+        self.database_filepath = os.path.join(self.connection_string,
+                                              self.database_filename)
+        self._lock = threading.RLock()
+        self._transaction_depth = 0
+        self.connection = sqlite3.connect(
+            self.database_filepath,
+            timeout=self.busy_timeout,
+            check_same_thread=False)
+        # Readers do not block the writer and vice versa
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.create_function("REGEXP", 2, regexp)
+        self.__create_tables()
+
+    def __create_tables(self):
+        with self._lock, self.connection:
+            for collection in self.collections:
+                columns = ", ".join(["pk TEXT PRIMARY KEY"] + [
+                    "%s TEXT" % field for field in self.indexed_fields
+                ] + ["document TEXT NOT NULL"])
+                self.connection.execute("CREATE TABLE IF NOT EXISTS %s (%s)" %
+                                        (collection, columns))
+                existing_columns = [
+                    row[1]
+                    for row in self.connection.execute(
+                        "PRAGMA table_info(%s)" % collection)
+                ]
+                for field in self.indexed_fields:
+                    if field not in existing_columns:
+                        # Fields indexed after the database was created
+                        self.__add_column(collection, field)
+                for field in self.indexed_fields:
+                    self.connection.execute(
+                        "CREATE INDEX IF NOT EXISTS %s_%s ON %s (%s)" %
+                        (collection, field, collection, field))
+
+    def __add_column(self, collection, field):
+        json_path = get_json_path(field)
+        self.connection.execute("ALTER TABLE %s ADD COLUMN %s TEXT" %
+                                (collection, field))
+        self.connection.execute(
+            "UPDATE %s SET %s = json_extract(document, '%s') "
+            "WHERE json_type(document, '%s') NOT IN ('array', 'object')" %
+            (collection, field, json_path, json_path))
+
+    def __check_collection(self, collection):
+        if collection not in self.collections:
+            raise EntityCollectionNotFound(collection)
+
+    def __select(self,
+                 collection,
+                 where="",
+                 params=(),
+                 order_by="",
+                 limit=None,
+                 offset=None,
+                 query_params=None):
+        """Select the documents matching the where clause and then the query params,
+        skipping offset documents and returning at most limit documents"""
+        sql = "SELECT document FROM %s" % collection
+        if where:
+            sql += " WHERE " + where
+        if order_by:
+            sql += " ORDER BY " + order_by
+        if not query_params and (limit is not None or offset is not None):
+            sql += " LIMIT %d OFFSET %d" % (-1 if limit is None else limit,
+                                            offset or 0)
+            limit, offset = None, None
+        documents = []
+        skipped = 0
+        with self._lock:
+            cursor = self.connection.execute(sql, params)
+            for row in cursor:
+                if limit is not None and len(documents) >= limit:
+                    break
+                document = json.loads(row[0])
+                if query_params and not match_document(document, query_params):
+                    continue
+                if offset and skipped < offset:
+                    skipped += 1
+                    continue
+                documents.append(document)
+            cursor.close()
+        return documents
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            self._transaction_depth += 1
+            try:
+                if self._transaction_depth == 1:
+                    # Commits on exit, or rolls back if an exception is raised
+                    with self.connection:
+                        yield
+                else:
+                    yield
+            finally:
+                self._transaction_depth -= 1
+
+    def get(self, collection, entity_id):
+        self.__check_collection(collection)
+        documents = self.__select(collection, "pk = ?", (entity_id, ))
+        if len(documents) == 1:
+            return normalize_entity(documents[0])
+        else:
+            raise EntityNotFound()
+
+    def get_by_shortened_id(self, collection, shortened_entity_id):
+        self.__check_collection(collection)
+        if not shortened_entity_id:
+            documents = self.__select(collection, limit=2)
+        else:
+            # Range over the primary key index for all ids with the prefix
+            upper_bound = shortened_entity_id[:-1] + \
+                chr(ord(shortened_entity_id[-1]) + 1)
+            documents = self.__select(
+                collection,
+                "pk >= ? AND pk < ?", (shortened_entity_id, upper_bound),
+                limit=2)
+        if len(documents) == 1:
+            return normalize_entity(documents[0])
+        elif len(documents) > 1:
+            raise MoreThanOneEntityFound()
+        else:
+            raise EntityNotFound()
+
+    def set(self, collection, obj):
+        self.__check_collection(collection)
+        document = denormalize_entity(obj)
+        if not document.get("pk"):
+            document["pk"] = create_unique_hash()
+        columns = [
+            self.__get_column_value(document, field)
+            for field in self.indexed_fields
+        ]
+        serialized_document = json.dumps(document, default=serialize_value)
+        with self.transaction():
+            # Update in place to keep the insertion order of existing documents
+            cursor = self.connection.execute(
+                "UPDATE %s SET %s, document = ? WHERE pk = ?" %
+                (collection,
+                 ", ".join(["%s = ?" % field
+                            for field in self.indexed_fields])),
+                columns + [serialized_document, document["pk"]])
+            if cursor.rowcount == 0:
+                self.connection.execute(
+                    "INSERT INTO %s (pk, %s, document) VALUES (?, %s, ?)" %
+                    (collection, ", ".join(self.indexed_fields),
+                     ", ".join(["?"] * len(self.indexed_fields))),
+                    [document["pk"]] + columns + [serialized_document])
+        return self.get(collection, document["pk"])
+
+    def exists(self, collection, entity_id):
+        self.__check_collection(collection)
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT 1 FROM %s WHERE pk = ?" % collection,
+                (entity_id, )).fetchone()
+        return row is not None
+
+    def query(self,
+              collection,
+              query_params,
+              sort_key=None,
+              sort_order=None,
+              limit=None,
+              offset=None):
+        self.__check_collection(collection)
+        check_page(limit, offset)
+        query_params = dict(query_params)
+        if query_params.get('id', None) is not None:
+            query_params['pk'] = query_params['id']
+            del query_params['id']
+        if sort_key is not None and sort_order is not None:
+            if sort_order == 'ascending':
+                order_by = "%s ASC" % self.__get_field_expression(sort_key)
+            elif sort_order == 'descending':
+                order_by = "%s DESC" % self.__get_field_expression(sort_key)
+            else:
+                raise InvalidArgumentType()
+        else:
+            if sort_key is not None and sort_order is None or \
+                sort_key is None and sort_order is not None:
+                raise RequiredArgumentMissing()
+            order_by = ""
+        where, params, remaining_query_params = self.__compile_query(
+            query_params)
+        documents = self.__select(
+            collection,
+            where,
+            params,
+            order_by,
+            limit=limit,
+            offset=offset,
+            query_params=remaining_query_params)
+        return [normalize_entity(document) for document in documents]
+
+    def delete(self, collection, entity_id):
+        self.__check_collection(collection)
+        with self.transaction():
+            cursor = self.connection.execute(
+                "DELETE FROM %s WHERE pk = ?" % collection, (entity_id, ))
+        if cursor.rowcount != 1:
+            raise EntityNotFound()
+        return True
+
+    @staticmethod
+    def __get_column_value(document, field):
+        value = document.get(field, None)
+        return value if isinstance(value, SCALAR_TYPES) else None
+
+    def __get_field_expression(self, field):
+        """Return the sql expression for the value of the field in a document"""
+        if field == "pk" or field in self.indexed_fields:
+            return field
+        return "json_extract(document, '%s')" % get_json_path(field)
+
+    def __compile_query(self, query_params):
+        """Compile the conditions which can be run within sqlite
+
+        Returns
+        -------
+        tuple
+            where clause, its parameters and the query params which still have to
+            be matched on the documents returned
+        """
+        conditions, params, remaining_query_params = [], [], {}
+        for key, value in query_params.items():
+            if key == "$and" and isinstance(value, list):
+                remaining_items = []
+                for item in value:
+                    where, item_params, remaining_item = self.__compile_query(
+                        item)
+                    if where:
+                        conditions.append("(%s)" % where)
+                        params.extend(item_params)
+                    if remaining_item:
+                        remaining_items.append(remaining_item)
+                if remaining_items:
+                    remaining_query_params[key] = remaining_items
+                continue
+            if key == "$or" and isinstance(value, list) and value:
+                compiled_items = [self.__compile_query(item) for item in value]
+                # Documents matching any of the items match at least one of the
+                # conditions, so filter on those unless an item has none
+                if all(where for where, _, _ in compiled_items):
+                    conditions.append("(%s)" % " OR ".join(
+                        "(%s)" % where for where, _, _ in compiled_items))
+                    for _, item_params, _ in compiled_items:
+                        params.extend(item_params)
+                    if any(remaining_item
+                           for _, _, remaining_item in compiled_items):
+                        remaining_query_params[key] = value
+                else:
+                    remaining_query_params[key] = value
+                continue
+            if key.startswith("$"):
+                remaining_query_params[key] = value
+                continue
+            indexed = key == "pk" or key in self.indexed_fields
+            expression = self.__get_field_expression(key)
+            if isinstance(value, dict) and value and \
+                    all(operator.startswith("$") for operator in value):
+                operator_conditions = []
+                for operator, operand in value.items():
+                    if operator in self.comparison_operators:
+                        if not isinstance(operand, SCALAR_TYPES):
+                            raise InvalidArgumentType()
+                        operator_conditions.append(
+                            "%s %s ?" % (expression,
+                                         self.comparison_operators[operator]))
+                        params.append(operand)
+                    elif operator == "$in" and isinstance(operand, list) and \
+                            all(isinstance(item, SCALAR_TYPES)
+                                for item in operand):
+                        operator_conditions.append(
+                            "%s IN (%s)" % (expression,
+                                            ", ".join(["?"] * len(operand))))
+                        params.extend(operand)
+                    elif operator == "$regex" and \
+                            isinstance(operand, STRING_TYPES):
+                        operator_conditions.append("%s REGEXP ?" % expression)
+                        params.append(operand)
+                    else:
+                        operator_conditions = None
+                        break
+                if operator_conditions is None:
+                    remaining_query_params[key] = value
+                    continue
+                if not indexed:
+                    remaining_query_params[key] = value
+            elif isinstance(value, SCALAR_TYPES):
+                operator_conditions = ["%s = ?" % expression]
+                params.append(value)
+                if not indexed:
+                    remaining_query_params[key] = value
+            else:
+                remaining_query_params[key] = value
+                continue
+            if not indexed:
+                # A list value matches if any of its items match, so leave those
+                # documents to be matched on their values
+                operator_conditions = [
+                    "(%s OR json_type(document, '%s') = 'array')" %
+                    (" AND ".join(operator_conditions), get_json_path(key))
+                ]
+            conditions.extend(operator_conditions)
+        return " AND ".join(conditions), params, remaining_query_params
+
+
+def serialize_value(value):
+    """Serialize values json does not support, as the BlitzDB json serializer"""
+    if isinstance(value, datetime):
+        return value.ctime()
+    raise TypeError(repr(value))
+
+
+def regexp(pattern, value):
+    """Match the start of a string value with the pattern, as the $regex operator"""
+    return isinstance(value, STRING_TYPES) and \
+        re.match(pattern, value) is not None
+
+
+def get_json_path(field):
+    """Return the sqlite json path of a field, nested fields are separated by dots"""
+    return "$" + "".join('."%s"' % part.replace("'", "''").replace('"', '\\"')
+                         for part in field.split("."))
@@ -9,6 +9,7 @@ import os
 import tempfile
 import datetime
 import platform
+import threading
 
 from datmo.core.storage.driver.blitzdb_dal_driver import BlitzDBDALDriver
 from datmo.core.util.exceptions import EntityNotFound, InvalidArgumentType, \
@@ -63,6 +64,9 @@ class TestBlitzDBDALDriver():
     def teardown_class(self):
         pass
 
+    def get_new_database(self):
+        return BlitzDBDALDriver("file", self.temp_dir)
+
     def test_filebased_db(self):
         assert self.database != None
 
@@ -246,20 +250,23 @@ class TestBlitzDBDALDriver():
 
     def test_query_gte_datetime_should_fail(self):
         collection = 'snapshot'
-        self.database.set(collection,
-                          {"range_query3": datetime.datetime(2017, 1, 1)})
-        self.database.set(collection,
-                          {"range_query3": datetime.datetime(2017, 2, 1)})
-        self.database.set(collection,
-                          {"range_query3": datetime.datetime(2017, 3, 1)})
+        self.database.set(collection, {
+            "range_query3": datetime.datetime(2017, 1, 1)
+        })
+        self.database.set(collection, {
+            "range_query3": datetime.datetime(2017, 2, 1)
+        })
+        self.database.set(collection, {
+            "range_query3": datetime.datetime(2017, 3, 1)
+        })
 
         failed = False
         try:
-            _ = self.database.query(
-                collection,
-                {"range_query2": {
+            _ = self.database.query(collection, {
+                "range_query2": {
                     "$gte": datetime.datetime(2017, 2, 1)
-                }})
+                }
+            })
         except Exception:
             failed = True
         assert failed
@@ -477,10 +484,11 @@ class TestBlitzDBDALDriver():
         assert failed
 
         # wrong key and right order being passed in
-        expected_items = self.database.query(collection,
-                                             {"range_query5": {
-                                                 "$gte": 2
-                                             }})
+        expected_items = self.database.query(collection, {
+            "range_query5": {
+                "$gte": 2
+            }
+        })
         items = self.database.query(
             collection, {"range_query5": {
                 "$gte": 2
@@ -568,10 +576,11 @@ class TestBlitzDBDALDriver():
         assert failed
 
         # wrong key and right order being passed in
-        expected_items = self.database.query(collection,
-                                             {"range_query6": {
-                                                 "$gte": 2
-                                             }})
+        expected_items = self.database.query(collection, {
+            "range_query6": {
+                "$gte": 2
+            }
+        })
         items = self.database.query(
             collection, {"range_query6": {
                 "$gte": 2
@@ -597,12 +606,16 @@ class TestBlitzDBDALDriver():
         self.database.set("snapshot", {"id": 1, "key": "hello"})
         self.database.set("snapshot", {"id": 2, "key": "there"})
         items = [
-            item for item in self.database.query("snapshot", {"key": "there"})
+            item for item in self.database.query("snapshot", {
+                "key": "there"
+            })
         ]
         next_item = items[0]
 
         items = [
-            item for item in self.database.query("snapshot", {"key": "hello"})
+            item for item in self.database.query("snapshot", {
+                "key": "hello"
+            })
         ]
         current_item = items[0]
         current_item['key'] = next_item['key']
@@ -617,3 +630,251 @@ class TestBlitzDBDALDriver():
         items = self.database.query("snapshot", {"key": "there"})
         assert len(items) == 1
         assert items[0] == current_item
+
+    def test_query_limit_offset(self):
+        collection = 'user'
+        for i in range(5):
+            self.database.set(collection, {"page_query": i})
+        items = self.database.query(
+            collection, {"page_query": {
+                "$gte": 0
+            }},
+            sort_key="page_query",
+            sort_order="ascending",
+            limit=2)
+        assert [item['page_query'] for item in items] == [0, 1]
+        items = self.database.query(
+            collection, {"page_query": {
+                "$gte": 0
+            }},
+            sort_key="page_query",
+            sort_order="descending",
+            limit=2,
+            offset=2)
+        assert [item['page_query'] for item in items] == [2, 1]
+        items = self.database.query(
+            collection, {"page_query": {
+                "$gte": 0
+            }}, offset=4)
+        assert len(items) == 1
+        # A page within a transaction includes the pending writes
+        with self.database.transaction():
+            self.database.set(collection, {"page_query": 5})
+            items = self.database.query(
+                collection, {"page_query": {
+                    "$gte": 0
+                }},
+                sort_key="page_query",
+                sort_order="descending",
+                limit=1)
+            assert [item['page_query'] for item in items] == [5]
+        failed = False
+        try:
+            _ = self.database.query(collection, {}, limit=-1)
+        except InvalidArgumentType:
+            failed = True
+        assert failed
+
+    def test_query_regex_or(self):
+        collection = 'user'
+        self.database.set(collection, {
+            "regex_message": "first run",
+            "regex_label": None
+        })
+        self.database.set(collection, {
+            "regex_message": "second try",
+            "regex_label": "best run"
+        })
+        self.database.set(collection, {"regex_message": 3})
+        items = self.database.query(collection, {
+            "regex_message": {
+                "$regex": ".*run"
+            }
+        })
+        assert [item['regex_message'] for item in items] == ["first run"]
+        # Matches from the start of the value
+        items = self.database.query(collection, {
+            "regex_message": {
+                "$regex": "run"
+            }
+        })
+        assert items == []
+        items = self.database.query(
+            collection, {
+                "$or": [{
+                    "regex_message": {
+                        "$regex": ".*run"
+                    }
+                }, {
+                    "regex_label": {
+                        "$regex": ".*run"
+                    }
+                }]
+            },
+            sort_key="regex_message",
+            sort_order="ascending")
+        assert [item['regex_message'] for item in items] == \
+               ["first run", "second try"]
+
+    def test_set_many(self):
+        collection = 'code'
+        results = self.database.set_many(collection, [{
+            "set_many": 1
+        }, {
+            "set_many": 2
+        }])
+        assert [result['set_many'] for result in results] == [1, 2]
+        for result in results:
+            assert self.database.get(collection, result['id']) == result
+        assert self.get_new_database().exists(collection, results[0]['id'])
+
+    def test_transaction(self):
+        collection = 'code'
+        other_database = self.get_new_database()
+        with self.database.transaction():
+            result = self.database.set(collection, {"transaction": 1})
+            # Writes are seen within the transaction
+            assert self.database.get(collection, result['id']) == result
+            assert self.database.exists(collection, result['id'])
+            items = self.database.query(collection, {"transaction": 1})
+            assert [item['id'] for item in items] == [result['id']]
+            result = self.database.set(collection, {
+                "id": result['id'],
+                "transaction": 2
+            })
+            assert self.database.query(collection, {"transaction": 1}) == []
+            with self.database.transaction():
+                result_2 = self.database.set(collection, {"transaction": 2})
+            # Only the outermost transaction commits
+            assert not other_database.exists(collection, result['id'])
+            assert not other_database.exists(collection, result_2['id'])
+            self.database.delete(collection, result_2['id'])
+            assert not self.database.exists(collection, result_2['id'])
+        assert other_database.get(collection, result['id']) == result
+        assert not other_database.exists(collection, result_2['id'])
+        items = self.database.query(collection, {"transaction": 2})
+        assert [item['id'] for item in items] == [result['id']]
+
+    def test_threads(self):
+        collection = 'code'
+        errors = []
+
+        def write(thread_index):
+            try:
+                for i in range(10):
+                    if i % 2:
+                        with self.database.transaction():
+                            self.database.set(collection, {
+                                "threads": thread_index,
+                                "index": i
+                            })
+                    else:
+                        self.database.set(collection, {
+                            "threads": thread_index,
+                            "index": i
+                        })
+                    self.database.query(collection, {"threads": thread_index})
+            except Exception as e:
+                errors.append(e)
+
+        threads = [
+            threading.Thread(target=write, args=(thread_index, ))
+            for thread_index in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+        # The writes of each thread are all committed and indexed
+        for thread_index in range(4):
+            items = self.get_new_database().query(collection, {
+                "threads": thread_index
+            })
+            assert sorted(item['index'] for item in items) == list(range(10))
+
+    def test_transaction_rollback(self):
+        collection = 'code'
+        failed = False
+        try:
+            with self.database.transaction():
+                result = self.database.set(collection, {"rollback": 1})
+                raise ValueError()
+        except ValueError:
+            failed = True
+        assert failed
+        assert not self.database.exists(collection, result['id'])
+        assert not self.get_new_database().exists(collection, result['id'])
+
+
+class TestBlitzDBDALDriverCached(TestBlitzDBDALDriver):
+    """
+    Checks all functions of BlitzDBDALDriver with the cached file backend
+    """
+
+    def setup_class(self):
+        # provide mountable tmp directory for docker
+        tempfile.tempdir = "/tmp" if not platform.system(
+        ) == "Windows" else None
+        test_datmo_dir = os.environ.get('TEST_DATMO_DIR',
+                                        tempfile.gettempdir())
+        self.temp_dir = tempfile.mkdtemp(dir=test_datmo_dir)
+        self.collection = 'model'
+        self.database = BlitzDBDALDriver("file", self.temp_dir, cached=True)
+
+    def get_new_database(self):
+        return BlitzDBDALDriver("file", self.temp_dir, cached=True)
+
+    def test_cached_no_reload(self):
+        database = BlitzDBDALDriver("file", self.temp_dir, cached=True)
+        test_obj = database.set(self.collection, {"foo": "cached"})
+        backend = database.backend
+        # Reads through the same driver do not reload the backend
+        assert database.get(self.collection, test_obj['id']) == test_obj
+        _ = database.query(self.collection, {"foo": "cached"})
+        assert database.exists(self.collection, test_obj['id'])
+        assert database.backend is backend
+        # Nor do its writes, which update the indexes in memory
+        test_obj['foo'] = "cached_2"
+        database.set(self.collection, test_obj)
+        assert database.backend is backend
+        assert database.query(self.collection, {"foo": "cached"}) == []
+        assert database.query(self.collection, {
+            "foo": "cached_2"
+        }) == [test_obj]
+
+    def test_cached_concurrent_commit(self):
+        database = BlitzDBDALDriver("file", self.temp_dir, cached=True)
+        with database.transaction():
+            test_obj = database.set(self.collection, {"foo": "first"})
+            # Another client commits while the transaction is open
+            generation_filepath = os.path.join(self.temp_dir, "generation")
+            with open(generation_filepath, "r") as f:
+                generation = int(f.read())
+            with open(generation_filepath, "w") as f:
+                f.write(str(generation + 1))
+        # The database is loaded again once, to see the commit of the other
+        backend = database.backend
+        assert database.get(self.collection, test_obj['id']) == test_obj
+        assert database.backend is not backend
+        backend = database.backend
+        _ = database.query(self.collection, {"foo": "first"})
+        assert database.backend is backend
+
+    def test_cached_invalidation(self):
+        database_2 = BlitzDBDALDriver("file", self.temp_dir, cached=True)
+        database_3 = BlitzDBDALDriver("file", self.temp_dir, cached=True)
+        test_obj = database_2.set(self.collection, {"foo": "before"})
+        assert database_3.get(self.collection,
+                              test_obj['id'])['foo'] == "before"
+        # Updates and deletes by another client are seen
+        test_obj['foo'] = "after"
+        database_2.set(self.collection, test_obj)
+        assert database_3.get(self.collection,
+                              test_obj['id'])['foo'] == "after"
+        database_2.delete(self.collection, test_obj['id'])
+        assert not database_3.exists(self.collection, test_obj['id'])
+        # Writes by a driver without the cache are seen
+        database_4 = BlitzDBDALDriver("file", self.temp_dir)
+        test_obj_4 = database_4.set(self.collection, {"foo": "uncached"})
+        assert database_3.exists(self.collection, test_obj_4['id'])
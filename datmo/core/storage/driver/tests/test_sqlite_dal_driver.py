@@ -0,0 +1,138 @@
+"""
+Tests for sqlite_dal_driver.py
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import tempfile
+import platform
+
+from datmo.core.storage.driver.sqlite_dal_driver import SQLiteDALDriver
+from datmo.core.storage.driver.tests import test_blitzdb_dal_driver
+from datmo.core.util.exceptions import EntityNotFound, \
+    EntityCollectionNotFound, MoreThanOneEntityFound
+
+
+class TestSQLiteDALDriver(test_blitzdb_dal_driver.TestBlitzDBDALDriver):
+    """
+    Checks all functions of SQLiteDALDriver, with the same tests as BlitzDBDALDriver
+    """
+
+    def setup_class(self):
+        # provide mountable tmp directory for docker
+        tempfile.tempdir = "/tmp" if not platform.system(
+        ) == "Windows" else None
+        test_datmo_dir = os.environ.get('TEST_DATMO_DIR',
+                                        tempfile.gettempdir())
+        self.temp_dir = tempfile.mkdtemp(dir=test_datmo_dir)
+        self.collection = 'model'
+        self.database = SQLiteDALDriver(self.temp_dir)
+
+    def get_new_database(self):
+        return SQLiteDALDriver(self.temp_dir)
+
+    def test_wal_mode(self):
+        journal_mode = self.database.connection.execute(
+            "PRAGMA journal_mode").fetchone()[0]
+        assert journal_mode == "wal"
+
+    def test_indexes_used(self):
+        query_plan = self.database.connection.execute(
+            "EXPLAIN QUERY PLAN SELECT document FROM snapshot "
+            "WHERE model_id = ? ORDER BY created_at DESC",
+            ("model_id", )).fetchall()
+        assert "USING INDEX" in " ".join(str(row[-1]) for row in query_plan)
+        query_plan = self.database.connection.execute(
+            "EXPLAIN QUERY PLAN SELECT document FROM snapshot "
+            "WHERE pk >= ? AND pk < ?", ("a", "b")).fetchall()
+        assert "autoindex" in " ".join(str(row[-1]) for row in query_plan)
+
+    def test_query_indexed_fields(self):
+        collection = 'task'
+        first = self.database.set(collection, {
+            "model_id": "model_1",
+            "code_id": "code_1",
+            "foo": ["bar", "baz"]
+        })
+        second = self.database.set(collection, {
+            "model_id": "model_1",
+            "code_id": "code_2",
+            "foo": "bar"
+        })
+        _ = self.database.set(collection, {"model_id": "model_2"})
+        items = self.database.query(collection, {"model_id": "model_1"})
+        assert [item['id'] for item in items] == [first['id'], second['id']]
+        items = self.database.query(collection, {
+            "model_id": "model_1",
+            "code_id": {
+                "$in": ["code_2", "code_3"]
+            }
+        })
+        assert [item['id'] for item in items] == [second['id']]
+        # Lists match the values they contain
+        items = self.database.query(collection, {
+            "model_id": "model_1",
+            "foo": "bar"
+        })
+        assert len(items) == 2
+        items = self.database.query(collection, {"foo": ["bar", "baz"]})
+        assert [item['id'] for item in items] == [first['id']]
+
+    def test_query_nested_dict(self):
+        collection = 'snapshot'
+        result = self.database.set(collection, {
+            "config_query": {
+                "a": 1,
+                "b": {
+                    "c": 2
+                }
+            }
+        })
+        items = self.database.query(collection, {
+            "config_query": {
+                "a": 1,
+                "b": {
+                    "c": 2
+                }
+            }
+        })
+        assert [item['id'] for item in items] == [result['id']]
+        items = self.database.query(collection, {"config_query": {"a": 1}})
+        assert items == []
+        items = self.database.query(collection, {"config_query.b.c": 2})
+        assert [item['id'] for item in items] == [result['id']]
+
+    def test_get_by_shortened_id_multiple(self):
+        collection = 'user'
+        _ = self.database.set(collection, {"id": "abc1", "foo": "bar"})
+        _ = self.database.set(collection, {"id": "abc2", "foo": "bar"})
+        _ = self.database.set(collection, {"id": "abd1", "foo": "bar"})
+        result = self.database.get_by_shortened_id(collection, "abc2")
+        assert result['id'] == "abc2"
+        failed = False
+        try:
+            self.database.get_by_shortened_id(collection, "abc")
+        except MoreThanOneEntityFound:
+            failed = True
+        assert failed
+        failed = False
+        try:
+            self.database.get_by_shortened_id(collection, "abe")
+        except EntityNotFound:
+            failed = True
+        assert failed
+
+    def test_collection_not_found(self):
+        failed = False
+        try:
+            self.database.set("not_a_collection", {"foo": "bar"})
+        except EntityCollectionNotFound:
+            failed = True
+        assert failed
+
+    def test_persisted(self):
+        result = self.database.set(self.collection, {"foo": "persisted"})
+        database_2 = SQLiteDALDriver(self.temp_dir)
+        assert database_2.get(self.collection, result['id']) == result
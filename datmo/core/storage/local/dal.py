@@ -12,7 +12,6 @@ from datmo.core.entity.snapshot import Snapshot
 from datmo.core.entity.user import User
 from datmo.core.util.exceptions import InputError, EntityNotFound, MoreThanOneEntityFound, DALNotInitialized
 from datmo.core.util.misc_functions import create_unique_hash
-from datmo.core.storage.driver.blitzdb_dal_driver import BlitzDBDALDriver
 
 
 class LocalDAL():
@@ -23,7 +22,7 @@ class LocalDAL():
     Parameters
     ----------
     driver_type : str
-        type of driver to pull from
+        type of driver to pull from, one of "blitzdb" or "sqlite"
     driver_options : dict
         options for the DALdriver class
     driver : datmo.core.storage.driver.DALDriver, optional
@@ -48,6 +47,8 @@ class LocalDAL():
     -------
     init()
         initialize the dal
+    transaction()
+        context in which all writes to the dal are committed together
 
     """
 
@@ -55,6 +56,8 @@ class LocalDAL():
         self.driver_type = driver_type
         self.driver_options = driver_options
         self.driver = driver
+        # model of the project, cached by ModelMethods until a model is written
+        self._model_cache = {}
         self._is_initialized = self.is_initialized
 
     @property
@@ -63,8 +66,7 @@ class LocalDAL():
             self._is_initialized = True
             # set the driver so it is available
             if not self.driver:
-                if self.driver_type == "blitzdb":
-                    self.driver = BlitzDBDALDriver(**self.driver_options)
+                self.driver = self._create_driver()
             return self._is_initialized
         self._is_initialized = False
         return self._is_initialized
@@ -84,7 +86,7 @@ class LocalDAL():
         """
         if not self.is_initialized:
             raise DALNotInitialized()
-        return ModelMethods(self.driver)
+        return ModelMethods(self.driver, self._model_cache)
 
     @property
     def code(self):
@@ -191,10 +193,41 @@ class LocalDAL():
             raise DALNotInitialized()
         return UserMethods(self.driver)
 
+    def transaction(self):
+        """Group writes to any of the entities into one commit, e.g.
+
+        >>> with dal.transaction():
+        ...     code = dal.code.create(Code(code_dict))
+        ...     snapshot = dal.snapshot.create(Snapshot(snapshot_dict))
+
+        Writes are committed when the outermost transaction exits, and discarded
+        if an exception is raised
+
+        Returns
+        -------
+        context manager
+
+        Raises
+        ------
+        DALNotInitialized
+        """
+        if not self.is_initialized:
+            raise DALNotInitialized()
+        return self.driver.transaction()
+
     def init(self):
         if not self.driver:
-            if self.driver_type == "blitzdb":
-                self.driver = BlitzDBDALDriver(**self.driver_options)
+            self.driver = self._create_driver()
+
+    def _create_driver(self):
+        # Only the module of the driver used is imported, blitzdb being slow
+        if self.driver_type == "blitzdb":
+            from datmo.core.storage.driver.blitzdb_dal_driver import BlitzDBDALDriver
+            return BlitzDBDALDriver(**self.driver_options)
+        elif self.driver_type == "sqlite":
+            from datmo.core.storage.driver.sqlite_dal_driver import SQLiteDALDriver
+            return SQLiteDALDriver(**self.driver_options)
+        return None
 
 
 class EntityMethodsCRUD(object):
@@ -213,6 +246,37 @@ class EntityMethodsCRUD(object):
         return self.entity_class(obj)
 
     def create(self, datmo_entity):
+        dict_obj = self._get_create_dict(datmo_entity)
+        response = self.driver.set(self.collection, dict_obj)
+        entity_instance = self.entity_class(response)
+        return entity_instance
+
+    def create_many(self, datmo_entities):
+        dict_objs = [
+            self._get_create_dict(datmo_entity)
+            for datmo_entity in datmo_entities
+        ]
+        return [
+            self.entity_class(response)
+            for response in self.driver.set_many(self.collection, dict_objs)
+        ]
+
+    def update(self, datmo_entity):
+        dict_obj = self._get_update_dict(datmo_entity)
+        response = self.driver.set(self.collection, dict_obj)
+        entity_instance = self.entity_class(response)
+        return entity_instance
+
+    def update_many(self, datmo_entities):
+        with self.driver.transaction():
+            dict_objs = [
+                self._get_update_dict(datmo_entity)
+                for datmo_entity in datmo_entities
+            ]
+            responses = self.driver.set_many(self.collection, dict_objs)
+        return [self.entity_class(response) for response in responses]
+
+    def _get_create_dict(self, datmo_entity):
         # translate datmo_entity to a standard dictionary (document) to be stored
         if hasattr(datmo_entity, 'to_dictionary'):
             dict_obj = datmo_entity.to_dictionary()
@@ -224,11 +288,9 @@ class EntityMethodsCRUD(object):
         # dict_obj['id'] = create_unique_hash(base_hash=latest_entity['id'])
         dict_obj['id'] = dict_obj['id'] if 'id' in dict_obj.keys() and dict_obj['id'] else \
             create_unique_hash()
-        response = self.driver.set(self.collection, dict_obj)
-        entity_instance = self.entity_class(response)
-        return entity_instance
+        return dict_obj
 
-    def update(self, datmo_entity):
+    def _get_update_dict(self, datmo_entity):
         # translate datmo_entity to a standard dictionary (document) to be stored
         if hasattr(datmo_entity, 'to_dictionary'):
             dict_obj = datmo_entity.to_dictionary()
@@ -247,17 +309,21 @@ class EntityMethodsCRUD(object):
 
         # set updated_at always
         dict_obj['updated_at'] = datetime.utcnow()
-        response = self.driver.set(self.collection, dict_obj)
-        entity_instance = self.entity_class(response)
-        return entity_instance
+        return dict_obj
 
     def delete(self, entity_id):
         return self.driver.delete(self.collection, entity_id)
 
-    def query(self, query_params, sort_key=None, sort_order=None):
+    def query(self,
+              query_params,
+              sort_key=None,
+              sort_order=None,
+              limit=None,
+              offset=None):
         return [
-            self.entity_class(item) for item in self.driver.query(
-                self.collection, query_params, sort_key, sort_order)
+            self.entity_class(item)
+            for item in self.driver.query(self.collection, query_params,
+                                          sort_key, sort_order, limit, offset)
         ]
 
     def findOne(self, query_params):
@@ -280,8 +346,42 @@ class EntityMethodsCRUD(object):
 # Datmo Entity methods
 #
 class ModelMethods(EntityMethodsCRUD):
-    def __init__(self, driver):
+    def __init__(self, driver, cache=None):
         super(ModelMethods, self).__init__('model', Model, driver)
+        self._cache = cache if cache is not None else {}
+
+    def get_current(self):
+        """Return the model of the project, or None if there is none, cached until a
+        model is written through the dal
+
+        Returns
+        -------
+        datmo.core.entity.model.Model or None
+        """
+        if "model" not in self._cache:
+            models = self.query({})
+            self._cache["model"] = models[0] if models else None
+        return self._cache["model"]
+
+    def create(self, datmo_entity):
+        self._cache.clear()
+        return super(ModelMethods, self).create(datmo_entity)
+
+    def create_many(self, datmo_entities):
+        self._cache.clear()
+        return super(ModelMethods, self).create_many(datmo_entities)
+
+    def update(self, datmo_entity):
+        self._cache.clear()
+        return super(ModelMethods, self).update(datmo_entity)
+
+    def update_many(self, datmo_entities):
+        self._cache.clear()
+        return super(ModelMethods, self).update_many(datmo_entities)
+
+    def delete(self, entity_id):
+        self._cache.clear()
+        return super(ModelMethods, self).delete(entity_id)
 
 
 class CodeMethods(EntityMethodsCRUD):
@@ -310,6 +410,36 @@ class SnapshotMethods(EntityMethodsCRUD):
     def __init__(self, driver):
         super(SnapshotMethods, self).__init__('snapshot', Snapshot, driver)
 
+    def _get_create_dict(self, datmo_entity):
+        dict_obj = super(SnapshotMethods, self)._get_create_dict(datmo_entity)
+        dict_obj['fingerprint'] = Snapshot.get_fingerprint(dict_obj)
+        return dict_obj
+
+    def _get_update_dict(self, datmo_entity):
+        dict_obj = super(SnapshotMethods, self)._get_update_dict(datmo_entity)
+        dict_obj['fingerprint'] = Snapshot.get_fingerprint(dict_obj)
+        return dict_obj
+
+    def backfill_fingerprints(self):
+        """Store the fingerprint of snapshots which were created before fingerprints
+        were stored, keeping the rest of the snapshot as is
+
+        Returns
+        -------
+        int
+            number of snapshots updated
+        """
+        with self.driver.transaction():
+            dict_objs = []
+            for snapshot in self.query({}):
+                if snapshot.fingerprint is None:
+                    dict_obj = snapshot.to_dictionary()
+                    dict_obj['fingerprint'] = Snapshot.get_fingerprint(
+                        dict_obj)
+                    dict_objs.append(dict_obj)
+            self.driver.set_many(self.collection, dict_objs)
+        return len(dict_objs)
+
 
 class UserMethods(EntityMethodsCRUD):
     def __init__(self, driver):
@@ -132,6 +132,29 @@ class TestLocalDAL():
             deleted = True
         assert deleted
 
+    def test_get_current_model(self):
+        assert self.dal.model.get_current() is None
+        model = self.dal.model.create(Model(self.model_input_dict))
+        assert self.dal.model.get_current().id == model.id
+        # The model is cached until it is written through the dal
+        queries = []
+        driver_query = self.dal.driver.query
+
+        def query(*args):
+            queries.append(args)
+            return driver_query(*args)
+
+        self.dal.driver.query = query
+        assert self.dal.model.get_current().id == model.id
+        assert queries == []
+        updated_model = self.dal.model.update({
+            "id": model.id,
+            "name": "model_4a"
+        })
+        assert self.dal.model.get_current().name == updated_model.name
+        self.dal.model.delete(model.id)
+        assert self.dal.model.get_current() is None
+
     def test_query_models_basic(self):
         model = self.dal.model.create(Model(self.model_input_dict))
         assert len(self.dal.model.query({"id": model.id})) == 1
@@ -10,6 +10,7 @@ import tempfile
 import platform
 
 from datmo.core.storage.driver.blitzdb_dal_driver import BlitzDBDALDriver
+from datmo.core.storage.driver.sqlite_dal_driver import SQLiteDALDriver
 from datmo.core.storage.local.dal import LocalDAL
 from datmo.core.entity.model import Model
 from datmo.core.entity.snapshot import Snapshot
@@ -17,6 +18,8 @@ from datmo.core.util.exceptions import EntityNotFound, InvalidArgumentType
 
 
 class TestLocalDAL():
+    use_sqlite = False
+
     def setup_method(self):
         # provide mountable tmp directory for docker
         tempfile.tempdir = "/tmp" if not platform.system(
@@ -29,6 +32,9 @@ class TestLocalDAL():
             "driver_type": "file",
             "connection_string": self.temp_dir
         }
+        if self.use_sqlite:
+            self.driver_type = "sqlite"
+            self.driver_options = {"connection_string": self.temp_dir}
         self.dal = LocalDAL(self.driver_type, self.driver_options)
         model_name = "model_1"
         model = self.dal.model.create(Model({"name": model_name}))
@@ -93,7 +99,10 @@ class TestLocalDAL():
         snapshot = self.dal.snapshot.create(Snapshot(self.snapshot_input_dict))
 
         # create new dal with new driver instance (fails)
-        new_driver_instance = BlitzDBDALDriver("file", self.temp_dir)
+        if self.use_sqlite:
+            new_driver_instance = SQLiteDALDriver(self.temp_dir)
+        else:
+            new_driver_instance = BlitzDBDALDriver("file", self.temp_dir)
         new_dal_instance = LocalDAL(
             self.driver_type, self.driver_options, driver=new_driver_instance)
         new_snapshot_1 = new_dal_instance.snapshot.get_by_id(snapshot.id)
@@ -224,3 +233,119 @@ class TestLocalDAL():
         })
         assert len(snapshots) == 3
         assert len(result) == 1
+
+    def test_query_snapshots_page(self):
+        _ = self.dal.snapshot.create(Snapshot(self.snapshot_input_dict))
+        _ = self.dal.snapshot.create(Snapshot(self.snapshot_input_dict))
+        _ = self.dal.snapshot.create(Snapshot(self.snapshot_input_dict))
+        snapshots = self.dal.snapshot.query(
+            {}, sort_key="created_at", sort_order="descending")
+        result = self.dal.snapshot.query(
+            {}, sort_key="created_at", sort_order="descending", limit=2)
+        assert [item.id for item in result] == \
+               [item.id for item in snapshots[:2]]
+        result = self.dal.snapshot.query(
+            {
+                "config.test": {
+                    "$gte": 0.4
+                }
+            },
+            sort_key="created_at",
+            sort_order="descending",
+            limit=2,
+            offset=2)
+        assert [item.id for item in result] == [snapshots[2].id]
+
+    def test_create_many_snapshots(self):
+        snapshots = self.dal.snapshot.create_many([
+            Snapshot(self.snapshot_input_dict),
+            Snapshot(self.snapshot_input_dict)
+        ])
+        assert len(snapshots) == 2
+        assert snapshots[0].id != snapshots[1].id
+        for snapshot in snapshots:
+            assert snapshot.created_at
+            assert self.dal.snapshot.get_by_id(snapshot.id) == snapshot
+
+    def test_update_many_snapshots(self):
+        snapshots = self.dal.snapshot.create_many([
+            Snapshot(self.snapshot_input_dict),
+            Snapshot(self.snapshot_input_dict)
+        ])
+        updated_snapshots = self.dal.snapshot.update_many([{
+            "id": snapshots[0].id,
+            "message": "first"
+        }, {
+            "id": snapshots[1].id,
+            "message": "second"
+        }])
+        assert [snapshot.message for snapshot in updated_snapshots] == \
+               ["first", "second"]
+        assert updated_snapshots[0].code_id == snapshots[0].code_id
+        assert self.dal.snapshot.get_by_id(snapshots[1].id).message == "second"
+
+    def test_transaction_snapshot(self):
+        with self.dal.transaction():
+            model = self.dal.model.create(Model({"name": "model_2"}))
+            snapshot_input_dict = self.snapshot_input_dict.copy()
+            snapshot_input_dict["model_id"] = model.id
+            snapshot = self.dal.snapshot.create(Snapshot(snapshot_input_dict))
+            snapshot = self.dal.snapshot.update({
+                "id": snapshot.id,
+                "message": "updated"
+            })
+        new_dal_instance = LocalDAL(self.driver_type, self.driver_options)
+        assert new_dal_instance.model.get_by_id(model.id) == model
+        new_snapshot = new_dal_instance.snapshot.get_by_id(snapshot.id)
+        assert new_snapshot.message == "updated"
+        assert new_snapshot.model_id == model.id
+
+    def test_transaction_rollback_snapshot(self):
+        failed = False
+        try:
+            with self.dal.transaction():
+                snapshot = self.dal.snapshot.create(
+                    Snapshot(self.snapshot_input_dict))
+                raise ValueError()
+        except ValueError:
+            failed = True
+        assert failed
+        assert self.dal.snapshot.query({"id": snapshot.id}) == []
+
+    def test_snapshot_fingerprint(self):
+        snapshot = self.dal.snapshot.create(Snapshot(self.snapshot_input_dict))
+        assert snapshot.fingerprint == Snapshot.get_fingerprint(
+            self.snapshot_input_dict)
+        result = self.dal.snapshot.query({"fingerprint": snapshot.fingerprint})
+        assert [item.id for item in result] == [snapshot.id]
+        # The fingerprint follows updates to the components
+        updated_snapshot = self.dal.snapshot.update({
+            "id": snapshot.id,
+            "stats": {
+                "test": 0.99
+            }
+        })
+        assert updated_snapshot.fingerprint != snapshot.fingerprint
+        assert self.dal.snapshot.query({
+            "fingerprint": snapshot.fingerprint
+        }) == []
+
+    def test_backfill_fingerprints(self):
+        # Snapshot stored before fingerprints were added
+        dict_obj = Snapshot(self.snapshot_input_dict).to_dictionary()
+        dict_obj['id'] = "legacy_snapshot"
+        del dict_obj['fingerprint']
+        self.dal.driver.set("snapshot", dict_obj)
+        snapshot = self.dal.snapshot.get_by_id("legacy_snapshot")
+        assert snapshot.fingerprint is None
+
+        assert self.dal.snapshot.backfill_fingerprints() == 1
+        backfilled_snapshot = self.dal.snapshot.get_by_id("legacy_snapshot")
+        assert backfilled_snapshot.fingerprint == Snapshot.get_fingerprint(
+            self.snapshot_input_dict)
+        assert backfilled_snapshot.updated_at == snapshot.updated_at
+        assert self.dal.snapshot.backfill_fingerprints() == 0
+
+
+class TestLocalDALSQLite(TestLocalDAL):
+    use_sqlite = True
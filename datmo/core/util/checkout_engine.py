@@ -0,0 +1,157 @@
+import os
+import shutil
+
+
+class CheckoutEngine(object):
+    """CheckoutEngine brings a working directory to the state given by a manifest of
+    files, by diffing the manifest against the files in the directory and only
+    deleting, adding or replacing the files which differ. Files are compared by
+    their content hashes, taken from a file index so unchanged files (by size and
+    mtime) are not read again.
+
+    Parameters
+    ----------
+    dst_dirpath : str
+        absolute path of the working directory to checkout to
+    file_index : datmo.core.util.file_index.FileIndex
+        file index rooted at the working directory
+
+    Attributes
+    ----------
+    dst_dirpath : str
+    file_index : datmo.core.util.file_index.FileIndex
+
+    Methods
+    -------
+    diff(manifest, rel_filepaths=None)
+        return the files which have to be added, replaced and deleted
+    checkout(manifest, write_file, rel_filepaths=None, rel_dirpaths=None)
+        apply the diff to the working directory, returning the checkout stats
+    """
+
+    def __init__(self, dst_dirpath, file_index):
+        self.dst_dirpath = dst_dirpath
+        self.file_index = file_index
+
+    def _list_filepaths(self):
+        if not os.path.isdir(self.dst_dirpath):
+            return []
+        return [
+            os.path.relpath(os.path.join(dirpath, filename), self.dst_dirpath)
+            for dirpath, _, filenames in os.walk(self.dst_dirpath)
+            for filename in filenames
+        ]
+
+    def diff(self, manifest, rel_filepaths=None):
+        """Compare the manifest with the files in the working directory
+
+        Parameters
+        ----------
+        manifest : dict
+            relative filepath -> content hash of each file to checkout
+        rel_filepaths : list, optional
+            relative filepaths of the files currently managed in the working
+            directory (default is all files within it)
+
+        Returns
+        -------
+        dict
+            "add", "replace" and "delete" lists of relative filepaths
+        """
+        if rel_filepaths is None:
+            rel_filepaths = self._list_filepaths()
+        rel_filepaths = [
+            rel_filepath for rel_filepath in rel_filepaths
+            if os.path.isfile(os.path.join(self.dst_dirpath, rel_filepath))
+        ]
+        current_filehashes = self.file_index.get_filehashes(rel_filepaths)
+        self.file_index.prune(rel_filepaths)
+        return {
+            "add":
+                sorted(rel_filepath for rel_filepath in manifest
+                       if rel_filepath not in current_filehashes),
+            "replace":
+                sorted(rel_filepath
+                       for rel_filepath, filehash in manifest.items()
+                       if rel_filepath in current_filehashes
+                       and current_filehashes[rel_filepath] != filehash),
+            "delete":
+                sorted(rel_filepath for rel_filepath in current_filehashes
+                       if rel_filepath not in manifest)
+        }
+
+    def checkout(self,
+                 manifest,
+                 write_file,
+                 rel_filepaths=None,
+                 rel_dirpaths=None):
+        """Checkout the manifest to the working directory
+
+        Parameters
+        ----------
+        manifest : dict
+            relative filepath -> content hash of each file to checkout
+        write_file : function
+            function which takes a relative filepath, its content hash and the
+            absolute filepath to create, writes the file and returns the number of
+            bytes written
+        rel_filepaths : list, optional
+            relative filepaths of the files currently managed in the working
+            directory (default is all files within it)
+        rel_dirpaths : list, optional
+            relative dirpaths of the directories to checkout. If given, directories
+            left empty which are not within the manifest are removed (default is
+            None, which leaves all directories in place)
+
+        Returns
+        -------
+        dict
+            "added", "replaced" and "deleted" number of files, "bytes_written" and
+            "bytes_deleted"
+        """
+        changes = self.diff(manifest, rel_filepaths)
+        stats = {
+            "added": len(changes["add"]),
+            "replaced": len(changes["replace"]),
+            "deleted": len(changes["delete"]),
+            "bytes_written": 0,
+            "bytes_deleted": 0
+        }
+        for rel_filepath in changes["delete"] + changes["replace"]:
+            absolute_filepath = os.path.join(self.dst_dirpath, rel_filepath)
+            stats["bytes_deleted"] += os.path.getsize(absolute_filepath)
+            os.remove(absolute_filepath)
+        if rel_dirpaths is not None:
+            self._remove_empty_dirpaths(manifest, rel_dirpaths)
+        for rel_dirpath in rel_dirpaths or []:
+            absolute_dirpath = os.path.join(self.dst_dirpath, rel_dirpath)
+            if not os.path.isdir(absolute_dirpath):
+                os.makedirs(absolute_dirpath)
+        for rel_filepath in changes["add"] + changes["replace"]:
+            absolute_filepath = os.path.join(self.dst_dirpath, rel_filepath)
+            absolute_dirpath = os.path.dirname(absolute_filepath)
+            if os.path.isdir(absolute_filepath):
+                # A directory in the working directory is replaced by a file
+                shutil.rmtree(absolute_filepath)
+            elif not os.path.isdir(absolute_dirpath):
+                os.makedirs(absolute_dirpath)
+            stats["bytes_written"] += write_file(
+                rel_filepath, manifest[rel_filepath], absolute_filepath)
+        self.file_index.save()
+        return stats
+
+    def _remove_empty_dirpaths(self, manifest, rel_dirpaths):
+        """Remove the directories which are empty and not needed by the manifest"""
+        keep_rel_dirpaths = set(
+            os.path.normpath(rel_dirpath) for rel_dirpath in rel_dirpaths)
+        for rel_filepath in manifest:
+            rel_dirpath = os.path.dirname(rel_filepath)
+            while rel_dirpath:
+                keep_rel_dirpaths.add(rel_dirpath)
+                rel_dirpath = os.path.dirname(rel_dirpath)
+        for dirpath, _, _ in os.walk(self.dst_dirpath, topdown=False):
+            rel_dirpath = os.path.relpath(dirpath, self.dst_dirpath)
+            if rel_dirpath == "." or rel_dirpath in keep_rel_dirpaths:
+                continue
+            if not os.listdir(dirpath):
+                os.rmdir(dirpath)
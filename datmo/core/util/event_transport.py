@@ -0,0 +1,358 @@
+import os
+import glob
+import json
+import time
+import uuid
+import atexit
+import threading
+from io import open
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+try:
+    import fcntl
+except ImportError:
+    # Windows has no advisory locks, the spill file is then not locked
+    fcntl = None
+
+from datmo.core.util.logger import DatmoLogger
+
+# Put in the queue to stop the worker
+_STOP = object()
+
+
+class EventTransport(object):
+    """EventTransport sends events from a background thread, so the caller never
+    waits on the network. Events are put in a bounded queue, from which the worker
+    takes them in batches, once batch_size events are queued or flush_interval
+    seconds after the first event of the batch, and sends them one after the other.
+
+    An event failing to send is retried with exponential backoff. If it still fails,
+    the endpoint is deemed unreachable for retry_interval seconds, during which
+    events are appended to a spill file on disk instead of sent. Spilled events are
+    sent again, before new ones, once the endpoint is reachable, including by later
+    processes. To send them, the spill file is first moved aside to a replay file,
+    so events spilled meanwhile go to a new spill file and putting events never
+    waits on the network. Events are sent at least once: an event may be sent twice
+    if the process stops while sending spilled events, the replay file left then
+    being sent by a later process.
+
+    Parameters
+    ----------
+    send : function
+        sends an event (dict), returning a dict with its "status_code"
+    spill_dirpath : str
+        directory of the spill file, created on the first spill
+    batch_size : int, optional
+        maximum number of events sent per batch (default is 100)
+    flush_interval : float, optional
+        maximum time in seconds an event waits for its batch (default is 1)
+    max_queue_size : int, optional
+        maximum number of events in memory, beyond which events are spilled (default
+        is 10000)
+    max_retries : int, optional
+        number of retries of an event failing to send (default is 3)
+    backoff_factor : float, optional
+        wait before the first retry, doubled for every retry (default is 0.5)
+    retry_interval : float, optional
+        time in seconds events are spilled after the endpoint was unreachable
+        (default is 30)
+    max_spill_size : int, optional
+        maximum size in bytes of the spill file, beyond which events are dropped
+        (default is 100 MB)
+    shutdown_timeout : float, optional
+        time in seconds the events queued are sent for at exit, before the rest is
+        spilled (default is 5)
+
+    Methods
+    -------
+    put(event)
+        queue an event to be sent, without blocking
+    flush(timeout=None)
+        wait until the events queued are sent or spilled
+    close(timeout=None)
+        send or spill the events queued and stop the worker
+    """
+
+    spill_filename = "events.jsonl"
+
+    def __init__(self,
+                 send,
+                 spill_dirpath,
+                 batch_size=100,
+                 flush_interval=1,
+                 max_queue_size=10000,
+                 max_retries=3,
+                 backoff_factor=0.5,
+                 retry_interval=30,
+                 max_spill_size=100 * 1024 * 1024,
+                 shutdown_timeout=5):
+        self.send = send
+        self.spill_dirpath = spill_dirpath
+        self.spill_filepath = os.path.join(spill_dirpath, self.spill_filename)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.retry_interval = retry_interval
+        self.max_spill_size = max_spill_size
+        self.logger = DatmoLogger.get_logger(__name__)
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._spill_lock = threading.Lock()
+        self._unreachable_until = 0
+        self._stopping = threading.Event()
+        self._closed = False
+        # Events spilled by earlier processes are sent once the worker starts
+        self._spilled = os.path.isfile(self.spill_filepath) or bool(
+            self._get_replay_filepaths())
+        self._worker = threading.Thread(target=self._run)
+        self._worker.daemon = True
+        self._worker.start()
+        atexit.register(self.close, shutdown_timeout)
+
+    def put(self, event):
+        """Queue an event to be sent, spilling it if the queue is full"""
+        if self._closed:
+            self._spill([event])
+            return
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self._spill([event])
+
+    def flush(self, timeout=None):
+        """Wait until the events queued are sent or spilled
+
+        Returns
+        -------
+        bool
+            True if the events were sent or spilled within the timeout
+        """
+        if self._closed:
+            return True
+        flushed = threading.Event()
+        try:
+            self._queue.put(flushed, timeout=timeout)
+        except queue.Full:
+            return False
+        return flushed.wait(timeout) or flushed.is_set()
+
+    def close(self, timeout=None):
+        """Send or spill the events queued and stop the worker. Events still being
+        retried after the timeout are spilled"""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._worker.join(timeout)
+        if self._worker.is_alive():
+            # Spill the events left instead of sending them
+            self._stopping.set()
+            self._worker.join(self.flush_interval + 1)
+
+    def _run(self):
+        while True:
+            batch, flushed_events, stop = [], [], False
+            try:
+                batch, flushed_events, stop = self._get_batch()
+                if batch:
+                    self._send_batch(batch)
+            except Exception as e:
+                # The worker keeps running, e.g. once the disk has room again
+                self.logger.error("events failed to send: %s" % e)
+                self.__spill_failed(batch)
+            for flushed in flushed_events:
+                flushed.set()
+            if stop:
+                return
+
+    def __spill_failed(self, batch):
+        if not batch:
+            return
+        try:
+            self._spill(batch)
+        except Exception as e:
+            self.logger.error("%d events dropped, failed to spill: %s" %
+                              (len(batch), e))
+
+    def _get_batch(self):
+        batch, flushed_events = [], []
+        deadline = None
+        while len(batch) < self.batch_size:
+            try:
+                if deadline is None:
+                    item = self._queue.get()
+                else:
+                    item = self._queue.get(
+                        timeout=max(deadline - time.time(), 0.001))
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, flushed_events, True
+            if isinstance(item, threading.Event):
+                flushed_events.append(item)
+                break
+            batch.append(item)
+            if deadline is None:
+                deadline = time.time() + self.flush_interval
+        return batch, flushed_events, False
+
+    def _send_batch(self, batch):
+        if self._stopping.is_set() or time.time() < self._unreachable_until:
+            self._spill(batch)
+            return
+        # Spilled events are sent before new ones
+        if self._spilled and not self._replay():
+            self._spill(batch)
+            return
+        for index, event in enumerate(batch):
+            if not self._send_event(event):
+                self._spill(batch[index:])
+                return
+
+    def _send_event(self, event):
+        """Send an event, with retries, returning False if it could not be sent"""
+        for attempt in range(self.max_retries + 1):
+            # The wait ends early once stopping, the event is then spilled
+            if attempt and self._stopping.wait(self.backoff_factor * 2**
+                                               (attempt - 1)):
+                return False
+            try:
+                status_code = self.send(dict(event)).get("status_code", 500)
+            except Exception as e:
+                self.logger.warning("event %s failed to send: %s" %
+                                    (event.get("id"), e))
+                status_code = 500
+            if status_code < 300:
+                return True
+            if status_code < 500 and status_code != 429:
+                # The event is rejected, sending it again would not change that
+                self.logger.warning("event %s rejected with status %s" %
+                                    (event.get("id"), status_code))
+                return True
+        self._unreachable_until = time.time() + self.retry_interval
+        return False
+
+    def _open_locked(self, filepath, mode):
+        """Open the file and lock it, or return None if it does not exist. The file
+        is opened again if it was moved while waiting for the lock, as it is no
+        longer the one at the filepath"""
+        while True:
+            try:
+                f = open(filepath, mode)
+            except (IOError, OSError):
+                return None
+            if fcntl is None:
+                return f
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                if os.stat(filepath).st_ino == os.fstat(f.fileno()).st_ino:
+                    return f
+            except OSError:
+                pass
+            f.close()
+
+    def _spill(self, events):
+        with self._spill_lock:
+            if not os.path.isdir(self.spill_dirpath):
+                os.makedirs(self.spill_dirpath)
+            f = self._open_locked(self.spill_filepath, "ab")
+            with f:
+                if os.fstat(f.fileno()).st_size >= self.max_spill_size:
+                    self.logger.warning(
+                        "%d events dropped, spill file %s is full" %
+                        (len(events), self.spill_filepath))
+                    return
+                for event in events:
+                    f.write((json.dumps(event) + "\n").encode("utf-8"))
+            self._spilled = True
+
+    def _get_replay_filepaths(self):
+        # Only found with locks, to tell those left by a process which stopped
+        # from those being sent
+        if fcntl is None:
+            return []
+        return glob.glob(self.spill_filepath + ".*.replay")
+
+    def _claim(self):
+        """Move the spill file to a new replay file, returning its filepath and the
+        file open and locked, or None if nothing is spilled"""
+        with self._spill_lock:
+            self._spilled = False
+            f = self._open_locked(self.spill_filepath, "r+b")
+            if f is None:
+                return None
+            # The lock moves with the file, processes waiting to spill to it open
+            # the new spill file once they get the lock
+            replay_filepath = "%s.%s.replay" % (self.spill_filepath,
+                                                uuid.uuid4().hex)
+            if fcntl is None:
+                # Windows does not move open files, nor are they locked there
+                f.close()
+            try:
+                os.rename(self.spill_filepath, replay_filepath)
+            except OSError:
+                self._spilled = True
+                f.close()
+                raise
+            if fcntl is None:
+                f = open(replay_filepath, "r+b")
+            return replay_filepath, f
+
+    def _replay(self):
+        """Send the spilled events, spilling again those which could not be sent.
+        Returns whether all of them were sent"""
+        replay_files = []
+        for filepath in self._get_replay_filepaths():
+            # Replay files left by processes which stopped while sending them
+            try:
+                f = open(filepath, "r+b")
+            except (IOError, OSError):
+                continue
+            try:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except (IOError, OSError):
+                # Being sent by another process
+                f.close()
+                continue
+            replay_files.append((filepath, f))
+        claimed = self._claim()
+        if claimed is not None:
+            replay_files.append(claimed)
+        sent = True
+        for filepath, f in replay_files:
+            with f:
+                if sent:
+                    sent = self._send_replay_file(f)
+                else:
+                    self._spill(self._read_events(f))
+                # Emptied before being removed, in case another process opened it
+                f.truncate(0)
+                try:
+                    os.remove(filepath)
+                except OSError:
+                    pass
+        return sent
+
+    def _read_events(self, f):
+        f.seek(0)
+        events = []
+        for line in f.read().splitlines():
+            try:
+                events.append(json.loads(line.decode("utf-8")))
+            except ValueError:
+                # A line cut short by a crash
+                continue
+        return events
+
+    def _send_replay_file(self, f):
+        events = self._read_events(f)
+        for index, event in enumerate(events):
+            if not self._send_event(event):
+                self._spill(events[index:])
+                return False
+        return True
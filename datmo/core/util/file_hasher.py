@@ -0,0 +1,111 @@
+import os
+import mmap
+import hashlib
+import multiprocessing
+from io import open
+from multiprocessing.pool import ThreadPool
+
+from datmo.core.util.i18n import get as __
+from datmo.core.util.exceptions import PathDoesNotExist
+
+
+class FileHasher(object):
+    """FileHasher computes md5 content hashes of files and directories, reading files
+    on a pool of threads (hashlib releases the GIL while hashing). Directory hashes
+    are equal to checksumdir.dirhash and do not depend on the number of workers.
+
+    Parameters
+    ----------
+    workers : int, optional
+        number of threads used to read and hash files (default is the number of cpus)
+
+    Attributes
+    ----------
+    workers : int
+
+    Methods
+    -------
+    get_filehash(absolute_filepath)
+        return the hash of a file
+    get_filehashes(absolute_filepaths)
+        return the hashes of the files, in the same order
+    get_dirhash(absolute_dirpath)
+        return the hash of all files within a directory
+    reduce_filehashes(filehashes)
+        combine file hashes into a single hash, regardless of their order
+    """
+
+    BUFF_SIZE = 1024 * 1024
+    # Files at least this large are hashed from a memory map of the file
+    MMAP_THRESHOLD = 64 * 1024 * 1024
+
+    def __init__(self, workers=None):
+        if not workers:
+            try:
+                workers = multiprocessing.cpu_count()
+            except NotImplementedError:
+                workers = 1
+        self.workers = workers
+
+    def get_filehash(self, absolute_filepath):
+        if not os.path.isfile(absolute_filepath):
+            raise PathDoesNotExist(
+                __("error", "util.misc_functions.get_filehash",
+                   absolute_filepath))
+        return self._hash_file(absolute_filepath)
+
+    def get_filehashes(self, absolute_filepaths):
+        for absolute_filepath in absolute_filepaths:
+            if not os.path.isfile(absolute_filepath):
+                raise PathDoesNotExist(
+                    __("error", "util.misc_functions.get_filehash",
+                       absolute_filepath))
+        return self._map(self._hash_file, absolute_filepaths)
+
+    def get_dirhash(self, absolute_dirpath):
+        absolute_filepaths = []
+        for root, _, files in os.walk(absolute_dirpath):
+            absolute_filepaths.extend(
+                [os.path.join(root, filename) for filename in files])
+        # Like checksumdir, a broken symlink hashes as an empty file
+        return self.reduce_filehashes(
+            self._map(self._hash_file, absolute_filepaths))
+
+    @staticmethod
+    def reduce_filehashes(filehashes):
+        """Combine the file hashes the same way as checksumdir.dirhash, which only
+        takes the contents into account and not the filepaths"""
+        md5 = hashlib.md5()
+        for filehash in sorted(filehashes):
+            md5.update(filehash.encode("utf-8"))
+        return md5.hexdigest()
+
+    def _map(self, func, items):
+        items = list(items)
+        if self.workers < 2 or len(items) < 2:
+            return [func(item) for item in items]
+        pool = ThreadPool(min(self.workers, len(items)))
+        try:
+            return pool.map(func, items)
+        finally:
+            pool.close()
+            pool.join()
+
+    def _hash_file(self, absolute_filepath):
+        md5 = hashlib.md5()
+        if not os.path.exists(absolute_filepath):
+            return md5.hexdigest()
+        with open(absolute_filepath, "rb") as f:
+            if os.fstat(f.fileno()).st_size >= self.MMAP_THRESHOLD:
+                mapped_file = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    md5.update(mapped_file)
+                finally:
+                    mapped_file.close()
+            else:
+                while True:
+                    data = f.read(self.BUFF_SIZE)
+                    if not data:
+                        break
+                    md5.update(data)
+        return md5.hexdigest()
@@ -0,0 +1,170 @@
+import os
+import json
+import time
+import tempfile
+from io import open
+
+
+class FileIndex(object):
+    """FileIndex is a persistent stat cache which maps files within a root directory
+    to their content hashes. A file is only read and hashed again if its stat
+    signature (size, mtime, ctime, inode) has changed since it was last indexed.
+
+    Parameters
+    ----------
+    root : str
+        absolute path of the directory the relative filepaths are based on
+    filepath : str
+        absolute path of the file used to persist the index
+    get_filehashes : function
+        function which takes a list of absolute filepaths and returns the list of
+        their content hashes, in the same order
+
+    Attributes
+    ----------
+    root : str
+    filepath : str
+    entries : dict
+        relative filepath -> [size, mtime_ns, ctime_ns, inode, indexed_at_ns, filehash]
+
+    Methods
+    -------
+    get_filehashes(rel_filepaths)
+        return the content hash for each relative filepath, hashing only changed files
+    prune(rel_filepaths)
+        remove all entries which are not in the given relative filepaths
+    save(prune_missing=False)
+        persist the index to file if it has changed
+    """
+
+    version = 1
+    # Files modified within this window before a hashing pass are "racily clean":
+    # a later write within the same timestamp granularity could leave the stat
+    # signature unchanged, so those files are always hashed again
+    racy_window_ns = 2 * 10**9
+
+    def __init__(self, root, filepath, get_filehashes):
+        self.root = root
+        self.filepath = filepath
+        self._get_filehashes = get_filehashes
+        self._entries = None
+        self._is_dirty = False
+
+    @property
+    def entries(self):
+        if self._entries is None:
+            self._entries = self._load()
+        return self._entries
+
+    def _load(self):
+        if not os.path.isfile(self.filepath):
+            return {}
+        try:
+            with open(self.filepath, "r") as f:
+                index_dict = json.load(f)
+        except (IOError, OSError, ValueError):
+            # The index is only a cache, if it cannot be read it is rebuilt
+            return {}
+        if not isinstance(index_dict, dict) or \
+                index_dict.get("version") != self.version:
+            return {}
+        return index_dict.get("entries", {})
+
+    @staticmethod
+    def _get_stat_signature(absolute_filepath):
+        stat_result = os.stat(absolute_filepath)
+        mtime_ns = getattr(stat_result, "st_mtime_ns",
+                           int(stat_result.st_mtime * 10**9))
+        ctime_ns = getattr(stat_result, "st_ctime_ns",
+                           int(stat_result.st_ctime * 10**9))
+        return [stat_result.st_size, mtime_ns, ctime_ns, stat_result.st_ino]
+
+    def get_filehashes(self, rel_filepaths):
+        """Return the content hash for each of the relative filepaths given
+
+        Parameters
+        ----------
+        rel_filepaths : list
+            list of filepaths relative to the root
+
+        Returns
+        -------
+        dict
+            relative filepath -> content hash
+        """
+        indexed_at_ns = int(time.time() * 10**9)
+        filehashes = {}
+        changed_rel_filepaths, changed_signatures = [], []
+        for rel_filepath in rel_filepaths:
+            absolute_filepath = os.path.join(self.root, rel_filepath)
+            signature = self._get_stat_signature(absolute_filepath)
+            entry = self.entries.get(rel_filepath)
+            if entry and entry[:4] == signature and \
+                    max(signature[1], signature[2]) + self.racy_window_ns < entry[4]:
+                filehashes[rel_filepath] = entry[5]
+                continue
+            changed_rel_filepaths.append(rel_filepath)
+            changed_signatures.append(signature)
+        # Hash all changed files together so they can be read in parallel
+        changed_filehashes = self._get_filehashes([
+            os.path.join(self.root, rel_filepath)
+            for rel_filepath in changed_rel_filepaths
+        ])
+        for rel_filepath, signature, filehash in zip(
+                changed_rel_filepaths, changed_signatures, changed_filehashes):
+            self.entries[rel_filepath] = signature + [indexed_at_ns, filehash]
+            self._is_dirty = True
+            filehashes[rel_filepath] = filehash
+        return filehashes
+
+    def prune(self, rel_filepaths):
+        """Remove entries for files which are no longer present
+
+        Parameters
+        ----------
+        rel_filepaths : list
+            list of filepaths relative to the root to keep
+        """
+        rel_filepaths = set(rel_filepaths)
+        for rel_filepath in list(self.entries):
+            if rel_filepath not in rel_filepaths:
+                del self.entries[rel_filepath]
+                self._is_dirty = True
+
+    def save(self, prune_missing=False):
+        """Write the index to file, through a temporary file so readers never
+        see a partially written index
+
+        Parameters
+        ----------
+        prune_missing : bool, optional
+            if True, entries for files which no longer exist are removed before
+            the index is written, for indexes of files which are not all listed
+            at once to be pruned (default is False)
+
+        Returns
+        -------
+        bool
+            True if the index was written, False if there was nothing to write
+        """
+        if not self._is_dirty:
+            return False
+        if prune_missing:
+            for rel_filepath in list(self.entries):
+                if not os.path.isfile(os.path.join(self.root, rel_filepath)):
+                    del self.entries[rel_filepath]
+        directory = os.path.dirname(self.filepath)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        file_descriptor, temp_filepath = tempfile.mkstemp(dir=directory)
+        with os.fdopen(file_descriptor, "w") as f:
+            json.dump({"version": self.version, "entries": self.entries}, f)
+        try:
+            os.replace(temp_filepath, self.filepath)
+        except AttributeError:
+            # python 2 does not have os.replace
+            if os.path.exists(self.filepath):
+                os.remove(self.filepath)
+            os.rename(temp_filepath, self.filepath)
+        self._is_dirty = False
+        return True
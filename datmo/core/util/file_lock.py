@@ -0,0 +1,145 @@
+import os
+from io import open
+try:
+    import fcntl
+    msvcrt = None
+except ImportError:
+    # Windows locks a range of bytes of the file instead
+    fcntl = None
+    import msvcrt
+
+
+class FileLock(object):
+    """FileLock is an exclusive lock on a file, held by a process until it releases
+    it or exits. As the system releases the lock of a process which exits, whether
+    the lock is held tells whether its holder is alive, even once its pid has been
+    reused, e.g. for the pid file of a daemon.
+
+    Locks are held by an open file, so two locks on the same file exclude each
+    other even within a process. The file is only removed while locked, so a file
+    locked by another process is never removed under it.
+
+    Parameters
+    ----------
+    filepath : str
+        absolute filepath of the lock file, created if it does not exist
+
+    Attributes
+    ----------
+    filepath : str
+    locked : bool
+        whether this lock holds the file
+
+    Methods
+    -------
+    acquire(blocking=False)
+        lock the file, returning False if it is locked by another holder
+    release(remove=False)
+        unlock the file, removing it first if remove is True
+    is_locked()
+        return whether the file is locked by another holder
+    write(content)
+        replace the content of the locked file, e.g. with the pid of its holder
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self._file = None
+
+    @property
+    def locked(self):
+        return self._file is not None
+
+    def acquire(self, blocking=False):
+        """Lock the file
+
+        Parameters
+        ----------
+        blocking : bool, optional
+            if True, wait until the file is unlocked (default is False)
+
+        Returns
+        -------
+        bool
+            True if the file was locked, False if it is locked by another holder
+        """
+        if self._file is not None:
+            return True
+        while True:
+            # Appending creates the file without truncating the content of a holder
+            f = open(self.filepath, "a+b")
+            try:
+                self.__lock(f, blocking)
+            except (IOError, OSError):
+                f.close()
+                return False
+            # The file may have been removed by its holder while waiting for the
+            # lock, in which case the lock is on the file removed
+            try:
+                if os.fstat(f.fileno()).st_ino == os.stat(
+                        self.filepath).st_ino:
+                    break
+            except OSError:
+                pass
+            f.close()
+        self._file = f
+        return True
+
+    @staticmethod
+    def __lock(f, blocking):
+        if fcntl is not None:
+            flags = fcntl.LOCK_EX if blocking else \
+                fcntl.LOCK_EX | fcntl.LOCK_NB
+            fcntl.flock(f.fileno(), flags)
+            return
+        f.seek(0)
+        if not blocking:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            return
+        while True:
+            try:
+                # Retries for 10 seconds before failing
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except (IOError, OSError):
+                continue
+
+    def release(self, remove=False):
+        """Unlock the file
+
+        Parameters
+        ----------
+        remove : bool, optional
+            if True, remove the file while it is still locked (default is False)
+        """
+        if self._file is None:
+            return
+        f, self._file = self._file, None
+        if remove and msvcrt is None:
+            os.remove(self.filepath)
+        f.close()
+        if remove and msvcrt is not None:
+            # Windows does not remove open files, the file is only removed if no
+            # other process has opened it since it was unlocked
+            try:
+                os.remove(self.filepath)
+            except OSError:
+                pass
+
+    def is_locked(self):
+        """Return whether the file is locked by another holder, without waiting"""
+        if self._file is not None:
+            return False
+        if not os.path.isfile(self.filepath):
+            return False
+        if not self.acquire():
+            return True
+        self.release()
+        return False
+
+    def write(self, content):
+        """Replace the content of the file, which has to be locked"""
+        self._file.seek(0)
+        self._file.truncate()
+        self._file.write(content.encode("utf-8"))
+        self._file.flush()
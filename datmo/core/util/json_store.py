@@ -1,7 +1,15 @@
 import os
+import copy
+import stat
 import json
-import yaml
+import tempfile
 from io import open
+from contextlib import contextmanager
+try:
+    import fcntl
+except ImportError:
+    # Windows has no advisory locks, writes there are only atomic
+    fcntl = None
 try:
     to_unicode = unicode
 except NameError:
@@ -23,12 +31,51 @@ from datmo.core.util.exceptions import (SaveSettingError, FileIOError)
 
 
 class JSONStore():
-    # TODO:  add file locking
-    # https://stackoverflow.com/questions/186202/what-is-the-best-way-to-open-a-file-for-exclusive-access-in-python
+    """JSONStore stores a dictionary in a JSON file
+
+    The parsed file is kept in memory until the file changes, so repeated reads do
+    not parse it again. Every write goes through a temporary file renamed over the
+    file, so readers never see a partial file, and updates of keys hold an advisory
+    lock on the file so concurrent processes do not overwrite each other's keys.
+
+    Parameters
+    ----------
+    filepath : str
+        absolute filepath of the JSON file
+    initial_dict : dict, optional
+        dictionary written to the file, replacing its content (default is {},
+        which leaves the file untouched)
+
+    Attributes
+    ----------
+    filepath : str
+
+    Methods
+    -------
+    to_file(dictionary)
+        replace the content of the file with the dictionary
+    save(key, value)
+        set the value of a key
+    save_many(dictionary)
+        set the values of several keys in a single write
+    get(name)
+        return the value of a key, or None
+    remove(name)
+        remove a key
+    remove_many(names)
+        remove several keys in a single write
+    to_dict()
+        return the content of the file as a dictionary
+    """
+
     # Alternatives to JSON??
     # https://martin-thoma.com/configuration-files-in-python/
     def __init__(self, filepath, initial_dict={}):
         self.filepath = filepath
+        # parsed content of the file, as of the stat signature of the file
+        self._settings = None
+        self._settings_dict = None
+        self._signature = None
         # Ensure filepath directories exist
         directory = os.path.dirname(filepath)
         if not os.path.exists(directory):
@@ -36,84 +83,140 @@ class JSONStore():
         # save initial dictionary
         if initial_dict:
             self.to_file(initial_dict)
-        # keep file in memory until a write occurs
-        self.in_memory_settings = False
 
     def to_file(self, dictionary):
-        with open(self.filepath, "wb") as outfile:
-            str_ = json.dumps(
-                dictionary,
-                indent=4,
-                sort_keys=True,
-                separators=(',', ': '),
-                ensure_ascii=False)
-            outfile.write(to_bytes(str_))
+        with self._lock():
+            self._write(dictionary)
         return
 
     def save(self, key, value):
-        self.in_memory_settings = False
-        settings_dict = {}
-        if not os.path.exists(self.filepath):
-            open(self.filepath, 'w+').close()
-        else:
-            settings_dict = json.load(open(self.filepath, 'r'))
-        settings_dict[key] = value
-        with open(self.filepath, "wb") as outfile:
-            str_ = json.dumps(
-                settings_dict,
-                indent=4,
-                sort_keys=True,
-                separators=(',', ': '),
-                ensure_ascii=False)
-            outfile.write(to_bytes(str_))
+        self.save_many({key: value})
+        return
+
+    def save_many(self, dictionary):
+        with self._lock():
+            try:
+                settings_dict = dict(self._load(reload=True))
+            except Exception as err:
+                raise SaveSettingError(err)
+            settings_dict.update(dictionary)
+            self._write(settings_dict)
         return
 
     def get(self, name):
-        if self.in_memory_settings and name in self.in_memory_settings:
-            return self.in_memory_settings[name]
+        try:
+            settings = self._load()
+        except Exception as err:
+            raise SaveSettingError(err)
+        return copy.deepcopy(settings.get(name))
 
+    def remove(self, name):
+        self.remove_many([name])
+        return
+
+    def remove_many(self, names):
         if not os.path.exists(self.filepath):
             return None
-
-        with open(self.filepath) as settings_file:
+        with self._lock():
             try:
-                settings = json.load(settings_file)
-                # save in memory
-                self.in_memory_settings = settings
+                settings_dict = dict(self._load(reload=True))
             except Exception as err:
                 raise SaveSettingError(err)
-            if name in settings:
-                return settings[name]
-            else:
-                return None
+            for name in names:
+                settings_dict.pop(name, None)
+            self._write(settings_dict)
+        return
 
-    def remove(self, name):
-        if not os.path.exists(self.filepath):
+    def to_dict(self):
+        try:
+            settings = self._load()
+            if self._settings_dict is None:
+                import yaml
+                self._settings_dict = yaml.safe_load(json.dumps(settings))
+        except Exception as err:
+            raise FileIOError(err)
+        return copy.deepcopy(self._settings_dict)
+
+    def _get_signature(self):
+        try:
+            stat = os.stat(self.filepath)
+        except OSError:
             return None
-        else:
-            settings_dict = json.load(open(self.filepath, 'r'))
-        settings_dict.pop(name, None)
-        with open(self.filepath, "wb") as outfile:
-            str_ = json.dumps(
-                settings_dict,
-                indent=4,
-                sort_keys=True,
-                separators=(',', ': '),
-                ensure_ascii=False)
+        # Writes replace the file, so its inode changes even within the
+        # resolution of its mtime
+        return (stat.st_ino, getattr(stat, "st_mtime_ns", stat.st_mtime),
+                stat.st_size)
+
+    def _load(self, reload=False):
+        """Return the parsed content of the file, parsing it only if it changed
+        since it was last read or written, or if reload is True. The stat of a file
+        rewritten within the resolution of its mtime may not change, so updates
+        always reload the file while holding the lock"""
+        signature = self._get_signature()
+        if signature is None:
+            return {}
+        if reload or signature != self._signature:
+            with open(self.filepath, "r", encoding="utf-8") as settings_file:
+                settings_string = settings_file.read()
+            self._settings = json.loads(
+                settings_string) if settings_string.strip() else {}
+            self._settings_dict = None
+            self._signature = signature
+        return self._settings
+
+    def _write(self, dictionary):
+        str_ = json.dumps(
+            dictionary,
+            indent=4,
+            sort_keys=True,
+            separators=(',', ': '),
+            ensure_ascii=False)
+        # Write through a temporary file so readers never see a partial file
+        file_descriptor, temp_filepath = tempfile.mkstemp(
+            dir=os.path.dirname(self.filepath))
+        with os.fdopen(file_descriptor, "wb") as outfile:
             outfile.write(to_bytes(str_))
-        return
+        # mkstemp creates the file private, it keeps the mode of the file replaced
+        os.chmod(temp_filepath, self._get_mode())
+        try:
+            os.replace(temp_filepath, self.filepath)
+        except AttributeError:
+            # python 2 does not have os.replace
+            if os.path.exists(self.filepath):
+                os.remove(self.filepath)
+            os.rename(temp_filepath, self.filepath)
+        self._settings = json.loads(str_)
+        self._settings_dict = None
+        self._signature = self._get_signature()
 
-    def to_dict(self):
-        output_dict = dict()
-        # reading json file
-        if os.path.exists(self.filepath):
-            with open(self.filepath) as data_file:
-                meta_data_string = data_file.read()
-            if not meta_data_string:
-                return {}
+    def _get_mode(self):
+        try:
+            return stat.S_IMODE(os.stat(self.filepath).st_mode)
+        except OSError:
+            # The mode a new file is created with, as by open
+            umask = os.umask(0)
+            os.umask(umask)
+            return 0o666 & ~umask
+
+    @contextmanager
+    def _lock(self):
+        """Hold an exclusive advisory lock on the file, created if missing"""
+        if fcntl is None:
+            yield
+            return
+        while True:
+            lock_file = open(self.filepath, "ab")
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            # The file may have been replaced by another writer while waiting
+            # for the lock, in which case the lock is on the file replaced
             try:
-                output_dict = json.loads(meta_data_string)
-                output_dict = yaml.safe_load(json.dumps(output_dict))
-            except Exception as err:
-                raise FileIOError(err)
-        return output_dict
+                if os.fstat(lock_file.fileno()).st_ino == os.stat(
+                        self.filepath).st_ino:
+                    break
+            except OSError:
+                pass
+            lock_file.close()
+        try:
+            yield
+        finally:
+            lock_file.close()
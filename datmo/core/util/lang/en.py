@@ -76,6 +76,10 @@ MESSAGES = {
             "Updated snapshot with id: %s",
         "cli.snapshot.checkout.success":
             "Moved to snapshot with id: %s",
+        "cli.snapshot.backfill":
+            "Storing fingerprints for existing snapshots",
+        "cli.snapshot.backfill.success":
+            "Stored fingerprints for %s snapshots",
         "cli.run.run":
             "Running a script",
         "cli.run.rerun":
@@ -86,6 +90,12 @@ MESSAGES = {
             "Stopping the run...",
         "cli.run.run.complete":
             "Completed run: %s",
+        "cli.run.run.queued":
+            "Queued run: %s",
+        "cli.run.sweep":
+            "Running a sweep of the script",
+        "cli.run.sweep.complete":
+            "Completed sweep of %s runs, %s failed",
         "cli.run.stop":
             "Stopping the run: %s",
         "cli.run.stop.all":
@@ -181,6 +191,10 @@ MESSAGES = {
             "Data file being passed doesn't exist: %s",
         "cli.run.run.already_running":
             "Already running with id: %s",
+        "cli.run.sweep.spec":
+            "Parameter grid and random spec must be valid JSON: %s",
+        "cli.run.sweep":
+            "Error while running the sweep: %s",
         "cli.run.stop":
             "Error while stopping the run: %s",
         "cli.run.parse.paths":
@@ -203,6 +217,28 @@ MESSAGES = {
             "Filepath does not point to a valid file: %s",
         "util.misc_functions.mutually_exclusive":
             "Mutually exclusive arguments passed: %s",
+        "util.materializer.__init__":
+            "Error: Materialize mode %s is not supported, must be one of copy, reflink or hardlink",
+        "util.object_store.__init__.compression":
+            "Object store compression is not supported: %s",
+        "util.object_store.__init__.zstd":
+            "The zstandard package must be installed to use zstd compression",
+        "util.object_store.dne":
+            "Object does not exist in the object store: %s",
+        "util.run_queue.parse_mem_limit":
+            "Memory limit is not valid, must be a number with an optional unit b, k, m or g: %s",
+        "util.run_queue.get":
+            "Job does not exist in the run queue: %s",
+        "util.metric_store.log":
+            "Value of metric %s must be a number: %s",
+        "util.metric_store.log.step":
+            "Step of metric %s must be an integer: %s",
+        "util.sweep.grid":
+            "Parameter grid must be a dictionary of parameter names to lists of values: %s",
+        "util.sweep.random":
+            "Random spec must be a dictionary of parameter names to lists of values or distributions: %s",
+        "util.sweep.random.distribution":
+            "Distribution of parameter %s is not valid, must be one of {%s: [low, high]}",
         "controller.code.driver.file.create_ref.no_commit":
             "Commit ref given does not match an existing commit: %s",
         "controller.code.driver.file.create_ref.cannot_commit":
@@ -393,6 +429,8 @@ MESSAGES = {
             "Task specified by id %s has not been completed",
         "controller.snapshot.delete.arg":
             "Delete argument %s not present in input",
+        "controller.snapshot.list.cursor":
+            "A cursor can only be used when sorting by created_at, not by %s",
         "controller.task.__init__":
             "Project has not been initialized",
         "controller.task._run_helper.env_dne":
@@ -403,6 +441,14 @@ MESSAGES = {
             "Error creating task directory for run: %s",
         "controller.task.run.args.detach.interactive":
             "Error in running tasks since both detach and interactive is used",
+        "controller.task.submit.interactive":
+            "Interactive tasks cannot be queued",
+        "controller.task.run_many.arg":
+            "Either a parameter grid, or a random spec with a number of samples, is required",
+        "controller.task.run_many.grid.samples":
+            "Every combination of a parameter grid is run, samples are only taken from a random spec",
+        "controller.task.run_many.interactive":
+            "Interactive tasks cannot be swept",
         "controller.task.stop.arg":
             "Stop argument %s not present in input",
         "controller.task.stop.arg.missing":
@@ -0,0 +1,183 @@
+import os
+import json
+import sqlite3
+import threading
+
+from datmo.core.util.misc_functions import create_unique_hash
+
+
+class LocalRemoteAPI(object):
+    """LocalRemoteAPI serves the requests of RemoteAPI from a sqlite database on
+    this machine rather than from the Datmo services, so monitoring runs offline.
+    Its methods take and return the same values as those of RemoteAPI.
+
+    Each tracked prediction is stored as json, along with columns for the fields
+    it is filtered and sorted on, which are indexed so pages of results sorted by
+    creation time are read from the indexes. Data is scoped by api key as with the
+    services, and the database may be shared by several processes.
+
+    Parameters
+    ----------
+    api_key : str
+        credentials scoping the data
+    database_filepath : str
+        filepath of the database, created if it does not exist
+
+    Methods
+    -------
+    post_data(input_data)
+        store a tracked prediction
+    get_data(filter)
+        return the tracked predictions matching the filter
+    update_actual(id, update_dict)
+        update a tracked prediction, e.g. with its feedback
+    delete_data(filter)
+        delete the tracked predictions matching the filter
+    get_deployment_info()
+        return the deployment info set with set_deployment_info
+    set_deployment_info(deployment_info)
+        set the deployment info, i.e. the master_system_info and cluster_info
+    """
+
+    # Filters on these fields are exact matches on indexed columns
+    filter_fields = [
+        "id", "model_id", "model_version_id", "deployment_version_id"
+    ]
+    busy_timeout = 30
+
+    def __init__(self, api_key, database_filepath):
+        # Without credentials, data is scoped by an empty api key, as NULL would
+        # neither match in filters nor be unique in the primary key
+        self._api_key = api_key if api_key is not None else ""
+        self.database_filepath = database_filepath
+        dirpath = os.path.dirname(os.path.abspath(database_filepath))
+        if not os.path.isdir(dirpath):
+            os.makedirs(dirpath)
+        self._lock = threading.RLock()
+        self.connection = sqlite3.connect(
+            database_filepath,
+            timeout=self.busy_timeout,
+            check_same_thread=False)
+        # Readers do not block the writer and vice versa
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.__create_tables()
+
+    def __create_tables(self):
+        with self._lock, self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS metadata (id TEXT NOT NULL, "
+                "api_key TEXT NOT NULL, model_id TEXT, model_version_id TEXT, "
+                "deployment_version_id TEXT, created_at INTEGER, "
+                "document TEXT NOT NULL, PRIMARY KEY (api_key, id))")
+            # The dashboard filters by model, and then by model version or by
+            # deployment, sorting by creation time
+            for fields in [["model_id"], ["model_id", "model_version_id"],
+                           ["model_id", "deployment_version_id"]]:
+                self.connection.execute(
+                    "CREATE INDEX IF NOT EXISTS metadata_%s ON metadata "
+                    "(api_key, %s, created_at)" % ("_".join(fields),
+                                                   ", ".join(fields)))
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS deployment_info "
+                "(api_key TEXT PRIMARY KEY, document TEXT NOT NULL)")
+
+    def close(self):
+        self.connection.close()
+
+    def __where(self, filter):
+        conditions, params = ["api_key = ?"], [self._api_key]
+        for field in self.filter_fields:
+            if filter.get(field) is not None:
+                conditions.append("%s = ?" % field)
+                params.append(filter[field])
+        return " AND ".join(conditions), params
+
+    def post_data(self, input_data):
+        document = dict(input_data)
+        document.pop("api_key", None)
+        # Ids generated by the client (e.g. when tracking asynchronously) are kept,
+        # so sending a prediction twice stores it once. Ids are unique by api key,
+        # so the same id sent with another api key does not replace this one
+        document["id"] = document.get("id") or create_unique_hash()
+        with self._lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO metadata (id, api_key, model_id, "
+                "model_version_id, deployment_version_id, created_at, document) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (document["id"], self._api_key, document.get("model_id"),
+                 document.get("model_version_id"),
+                 document.get("deployment_version_id"),
+                 document.get("created_at"), json.dumps(document)))
+        return {"status_code": 200, "body": {"id": document["id"]}}
+
+    def get_data(self, filter):
+        where, params = self.__where(filter)
+        order = "DESC" if filter.get("sort_created_at") == "desc" else "ASC"
+        sql = ("SELECT document FROM metadata WHERE %s "
+               "ORDER BY created_at %s, rowid %s" % (where, order, order))
+        count, start = filter.get("count"), filter.get("start")
+        if count is not None or start:
+            limit = -1 if count is None else int(count)
+            sql += " LIMIT %d OFFSET %d" % (limit, int(start or 0))
+        with self._lock:
+            rows = self.connection.execute(sql, params).fetchall()
+        return {
+            "status_code": 200,
+            "body": [json.loads(row[0]) for row in rows]
+        }
+
+    def update_actual(self, id, update_dict):
+        if not isinstance(update_dict, dict):
+            return {"status_code": 500}
+        update_dict = dict(update_dict)
+        update_dict.pop("api_key", None)
+        update_dict.pop("id", None)
+        if "updated_at" in update_dict:
+            # The services return it as a string
+            update_dict["updated_at"] = str(update_dict["updated_at"])
+        updated = 0
+        with self._lock, self.connection:
+            row = self.connection.execute(
+                "SELECT document FROM metadata WHERE api_key = ? AND id = ?",
+                (self._api_key, id)).fetchone()
+            if row is not None:
+                document = json.loads(row[0])
+                document.update(update_dict)
+                self.connection.execute(
+                    "UPDATE metadata SET document = ? "
+                    "WHERE api_key = ? AND id = ?",
+                    (json.dumps(document), self._api_key, id))
+                updated = 1
+        return {"status_code": 200, "body": {"updated": updated}}
+
+    def delete_data(self, filter):
+        where, params = self.__where(filter)
+        with self._lock, self.connection:
+            deleted = self.connection.execute(
+                "DELETE FROM metadata WHERE %s" % where, params).rowcount
+        return {
+            "status_code": 200,
+            "body": {
+                "total": deleted,
+                "deleted": deleted
+            }
+        }
+
+    def get_deployment_info(self):
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT document FROM deployment_info WHERE api_key = ?",
+                (self._api_key, )).fetchone()
+        if row is None:
+            return {"status_code": 404, "body": {}}
+        return {"status_code": 200, "body": json.loads(row[0])}
+
+    def set_deployment_info(self, deployment_info):
+        """Set the deployment info returned by get_deployment_info, a dict with the
+        master_system_info and cluster_info of the deployments"""
+        with self._lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO deployment_info (api_key, document) "
+                "VALUES (?, ?)", (self._api_key, json.dumps(deployment_info)))
+        return {"status_code": 200, "body": deployment_info}
@@ -0,0 +1,298 @@
+import gzip
+import time
+import zlib
+import struct
+import threading
+from io import open
+from collections import deque
+
+# Lines are compressed in blocks, each a gzip member which can be decompressed on its
+# own, so the log file is also readable by gzip / zcat. The header of each block
+# holds an extra field with the number of its first line, its number of lines and its
+# size, so readers can skip over blocks without decompressing them
+GZIP_MAGIC = b"\x1f\x8b"
+BLOCK_EXTRA_ID = b"DL"
+BLOCK_EXTRA_FORMAT = "<QII"
+BLOCK_HEADER_FORMAT = "<2sBBIBBH2sH"
+BLOCK_HEADER_SIZE = struct.calcsize(BLOCK_HEADER_FORMAT) + struct.calcsize(
+    BLOCK_EXTRA_FORMAT)
+BLOCK_TRAILER_SIZE = 8
+
+
+def parse_result_line(line):
+    """Return the key and value of a line of the form "key:value", else None"""
+    split_line = line.split(":")
+    if len(split_line) == 2:
+        return split_line[0].strip(), split_line[1].strip()
+    return None
+
+
+def is_compressed(filepath):
+    """Return whether the log file is compressed (by its content, not its name)"""
+    with open(filepath, "rb") as f:
+        return f.read(2) == GZIP_MAGIC
+
+
+class LogWriter(object):
+    """LogWriter writes the lines of a log to a file as they arrive, compressed in
+    blocks if the filepath ends with ".gz", and keeps a bounded tail of the last lines
+    in memory, along with the results of the lines of the form "key:value". The lines
+    pending in a partial block are written every flush_interval seconds from a
+    background thread, so readers see the output of a run as it goes
+
+    Parameters
+    ----------
+    filepath : str
+        absolute filepath of the log file to create
+    tail_size : int, optional
+        maximum number of characters kept in the tail (default is 64 KB)
+    results : dict, optional
+        dictionary updated with the results as lines arrive (default is None, a
+        new dictionary)
+    flush_interval : float, optional
+        maximum time in seconds lines are written after they arrive (default is 1,
+        None to only write them in full blocks)
+
+    Attributes
+    ----------
+    filepath : str
+    compressed : bool
+    line_count : int
+        number of lines written
+    results : dict
+        results of the lines written, the last one for a key found several times
+
+    Methods
+    -------
+    write(line)
+        append a line to the log
+    get_tail()
+        return the last lines of the log, within the tail size
+    flush()
+        write the pending lines, as a partial block if compressed
+    close()
+        write the pending lines and close the file
+    """
+
+    block_lines = 1000
+    block_size = 1024 * 1024
+    compression_level = 6
+
+    def __init__(self,
+                 filepath,
+                 tail_size=64 * 1024,
+                 results=None,
+                 flush_interval=1):
+        self.filepath = filepath
+        self.compressed = filepath.endswith(".gz")
+        self.tail_size = tail_size
+        self.results = {} if results is None else results
+        self.flush_interval = flush_interval
+        self.line_count = 0
+        self._file = open(filepath, "wb")
+        self._block = []
+        self._block_size = 0
+        self._tail = deque()
+        self._tail_length = 0
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._flusher = None
+        if self.flush_interval:
+            self._flusher = threading.Thread(target=self._flush_periodically)
+            self._flusher.daemon = True
+            self._flusher.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def write(self, line):
+        with self._lock:
+            for line in line.rstrip("\r\n").split("\n"):
+                self._write_line(line.rstrip("\r"))
+
+    def _write_line(self, line):
+        data = line + "\n"
+        if not isinstance(data, bytes):
+            data = data.encode("utf-8")
+        self.line_count += 1
+        if self.compressed:
+            self._block.append(data)
+            self._block_size += len(data)
+            if len(self._block) >= self.block_lines or \
+                    self._block_size >= self.block_size:
+                self._write_block()
+        else:
+            self._file.write(data)
+        result = parse_result_line(line)
+        if result is not None:
+            self.results[result[0]] = result[1]
+        self._tail.append(line)
+        self._tail_length += len(line) + 1
+        while self._tail_length > self.tail_size and len(self._tail) > 1:
+            self._tail_length -= len(self._tail.popleft()) + 1
+
+    def get_tail(self):
+        return "".join(line + "\n" for line in self._tail)
+
+    def flush(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            if self._block:
+                self._write_block()
+            self._file.flush()
+
+    def close(self):
+        self._stopped.set()
+        if self._flusher is not None and \
+                self._flusher is not threading.current_thread():
+            self._flusher.join()
+        with self._lock:
+            if self._file.closed:
+                return
+            if self._block:
+                self._write_block()
+            self._file.close()
+
+    def _flush_periodically(self):
+        while not self._stopped.wait(self.flush_interval):
+            self.flush()
+
+    def _write_block(self):
+        data = b"".join(self._block)
+        compressor = zlib.compressobj(self.compression_level, zlib.DEFLATED,
+                                      -zlib.MAX_WBITS)
+        deflated = compressor.compress(data) + compressor.flush()
+        size = BLOCK_HEADER_SIZE + len(deflated) + BLOCK_TRAILER_SIZE
+        extra_length = struct.calcsize(BLOCK_EXTRA_FORMAT)
+        mtime = int(time.time())
+        # Deflate method, FEXTRA flag, no extra flags and unknown OS, followed by
+        # the block extra field as the only subfield
+        header = struct.pack(BLOCK_HEADER_FORMAT, GZIP_MAGIC, 8, 4, mtime, 0,
+                             255, extra_length + 4, BLOCK_EXTRA_ID,
+                             extra_length)
+        first_line = self.line_count - len(self._block)
+        self._file.write(header + struct.pack(BLOCK_EXTRA_FORMAT, first_line,
+                                              len(self._block), size))
+        self._file.write(deflated)
+        self._file.write(
+            struct.pack("<II",
+                        zlib.crc32(data) & 0xffffffff,
+                        len(data) & 0xffffffff))
+        # Readers see whole blocks while the log is written
+        self._file.flush()
+        self._block = []
+        self._block_size = 0
+
+
+class LogReader(object):
+    """LogReader reads pages of lines from a log file written by LogWriter, seeking to
+    the block holding the first line requested. Plain text log files are read too,
+    from their beginning
+
+    Parameters
+    ----------
+    filepath : str
+        absolute filepath of the log file
+
+    Attributes
+    ----------
+    filepath : str
+
+    Methods
+    -------
+    read(offset=0, limit=None)
+        return the lines of the log from offset on, at most limit of them
+    iter_lines(offset=0)
+        yield the lines of the log from offset on
+    count()
+        return the number of lines in the log
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+
+    def read(self, offset=0, limit=None):
+        lines = []
+        if limit is not None and limit <= 0:
+            return lines
+        for line in self.iter_lines(offset):
+            lines.append(line)
+            if limit is not None and len(lines) >= limit:
+                break
+        return lines
+
+    def iter_lines(self, offset=0):
+        offset = offset or 0
+        if not is_compressed(self.filepath):
+            with open(self.filepath, "r", encoding="utf-8") as f:
+                for line_number, line in enumerate(f):
+                    if line_number >= offset:
+                        yield line.rstrip("\r\n")
+            return
+        with open(self.filepath, "rb") as f:
+            if not self._has_blocks(f):
+                for line in self._iter_gzip_lines(offset):
+                    yield line
+                return
+            for position, first_line, line_count, size in \
+                    self._iter_blocks(f):
+                if first_line + line_count <= offset:
+                    continue
+                f.seek(position + BLOCK_HEADER_SIZE)
+                deflated_size = size - BLOCK_HEADER_SIZE - BLOCK_TRAILER_SIZE
+                deflated = f.read(deflated_size)
+                if len(deflated) < deflated_size:
+                    # Still being written
+                    return
+                lines = zlib.decompress(
+                    deflated,
+                    -zlib.MAX_WBITS).decode("utf-8").split("\n")[:line_count]
+                for line in lines[max(offset - first_line, 0):]:
+                    yield line
+
+    def count(self):
+        if not is_compressed(self.filepath):
+            with open(self.filepath, "rb") as f:
+                return sum(1 for _ in f)
+        with open(self.filepath, "rb") as f:
+            if not self._has_blocks(f):
+                return sum(1 for _ in self._iter_gzip_lines())
+            return sum(
+                line_count for _, _, line_count, _ in self._iter_blocks(f))
+
+    @staticmethod
+    def _has_blocks(f):
+        f.seek(0)
+        header = f.read(struct.calcsize(BLOCK_HEADER_FORMAT))
+        if len(header) < struct.calcsize(BLOCK_HEADER_FORMAT):
+            # The first block is still being written
+            return True
+        fields = struct.unpack(BLOCK_HEADER_FORMAT, header)
+        return bool(fields[2] & 4) and fields[7] == BLOCK_EXTRA_ID
+
+    @staticmethod
+    def _iter_blocks(f):
+        """Yield the position, first line, number of lines and size of each block, by
+        reading their headers only"""
+        position = 0
+        while True:
+            f.seek(position)
+            header = f.read(BLOCK_HEADER_SIZE)
+            if len(header) < BLOCK_HEADER_SIZE:
+                return
+            first_line, line_count, size = struct.unpack(
+                BLOCK_EXTRA_FORMAT,
+                header[struct.calcsize(BLOCK_HEADER_FORMAT):])
+            yield position, first_line, line_count, size
+            position += size
+
+    def _iter_gzip_lines(self, offset=0):
+        """Yield the lines of a gzip file not written by LogWriter"""
+        with gzip.open(self.filepath, "rb") as f:
+            for line_number, line in enumerate(f):
+                if line_number >= offset:
+                    yield line.decode("utf-8").rstrip("\r\n")
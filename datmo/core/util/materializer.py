@@ -0,0 +1,140 @@
+import os
+import errno
+import shutil
+from io import open
+
+from datmo.core.util.i18n import get as __
+from datmo.core.util.exceptions import InvalidArgumentType
+
+# ioctl request to share the extents of one file with another (linux/fs.h)
+FICLONE = 0x40049409
+
+
+class Materializer(object):
+    """Materializer writes files and directory trees to a destination using the
+    cheapest method the filesystem supports, and reports how many bytes were written.
+
+    Parameters
+    ----------
+    mode : str, optional
+        one of "copy", "reflink" or "hardlink" (default is "reflink")
+
+        copy
+            always write a full copy of each file
+        reflink
+            share the data blocks with the source (copy-on-write, e.g. btrfs, xfs),
+            fall back to a copy if the filesystem does not support it
+        hardlink
+            as reflink, but fall back to a hard link before a copy. The destination
+            shares its content with the source, so writing to the file in place also
+            changes the source; only use it with sources which are never modified
+
+    Attributes
+    ----------
+    mode : str
+
+    Methods
+    -------
+    file(src_filepath, dst_filepath)
+        materialize a file, returning the number of bytes written
+    tree(src_dirpath, dst_dirpath, symlinks=False, ignore=None)
+        materialize the contents of a directory, returning the number of bytes written
+
+    Raises
+    ------
+    InvalidArgumentType
+        if the mode is not supported
+    """
+
+    modes = ["copy", "reflink", "hardlink"]
+
+    def __init__(self, mode="reflink"):
+        if mode not in self.modes:
+            raise InvalidArgumentType(
+                __("error", "util.materializer.__init__", str(mode)))
+        self.mode = mode
+        # (src device, dst device) pairs already found to not support reflinks
+        self._reflink_unsupported = set()
+        self._hardlink_unsupported = set()
+
+    def file(self, src_filepath, dst_filepath):
+        """Materialize a file, the destination must not exist
+
+        Parameters
+        ----------
+        src_filepath : str
+            absolute path of the file to materialize
+        dst_filepath : str
+            absolute path of the file to create
+
+        Returns
+        -------
+        int
+            number of bytes written (0 if the data is shared with the source)
+        """
+        if self.mode != "copy":
+            devices = (os.stat(src_filepath).st_dev,
+                       os.stat(os.path.dirname(dst_filepath)).st_dev)
+            if devices not in self._reflink_unsupported:
+                if self._reflink(src_filepath, dst_filepath):
+                    return 0
+                self._reflink_unsupported.add(devices)
+            if self.mode == "hardlink" and \
+                    devices not in self._hardlink_unsupported:
+                try:
+                    os.link(src_filepath, dst_filepath)
+                    return 0
+                except (OSError, AttributeError):
+                    # AttributeError: os.link is not available on python 2 for Windows
+                    self._hardlink_unsupported.add(devices)
+        shutil.copy2(src_filepath, dst_filepath)
+        return os.path.getsize(dst_filepath)
+
+    def tree(self, src_dirpath, dst_dirpath, symlinks=False, ignore=None):
+        """Materialize the contents of the source directory within the destination
+        directory, with the same arguments as shutil.copytree
+
+        Returns
+        -------
+        int
+            number of bytes written
+        """
+        names = os.listdir(src_dirpath)
+        ignored_names = ignore(src_dirpath, names) if ignore else set()
+        bytes_written = 0
+        for name in names:
+            if name in ignored_names:
+                continue
+            src_path = os.path.join(src_dirpath, name)
+            dst_path = os.path.join(dst_dirpath, name)
+            if symlinks and os.path.islink(src_path):
+                os.symlink(os.readlink(src_path), dst_path)
+            elif os.path.isdir(src_path):
+                os.makedirs(dst_path)
+                bytes_written += self.tree(src_path, dst_path, symlinks,
+                                           ignore)
+                shutil.copystat(src_path, dst_path)
+            else:
+                bytes_written += self.file(src_path, dst_path)
+        return bytes_written
+
+    @staticmethod
+    def _reflink(src_filepath, dst_filepath):
+        try:
+            import fcntl
+        except ImportError:
+            # Not available on Windows
+            return False
+        try:
+            with open(src_filepath, "rb") as src, \
+                    open(dst_filepath, "wb") as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except (IOError, OSError) as e:
+            if os.path.exists(dst_filepath):
+                os.remove(dst_filepath)
+            if e.errno in (errno.EACCES, errno.ENOENT, errno.ENOSPC):
+                raise
+            # e.g. EOPNOTSUPP, EXDEV, EINVAL, ENOTTY
+            return False
+        shutil.copystat(src_filepath, dst_filepath)
+        return True
@@ -0,0 +1,224 @@
+import os
+import json
+import time
+import struct
+from io import open
+from numbers import Number, Integral
+
+from datmo.core.util.i18n import get as __
+from datmo.core.util.exceptions import InvalidArgumentType
+
+# Each record is the step, timestamp (epoch seconds), key id and value of a metric,
+# little endian and without padding so it maps onto RECORD_DTYPE
+RECORD_FORMAT = "<qdId"
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+RECORD_DTYPE = [("step", "<i8"), ("timestamp", "<f8"), ("key_id", "<u4"),
+                ("value", "<f8")]
+
+
+class MetricStore(object):
+    """MetricStore is an append-only store of the metrics of a run, as fixed size
+    binary records in a single file, with the metric keys in a file next to it.
+    Logging a metric appends a record and never rewrites earlier ones, and the
+    records are read back as NumPy arrays without parsing. NumPy is only needed to
+    read the metrics back as arrays.
+
+    A store has a single writer at a time, the run logging its metrics.
+
+    Parameters
+    ----------
+    dirpath : str
+        absolute path of the directory of the store, created on the first write
+    autoflush : bool, optional
+        if False, records are only written to the file once flushed or closed
+        (default is True)
+
+    Attributes
+    ----------
+    dirpath : str
+    records_filepath : str
+    keys_filepath : str
+
+    Methods
+    -------
+    log(key, value, step=None, timestamp=None)
+        append a value of a metric
+    get_keys()
+        return the metric keys, by key id
+    iter_records()
+        yield the records as (step, timestamp, key, value) tuples
+    read_records()
+        return all records as a NumPy structured array
+    read(keys=None)
+        return the step, timestamp and value arrays of each metric
+    flush()
+        write the records logged to the file
+    close()
+        close the records file
+    """
+
+    records_filename = "records.bin"
+    keys_filename = "keys.jsonl"
+
+    def __init__(self, dirpath, autoflush=True):
+        self.dirpath = dirpath
+        self.autoflush = autoflush
+        self.records_filepath = os.path.join(dirpath, self.records_filename)
+        self.keys_filepath = os.path.join(dirpath, self.keys_filename)
+        self._key_ids = None
+        self._next_steps = None
+        self._records_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def get_keys(self):
+        """Return the metric keys, the key id of each being its index"""
+        if not os.path.isfile(self.keys_filepath):
+            return []
+        with open(self.keys_filepath, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def log(self, key, value, step=None, timestamp=None):
+        """Append a value of a metric
+
+        Parameters
+        ----------
+        key : str
+            name of the metric
+        value : float
+            value of the metric
+        step : int, optional
+            step of the value (default is the step after the last one logged for
+            the metric, starting at 0)
+        timestamp : float, optional
+            time of the value in epoch seconds (default is now)
+
+        Returns
+        -------
+        int
+            step of the value
+
+        Raises
+        ------
+        InvalidArgumentType
+            if the value is not a number or the step is not an integer
+        """
+        if isinstance(value, bool) or not isinstance(value, Number):
+            raise InvalidArgumentType(
+                __("error", "util.metric_store.log", (key, value)))
+        if step is not None and (isinstance(step, bool)
+                                 or not isinstance(step, Integral)):
+            raise InvalidArgumentType(
+                __("error", "util.metric_store.log.step", (key, step)))
+        key_id = self.__get_key_id(key)
+        if step is None:
+            step = self.__get_next_steps().get(key_id, 0)
+        if self._next_steps is not None:
+            self._next_steps[key_id] = max(
+                self._next_steps.get(key_id, 0),
+                int(step) + 1)
+        if self._records_file is None:
+            self._records_file = open(self.records_filepath, "ab")
+        self._records_file.write(
+            struct.pack(RECORD_FORMAT, int(step), timestamp or time.time(),
+                        key_id, float(value)))
+        if self.autoflush:
+            self._records_file.flush()
+        return int(step)
+
+    def flush(self):
+        if self._records_file is not None:
+            self._records_file.flush()
+
+    def close(self):
+        if self._records_file is not None:
+            self._records_file.close()
+            self._records_file = None
+
+    def __get_key_id(self, key):
+        if self._key_ids is None:
+            self._key_ids = dict(
+                (existing_key, key_id)
+                for key_id, existing_key in enumerate(self.get_keys()))
+        if key not in self._key_ids:
+            if not os.path.isdir(self.dirpath):
+                os.makedirs(self.dirpath)
+            # The key is written before any record refers to it
+            with open(self.keys_filepath, "a", encoding="utf-8") as f:
+                f.write(json.dumps(key) + u"\n")
+            self._key_ids[key] = len(self._key_ids)
+        return self._key_ids[key]
+
+    def __get_next_steps(self):
+        if self._next_steps is None:
+            self._next_steps = {}
+            self.flush()
+            for step, _, key_id, _ in self.__iter_raw_records():
+                self._next_steps[key_id] = max(
+                    self._next_steps.get(key_id, 0), step + 1)
+        return self._next_steps
+
+    def __iter_raw_records(self):
+        if not os.path.isfile(self.records_filepath):
+            return
+        with open(self.records_filepath, "rb") as f:
+            while True:
+                data = f.read(RECORD_SIZE * 4096)
+                # A record still being written is left out
+                count = len(data) // RECORD_SIZE
+                for index in range(count):
+                    yield struct.unpack_from(RECORD_FORMAT, data,
+                                             index * RECORD_SIZE)
+                if len(data) < RECORD_SIZE * 4096:
+                    return
+
+    def iter_records(self):
+        """Yield the records in the order they were logged, as (step, timestamp,
+        key, value) tuples, without NumPy"""
+        keys = self.get_keys()
+        for step, timestamp, key_id, value in self.__iter_raw_records():
+            yield step, timestamp, keys[key_id], value
+
+    def read_records(self):
+        """Return all records as a NumPy structured array with the fields step,
+        timestamp, key_id and value, in the order they were logged"""
+        import numpy as np
+        dtype = np.dtype(RECORD_DTYPE)
+        if not os.path.isfile(self.records_filepath):
+            return np.zeros(0, dtype=dtype)
+        count = os.path.getsize(self.records_filepath) // RECORD_SIZE
+        return np.fromfile(self.records_filepath, dtype=dtype, count=count)
+
+    def read(self, keys=None):
+        """Return the values of each metric as NumPy arrays
+
+        Parameters
+        ----------
+        keys : list, optional
+            keys of the metrics to return (default is all metrics)
+
+        Returns
+        -------
+        dict
+            key -> dict of "step", "timestamp" and "value" arrays, ordered by step
+        """
+        import numpy as np
+        records = self.read_records()
+        all_keys = self.get_keys()
+        metrics = {}
+        for key in all_keys if keys is None else keys:
+            if key not in all_keys:
+                continue
+            key_records = records[records["key_id"] == all_keys.index(key)]
+            key_records = key_records[np.argsort(
+                key_records["step"], kind="mergesort")]
+            metrics[key] = {
+                "step": key_records["step"],
+                "timestamp": key_records["timestamp"],
+                "value": key_records["value"]
+            }
+        return metrics
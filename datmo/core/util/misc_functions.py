@@ -6,18 +6,13 @@ import ast
 import hashlib
 import textwrap
 import datetime
-import pytz
 import json
-import tzlocal
-import pytest
 import collections
 import platform
 import tempfile
 import subprocess
-import zipfile
 import sys
 import shutil
-import requests
 from enum import Enum
 from io import open
 try:
@@ -43,7 +38,9 @@ except NameError:
 
 from glob import glob
 
-from datmo.core.controller.environment.driver.dockerenv import DockerEnvironmentDriver
+# Modules which are slow to import (requests, docker, pytz, pytest...) are imported
+# by the functions using them, as this module is imported by every datmo command
+
 from datmo.core.util.i18n import get as __
 from datmo.core.util.exceptions import (
     PathDoesNotExist, MutuallyExclusiveArguments, RequiredArgumentMissing,
@@ -100,6 +97,7 @@ def slack_message(webhook_url, options):
         }]
     }
 
+    import requests
     response = requests.post(
         webhook_url,
         data=json.dumps(slack_data),
@@ -273,6 +271,7 @@ def is_project_dir(path):
 
 # TODO: add test
 def check_docker_inactive(filepath, datmo_directory_name):
+    from datmo.core.controller.environment.driver.dockerenv import DockerEnvironmentDriver
     try:
         test = DockerEnvironmentDriver(
             root=filepath, datmo_directory_name=datmo_directory_name)
@@ -290,6 +289,7 @@ def check_docker_inactive(filepath, datmo_directory_name):
 
 # TODO: add test
 def pytest_docker_environment_failed_instantiation(filepath):
+    import pytest
     return pytest.mark.skipif(
         # TODO: abstract the "datmo_directory_name"
         check_docker_inactive(filepath, ".datmo"),
@@ -318,6 +318,8 @@ def parse_cli_key_value(cli_string, default_key):
 
 
 def prettify_datetime(datetime_obj, tz=None):
+    import pytz
+    import tzlocal
     if not tz:
         tz = tzlocal.get_localzone()
     return str(
@@ -454,6 +456,7 @@ def get_headers(access_key):
 
 
 def authenticated_get_call(url, access_key=None, stream=False):
+    import requests
     headers = get_headers(access_key)
     res = requests.get(url, headers=headers, stream=stream)
     return res
@@ -463,18 +466,21 @@ def authenticated_post_call(url,
                             data,
                             access_key=None,
                             content_type="application/json"):
+    import requests
     headers = get_headers(access_key)
     res = requests.post(url, data=data, headers=headers)
     return res
 
 
 def authenticated_put_call(url, data, access_key=None):
+    import requests
     headers = get_headers(access_key)
     res = requests.put(url, data=data, headers=headers)
     return res
 
 
 def authenticated_delete_call(url, access_key=None):
+    import requests
     headers = get_headers(access_key)
     res = requests.delete(url, headers=headers)
     return res
@@ -550,6 +556,7 @@ class Commands(object):
         in the archive). Empty subfolders will be included in the archive
         as well.
         """
+        import zipfile
         # Retrieve the paths of the folder contents.
         contents = os.walk(folder_path)
         try:
@@ -0,0 +1,248 @@
+import os
+import stat
+import zlib
+import shutil
+import tempfile
+from io import open
+
+from datmo.core.util.i18n import get as __
+from datmo.core.util.exceptions import InvalidArgumentType, PathDoesNotExist
+
+
+class ObjectStore(object):
+    """ObjectStore is a content-addressed store for file contents. Each unique file
+    content is stored once, keyed by its file hash, within fan-out directories
+    (e.g. objects/d4/1d8cd98f00b204e9800998ecf8427e) so that no single directory
+    grows too large.
+
+    Parameters
+    ----------
+    root : str
+        absolute path of the directory to store objects within
+    compression : str, optional
+        compression to apply to new objects, one of None, "zlib" or "zstd"
+        (default is None, objects are stored as is and can be hard linked).
+        Objects are found regardless of the compression they were stored with.
+        Objects keep the permissions they were added with, as objects linked into
+        several places share them, so they are never changed afterwards.
+
+    Attributes
+    ----------
+    root : str
+    compression : str or None
+
+    Methods
+    -------
+    exists(filehash)
+        check if an object exists for the file hash
+    add(absolute_filepath, filehash, move=False, mode=None)
+        add the file to the store if its content is not already stored
+    copy(filehash, dst_filepath, mode=None)
+        write the content of the object to the destination filepath
+    link(filehash, dst_filepath, mode=None)
+        hard link the object to the destination filepath, copy if not possible
+
+    Raises
+    ------
+    InvalidArgumentType
+        if the compression is not supported
+    """
+
+    extensions = {None: "", "zlib": ".z", "zstd": ".zst"}
+    BUFF_SIZE = 1024 * 1024
+
+    def __init__(self, root, compression=None):
+        if compression not in self.extensions:
+            raise InvalidArgumentType(
+                __("error", "util.object_store.__init__.compression",
+                   str(compression)))
+        if compression == "zstd":
+            try:
+                import zstandard
+            except ImportError:
+                raise InvalidArgumentType(
+                    __("error", "util.object_store.__init__.zstd"))
+        self.root = root
+        self.compression = compression
+
+    def _get_object_filepath(self, filehash, compression):
+        return os.path.join(self.root, filehash[:2],
+                            filehash[2:] + self.extensions[compression])
+
+    def _find(self, filehash):
+        """Return the filepath and compression of the stored object or (None, None)"""
+        # Look for the current compression first as it is the most likely
+        compressions = [self.compression] + [
+            compression for compression in self.extensions
+            if compression != self.compression
+        ]
+        for compression in compressions:
+            object_filepath = self._get_object_filepath(filehash, compression)
+            if os.path.isfile(object_filepath):
+                return object_filepath, compression
+        return None, None
+
+    def exists(self, filehash):
+        object_filepath, _ = self._find(filehash)
+        return object_filepath is not None
+
+    def add(self, absolute_filepath, filehash, move=False, mode=None):
+        """Add a file to the store, only writing it if the content is not already stored
+
+        Parameters
+        ----------
+        absolute_filepath : str
+            absolute path of the file to add
+        filehash : str
+            hash of the content of the file
+        move : bool, optional
+            move the file into the store instead of copying it, the file will not
+            exist at the given path afterwards (default is False)
+        mode : int, optional
+            permissions of the object if it is written (default is None, those
+            of the file)
+
+        Returns
+        -------
+        int
+            number of bytes written to the store
+        """
+        if self.exists(filehash):
+            if move:
+                os.remove(absolute_filepath)
+            return 0
+        object_filepath = self._get_object_filepath(filehash, self.compression)
+        object_dirpath = os.path.dirname(object_filepath)
+        if not os.path.isdir(object_dirpath):
+            try:
+                os.makedirs(object_dirpath)
+            except OSError:
+                # Created concurrently by another process
+                if not os.path.isdir(object_dirpath):
+                    raise
+        if move and self.compression is None:
+            try:
+                if mode is not None:
+                    os.chmod(absolute_filepath, mode)
+                os.rename(absolute_filepath, object_filepath)
+                return os.path.getsize(object_filepath)
+            except OSError:
+                # Different filesystem or the object was added concurrently
+                pass
+        # Write to a temporary file first so a partial object is never visible
+        file_descriptor, temp_filepath = tempfile.mkstemp(dir=object_dirpath)
+        os.close(file_descriptor)
+        try:
+            with open(absolute_filepath, "rb") as src, \
+                    open(temp_filepath, "wb") as dst:
+                self._write(src, dst, self.compression)
+            shutil.copystat(absolute_filepath, temp_filepath)
+            if mode is not None:
+                os.chmod(temp_filepath, mode)
+            if os.path.isfile(object_filepath):
+                # Added concurrently by another process
+                os.remove(temp_filepath)
+            else:
+                os.rename(temp_filepath, object_filepath)
+        except Exception:
+            if os.path.isfile(temp_filepath):
+                os.remove(temp_filepath)
+            raise
+        if move:
+            os.remove(absolute_filepath)
+        return os.path.getsize(object_filepath)
+
+    def copy(self, filehash, dst_filepath, mode=None):
+        """Write the content of an object to the destination filepath
+
+        Parameters
+        ----------
+        filehash : str
+            hash of the content of the file
+        dst_filepath : str
+            absolute path of the file to write
+        mode : int, optional
+            permissions of the destination (default is None, those of the object)
+
+        Returns
+        -------
+        int
+            number of bytes written to the destination
+
+        Raises
+        ------
+        PathDoesNotExist
+            if there is no object for the file hash
+        """
+        object_filepath, compression = self._find(filehash)
+        if object_filepath is None:
+            raise PathDoesNotExist(
+                __("error", "util.object_store.dne", filehash))
+        if compression is None:
+            shutil.copy2(object_filepath, dst_filepath)
+        else:
+            with open(object_filepath, "rb") as src, \
+                    open(dst_filepath, "wb") as dst:
+                self._read(src, dst, compression)
+            shutil.copystat(object_filepath, dst_filepath)
+        if mode is not None:
+            os.chmod(dst_filepath, mode)
+        return os.path.getsize(dst_filepath)
+
+    def link(self, filehash, dst_filepath, mode=None):
+        """Hard link an object to the destination filepath so the content is not
+        stored twice. Falls back to a copy if the object is compressed, does not
+        have the permissions given or the filesystem does not support hard links
+
+        Parameters
+        ----------
+        filehash : str
+            hash of the content of the file
+        dst_filepath : str
+            absolute path of the file to create
+        mode : int, optional
+            permissions of the destination (default is None, those of the object)
+
+        Returns
+        -------
+        int
+            number of bytes written to the destination (0 if linked)
+        """
+        object_filepath, compression = self._find(filehash)
+        if object_filepath is not None and compression is None and (
+                mode is None
+                or stat.S_IMODE(os.stat(object_filepath).st_mode) == mode):
+            try:
+                os.link(object_filepath, dst_filepath)
+                return 0
+            except (OSError, AttributeError):
+                # AttributeError: os.link is not available on python 2 for Windows
+                pass
+        return self.copy(filehash, dst_filepath, mode=mode)
+
+    def _write(self, src, dst, compression):
+        if compression == "zstd":
+            import zstandard
+            zstandard.ZstdCompressor().copy_stream(src, dst)
+            return
+        compressor = zlib.compressobj() if compression == "zlib" else None
+        while True:
+            data = src.read(self.BUFF_SIZE)
+            if not data:
+                break
+            dst.write(compressor.compress(data) if compressor else data)
+        if compressor:
+            dst.write(compressor.flush())
+
+    def _read(self, src, dst, compression):
+        if compression == "zstd":
+            import zstandard
+            zstandard.ZstdDecompressor().copy_stream(src, dst)
+            return
+        decompressor = zlib.decompressobj()
+        while True:
+            data = src.read(self.BUFF_SIZE)
+            if not data:
+                break
+            dst.write(decompressor.decompress(data))
+        dst.write(decompressor.flush())
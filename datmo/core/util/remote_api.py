@@ -2,6 +2,27 @@ import json
 import requests
 
 
+def get_remote_api(api_key):
+    """Return the API serving the remote requests with the backend configured, the
+    Datmo services or a local database (see Config.remote_backend)
+
+    Parameters
+    ----------
+    api_key : str
+        credentials to access remote
+
+    Returns
+    -------
+    RemoteAPI or datmo.core.util.local_remote_api.LocalRemoteAPI
+    """
+    from datmo.config import Config
+    backend, database_filepath = Config().remote_backend
+    if backend == "local":
+        from datmo.core.util.local_remote_api import LocalRemoteAPI
+        return LocalRemoteAPI(api_key, database_filepath)
+    return RemoteAPI(api_key)
+
+
 class RemoteAPI():
     """API for Accessing Datmo Services
 
@@ -12,7 +33,10 @@ class RemoteAPI():
 
     Attributes
     ----------
-
+    session : requests.Session
+        session of the requests, which keeps their connections open to be reused
+    timeout : float
+        time in seconds to wait for the response of a request
 
     Methods
     -------
@@ -39,6 +63,20 @@ class RemoteAPI():
             "https://hb0c2py3sh.execute-api.eu-west-1.amazonaws.com/production/datmo_deployments"
         self.delete_meta_data_endpoint = \
             "https://ynpas9m577.execute-api.eu-west-1.amazonaws.com/production/datmo_monitoring"
+        self.timeout = 10
+        self._session = None
+
+    @property
+    def session(self):
+        if self._session is None:
+            self._session = requests.Session()
+            # Requests of several threads (e.g. tracking in the background) each
+            # keep a connection open
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=4, pool_maxsize=16)
+            self._session.mount("https://", adapter)
+            self._session.mount("http://", adapter)
+        return self._session
 
     def post_data(self, input_data):
         # Run post request and gather result and return to user
@@ -46,10 +84,11 @@ class RemoteAPI():
         try:
             headers = {"content-type": "application/json"}
             input_data['api_key'] = self._api_key
-            r = requests.post(
+            r = self.session.post(
                 self.post_meta_data_endpoint,
                 data=json.dumps(input_data),
-                headers=headers)
+                headers=headers,
+                timeout=self.timeout)
             response = {"status_code": r.status_code, "body": r.json()}
         except:
             response['status_code'] = 500
@@ -61,10 +100,11 @@ class RemoteAPI():
         try:
             headers = {"content-type": "application/json"}
             filter['api_key'] = self._api_key
-            r = requests.delete(
+            r = self.session.delete(
                 self.delete_meta_data_endpoint,
                 data=json.dumps(filter),
-                headers=headers)
+                headers=headers,
+                timeout=self.timeout)
             response = {"status_code": r.status_code, "body": r.json()}
         except:
             response['status_code'] = 500
@@ -76,8 +116,11 @@ class RemoteAPI():
         try:
             headers = {"content-type": "application/json"}
             filter['api_key'] = self._api_key
-            r = requests.get(
-                self.get_meta_data_endpoint, params=filter, headers=headers)
+            r = self.session.get(
+                self.get_meta_data_endpoint,
+                params=filter,
+                headers=headers,
+                timeout=self.timeout)
             response = {"status_code": r.status_code, "body": r.json()}
         except:
             response['status_code'] = 500
@@ -91,10 +134,11 @@ class RemoteAPI():
                 raise Exception
             update_dict['api_key'] = self._api_key
             update_dict['id'] = id
-            r = requests.put(
+            r = self.session.put(
                 self.put_meta_data_endpoint,
                 data=json.dumps(update_dict),
-                headers=headers)
+                headers=headers,
+                timeout=self.timeout)
             response = {"status_code": r.status_code, "body": r.json()}
         except:
             response['status_code'] = 500
@@ -106,10 +150,11 @@ class RemoteAPI():
         try:
             headers = {"content-type": "application/json"}
             params = {"api_key": self._api_key}
-            r = requests.get(
+            r = self.session.get(
                 self.get_deployment_info_endpoint,
                 params=params,
-                headers=headers)
+                headers=headers,
+                timeout=self.timeout)
             response = {"status_code": r.status_code, "body": r.json()}
         except:
             response['status_code'] = 500
@@ -0,0 +1,218 @@
+import os
+import re
+import json
+import time
+import tempfile
+from io import open
+
+from datmo.core.util.i18n import get as __
+from datmo.core.util.exceptions import InvalidArgumentType, DoesNotExist
+
+# Multipliers of the units of a docker memory limit, e.g. "512m" or "4g"
+MEM_LIMIT_UNITS = {"b": 1, "k": 1024, "m": 1024**2, "g": 1024**3}
+
+
+def parse_mem_limit(mem_limit):
+    """Return the number of bytes of a docker memory limit
+
+    Parameters
+    ----------
+    mem_limit : str or int or None
+        memory limit as a number of bytes, or a number with one of the units
+        b, k, m or g (e.g. "4g")
+
+    Returns
+    -------
+    int or None
+        number of bytes, None if there is no memory limit
+
+    Raises
+    ------
+    InvalidArgumentType
+        if the memory limit is not valid
+    """
+    if mem_limit is None:
+        return None
+    if isinstance(mem_limit, int) and not isinstance(mem_limit, bool):
+        return mem_limit
+    match = re.match(r"^\s*(\d+(?:\.\d+)?)\s*([bkmg]?)b?\s*$",
+                     str(mem_limit).lower())
+    if not match:
+        raise InvalidArgumentType(
+            __("error", "util.run_queue.parse_mem_limit", str(mem_limit)))
+    number, unit = match.groups()
+    return int(float(number) * MEM_LIMIT_UNITS[unit or "b"])
+
+
+class RunQueue(object):
+    """RunQueue is a first in, first out queue of task runs persisted in a directory,
+    with a file for each job. Jobs are claimed by renaming their file, so a job is
+    only run once even if several schedulers read the same queue.
+
+    Parameters
+    ----------
+    dirpath : str
+        absolute path of the directory of the queue, created if it does not exist
+
+    Attributes
+    ----------
+    dirpath : str
+
+    Methods
+    -------
+    put(task_id, snapshot_dict=None, task_dict=None, before_snapshot_id=None)
+        add a job for the task run to the end of the queue
+    list(running=False)
+        return the jobs which are waiting to run (or running), in order
+    get(name, running=False)
+        return a job waiting to run (or running)
+    claim(job)
+        mark a job as running, returning False if it was already claimed
+    update(job)
+        replace a running job, e.g. with the pid of its worker
+    remove(job)
+        remove a job from the queue
+    get_lock_filepath(name)
+        return the filepath of the lock held by the worker of a job
+    """
+
+    queued_extension = ".json"
+    running_extension = ".running"
+    lock_extension = ".lock"
+
+    def __init__(self, dirpath):
+        self.dirpath = dirpath
+        if not os.path.isdir(self.dirpath):
+            os.makedirs(self.dirpath)
+
+    def put(self,
+            task_id,
+            snapshot_dict=None,
+            task_dict=None,
+            before_snapshot_id=None):
+        """Add a job to the end of the queue
+
+        Parameters
+        ----------
+        before_snapshot_id : str, optional
+            id of the snapshot taken when the task was submitted, which the run
+            starts from (default is None, the snapshot is then taken at start)
+
+        Returns
+        -------
+        dict
+            the job, with "task_id", "snapshot_dict", "task_dict",
+            "before_snapshot_id", "mem_limit" and "submitted_at" (epoch seconds)
+        """
+        task_dict = task_dict or {}
+        job = {
+            "task_id": task_id,
+            "snapshot_dict": snapshot_dict or {},
+            "task_dict": task_dict,
+            "before_snapshot_id": before_snapshot_id,
+            "mem_limit": parse_mem_limit(task_dict.get("mem_limit", None)),
+            "submitted_at": time.time()
+        }
+        # Names sort by the time of submission
+        job["name"] = "%020d-%s" % (int(job["submitted_at"] * 10**6), task_id)
+        self.__write(job, self._get_filepath(job["name"]))
+        return job
+
+    def update(self, job):
+        """Replace a running job with the job given, e.g. with the pid of its worker
+
+        Raises
+        ------
+        DoesNotExist
+            if the job is not running
+        """
+        filepath = self._get_filepath(job["name"], self.running_extension)
+        if not os.path.isfile(filepath):
+            raise DoesNotExist(__("error", "util.run_queue.get", job["name"]))
+        self.__write(job, filepath)
+        return job
+
+    def __write(self, job, filepath):
+        file_descriptor, temp_filepath = tempfile.mkstemp(dir=self.dirpath)
+        with os.fdopen(file_descriptor, "w") as f:
+            json.dump(job, f)
+        # Only visible to readers once fully written
+        try:
+            os.replace(temp_filepath, filepath)
+        except AttributeError:
+            # python 2 does not have os.replace
+            if os.path.exists(filepath):
+                os.remove(filepath)
+            os.rename(temp_filepath, filepath)
+
+    def list(self, running=False):
+        """Return the jobs waiting to run, or the running jobs, first submitted
+        first"""
+        extension = self.running_extension if running else \
+            self.queued_extension
+        jobs = []
+        for filename in sorted(os.listdir(self.dirpath)):
+            if not filename.endswith(extension):
+                continue
+            try:
+                with open(os.path.join(self.dirpath, filename), "r") as f:
+                    jobs.append(json.load(f))
+            except (IOError, OSError, ValueError):
+                # Claimed or removed since the directory was listed
+                continue
+        return jobs
+
+    def get(self, name, running=False):
+        """Return the job waiting to run, or the running job, with the name given
+
+        Raises
+        ------
+        DoesNotExist
+            if there is no such job in the queue
+        """
+        extension = self.running_extension if running else \
+            self.queued_extension
+        try:
+            with open(self._get_filepath(name, extension), "r") as f:
+                return json.load(f)
+        except (IOError, OSError):
+            raise DoesNotExist(__("error", "util.run_queue.get", name))
+
+    def claim(self, job):
+        """Mark the job as running
+
+        Returns
+        -------
+        bool
+            True if the job was claimed, False if it was already claimed or removed
+        """
+        try:
+            os.rename(
+                self._get_filepath(job["name"]),
+                self._get_filepath(job["name"], self.running_extension))
+        except OSError:
+            return False
+        return True
+
+    def remove(self, job):
+        """Remove a queued or running job
+
+        Returns
+        -------
+        bool
+            True if the job was removed, False if it was not in the queue
+        """
+        for extension in [self.queued_extension, self.running_extension]:
+            filepath = self._get_filepath(job["name"], extension)
+            if os.path.isfile(filepath):
+                os.remove(filepath)
+                return True
+        return False
+
+    def get_lock_filepath(self, name):
+        """Return the filepath of the lock which the worker running the job holds
+        while it is alive"""
+        return self._get_filepath(name, self.lock_extension)
+
+    def _get_filepath(self, name, extension=queued_extension):
+        return os.path.join(self.dirpath, name + extension)
@@ -0,0 +1,128 @@
+import re
+import math
+import random
+import itertools
+
+from datmo.core.util.i18n import get as __
+from datmo.core.util.exceptions import InvalidArgumentType
+
+# Distributions of a random spec, from which values are sampled between low and high
+DISTRIBUTIONS = {
+    "uniform":
+        lambda rng, low, high: rng.uniform(low, high),
+    "loguniform":
+        lambda rng, low, high: math.exp(
+            rng.uniform(math.log(low), math.log(high))),
+    "randint":
+        lambda rng, low, high: rng.randint(low, high)
+}
+
+
+def expand_grid(grid):
+    """Return the configs of every combination of the values of a parameter grid
+
+    Parameters
+    ----------
+    grid : dict
+        parameter name -> list of values (a single value is used for all configs),
+        e.g. {"lr": [0.1, 0.01], "batch_size": [32, 64]}
+
+    Returns
+    -------
+    list
+        parameter name -> value dicts, with the last parameters (by name) varying
+        fastest
+
+    Raises
+    ------
+    InvalidArgumentType
+        if the grid is not a dict
+    """
+    if not isinstance(grid, dict):
+        raise InvalidArgumentType(__("error", "util.sweep.grid", grid))
+    names = sorted(grid)
+    values = [
+        grid[name] if isinstance(grid[name], list) else [grid[name]]
+        for name in names
+    ]
+    return [
+        dict(zip(names, combination))
+        for combination in itertools.product(*values)
+    ]
+
+
+def sample_random(spec, samples, seed=None):
+    """Return configs sampled at random from a parameter spec
+
+    Parameters
+    ----------
+    spec : dict
+        parameter name -> list of values to choose from, a distribution given as
+        {"uniform": [low, high]}, {"loguniform": [low, high]} or
+        {"randint": [low, high]}, or a single value used for all configs
+    samples : int
+        number of configs to sample
+    seed : int, optional
+        seed of the random generator, to sample the same configs again
+
+    Returns
+    -------
+    list
+        parameter name -> value dicts
+
+    Raises
+    ------
+    InvalidArgumentType
+        if the spec or one of its distributions is not valid
+    """
+    if not isinstance(spec, dict):
+        raise InvalidArgumentType(__("error", "util.sweep.random", spec))
+    rng = random.Random(seed)
+    configs = []
+    for _ in range(samples):
+        config = {}
+        for name in sorted(spec):
+            config[name] = _sample_value(rng, name, spec[name])
+        configs.append(config)
+    return configs
+
+
+def _sample_value(rng, name, value_spec):
+    if isinstance(value_spec, list):
+        return rng.choice(value_spec)
+    if not isinstance(value_spec, dict):
+        return value_spec
+    if len(value_spec) != 1 or list(value_spec)[0] not in DISTRIBUTIONS:
+        raise InvalidArgumentType(
+            __("error", "util.sweep.random.distribution",
+               (name, ", ".join(sorted(DISTRIBUTIONS)))))
+    distribution, bounds = list(value_spec.items())[0]
+    if not isinstance(bounds, list) or len(bounds) != 2:
+        raise InvalidArgumentType(
+            __("error", "util.sweep.random.distribution",
+               (name, ", ".join(sorted(DISTRIBUTIONS)))))
+    return DISTRIBUTIONS[distribution](rng, bounds[0], bounds[1])
+
+
+def format_command(command_list, config):
+    """Replace the {name} placeholders of the parameters of the config in each item
+    of the command, leaving any other braces untouched
+
+    Parameters
+    ----------
+    command_list : list
+        command to run, e.g. ["python", "train.py", "--lr", "{lr}"]
+    config : dict
+        parameter name -> value
+
+    Returns
+    -------
+    list
+        command with the values of the config
+    """
+
+    def replace(match):
+        name = match.group(1)
+        return str(config[name]) if name in config else match.group(0)
+
+    return [re.sub(r"\{(\w+)\}", replace, item) for item in command_list]
@@ -0,0 +1,198 @@
+import math
+import threading
+
+import psutil
+
+
+class LatencyHistogram(object):
+    """LatencyHistogram counts latencies in log scaled buckets, each bucket being
+    about 9% wider than the one before, so its size depends on the range of the
+    latencies and not on how many are recorded, and its percentiles are within 9%
+    of the exact ones
+
+    Parameters
+    ----------
+    buckets_per_doubling : int, optional
+        number of buckets between a latency and twice that latency (default is 8)
+    min_latency : float, optional
+        latencies up to it are counted in its bucket (default is 0.001, i.e. 1 us
+        for latencies in ms)
+
+    Attributes
+    ----------
+    count : int
+        number of latencies recorded
+    sum : float
+        sum of the latencies recorded
+    max : float
+        largest latency recorded
+
+    Methods
+    -------
+    record(latency)
+        count a latency
+    percentile(percent)
+        return the latency below which the percent of latencies fall
+    summary(percents=(50, 90, 99))
+        return the count, mean, max and percentiles of the latencies
+    to_dict()
+        return the counts of the histogram by bucket upper bound
+    """
+
+    def __init__(self, buckets_per_doubling=8, min_latency=0.001):
+        self.buckets_per_doubling = buckets_per_doubling
+        self.min_latency = min_latency
+        self.count = 0
+        self.sum = 0
+        self.max = 0
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def get_bucket(self, latency):
+        """Return the index of the bucket of the latency, bucket 0 holding those
+        from just above 2**(-1/buckets_per_doubling) to 1"""
+        latency = max(latency, self.min_latency)
+        return int(math.ceil(math.log(latency, 2) * self.buckets_per_doubling))
+
+    def get_upper_bound(self, bucket):
+        return 2**(bucket / float(self.buckets_per_doubling))
+
+    def record(self, latency):
+        with self._lock:
+            bucket = self.get_bucket(latency)
+            self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+            self.count += 1
+            self.sum += latency
+            self.max = max(self.max, latency)
+
+    def percentile(self, percent):
+        """Return the latency below which the percent of the latencies fall, as the
+        upper bound of its bucket but at most the largest latency, or None if no
+        latency was recorded"""
+        with self._lock:
+            if not self.count:
+                return None
+            rank = int(math.ceil(self.count * percent / 100.0)) or 1
+            seen = 0
+            for bucket in sorted(self._buckets):
+                seen += self._buckets[bucket]
+                if seen >= rank:
+                    return min(self.get_upper_bound(bucket), self.max)
+            return self.max
+
+    def summary(self, percents=(50, 90, 99)):
+        """Return the count, mean and max of the latencies, and their percentiles
+        as p50, p90, etc"""
+        summary = {
+            "count": self.count,
+            "mean": self.sum / float(self.count) if self.count else None,
+            "max": self.max
+        }
+        for percent in percents:
+            summary["p%g" % percent] = self.percentile(percent)
+        return summary
+
+    def to_dict(self):
+        """Return the histogram as a dictionary, with the counts of the buckets by
+        their upper bound, rounded to 3 significant digits"""
+        with self._lock:
+            buckets = dict(("%.3g" % self.get_upper_bound(bucket), count)
+                           for bucket, count in self._buckets.items())
+            return {
+                "count": self.count,
+                "sum": self.sum,
+                "max": self.max,
+                "buckets": buckets
+            }
+
+
+class SystemMetricsSampler(object):
+    """SystemMetricsSampler samples the system metrics from a background thread
+    every interval, so reading them is only a lookup of the last sample. The first
+    sample is taken when the sampler starts
+
+    Parameters
+    ----------
+    interval : float, optional
+        time in seconds between samples (default is 1)
+    process_metrics : bool, optional
+        if True, the memory (rss) and number of threads of the current process are
+        sampled too (default is False)
+    latency_histogram : bool, optional
+        if True, the latencies recorded between two samples are sampled as a
+        histogram (default is False)
+
+    Attributes
+    ----------
+    snapshot : dict
+        last sample of the metrics, replaced as a whole by the next one and never
+        changed, so it is read without locking
+
+    Methods
+    -------
+    start()
+        take the first sample and start the sampling thread
+    stop()
+        stop the sampling thread
+    sample()
+        return a new sample of the metrics
+    record_latency(latency)
+        count the latency of a prediction, in ms, in the next sample
+    """
+
+    def __init__(self,
+                 interval=1,
+                 process_metrics=False,
+                 latency_histogram=False):
+        self.interval = interval
+        self.process_metrics = process_metrics
+        self.latency_histogram = latency_histogram
+        self.snapshot = {}
+        self._process = psutil.Process() if process_metrics else None
+        self._histogram = LatencyHistogram() if latency_histogram else None
+        self._histogram_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self.snapshot = self.sample()
+            self._thread = threading.Thread(target=self._run)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def sample(self):
+        # cpu_percent is the utilization since its previous call, i.e. the interval
+        metrics = {
+            "cpu_percent": psutil.cpu_percent(),
+            "memory_percent": psutil.virtual_memory().percent
+        }
+        if self._process is not None:
+            metrics["process_rss"] = self._process.memory_info().rss
+            metrics["process_num_threads"] = self._process.num_threads()
+        if self._histogram is not None:
+            # Each sample holds the latencies recorded since the one before
+            with self._histogram_lock:
+                histogram, self._histogram = self._histogram, LatencyHistogram(
+                )
+            metrics["latency_histogram"] = histogram.to_dict()
+        return metrics
+
+    def record_latency(self, latency):
+        if self._histogram is not None:
+            with self._histogram_lock:
+                self._histogram.record(latency)
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.snapshot = self.sample()
@@ -0,0 +1,138 @@
+"""
+Tests for checkout_engine.py
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import hashlib
+import tempfile
+import platform
+from io import open
+try:
+
+    def to_bytes(val):
+        return bytes(val)
+
+    to_bytes("test")
+except TypeError:
+
+    def to_bytes(val):
+        return bytes(val, "utf-8")
+
+    to_bytes("test")
+
+from datmo.core.util.file_index import FileIndex
+from datmo.core.util.checkout_engine import CheckoutEngine
+
+
+class TestCheckoutEngine():
+    def setup_method(self):
+        # provide mountable tmp directory for docker
+        tempfile.tempdir = "/tmp" if not platform.system(
+        ) == "Windows" else None
+        test_datmo_dir = os.environ.get('TEST_DATMO_DIR',
+                                        tempfile.gettempdir())
+        self.temp_dir = tempfile.mkdtemp(dir=test_datmo_dir)
+        self.dst_dirpath = os.path.join(self.temp_dir, "dst")
+        os.makedirs(os.path.join(self.dst_dirpath, "dirpath"))
+        self.contents = {
+            "same.txt": "same",
+            "changed.txt": "new",
+            os.path.join("dirpath", "added.txt"): "added"
+        }
+        self.manifest = dict(
+            (rel_filepath, hashlib.md5(to_bytes(content)).hexdigest())
+            for rel_filepath, content in self.contents.items())
+        self.__write("same.txt", "same")
+        self.__write("changed.txt", "old")
+        self.__write(os.path.join("deleted", "deleted.txt"), "deleted")
+        self.written_filepaths = []
+
+    def teardown_method(self):
+        pass
+
+    def __write(self, rel_filepath, content):
+        absolute_filepath = os.path.join(self.dst_dirpath, rel_filepath)
+        if not os.path.isdir(os.path.dirname(absolute_filepath)):
+            os.makedirs(os.path.dirname(absolute_filepath))
+        with open(absolute_filepath, "wb") as f:
+            f.write(to_bytes(content))
+
+    def __get_filehashes(self, absolute_filepaths):
+        filehashes = []
+        for absolute_filepath in absolute_filepaths:
+            with open(absolute_filepath, "rb") as f:
+                filehashes.append(hashlib.md5(f.read()).hexdigest())
+        return filehashes
+
+    def __write_file(self, rel_filepath, filehash, absolute_filepath):
+        assert filehash == self.manifest[rel_filepath]
+        self.written_filepaths.append(rel_filepath)
+        with open(absolute_filepath, "wb") as f:
+            f.write(to_bytes(self.contents[rel_filepath]))
+        return len(self.contents[rel_filepath])
+
+    def __checkout_engine(self):
+        return CheckoutEngine(self.dst_dirpath,
+                              FileIndex(self.dst_dirpath,
+                                        os.path.join(self.temp_dir,
+                                                     "index.json"),
+                                        self.__get_filehashes))
+
+    def test_diff(self):
+        result = self.__checkout_engine().diff(self.manifest)
+        assert result == {
+            "add": [os.path.join("dirpath", "added.txt")],
+            "replace": ["changed.txt"],
+            "delete": [os.path.join("deleted", "deleted.txt")]
+        }
+
+    def test_checkout(self):
+        checkout_engine = self.__checkout_engine()
+        stats = checkout_engine.checkout(
+            self.manifest, self.__write_file, rel_dirpaths=["dirpath"])
+        assert stats == {
+            "added": 1,
+            "replaced": 1,
+            "deleted": 1,
+            "bytes_written": 8,
+            "bytes_deleted": 10
+        }
+        assert sorted(self.written_filepaths) == \
+               sorted([os.path.join("dirpath", "added.txt"), "changed.txt"])
+        # Directories left empty are removed
+        assert not os.path.exists(os.path.join(self.dst_dirpath, "deleted"))
+        for rel_filepath, content in self.contents.items():
+            with open(os.path.join(self.dst_dirpath, rel_filepath), "rb") as f:
+                assert f.read() == to_bytes(content)
+        # Nothing is written once the directory matches the manifest
+        stats = checkout_engine.checkout(self.manifest, self.__write_file)
+        assert stats["bytes_written"] == 0
+        assert len(self.written_filepaths) == 2
+
+    def test_checkout_managed_files(self):
+        stats = self.__checkout_engine().checkout(
+            self.manifest,
+            self.__write_file,
+            rel_filepaths=["same.txt", "changed.txt"])
+        # Files which are not managed are left in place
+        assert stats["deleted"] == 0
+        assert os.path.isfile(
+            os.path.join(self.dst_dirpath, "deleted", "deleted.txt"))
+        assert os.path.isdir(os.path.join(self.dst_dirpath, "deleted"))
+
+    def test_checkout_file_replaces_directory(self):
+        manifest = {"deleted": self.manifest["same.txt"]}
+        self.contents["deleted"] = "same"
+        self.manifest = manifest
+
+        def write_file(rel_filepath, filehash, absolute_filepath):
+            with open(absolute_filepath, "wb") as f:
+                f.write(to_bytes(self.contents[rel_filepath]))
+            return 4
+
+        stats = self.__checkout_engine().checkout(manifest, write_file)
+        assert stats["added"] == 1
+        assert os.path.isfile(os.path.join(self.dst_dirpath, "deleted"))
@@ -0,0 +1,252 @@
+"""
+Tests for event_transport.py
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import json
+import time
+import tempfile
+import platform
+import threading
+
+from datmo.core.util.event_transport import EventTransport
+
+
+class Endpoint(object):
+    """Records the events sent, answering with the status codes given in turn"""
+
+    def __init__(self, status_codes=None, delay=0):
+        self.status_codes = list(status_codes or [])
+        self.delay = delay
+        self.events = []
+        self.threads = set()
+
+    def send(self, event):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        status_code = self.status_codes.pop(0) if self.status_codes else 200
+        if status_code == 200:
+            self.events.append(event)
+        return {"status_code": status_code}
+
+
+class TestEventTransport():
+    def setup_method(self):
+        # provide mountable tmp directory for docker
+        tempfile.tempdir = "/tmp" if not platform.system(
+        ) == "Windows" else None
+        test_datmo_dir = os.environ.get('TEST_DATMO_DIR',
+                                        tempfile.gettempdir())
+        self.temp_dir = tempfile.mkdtemp(dir=test_datmo_dir)
+        self.spill_dirpath = os.path.join(self.temp_dir, "spill")
+        self.transports = []
+
+    def teardown_method(self):
+        for transport in self.transports:
+            transport.close(1)
+
+    def get_transport(self, endpoint, **kwargs):
+        kwargs.setdefault("flush_interval", 0.05)
+        kwargs.setdefault("backoff_factor", 0.01)
+        transport = EventTransport(endpoint.send, self.spill_dirpath, **kwargs)
+        self.transports.append(transport)
+        return transport
+
+    def get_spilled(self):
+        filepath = os.path.join(self.spill_dirpath, "events.jsonl")
+        if not os.path.isfile(filepath):
+            return []
+        with open(filepath) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def test_put(self):
+        endpoint = Endpoint(delay=0.2)
+        transport = self.get_transport(endpoint)
+        start = time.time()
+        for i in range(5):
+            transport.put({"id": i})
+        # Sending happens in the background
+        assert time.time() - start < 0.1
+        assert transport.flush(5)
+        assert [event["id"] for event in endpoint.events] == list(range(5))
+        assert threading.current_thread().name not in endpoint.threads
+
+    def test_batch(self):
+        endpoint = Endpoint()
+        transport = self.get_transport(endpoint, batch_size=3)
+        batches = []
+        send_batch = transport._send_batch
+        transport._send_batch = lambda batch: (batches.append(len(batch)),
+                                               send_batch(batch))
+        for i in range(7):
+            transport.put({"id": i})
+        assert transport.flush(5)
+        assert sum(batches) == 7
+        assert max(batches) <= 3
+
+    def test_retry(self):
+        endpoint = Endpoint(status_codes=[500, 429, 200])
+        transport = self.get_transport(endpoint)
+        transport.put({"id": 1})
+        assert transport.flush(5)
+        assert endpoint.events == [{"id": 1}]
+        assert self.get_spilled() == []
+
+    def test_rejected(self):
+        endpoint = Endpoint(status_codes=[400])
+        transport = self.get_transport(endpoint)
+        transport.put({"id": 1})
+        transport.put({"id": 2})
+        assert transport.flush(5)
+        # A rejected event is not retried nor spilled
+        assert endpoint.events == [{"id": 2}]
+        assert self.get_spilled() == []
+
+    def test_send_exception(self):
+        def send(event):
+            raise ValueError("unreachable")
+
+        transport = EventTransport(
+            send,
+            self.spill_dirpath,
+            flush_interval=0.05,
+            max_retries=1,
+            backoff_factor=0.01)
+        self.transports.append(transport)
+        transport.put({"id": 1})
+        assert transport.flush(5)
+        assert self.get_spilled() == [{"id": 1}]
+
+    def test_spill_failed(self):
+        # The spill directory cannot be created under a file
+        with open(os.path.join(self.temp_dir, "file"), "w") as f:
+            f.write("test")
+        self.spill_dirpath = os.path.join(self.temp_dir, "file", "spill")
+        endpoint = Endpoint(status_codes=[500])
+        transport = self.get_transport(endpoint, max_retries=0)
+        transport.put({"id": 1})
+        assert transport.flush(5)
+        # The worker keeps sending once the events cannot be spilled
+        transport._unreachable_until = 0
+        transport.put({"id": 2})
+        assert transport.flush(5)
+        assert endpoint.events == [{"id": 2}]
+
+    def test_spill_and_replay(self):
+        endpoint = Endpoint(status_codes=[500] * 3)
+        transport = self.get_transport(
+            endpoint, max_retries=2, retry_interval=0.2)
+        transport.put({"id": 1})
+        transport.put({"id": 2})
+        assert transport.flush(5)
+        # The endpoint is unreachable, the events are kept on disk
+        assert endpoint.events == []
+        assert self.get_spilled() == [{"id": 1}, {"id": 2}]
+        transport.put({"id": 3})
+        assert transport.flush(5)
+        assert endpoint.events == []
+        assert self.get_spilled() == [{"id": 1}, {"id": 2}, {"id": 3}]
+        # Once reachable again, spilled events are sent before new ones
+        time.sleep(0.2)
+        transport.put({"id": 4})
+        assert transport.flush(5)
+        assert [event["id"] for event in endpoint.events] == [1, 2, 3, 4]
+        assert not os.path.isfile(
+            os.path.join(self.spill_dirpath, "events.jsonl"))
+
+    def test_replay_partial(self):
+        endpoint = Endpoint()
+        transport = self.get_transport(endpoint, max_retries=0)
+        transport._spill([{"id": 1}, {"id": 2}, {"id": 3}])
+        endpoint.status_codes = [200, 500]
+        assert not transport._replay()
+        assert endpoint.events == [{"id": 1}]
+        assert self.get_spilled() == [{"id": 2}, {"id": 3}]
+
+    def test_replay_earlier_process(self):
+        endpoint = Endpoint(status_codes=[500])
+        transport = self.get_transport(endpoint, max_retries=0)
+        transport.put({"id": 1})
+        transport.close(5)
+        assert self.get_spilled() == [{"id": 1}]
+        # Spilled events are sent by the next transport
+        endpoint = Endpoint()
+        transport = self.get_transport(endpoint)
+        transport.put({"id": 2})
+        assert transport.flush(5)
+        assert endpoint.events == [{"id": 1}, {"id": 2}]
+
+    def test_replay_stopped_process(self):
+        # A process stopped while sending its spilled events left them aside
+        os.makedirs(self.spill_dirpath)
+        replay_filepath = os.path.join(self.spill_dirpath,
+                                       "events.jsonl.stopped.replay")
+        with open(replay_filepath, "w") as f:
+            f.write(json.dumps({"id": 1}) + "\n")
+        endpoint = Endpoint()
+        transport = self.get_transport(endpoint)
+        transport.put({"id": 2})
+        assert transport.flush(5)
+        assert endpoint.events == [{"id": 1}, {"id": 2}]
+        assert os.listdir(self.spill_dirpath) == []
+
+    def test_spill_while_replaying(self):
+        endpoint = Endpoint(delay=0.5)
+        transport = self.get_transport(endpoint, max_retries=0)
+        transport._spill([{"id": 1}])
+        replay = threading.Thread(target=transport._replay)
+        replay.start()
+        time.sleep(0.1)
+        # Events are spilled while spilled ones are being sent, without waiting
+        start = time.time()
+        transport._spill([{"id": 2}])
+        assert time.time() - start < 0.2
+        replay.join()
+        assert endpoint.events == [{"id": 1}]
+        assert self.get_spilled() == [{"id": 2}]
+
+    def test_queue_full(self):
+        endpoint = Endpoint(delay=0.2)
+        transport = self.get_transport(
+            endpoint, batch_size=1, max_queue_size=1)
+        start = time.time()
+        for i in range(5):
+            transport.put({"id": i})
+        # Events beyond the queue are spilled, not blocking nor lost
+        assert time.time() - start < 0.1
+        assert transport.flush(5)
+        sent = [event["id"] for event in endpoint.events]
+        spilled = [event["id"] for event in self.get_spilled()]
+        assert sorted(sent + spilled) == list(range(5))
+
+    def test_max_spill_size(self):
+        endpoint = Endpoint()
+        transport = self.get_transport(endpoint, max_spill_size=10)
+        transport._spill([{"id": 1}])
+        transport._spill([{"id": 2}])
+        assert self.get_spilled() == [{"id": 1}]
+
+    def test_close(self):
+        endpoint = Endpoint()
+        transport = self.get_transport(endpoint, flush_interval=10)
+        transport.put({"id": 1})
+        transport.close(5)
+        assert endpoint.events == [{"id": 1}]
+        assert not transport._worker.is_alive()
+        # Events put once closed are kept for later
+        transport.put({"id": 2})
+        assert self.get_spilled() == [{"id": 2}]
+
+    def test_close_timeout(self):
+        endpoint = Endpoint(status_codes=[500] * 100)
+        transport = self.get_transport(
+            endpoint, max_retries=100, backoff_factor=0.1)
+        transport.put({"id": 1})
+        start = time.time()
+        transport.close(0.2)
+        assert time.time() - start < 2
+        assert not transport._worker.is_alive()
+        assert self.get_spilled() == [{"id": 1}]
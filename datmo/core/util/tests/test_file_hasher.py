@@ -0,0 +1,97 @@
+"""
+Tests for file_hasher.py
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import hashlib
+import tempfile
+import platform
+import checksumdir
+from io import open
+try:
+
+    def to_bytes(val):
+        return bytes(val)
+
+    to_bytes("test")
+except TypeError:
+
+    def to_bytes(val):
+        return bytes(val, "utf-8")
+
+    to_bytes("test")
+
+from datmo.core.util.file_hasher import FileHasher
+from datmo.core.util.exceptions import PathDoesNotExist
+
+
+class TestFileHasher():
+    def setup_method(self):
+        # provide mountable tmp directory for docker
+        tempfile.tempdir = "/tmp" if not platform.system(
+        ) == "Windows" else None
+        test_datmo_dir = os.environ.get('TEST_DATMO_DIR',
+                                        tempfile.gettempdir())
+        self.temp_dir = tempfile.mkdtemp(dir=test_datmo_dir)
+        os.makedirs(os.path.join(self.temp_dir, "dirpath1", "dirpath2"))
+        self.filepaths = []
+        for i, rel_dirpath in enumerate(
+            ["", "dirpath1",
+             os.path.join("dirpath1", "dirpath2")] * 5):
+            filepath = os.path.join(self.temp_dir, rel_dirpath,
+                                    "file_%s.txt" % i)
+            with open(filepath, "wb") as f:
+                f.write(to_bytes("content %s" % i) * (i * 1000))
+            self.filepaths.append(filepath)
+
+    def teardown_method(self):
+        pass
+
+    def test_get_filehash(self):
+        file_hasher = FileHasher()
+        with open(self.filepaths[3], "rb") as f:
+            assert file_hasher.get_filehash(self.filepaths[3]) == \
+                hashlib.md5(f.read()).hexdigest()
+        failed = False
+        try:
+            file_hasher.get_filehash(os.path.join(self.temp_dir, "random"))
+        except PathDoesNotExist:
+            failed = True
+        assert failed
+
+    def test_get_filehashes(self):
+        expected = [
+            FileHasher(workers=1).get_filehash(filepath)
+            for filepath in self.filepaths
+        ]
+        for workers in [1, 2, 8]:
+            result = FileHasher(workers=workers).get_filehashes(self.filepaths)
+            assert result == expected
+
+    def test_get_filehash_mmap(self):
+        file_hasher = FileHasher()
+        file_hasher.MMAP_THRESHOLD = 1
+        for filepath in self.filepaths:
+            with open(filepath, "rb") as f:
+                assert file_hasher.get_filehash(filepath) == \
+                    hashlib.md5(f.read()).hexdigest()
+
+    def test_get_dirhash(self):
+        expected = checksumdir.dirhash(self.temp_dir)
+        for workers in [1, 2, 8]:
+            assert FileHasher(workers=workers).get_dirhash(
+                self.temp_dir) == expected
+        empty_dirpath = os.path.join(self.temp_dir, "empty")
+        os.makedirs(empty_dirpath)
+        assert FileHasher().get_dirhash(
+            empty_dirpath) == "d41d8cd98f00b204e9800998ecf8427e"
+
+    def test_reduce_filehashes(self):
+        filehashes = FileHasher().get_filehashes(self.filepaths)
+        assert FileHasher.reduce_filehashes(filehashes) == \
+            FileHasher.reduce_filehashes(reversed(filehashes))
+        assert FileHasher.reduce_filehashes(filehashes) == \
+            checksumdir.dirhash(self.temp_dir)
@@ -0,0 +1,142 @@
+"""
+Tests for file_index.py
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import time
+import hashlib
+import tempfile
+import platform
+from io import open
+try:
+
+    def to_bytes(val):
+        return bytes(val)
+
+    to_bytes("test")
+except TypeError:
+
+    def to_bytes(val):
+        return bytes(val, "utf-8")
+
+    to_bytes("test")
+
+from datmo.core.util.file_index import FileIndex
+
+
+class TestFileIndex():
+    def setup_method(self):
+        # provide mountable tmp directory for docker
+        tempfile.tempdir = "/tmp" if not platform.system(
+        ) == "Windows" else None
+        test_datmo_dir = os.environ.get('TEST_DATMO_DIR',
+                                        tempfile.gettempdir())
+        self.temp_dir = tempfile.mkdtemp(dir=test_datmo_dir)
+        self.index_filepath = os.path.join(self.temp_dir, ".datmo", "cache",
+                                           "index.json")
+        self.hashed_filepaths = []
+        with open(os.path.join(self.temp_dir, "test.txt"), "wb") as f:
+            f.write(to_bytes("hello"))
+        with open(os.path.join(self.temp_dir, "test2.txt"), "wb") as f:
+            f.write(to_bytes("world"))
+
+    def teardown_method(self):
+        pass
+
+    def __get_filehashes(self, absolute_filepaths):
+        filehashes = []
+        for absolute_filepath in absolute_filepaths:
+            self.hashed_filepaths.append(absolute_filepath)
+            with open(absolute_filepath, "rb") as f:
+                filehashes.append(hashlib.md5(f.read()).hexdigest())
+        return filehashes
+
+    def __file_index(self):
+        file_index = FileIndex(self.temp_dir, self.index_filepath,
+                               self.__get_filehashes)
+        # Trust entries as soon as they are indexed
+        file_index.racy_window_ns = 0
+        return file_index
+
+    def test_get_filehashes(self):
+        file_index = self.__file_index()
+        result = file_index.get_filehashes(["test.txt", "test2.txt"])
+        assert result == {
+            "test.txt": hashlib.md5(to_bytes("hello")).hexdigest(),
+            "test2.txt": hashlib.md5(to_bytes("world")).hexdigest()
+        }
+        assert len(self.hashed_filepaths) == 2
+        # Unchanged files are not hashed again
+        result_2 = file_index.get_filehashes(["test.txt", "test2.txt"])
+        assert result_2 == result
+        assert len(self.hashed_filepaths) == 2
+
+    def test_get_filehashes_changed(self):
+        file_index = self.__file_index()
+        _ = file_index.get_filehashes(["test.txt", "test2.txt"])
+        # Rewrite with content of the same size and the same mtime, after
+        # waiting out the filesystem timestamp granularity
+        time.sleep(0.05)
+        filepath = os.path.join(self.temp_dir, "test.txt")
+        stat_result = os.stat(filepath)
+        with open(filepath, "wb") as f:
+            f.write(to_bytes("howdy"))
+        os.utime(filepath, (stat_result.st_atime, stat_result.st_mtime))
+        result = file_index.get_filehashes(["test.txt", "test2.txt"])
+        assert result["test.txt"] == hashlib.md5(to_bytes("howdy")).hexdigest()
+        assert self.hashed_filepaths.count(filepath) == 2
+        assert len(self.hashed_filepaths) == 3
+
+    def test_racy_window(self):
+        file_index = FileIndex(self.temp_dir, self.index_filepath,
+                               self.__get_filehashes)
+        # Files which were just modified are always hashed again
+        _ = file_index.get_filehashes(["test.txt"])
+        _ = file_index.get_filehashes(["test.txt"])
+        assert len(self.hashed_filepaths) == 2
+
+    def test_save(self):
+        file_index = self.__file_index()
+        assert not file_index.save()
+        _ = file_index.get_filehashes(["test.txt", "test2.txt"])
+        assert file_index.save()
+        assert os.path.isfile(self.index_filepath)
+        # Nothing to write if nothing changed
+        assert not file_index.save()
+        # A new index loads the saved entries and does not hash again
+        file_index_2 = self.__file_index()
+        _ = file_index_2.get_filehashes(["test.txt", "test2.txt"])
+        assert len(self.hashed_filepaths) == 2
+        assert file_index_2.entries == file_index.entries
+
+    def test_load_corrupt(self):
+        os.makedirs(os.path.dirname(self.index_filepath))
+        with open(self.index_filepath, "wb") as f:
+            f.write(to_bytes("{not json"))
+        file_index = self.__file_index()
+        assert file_index.entries == {}
+        result = file_index.get_filehashes(["test.txt"])
+        assert result["test.txt"] == hashlib.md5(to_bytes("hello")).hexdigest()
+
+    def test_prune(self):
+        file_index = self.__file_index()
+        _ = file_index.get_filehashes(["test.txt", "test2.txt"])
+        file_index.prune(["test.txt"])
+        assert list(file_index.entries) == ["test.txt"]
+
+    def test_save_prune_missing(self):
+        file_index = self.__file_index()
+        _ = file_index.get_filehashes(["test.txt", "test2.txt"])
+        file_index.save()
+        os.remove(os.path.join(self.temp_dir, "test2.txt"))
+        # Entries of missing files are only removed when the index is written
+        assert not file_index.save(prune_missing=True)
+        assert sorted(file_index.entries) == ["test.txt", "test2.txt"]
+        with open(os.path.join(self.temp_dir, "test3.txt"), "wb") as f:
+            f.write(to_bytes("hello"))
+        _ = file_index.get_filehashes(["test3.txt"])
+        assert file_index.save(prune_missing=True)
+        assert sorted(self.__file_index().entries) == ["test.txt", "test3.txt"]
@@ -0,0 +1,90 @@
+"""
+Tests for file_lock.py
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import sys
+import tempfile
+import platform
+import subprocess
+from io import open
+
+from datmo.core.util.file_lock import FileLock
+
+
+class TestFileLock():
+    def setup_method(self):
+        # provide mountable tmp directory for docker
+        tempfile.tempdir = "/tmp" if not platform.system(
+        ) == "Windows" else None
+        test_datmo_dir = os.environ.get('TEST_DATMO_DIR',
+                                        tempfile.gettempdir())
+        self.temp_dir = tempfile.mkdtemp(dir=test_datmo_dir)
+        self.filepath = os.path.join(self.temp_dir, "test.lock")
+
+    def test_acquire_release(self):
+        lock = FileLock(self.filepath)
+        other_lock = FileLock(self.filepath)
+        assert not other_lock.is_locked()
+        assert lock.acquire()
+        assert lock.locked
+        assert os.path.isfile(self.filepath)
+        # Locks on the same file exclude each other
+        assert not other_lock.acquire()
+        assert other_lock.is_locked()
+        # Acquiring a lock already held succeeds
+        assert lock.acquire()
+        lock.release()
+        assert not lock.locked
+        assert not other_lock.is_locked()
+        assert other_lock.acquire()
+        other_lock.release()
+        # The file is kept unless removed
+        assert os.path.isfile(self.filepath)
+
+    def test_release_remove(self):
+        lock = FileLock(self.filepath)
+        assert lock.acquire()
+        lock.release(remove=True)
+        assert not os.path.isfile(self.filepath)
+        assert not lock.is_locked()
+        # Checking the lock does not create the file
+        assert not os.path.isfile(self.filepath)
+
+    def test_write(self):
+        lock = FileLock(self.filepath)
+        lock.acquire()
+        lock.write("1234")
+        lock.write("56")
+        with open(self.filepath, "r") as f:
+            assert f.read() == "56"
+        lock.release()
+        # Another holder does not truncate the content
+        assert FileLock(self.filepath).acquire()
+        with open(self.filepath, "r") as f:
+            assert f.read() == "56"
+
+    def test_process_exit(self):
+        # The lock held by a process is released when it exits
+        script = ("import sys\n"
+                  "from datmo.core.util.file_lock import FileLock\n"
+                  "lock = FileLock(sys.argv[1])\n"
+                  "lock.acquire()\n"
+                  "sys.stdout.write('locked\\n')\n"
+                  "sys.stdout.flush()\n"
+                  "sys.stdin.readline()\n")
+        process = subprocess.Popen(
+            [sys.executable, "-c", script, self.filepath],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE)
+        assert process.stdout.readline().strip() == b"locked"
+        lock = FileLock(self.filepath)
+        assert lock.is_locked()
+        assert not lock.acquire()
+        process.communicate(b"\n")
+        assert not lock.is_locked()
+        assert lock.acquire()
+        lock.release()
@@ -5,8 +5,10 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import stat
 import tempfile
 import platform
+import threading
 import os
 from io import open
 try:
@@ -88,3 +90,88 @@ class TestJSONStore():
         except FileIOError:
             failed = True
         assert failed
+
+    def test_save_many(self):
+        storage = JSONStore(os.path.join(self.temp_dir, "save_many.json"))
+        storage.save("foo", "bar")
+        storage.save_many({"foo": "baz", "number": 1, "obj": {"a": [1, 2]}})
+        assert storage.to_dict() == {
+            "foo": "baz",
+            "number": 1,
+            "obj": {
+                "a": [1, 2]
+            }
+        }
+        storage.remove_many(["foo", "number", "missing"])
+        assert storage.to_dict() == {"obj": {"a": [1, 2]}}
+
+    def test_remove(self):
+        storage = JSONStore(os.path.join(self.temp_dir, "remove.json"))
+        assert storage.remove("foo") is None
+        storage.save("foo", "bar")
+        storage.remove("foo")
+        assert storage.get("foo") is None
+        assert storage.to_dict() == {}
+
+    def test_cache(self):
+        filepath = os.path.join(self.temp_dir, "cache.json")
+        storage = JSONStore(filepath, {"foo": "bar"})
+        other_storage = JSONStore(filepath)
+        assert other_storage.get("foo") == "bar"
+        # Changes from other stores of the same file are read
+        storage.save("foo", "baz")
+        assert other_storage.get("foo") == "baz"
+        assert other_storage.to_dict() == {"foo": "baz"}
+        # Values returned are copies of the values in memory
+        storage.save("obj", {"a": 1})
+        storage.get("obj")["a"] = 2
+        storage.to_dict()["obj"]["a"] = 2
+        assert storage.get("obj") == {"a": 1}
+
+    def test_write_atomic(self):
+        dirpath = os.path.join(self.temp_dir, "atomic")
+        storage = JSONStore(os.path.join(dirpath, "atomic.json"))
+        storage.save("foo", "bar")
+        storage.to_file({"foo": "baz"})
+        # Only the file is left in the directory
+        assert os.listdir(dirpath) == ["atomic.json"]
+        assert storage.get("foo") == "baz"
+
+    def test_write_mode(self):
+        if platform.system() == "Windows":
+            # Windows only has a read-only mode
+            return
+        filepath = os.path.join(self.temp_dir, "mode.json")
+        umask = os.umask(0o077)
+        try:
+            JSONStore(filepath, initial_dict={"foo": "bar"})
+        finally:
+            os.umask(umask)
+        # A new file is created with the mode given by the umask
+        assert stat.S_IMODE(os.stat(filepath).st_mode) == 0o600
+        # The mode of the file is kept when it is written again
+        os.chmod(filepath, 0o640)
+        storage = JSONStore(filepath)
+        storage.save("foo", "baz")
+        storage.to_file({"foo": "qux"})
+        assert stat.S_IMODE(os.stat(filepath).st_mode) == 0o640
+
+    def test_save_concurrent(self):
+        filepath = os.path.join(self.temp_dir, "concurrent.json")
+        JSONStore(filepath)
+
+        def save_keys(index):
+            storage = JSONStore(filepath)
+            for key_index in range(20):
+                storage.save("key_%d_%d" % (index, key_index), key_index)
+
+        threads = [
+            threading.Thread(target=save_keys, args=(index, ))
+            for index in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # No key is lost to a concurrent write
+        assert len(JSONStore(filepath).to_dict()) == 4 * 20
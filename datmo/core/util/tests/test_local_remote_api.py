@@ -0,0 +1,211 @@
+"""
+Tests for local_remote_api.py
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import ast
+import json
+import tempfile
+import platform
+
+from datmo.config import Config
+from datmo.core.util.remote_api import RemoteAPI, get_remote_api
+from datmo.core.util.local_remote_api import LocalRemoteAPI
+
+
+class TestLocalRemoteAPI():
+    def setup_method(self):
+        # provide mountable tmp directory for docker
+        tempfile.tempdir = "/tmp" if not platform.system(
+        ) == "Windows" else None
+        test_datmo_dir = os.environ.get('TEST_DATMO_DIR',
+                                        tempfile.gettempdir())
+        self.temp_dir = tempfile.mkdtemp(dir=test_datmo_dir)
+        self.database_filepath = os.path.join(self.temp_dir, "remote.sqlite")
+        self.remote_api = LocalRemoteAPI("api_key", self.database_filepath)
+
+    def teardown_method(self):
+        self.remote_api.close()
+
+    def post(self, created_at, **kwargs):
+        input_data = {
+            "input": json.dumps({
+                "f1": created_at
+            }),
+            "prediction": json.dumps({
+                "p": 1
+            }),
+            "system_metrics": {
+                "cpu_percent": 10.0
+            },
+            "model_id": "model_id",
+            "created_at": created_at,
+            "api_key": "api_key"
+        }
+        input_data.update(kwargs)
+        response = self.remote_api.post_data(input_data)
+        assert response["status_code"] == 200
+        return response["body"]["id"]
+
+    def test_get_remote_api(self):
+        os.environ["DATMO_REMOTE_BACKEND"] = "local"
+        os.environ["DATMO_REMOTE_DATABASE"] = self.database_filepath
+        try:
+            assert Config().remote_backend == ("local", self.database_filepath)
+            remote_api = get_remote_api("api_key")
+            assert isinstance(remote_api, LocalRemoteAPI)
+            assert remote_api.database_filepath == self.database_filepath
+            remote_api.close()
+            os.environ["DATMO_REMOTE_BACKEND"] = "remote"
+            assert isinstance(get_remote_api("api_key"), RemoteAPI)
+        finally:
+            del os.environ["DATMO_REMOTE_BACKEND"]
+            del os.environ["DATMO_REMOTE_DATABASE"]
+
+    def test_post_data(self):
+        data_id = self.post(1)
+        assert data_id
+        assert self.post(2) != data_id
+        # Ids given by the client are kept, and posting twice stores once
+        assert self.post(3, id="client_id") == "client_id"
+        assert self.post(3, id="client_id") == "client_id"
+        assert len(self.remote_api.get_data({})["body"]) == 3
+        # The same id sent with another api key is another prediction
+        other_remote_api = LocalRemoteAPI("other_api_key",
+                                          self.database_filepath)
+        other_remote_api.post_data({"id": "client_id", "created_at": 4})
+        other_remote_api.update_actual("client_id", {"feedback": "{}"})
+        other_remote_api.close()
+        body = self.remote_api.get_data({"id": "client_id"})["body"]
+        assert len(body) == 1
+        assert body[0]["created_at"] == 3
+        assert "feedback" not in body[0]
+
+    def test_no_api_key(self):
+        remote_api = LocalRemoteAPI(None, self.database_filepath)
+        remote_api.post_data({"id": "client_id", "created_at": 1})
+        remote_api.post_data({"id": "client_id", "created_at": 1})
+        assert len(remote_api.get_data({})["body"]) == 1
+        assert remote_api.update_actual("client_id", {
+            "feedback": "{}"
+        })["body"]["updated"] == 1
+        assert self.remote_api.get_data({})["body"] == []
+        remote_api.close()
+
+    def test_get_data(self):
+        first_id = self.post(1, model_version_id="v1")
+        self.post(3, model_version_id="v2", deployment_version_id="d1")
+        self.post(2, model_version_id="v1", deployment_version_id="d1")
+        self.post(4, model_id="other_model_id")
+        body = self.remote_api.get_data({"model_id": "model_id"})["body"]
+        assert [datum["created_at"] for datum in body] == [1, 2, 3]
+        assert body[0]["id"] == first_id
+        assert body[0]["input"] == json.dumps({"f1": 1})
+        assert body[0]["system_metrics"] == {"cpu_percent": 10.0}
+        assert "api_key" not in body[0]
+        body = self.remote_api.get_data({
+            "model_id": "model_id",
+            "sort_created_at": "desc"
+        })["body"]
+        assert [datum["created_at"] for datum in body] == [3, 2, 1]
+        body = self.remote_api.get_data({
+            "model_id": "model_id",
+            "model_version_id": "v1"
+        })["body"]
+        assert [datum["created_at"] for datum in body] == [1, 2]
+        body = self.remote_api.get_data({
+            "model_id": "model_id",
+            "deployment_version_id": "d1"
+        })["body"]
+        assert [datum["created_at"] for datum in body] == [2, 3]
+        body = self.remote_api.get_data({"id": first_id})["body"]
+        assert [datum["id"] for datum in body] == [first_id]
+        # Data of other api keys is not returned
+        other_remote_api = LocalRemoteAPI("other_api_key",
+                                          self.database_filepath)
+        assert other_remote_api.get_data({})["body"] == []
+        other_remote_api.close()
+
+    def test_get_data_page(self):
+        for created_at in range(10):
+            self.post(created_at)
+        body = self.remote_api.get_data({
+            "model_id": "model_id",
+            "start": 2,
+            "count": 3
+        })["body"]
+        assert [datum["created_at"] for datum in body] == [2, 3, 4]
+        body = self.remote_api.get_data({
+            "model_id": "model_id",
+            "start": 8
+        })["body"]
+        assert [datum["created_at"] for datum in body] == [8, 9]
+        body = self.remote_api.get_data({
+            "model_id": "model_id",
+            "start": 0,
+            "count": 2,
+            "sort_created_at": "desc"
+        })["body"]
+        assert [datum["created_at"] for datum in body] == [9, 8]
+        # Pages sorted by creation time are read from an index
+        plan = " ".join(
+            str(row)
+            for row in self.remote_api.connection.execute(
+                "EXPLAIN QUERY PLAN SELECT document FROM metadata "
+                "WHERE api_key = ? AND model_id = ? "
+                "ORDER BY created_at ASC, rowid ASC LIMIT 2 OFFSET 2", (
+                    "api_key", "model_id")))
+        assert "USING INDEX" in plan
+
+    def test_update_actual(self):
+        data_id = self.post(1)
+        response = self.remote_api.update_actual(
+            data_id, {
+                "updated_at": 5,
+                "feedback": json.dumps({
+                    "y": 1
+                }),
+                "api_key": "api_key"
+            })
+        assert response["body"]["updated"] == 1
+        datum = self.remote_api.get_data({"id": data_id})["body"][0]
+        assert ast.literal_eval(datum["updated_at"]) == 5
+        assert ast.literal_eval(datum["feedback"]) == {"y": 1}
+        assert datum["created_at"] == 1
+        response = self.remote_api.update_actual("missing_id", {
+            "updated_at": 5
+        })
+        assert response["body"]["updated"] == 0
+        assert self.remote_api.update_actual(data_id,
+                                             "feedback")["status_code"] == 500
+
+    def test_delete_data(self):
+        data_id = self.post(1)
+        self.post(2)
+        body = self.remote_api.delete_data({
+            "model_id": "model_id",
+            "id": data_id
+        })["body"]
+        assert body == {"total": 1, "deleted": 1}
+        assert len(self.remote_api.get_data({})["body"]) == 1
+        body = self.remote_api.delete_data({"model_id": "model_id"})["body"]
+        assert body["deleted"] == 1
+        assert self.remote_api.get_data({})["body"] == []
+
+    def test_deployment_info(self):
+        assert self.remote_api.get_deployment_info()["status_code"] == 404
+        deployment_info = {
+            "master_system_info": {
+                "datmo_master_ip": "127.0.0.1"
+            },
+            "cluster_info": {
+                "clusters": []
+            }
+        }
+        self.remote_api.set_deployment_info(deployment_info)
+        response = self.remote_api.get_deployment_info()
+        assert response["status_code"] == 200
+        assert response["body"] == deployment_info
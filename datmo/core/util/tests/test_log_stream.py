@@ -0,0 +1,129 @@
+"""
+Tests for log_stream.py
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import gzip
+import time
+import tempfile
+import platform
+from io import open
+
+from datmo.core.util.log_stream import LogWriter, LogReader, \
+    parse_result_line, is_compressed
+
+
+class TestLogStream():
+    def setup_method(self):
+        # provide mountable tmp directory for docker
+        tempfile.tempdir = "/tmp" if not platform.system(
+        ) == "Windows" else None
+        test_datmo_dir = os.environ.get('TEST_DATMO_DIR',
+                                        tempfile.gettempdir())
+        self.temp_dir = tempfile.mkdtemp(dir=test_datmo_dir)
+        self.lines = ["line %d" % i for i in range(2500)]
+
+    def __write(self, filename, lines, **kwargs):
+        filepath = os.path.join(self.temp_dir, filename)
+        with LogWriter(filepath, **kwargs) as log_writer:
+            for line in lines:
+                log_writer.write(line + "\n")
+        return filepath, log_writer
+
+    def test_parse_result_line(self):
+        assert parse_result_line("accuracy : 0.94") == ("accuracy", "0.94")
+        assert parse_result_line("accuracy is good") is None
+        assert parse_result_line("time: 12:30") is None
+
+    def test_write_compressed(self):
+        filepath, log_writer = self.__write("task.log.gz", self.lines)
+        assert log_writer.compressed
+        assert log_writer.line_count == 2500
+        assert is_compressed(filepath)
+        # Readable as a regular gzip file
+        with gzip.open(filepath, "rb") as f:
+            assert f.read().decode("utf-8") == "\n".join(self.lines) + "\n"
+
+    def test_write_plain(self):
+        filepath, log_writer = self.__write("task.log", self.lines)
+        assert not log_writer.compressed
+        assert not is_compressed(filepath)
+        with open(filepath, "r") as f:
+            assert f.read() == "\n".join(self.lines) + "\n"
+
+    def test_write_multiline(self):
+        filepath, log_writer = self.__write("task.log.gz",
+                                            ["first\nsecond", "third"])
+        assert log_writer.line_count == 3
+        assert LogReader(filepath).read() == ["first", "second", "third"]
+
+    def test_get_tail(self):
+        _, log_writer = self.__write("task.log.gz", self.lines, tail_size=20)
+        assert log_writer.get_tail() == "line 2498\nline 2499\n"
+        _, log_writer = self.__write("task.log.gz", ["a" * 100], tail_size=20)
+        # The last line is kept even if it is longer than the tail
+        assert log_writer.get_tail() == "a" * 100 + "\n"
+
+    def test_results(self):
+        lines = ["accuracy:0.5", "training"] + self.lines + [
+            "accuracy : 0.9", "loss:0.1", "time: 12:30"
+        ]
+        _, log_writer = self.__write("task.log.gz", lines, tail_size=20)
+        # Results are parsed as lines arrive, not only from the tail
+        assert log_writer.results == {"accuracy": "0.9", "loss": "0.1"}
+        results = {"epochs": "3"}
+        _, log_writer = self.__write(
+            "task.log", ["accuracy:0.5"], results=results)
+        assert log_writer.results is results
+        assert results == {"epochs": "3", "accuracy": "0.5"}
+
+    def test_read(self):
+        for filename in ["task.log.gz", "task.log"]:
+            filepath, _ = self.__write(filename, self.lines)
+            log_reader = LogReader(filepath)
+            assert log_reader.count() == 2500
+            assert log_reader.read() == self.lines
+            assert log_reader.read(limit=2) == ["line 0", "line 1"]
+            assert log_reader.read(offset=999, limit=3) == \
+                ["line 999", "line 1000", "line 1001"]
+            assert log_reader.read(offset=2499) == ["line 2499"]
+            assert log_reader.read(offset=2500) == []
+            assert log_reader.read(limit=0) == []
+
+    def test_read_gzip(self):
+        filepath = os.path.join(self.temp_dir, "other.log.gz")
+        with gzip.open(filepath, "wb") as f:
+            f.write("\n".join(self.lines).encode("utf-8"))
+        log_reader = LogReader(filepath)
+        assert log_reader.count() == 2500
+        assert log_reader.read(offset=1000, limit=1) == ["line 1000"]
+
+    def test_read_while_writing(self):
+        filepath = os.path.join(self.temp_dir, "task.log.gz")
+        log_writer = LogWriter(filepath, flush_interval=None)
+        for line in self.lines[:1500]:
+            log_writer.write(line)
+        # Only the lines of the blocks written so far are read
+        assert LogReader(filepath).read() == self.lines[:1000]
+        log_writer.close()
+        assert LogReader(filepath).read() == self.lines[:1500]
+
+    def test_flush_interval(self):
+        for filename in ["task.log.gz", "task.log"]:
+            filepath = os.path.join(self.temp_dir, filename)
+            log_writer = LogWriter(filepath, flush_interval=0.05)
+            log_writer.write("first")
+            # The lines of a partial block are written within the interval
+            deadline = time.time() + 5
+            while not LogReader(filepath).read() and time.time() < deadline:
+                time.sleep(0.01)
+            assert LogReader(filepath).read() == ["first"]
+            log_writer.write("second")
+            log_writer.flush()
+            assert LogReader(filepath).read() == ["first", "second"]
+            log_writer.close()
+            assert not log_writer._flusher.is_alive()
+            assert LogReader(filepath).read() == ["first", "second"]
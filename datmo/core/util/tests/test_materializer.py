@@ -0,0 +1,105 @@
+"""
+Tests for materializer.py
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import tempfile
+import platform
+from io import open
+try:
+
+    def to_bytes(val):
+        return bytes(val)
+
+    to_bytes("test")
+except TypeError:
+
+    def to_bytes(val):
+        return bytes(val, "utf-8")
+
+    to_bytes("test")
+
+from datmo.core.util.materializer import Materializer
+from datmo.core.util.exceptions import InvalidArgumentType
+
+
+class TestMaterializer():
+    def setup_method(self):
+        # provide mountable tmp directory for docker
+        tempfile.tempdir = "/tmp" if not platform.system(
+        ) == "Windows" else None
+        test_datmo_dir = os.environ.get('TEST_DATMO_DIR',
+                                        tempfile.gettempdir())
+        self.temp_dir = tempfile.mkdtemp(dir=test_datmo_dir)
+        self.src_dirpath = os.path.join(self.temp_dir, "src")
+        self.dst_dirpath = os.path.join(self.temp_dir, "dst")
+        os.makedirs(os.path.join(self.src_dirpath, "dirpath1"))
+        os.makedirs(self.dst_dirpath)
+        with open(os.path.join(self.src_dirpath, "filepath1"), "wb") as f:
+            f.write(to_bytes("hello"))
+        with open(
+                os.path.join(self.src_dirpath, "dirpath1", "filepath2"),
+                "wb") as f:
+            f.write(to_bytes("world!"))
+
+    def teardown_method(self):
+        pass
+
+    def __read(self, filepath):
+        with open(filepath, "rb") as f:
+            return f.read()
+
+    def __check_tree(self):
+        assert self.__read(os.path.join(self.dst_dirpath,
+                                        "filepath1")) == to_bytes("hello")
+        assert self.__read(
+            os.path.join(self.dst_dirpath, "dirpath1",
+                         "filepath2")) == to_bytes("world!")
+
+    def test_init_fail(self):
+        failed = False
+        try:
+            Materializer(mode="random")
+        except InvalidArgumentType:
+            failed = True
+        assert failed
+
+    def test_copy(self):
+        materializer = Materializer(mode="copy")
+        result = materializer.tree(self.src_dirpath, self.dst_dirpath)
+        assert result == 11
+        self.__check_tree()
+        assert not os.path.samefile(
+            os.path.join(self.src_dirpath, "filepath1"),
+            os.path.join(self.dst_dirpath, "filepath1"))
+
+    def test_reflink(self):
+        materializer = Materializer(mode="reflink")
+        result = materializer.tree(self.src_dirpath, self.dst_dirpath)
+        # Nothing is written if the filesystem supports reflinks
+        assert result in [0, 11]
+        self.__check_tree()
+        # Writing to the destination never changes the source
+        with open(os.path.join(self.dst_dirpath, "filepath1"), "wb") as f:
+            f.write(to_bytes("howdy"))
+        assert self.__read(os.path.join(self.src_dirpath,
+                                        "filepath1")) == to_bytes("hello")
+
+    def test_hardlink(self):
+        materializer = Materializer(mode="hardlink")
+        result = materializer.tree(self.src_dirpath, self.dst_dirpath)
+        self.__check_tree()
+        if not platform.system() == "Windows":
+            assert result == 0
+
+    def test_tree_ignore(self):
+        materializer = Materializer(mode="copy")
+        result = materializer.tree(
+            self.src_dirpath,
+            self.dst_dirpath,
+            ignore=lambda dirpath, names: set(["dirpath1"]))
+        assert result == 5
+        assert os.listdir(self.dst_dirpath) == ["filepath1"]
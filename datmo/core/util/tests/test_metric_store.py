@@ -0,0 +1,108 @@
+"""
+Tests for metric_store.py
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import pytest
+import tempfile
+import platform
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from datmo.core.util.metric_store import MetricStore, RECORD_SIZE
+from datmo.core.util.exceptions import InvalidArgumentType
+
+numpy_not_installed = pytest.mark.skipif(
+    numpy is None, reason="numpy is required to read metrics back as arrays")
+
+
+class TestMetricStore():
+    def setup_method(self):
+        # provide mountable tmp directory for docker
+        tempfile.tempdir = "/tmp" if not platform.system(
+        ) == "Windows" else None
+        test_datmo_dir = os.environ.get('TEST_DATMO_DIR',
+                                        tempfile.gettempdir())
+        self.temp_dir = tempfile.mkdtemp(dir=test_datmo_dir)
+        self.dirpath = os.path.join(self.temp_dir, "metrics")
+        self.metric_store = MetricStore(self.dirpath)
+
+    def teardown_method(self):
+        self.metric_store.close()
+
+    def test_log(self):
+        assert self.metric_store.log("loss", 0.5) == 0
+        assert self.metric_store.log("loss", 0.4) == 1
+        assert self.metric_store.log("accuracy", 0.8, step=10) == 10
+        assert self.metric_store.log("loss", 0.3, step=5) == 5
+        assert self.metric_store.log("loss", 0.2) == 6
+        assert self.metric_store.get_keys() == ["loss", "accuracy"]
+        assert os.path.getsize(
+            self.metric_store.records_filepath) == 5 * RECORD_SIZE
+        records = list(self.metric_store.iter_records())
+        assert [
+            (step, key, value) for step, _, key, value in records
+        ] == [(0, "loss", 0.5), (1, "loss", 0.4), (10, "accuracy", 0.8),
+              (5, "loss", 0.3), (6, "loss", 0.2)]
+
+    def test_log_append(self):
+        self.metric_store.log("loss", 0.5)
+        self.metric_store.log("accuracy", 0.8, timestamp=1.5)
+        self.metric_store.close()
+        # A new store appends to the metrics logged before
+        metric_store = MetricStore(self.dirpath)
+        assert metric_store.log("loss", 0.4) == 1
+        assert metric_store.log("accuracy", 0.9) == 1
+        metric_store.close()
+        records = list(metric_store.iter_records())
+        assert len(records) == 4
+        assert records[1] == (0, 1.5, "accuracy", 0.8)
+
+    def test_log_failure(self):
+        for value, step in [("0.5", None), (True, None), (None, None),
+                            (0.5, 1.5), (0.5, "1")]:
+            failed = False
+            try:
+                self.metric_store.log("loss", value, step=step)
+            except InvalidArgumentType:
+                failed = True
+            assert failed
+        assert not os.path.exists(self.metric_store.records_filepath)
+
+    def test_iter_records_partial(self):
+        self.metric_store.log("loss", 0.5)
+        self.metric_store.close()
+        # A record still being written is left out
+        with open(self.metric_store.records_filepath, "ab") as f:
+            f.write(b"\x00" * (RECORD_SIZE - 1))
+        assert len(list(self.metric_store.iter_records())) == 1
+
+    @numpy_not_installed
+    def test_read_records(self):
+        assert len(self.metric_store.read_records()) == 0
+        for step in range(1000):
+            self.metric_store.log("loss", 1.0 / (step + 1))
+        records = self.metric_store.read_records()
+        assert len(records) == 1000
+        assert records["step"][-1] == 999
+        assert records["value"][-1] == 1.0 / 1000
+
+    @numpy_not_installed
+    def test_read(self):
+        assert self.metric_store.read() == {}
+        self.metric_store.log("loss", 0.5, step=1)
+        self.metric_store.log("accuracy", 0.8, step=0)
+        self.metric_store.log("loss", 0.6, step=0)
+        metrics = self.metric_store.read()
+        assert sorted(metrics) == ["accuracy", "loss"]
+        assert list(metrics["loss"]["step"]) == [0, 1]
+        assert list(metrics["loss"]["value"]) == [0.6, 0.5]
+        assert len(metrics["loss"]["timestamp"]) == 2
+        metrics = self.metric_store.read(keys=["accuracy", "unknown"])
+        assert list(metrics) == ["accuracy"]
+        assert list(metrics["accuracy"]["value"]) == [0.8]
@@ -0,0 +1,150 @@
+"""
+Tests for object_store.py
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import hashlib
+import tempfile
+import platform
+from io import open
+try:
+
+    def to_bytes(val):
+        return bytes(val)
+
+    to_bytes("test")
+except TypeError:
+
+    def to_bytes(val):
+        return bytes(val, "utf-8")
+
+    to_bytes("test")
+
+from datmo.core.util.object_store import ObjectStore
+from datmo.core.util.exceptions import InvalidArgumentType, PathDoesNotExist
+
+
+class TestObjectStore():
+    def setup_method(self):
+        # provide mountable tmp directory for docker
+        tempfile.tempdir = "/tmp" if not platform.system(
+        ) == "Windows" else None
+        test_datmo_dir = os.environ.get('TEST_DATMO_DIR',
+                                        tempfile.gettempdir())
+        self.temp_dir = tempfile.mkdtemp(dir=test_datmo_dir)
+        self.objects_dirpath = os.path.join(self.temp_dir, "objects")
+        self.filepath = os.path.join(self.temp_dir, "test.txt")
+        with open(self.filepath, "wb") as f:
+            f.write(to_bytes("hello"))
+        self.filehash = hashlib.md5(to_bytes("hello")).hexdigest()
+
+    def teardown_method(self):
+        pass
+
+    def __read(self, filepath):
+        with open(filepath, "rb") as f:
+            return f.read()
+
+    def test_init_fail(self):
+        failed = False
+        try:
+            ObjectStore(self.objects_dirpath, compression="random")
+        except InvalidArgumentType:
+            failed = True
+        assert failed
+
+    def test_add(self):
+        object_store = ObjectStore(self.objects_dirpath)
+        assert not object_store.exists(self.filehash)
+        result = object_store.add(self.filepath, self.filehash)
+        assert result == 5
+        assert object_store.exists(self.filehash)
+        assert os.path.isfile(
+            os.path.join(self.objects_dirpath, self.filehash[:2],
+                         self.filehash[2:]))
+        assert os.path.isfile(self.filepath)
+        # Content already stored is not written again
+        result = object_store.add(self.filepath, self.filehash)
+        assert result == 0
+
+    def test_add_move(self):
+        object_store = ObjectStore(self.objects_dirpath)
+        result = object_store.add(self.filepath, self.filehash, move=True)
+        assert result == 5
+        assert not os.path.exists(self.filepath)
+        assert object_store.exists(self.filehash)
+
+    def test_copy(self):
+        object_store = ObjectStore(self.objects_dirpath)
+        dst_filepath = os.path.join(self.temp_dir, "dst.txt")
+        failed = False
+        try:
+            object_store.copy(self.filehash, dst_filepath)
+        except PathDoesNotExist:
+            failed = True
+        assert failed
+        object_store.add(self.filepath, self.filehash)
+        result = object_store.copy(self.filehash, dst_filepath)
+        assert result == 5
+        assert self.__read(dst_filepath) == to_bytes("hello")
+
+    def test_link(self):
+        object_store = ObjectStore(self.objects_dirpath)
+        object_store.add(self.filepath, self.filehash)
+        dst_filepath = os.path.join(self.temp_dir, "dst.txt")
+        result = object_store.link(self.filehash, dst_filepath)
+        assert self.__read(dst_filepath) == to_bytes("hello")
+        if not platform.system() == "Windows":
+            assert result == 0
+            assert os.path.samefile(dst_filepath,
+                                    os.path.join(self.objects_dirpath,
+                                                 self.filehash[:2],
+                                                 self.filehash[2:]))
+
+    def test_mode(self):
+        if platform.system() == "Windows":
+            return
+        os.chmod(self.filepath, 0o644)
+        object_store = ObjectStore(self.objects_dirpath)
+        object_store.add(self.filepath, self.filehash, mode=0o755)
+        object_filepath = os.path.join(self.objects_dirpath, self.filehash[:2],
+                                       self.filehash[2:])
+        assert os.stat(object_filepath).st_mode & 0o777 == 0o755
+        # The permissions of an object are those it was added with
+        object_store.add(self.filepath, self.filehash, mode=0o600)
+        assert os.stat(object_filepath).st_mode & 0o777 == 0o755
+        dst_filepath = os.path.join(self.temp_dir, "dst.txt")
+        assert object_store.link(self.filehash, dst_filepath, mode=0o755) == 0
+        assert os.path.samefile(dst_filepath, object_filepath)
+        # Objects with other permissions are copied rather than changed
+        dst_filepath_2 = os.path.join(self.temp_dir, "dst_2.txt")
+        assert object_store.link(
+            self.filehash, dst_filepath_2, mode=0o644) == 5
+        assert os.stat(dst_filepath_2).st_mode & 0o777 == 0o644
+        assert os.stat(object_filepath).st_mode & 0o777 == 0o755
+        dst_filepath_3 = os.path.join(self.temp_dir, "dst_3.txt")
+        object_store.copy(self.filehash, dst_filepath_3, mode=0o600)
+        assert os.stat(dst_filepath_3).st_mode & 0o777 == 0o600
+
+    def test_compression(self):
+        with open(self.filepath, "wb") as f:
+            f.write(to_bytes("hello" * 1000))
+        filehash = hashlib.md5(to_bytes("hello" * 1000)).hexdigest()
+        object_store = ObjectStore(self.objects_dirpath, compression="zlib")
+        result = object_store.add(self.filepath, filehash)
+        assert 0 < result < 5000
+        assert os.path.isfile(
+            os.path.join(self.objects_dirpath, filehash[:2],
+                         filehash[2:] + ".z"))
+        # Compressed objects are copied, not linked
+        dst_filepath = os.path.join(self.temp_dir, "dst.txt")
+        result = object_store.link(filehash, dst_filepath)
+        assert result == 5000
+        assert self.__read(dst_filepath) == to_bytes("hello" * 1000)
+        # Objects are found regardless of the compression they were stored with
+        uncompressed_object_store = ObjectStore(self.objects_dirpath)
+        assert uncompressed_object_store.exists(filehash)
+        assert uncompressed_object_store.add(self.filepath, filehash) == 0
@@ -0,0 +1,122 @@
+"""
+Tests for run_queue.py
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import tempfile
+import platform
+
+from datmo.core.util.run_queue import RunQueue, parse_mem_limit
+from datmo.core.util.exceptions import InvalidArgumentType, DoesNotExist
+
+
+class TestRunQueue():
+    def setup_method(self):
+        # provide mountable tmp directory for docker
+        tempfile.tempdir = "/tmp" if not platform.system(
+        ) == "Windows" else None
+        test_datmo_dir = os.environ.get('TEST_DATMO_DIR',
+                                        tempfile.gettempdir())
+        self.temp_dir = tempfile.mkdtemp(dir=test_datmo_dir)
+        self.queue = RunQueue(os.path.join(self.temp_dir, "queue"))
+
+    def test_parse_mem_limit(self):
+        assert parse_mem_limit(None) is None
+        assert parse_mem_limit(100) == 100
+        assert parse_mem_limit("100") == 100
+        assert parse_mem_limit("2k") == 2 * 1024
+        assert parse_mem_limit("512m") == 512 * 1024**2
+        assert parse_mem_limit("4G") == 4 * 1024**3
+        assert parse_mem_limit("1.5g") == int(1.5 * 1024**3)
+        failed = False
+        try:
+            parse_mem_limit("four gigs")
+        except InvalidArgumentType:
+            failed = True
+        assert failed
+
+    def test_init(self):
+        assert os.path.isdir(self.queue.dirpath)
+
+    def test_put(self):
+        job = self.queue.put(
+            "task_id",
+            snapshot_dict={"message": "test"},
+            task_dict={
+                "command_list": ["python", "test.py"],
+                "mem_limit": "1m"
+            },
+            before_snapshot_id="snapshot_id")
+        assert job["task_id"] == "task_id"
+        assert job["snapshot_dict"] == {"message": "test"}
+        assert job["before_snapshot_id"] == "snapshot_id"
+        assert job["task_dict"]["command_list"] == ["python", "test.py"]
+        assert job["mem_limit"] == 1024**2
+        assert job["submitted_at"]
+        assert os.path.isfile(
+            os.path.join(self.queue.dirpath, job["name"] + ".json"))
+        # Only the job file is left in the directory
+        assert os.listdir(self.queue.dirpath) == [job["name"] + ".json"]
+
+    def test_list(self):
+        first_job = self.queue.put("first")
+        second_job = self.queue.put("second")
+        assert self.queue.list() == [first_job, second_job]
+        assert self.queue.list(running=True) == []
+
+    def test_get(self):
+        job = self.queue.put("task_id")
+        assert self.queue.get(job["name"]) == job
+        failed = False
+        try:
+            self.queue.get(job["name"], running=True)
+        except DoesNotExist:
+            failed = True
+        assert failed
+
+    def test_claim(self):
+        first_job = self.queue.put("first")
+        second_job = self.queue.put("second")
+        assert self.queue.claim(first_job)
+        # A job is only claimed once
+        assert not self.queue.claim(first_job)
+        assert self.queue.list() == [second_job]
+        assert self.queue.list(running=True) == [first_job]
+        assert self.queue.get(first_job["name"], running=True) == first_job
+
+    def test_update(self):
+        job = self.queue.put("task_id")
+        # Only running jobs are updated
+        failed = False
+        try:
+            self.queue.update(job)
+        except DoesNotExist:
+            failed = True
+        assert failed
+        self.queue.claim(job)
+        job["worker_pid"] = 1234
+        self.queue.update(job)
+        assert self.queue.get(job["name"], running=True)["worker_pid"] == 1234
+        assert self.queue.list(running=True) == [job]
+
+    def test_get_lock_filepath(self):
+        job = self.queue.put("task_id")
+        lock_filepath = self.queue.get_lock_filepath(job["name"])
+        assert lock_filepath == os.path.join(self.queue.dirpath,
+                                             job["name"] + ".lock")
+        # Lock files are not jobs
+        open(lock_filepath, "a").close()
+        assert self.queue.list() == [job]
+
+    def test_remove(self):
+        first_job = self.queue.put("first")
+        second_job = self.queue.put("second")
+        self.queue.claim(first_job)
+        assert self.queue.remove(first_job)
+        assert self.queue.remove(second_job)
+        assert not self.queue.remove(second_job)
+        assert self.queue.list() == []
+        assert self.queue.list(running=True) == []
@@ -0,0 +1,103 @@
+"""
+Tests for sweep.py
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from datmo.core.util.sweep import expand_grid, sample_random, format_command
+from datmo.core.util.exceptions import InvalidArgumentType
+
+
+class TestSweep():
+    def test_expand_grid(self):
+        configs = expand_grid({
+            "lr": [0.1, 0.01],
+            "batch_size": [32, 64],
+            "epochs": 10
+        })
+        assert configs == [
+            {
+                "batch_size": 32,
+                "epochs": 10,
+                "lr": 0.1
+            },
+            {
+                "batch_size": 32,
+                "epochs": 10,
+                "lr": 0.01
+            },
+            {
+                "batch_size": 64,
+                "epochs": 10,
+                "lr": 0.1
+            },
+            {
+                "batch_size": 64,
+                "epochs": 10,
+                "lr": 0.01
+            },
+        ]
+        assert expand_grid({}) == [{}]
+        failed = False
+        try:
+            expand_grid([0.1, 0.01])
+        except InvalidArgumentType:
+            failed = True
+        assert failed
+
+    def test_sample_random(self):
+        spec = {
+            "lr": {
+                "loguniform": [0.0001, 0.1]
+            },
+            "dropout": {
+                "uniform": [0.1, 0.5]
+            },
+            "layers": {
+                "randint": [1, 4]
+            },
+            "optimizer": ["sgd", "adam"],
+            "epochs": 10
+        }
+        configs = sample_random(spec, 20, seed=1)
+        assert len(configs) == 20
+        for config in configs:
+            assert 0.0001 <= config["lr"] <= 0.1
+            assert 0.1 <= config["dropout"] <= 0.5
+            assert config["layers"] in [1, 2, 3, 4]
+            assert config["optimizer"] in ["sgd", "adam"]
+            assert config["epochs"] == 10
+        # The same seed samples the same configs
+        assert sample_random(spec, 20, seed=1) == configs
+        assert sample_random(spec, 0) == []
+
+    def test_sample_random_failure(self):
+        for spec in [["sgd", "adam"], {
+                "lr": {
+                    "normal": [0, 1]
+                }
+        }, {
+                "lr": {
+                    "uniform": [0]
+                }
+        }]:
+            failed = False
+            try:
+                sample_random(spec, 1)
+            except InvalidArgumentType:
+                failed = True
+            assert failed
+
+    def test_format_command(self):
+        command_list = [
+            "python", "train.py", "--lr={lr}", "--layers", "{layers}",
+            "{unknown}", "awk '{print $1}'"
+        ]
+        assert format_command(command_list, {
+            "lr": 0.1,
+            "layers": 2
+        }) == [
+            "python", "train.py", "--lr=0.1", "--layers", "2", "{unknown}",
+            "awk '{print $1}'"
+        ]
@@ -0,0 +1,115 @@
+"""
+Tests for system_metrics.py
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import time
+
+from datmo.core.util.system_metrics import (LatencyHistogram,
+                                            SystemMetricsSampler)
+
+
+class TestLatencyHistogram():
+    def test_get_bucket(self):
+        histogram = LatencyHistogram()
+        assert histogram.get_bucket(1) == 0
+        # Latencies up to the minimum are in its bucket
+        assert histogram.get_bucket(0) == histogram.get_bucket(0.001)
+        assert histogram.get_bucket(0.0005) == histogram.get_bucket(0.001)
+        assert histogram.get_bucket(2) == 8
+        assert histogram.get_bucket(1024) == 80
+        # Each latency is at most its bucket upper bound, within 9% of it
+        for latency in [0.002, 0.35, 1.5, 3, 10, 99.9, 250, 12345.6]:
+            upper_bound = histogram.get_upper_bound(
+                histogram.get_bucket(latency))
+            assert latency <= upper_bound * (1 + 1e-9)
+            assert upper_bound < latency * 1.091
+
+    def test_record(self):
+        histogram = LatencyHistogram()
+        for latency in [1, 2, 2, 100]:
+            histogram.record(latency)
+        histogram_dict = histogram.to_dict()
+        assert histogram_dict["count"] == 4
+        assert histogram_dict["sum"] == 105
+        assert histogram_dict["max"] == 100
+        assert histogram_dict["buckets"]["1"] == 1
+        assert histogram_dict["buckets"]["2"] == 2
+        assert sum(histogram_dict["buckets"].values()) == 4
+
+    def test_percentile(self):
+        histogram = LatencyHistogram()
+        assert histogram.percentile(50) is None
+        latencies = [0.1 * i for i in range(1, 1001)]
+        for latency in reversed(latencies):
+            histogram.record(latency)
+        for percent in [1, 50, 90, 99]:
+            exact = latencies[int(len(latencies) * percent / 100.0) - 1]
+            assert exact <= histogram.percentile(percent) < exact * 1.091
+        # Percentiles are at most the largest latency
+        assert histogram.percentile(100) == 100
+        histogram = LatencyHistogram()
+        histogram.record(5)
+        assert histogram.percentile(0) == 5
+        assert histogram.percentile(100) == 5
+
+    def test_summary(self):
+        histogram = LatencyHistogram()
+        assert histogram.summary() == {
+            "count": 0,
+            "mean": None,
+            "max": 0,
+            "p50": None,
+            "p90": None,
+            "p99": None
+        }
+        for latency in [1, 2, 3, 4]:
+            histogram.record(latency)
+        summary = histogram.summary(percents=(50, 99.9))
+        assert summary["count"] == 4
+        assert summary["mean"] == 2.5
+        assert summary["max"] == 4
+        assert summary["p50"] == 2
+        assert summary["p99.9"] == 4
+
+
+class TestSystemMetricsSampler():
+    def test_sample(self):
+        sampler = SystemMetricsSampler()
+        metrics = sampler.sample()
+        assert sorted(metrics.keys()) == ["cpu_percent", "memory_percent"]
+        sampler = SystemMetricsSampler(
+            process_metrics=True, latency_histogram=True)
+        metrics = sampler.sample()
+        assert metrics["process_rss"] > 0
+        assert metrics["process_num_threads"] >= 1
+        assert metrics["latency_histogram"]["count"] == 0
+
+    def test_start_stop(self):
+        sampler = SystemMetricsSampler(interval=0.05)
+        assert sampler.snapshot == {}
+        sampler.start()
+        # The first sample is taken on start
+        snapshot = sampler.snapshot
+        assert "cpu_percent" in snapshot
+        sampler.start()
+        time.sleep(0.2)
+        # Samples replace the snapshot rather than change it
+        assert sampler.snapshot is not snapshot
+        sampler.stop()
+        assert not sampler._thread.is_alive()
+
+    def test_record_latency(self):
+        sampler = SystemMetricsSampler(latency_histogram=True)
+        sampler.record_latency(10)
+        sampler.record_latency(20)
+        assert sampler.sample()["latency_histogram"]["count"] == 2
+        # Each sample only counts the latencies since the one before
+        sampler.record_latency(30)
+        assert sampler.sample()["latency_histogram"]["count"] == 1
+        # Without the histogram, latencies are ignored
+        sampler = SystemMetricsSampler()
+        sampler.record_latency(10)
+        assert "latency_histogram" not in sampler.sample()
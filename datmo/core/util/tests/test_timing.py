@@ -0,0 +1,116 @@
+"""
+Tests for timing.py
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import time
+import threading
+
+from datmo.core.util.timing import (perf_counter_ns, ContextLocal, Timer,
+                                    LatencyReporter)
+
+
+class TestTiming():
+    def test_perf_counter_ns(self):
+        start = perf_counter_ns()
+        time.sleep(0.01)
+        elapsed = perf_counter_ns() - start
+        assert isinstance(elapsed, int)
+        assert elapsed >= 5 * 10**6
+
+    def test_context_local(self):
+        context = ContextLocal()
+        assert context.get("value") is None
+        assert context.get("value", 1) == 1
+        context.set("value", "main")
+        values = []
+
+        def run():
+            values.append(context.get("value"))
+            context.set("value", "thread")
+            values.append(context.get("value"))
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+        # Each thread has its own value
+        assert values == [None, "thread"]
+        assert context.get("value") == "main"
+
+    def test_timer(self):
+        elapsed = []
+        with Timer(elapsed.append) as timer:
+            time.sleep(0.01)
+        assert elapsed == [timer.elapsed_ns]
+        assert timer.elapsed_ns >= 5 * 10**6
+
+    def test_timer_decorator(self):
+        elapsed = []
+
+        @Timer(elapsed.append)
+        def predict(x, wait=0):
+            time.sleep(wait)
+            return x * 2
+
+        assert predict.__name__ == "predict"
+        assert predict(2) == 4
+        assert predict(3, wait=0.01) == 6
+        assert len(elapsed) == 2
+        assert elapsed[0] < elapsed[1]
+
+    def test_timer_exception(self):
+        elapsed = []
+        failed = False
+        try:
+            with Timer(elapsed.append):
+                raise ValueError
+        except ValueError:
+            failed = True
+        assert failed
+        assert len(elapsed) == 1
+
+
+class TestLatencyReporter():
+    def test_report(self):
+        sent = []
+        reporter = LatencyReporter(sent.append, interval=60)
+        reporter.report()
+        # Nothing is sent without latencies
+        assert sent == []
+        for latency in [1, 2, 3, 4]:
+            reporter.record(latency)
+        reporter.record(10, name="preprocess")
+        reporter.report()
+        assert sorted(sent[0].keys()) == ["latency", "preprocess"]
+        assert sent[0]["latency"]["count"] == 4
+        assert sent[0]["latency"]["p50"] == 2
+        assert sent[0]["preprocess"]["max"] == 10
+        # Each summary is of the latencies since the one before
+        reporter.record(5)
+        reporter.report()
+        assert list(sent[1].keys()) == ["latency"]
+        assert sent[1]["latency"]["count"] == 1
+        reporter.stop()
+
+    def test_interval(self):
+        sent = []
+        reporter = LatencyReporter(sent.append, interval=0.05)
+        reporter.record(1)
+        time.sleep(0.3)
+        assert len(sent) == 1
+        reporter.record(2)
+        # The last summary is sent on stop
+        reporter.stop()
+        assert len(sent) == 2
+        assert not reporter._thread.is_alive()
+
+    def test_send_exception(self):
+        def send(summaries):
+            raise ValueError("unreachable")
+
+        reporter = LatencyReporter(send, interval=60)
+        reporter.record(1)
+        reporter.report()
+        reporter.stop()
@@ -0,0 +1,170 @@
+import time
+import atexit
+import functools
+import threading
+try:
+    import contextvars
+except ImportError:
+    # python < 3.7, values are then local to each thread
+    contextvars = None
+
+from datmo.core.util.logger import DatmoLogger
+from datmo.core.util.system_metrics import LatencyHistogram
+
+try:
+    perf_counter_ns = time.perf_counter_ns
+except AttributeError:
+
+    def perf_counter_ns():
+        clock = getattr(time, "perf_counter", time.time)
+        return int(clock() * 1e9)
+
+
+class ContextLocal(object):
+    """ContextLocal holds values local to the current context, i.e. to each asyncio
+    task or thread, or local to each thread before python 3.7
+
+    Methods
+    -------
+    get(name, default=None)
+        return the value of the current context
+    set(name, value)
+        set the value of the current context
+    """
+
+    def __init__(self):
+        if contextvars is not None:
+            self._vars = {}
+            self._vars_lock = threading.Lock()
+        else:
+            self._local = threading.local()
+
+    def _get_var(self, name):
+        with self._vars_lock:
+            if name not in self._vars:
+                self._vars[name] = contextvars.ContextVar(name)
+            return self._vars[name]
+
+    def get(self, name, default=None):
+        if contextvars is None:
+            return getattr(self._local, name, default)
+        return self._get_var(name).get(default)
+
+    def set(self, name, value):
+        if contextvars is None:
+            setattr(self._local, name, value)
+        else:
+            self._get_var(name).set(value)
+
+
+class Timer(object):
+    """Timer measures the time taken by a block of code, as a context manager, or
+    by each call of a function, as a decorator, with time.perf_counter_ns
+
+    Parameters
+    ----------
+    callback : function
+        called with the time taken, in ns, once the block or call ends
+
+    Attributes
+    ----------
+    elapsed_ns : int or None
+        time taken by the last block timed with the timer as a context manager
+
+    Examples
+    --------
+    >>> with Timer(callback):
+    >>>     predict(x)
+    ...
+    >>> @Timer(callback)
+    >>> def predict(x):
+    >>>     ...
+    """
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.elapsed_ns = None
+        self._start_ns = None
+
+    def __enter__(self):
+        self._start_ns = perf_counter_ns()
+        return self
+
+    def __exit__(self, *args):
+        self.elapsed_ns = perf_counter_ns() - self._start_ns
+        self.callback(self.elapsed_ns)
+
+    def __call__(self, func):
+        # Each call is timed by its own timer, so concurrent calls do not clash
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with Timer(self.callback):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+
+class LatencyReporter(object):
+    """LatencyReporter aggregates latencies in histograms by name and sends their
+    summary, with the percentiles, from a background thread every interval rather
+    than one event per latency. Only names with latencies recorded during the
+    interval are sent, and the last interval is sent when the reporter stops
+
+    Parameters
+    ----------
+    send : function
+        called with the summaries of the interval, as a dict of name -> summary
+    interval : float, optional
+        time in seconds between two summaries (default is 60)
+
+    Methods
+    -------
+    record(latency, name="latency")
+        count a latency, in ms
+    report()
+        send the summary of the latencies recorded since the last one
+    stop()
+        stop the reporting thread, sending the last summary
+    """
+
+    def __init__(self, send, interval=60):
+        self.send = send
+        self.interval = interval
+        self.logger = DatmoLogger.get_logger(__name__)
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def record(self, latency, name="latency"):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            histogram.record(latency)
+
+    def report(self):
+        with self._lock:
+            histograms, self._histograms = self._histograms, {}
+        if not histograms:
+            return
+        summaries = dict((name, histogram.summary())
+                         for name, histogram in histograms.items())
+        try:
+            self.send(summaries)
+        except Exception as e:
+            self.logger.warning("latency summary failed to send: %s" % e)
+
+    def stop(self):
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._thread.join()
+        self.report()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.report()
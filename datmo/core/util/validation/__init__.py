@@ -1,19 +1,28 @@
 import os
-import yaml
-from cerberus import Validator
-from cerberus.schema import SchemaError
 from datmo.core.util.exceptions import ValidationFailed, ValidationSchemaMissing
 
 # http://docs.python-cerberus.org/en/stable/usage.html
 
-schema_yaml = open(os.path.join(os.path.split(__file__)[0], "schemas.yml"))
+# Schemas are loaded on the first validation, as parsing them and importing
+# cerberus are slow and most commands never validate
+_schemas = None
 
-schemas = yaml.safe_load(schema_yaml)
+
+def get_schemas():
+    global _schemas
+    if _schemas is None:
+        import yaml
+        with open(os.path.join(os.path.split(__file__)[0],
+                               "schemas.yml")) as schema_yaml:
+            _schemas = yaml.safe_load(schema_yaml)
+    return _schemas
 
 
 def validate(schema_name, values):
+    from cerberus import Validator
+    from cerberus.schema import SchemaError
     try:
-        v = Validator(schemas.get(schema_name))
+        v = Validator(get_schemas().get(schema_name))
         response = v.validate(values)
 
         if response == False:
@@ -69,7 +69,7 @@ def model_experiments(model_name):
     model = base_controller.model.__dict__
     if model_name == model['name']:
         tasks = base_controller.dal.task.query({"model_id": model['id']})
-        experiments = [Run(task) for task in tasks]
+        experiments = Run.from_tasks(tasks)
         for experiment in experiments:
             experiment.config_printable = printable_object(experiment.config)
             experiment.start_time_prettified = prettify_datetime(
@@ -173,7 +173,9 @@ def model_deployment_data(model_name, deployment_version_id, model_version_id):
             "deployment_version_id": deployment_version_id,
             "model_version_id": model_version_id,
         }
-        cumulative_data = datmo_monitoring.search_metadata(filter)
+        # Only the values of the key are kept, not the whole history
+        cumulative_data = datmo_monitoring.iter_metadata(
+            filter, fields=[data_type])
         cumulative_feature_data = [
             datum[data_type][key_name] for datum in cumulative_data
             if datum[data_type] and key_name in datum[data_type].keys()
@@ -227,14 +229,14 @@ def model_deployment_detail(model_name, deployment_version_id,
         "deployment_version_id": deployment_version_id
     }
     input_keys, prediction_keys, feedback_keys = [], [], []
-    data = datmo_monitoring.search_metadata(filter)
-
-    if data:
-        max_index = 0
-        for ind, datum in enumerate(data):
-            if datum['feedback'] is not None:
-                max_index = ind
-        datum = data[max_index]
+    # Keys are those of the last datum with feedback, else of the first datum
+    datum = None
+    for data_datum in datmo_monitoring.iter_metadata(
+            filter, fields=["input", "prediction", "feedback"]):
+        if datum is None or data_datum['feedback'] is not None:
+            datum = data_datum
+
+    if datum:
         input_keys = list(datum['input'].keys())
         prediction_keys = list(datum['prediction'].keys())
         feedback_keys = list(
@@ -284,10 +286,11 @@ def model_deployments(model_name):
 
     # get all data and extract unique model_version_id and deployment_version_id
     filter = {"model_id": model_name}
-    all_data = datmo_monitoring.search_metadata(filter)
-    model_version_ids = set(data['model_version_id'] for data in all_data)
-    deployment_version_ids = set(
-        data['deployment_version_id'] for data in all_data)
+    model_version_ids, deployment_version_ids = set(), set()
+    for data in datmo_monitoring.iter_metadata(
+            filter, fields=["model_version_id", "deployment_version_id"]):
+        model_version_ids.add(data['model_version_id'])
+        deployment_version_ids.add(data['deployment_version_id'])
 
     # Get deployment information for each of the deployments
     deployments = []
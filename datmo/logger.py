@@ -1,18 +1,62 @@
 from __future__ import print_function
 
 import os
+import time
+import atexit
+import weakref
+import threading
 try:
     basestring
 except NameError:
     basestring = str
 
 from datmo.core.util.json_store import JSONStore
+from datmo.core.util.metric_store import MetricStore
 from datmo.core.util.exceptions import InvalidArgumentType
 
+# Buffered loggers are flushed at exit, without being kept alive until then
+_buffered_loggers = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_buffered_loggers():
+    for logger in list(_buffered_loggers):
+        logger.flush()
+
+
+def _flush_periodically(logger_ref, interval, stopped):
+    """Flush the logger every interval from a daemon thread, until it is closed
+    or garbage collected"""
+    while not stopped.wait(interval):
+        logger = logger_ref()
+        if logger is None:
+            return
+        logger.flush()
+        del logger
+
 
 class Logger():
     """Logger is a class to enable user to store properties
 
+    By default each call writes to file. In buffered mode, the configs and results
+    are kept in memory and written to file every flush_interval seconds, from a
+    background thread, or every flush_size calls, and when the process exits or
+    the logger is closed, so they can be logged at every
+    step of training. Writes replace the files atomically, and a logger can be
+    used from several threads.
+
+    Parameters
+    ----------
+    task_dir : str, optional
+        directory of the task run (default is "/task", the current directory is
+        used if it does not exist)
+    buffered : bool, optional
+        whether to buffer writes (default is False)
+    flush_interval : float, optional
+        seconds after which buffered writes are flushed (default is 5)
+    flush_size : int, optional
+        number of buffered calls after which they are flushed (default is 1000)
+
     Attributes
     ----------
     config : dict
@@ -26,23 +70,92 @@ class Logger():
         Saving the configuration dictionary for the run
     log_results(results)
         Saving the result dictionary for the run
+    log_metric(key, value, step=None)
+        Appending a value of a metric to the metric store of the run
+    flush()
+        Writing the buffered configs, results and metrics to file
+    close()
+        Flushing and stopping the background flushes of a buffered logger
 
     Raises
     ------
     InvalidArgumentType
     """
 
-    def __init__(self, task_dir="/task"):
+    def __init__(self,
+                 task_dir="/task",
+                 buffered=False,
+                 flush_interval=5,
+                 flush_size=1000):
 
         self.task_dir = task_dir
+        self.buffered = buffered
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self._metric_store = None
+        self._lock = threading.RLock()
+        # path -> dictionary of the file, with the updates not yet flushed
+        self._dictionaries = {}
+        self._pending_paths = set()
+        self._pending_count = 0
+        self._flushed_at = time.time()
+        self._stopped = threading.Event()
+        if self.buffered:
+            _buffered_loggers.add(self)
+            if self.flush_interval and self.flush_interval > 0:
+                # The thread only holds a weak reference, so an unused logger is
+                # still garbage collected
+                flusher = threading.Thread(
+                    target=_flush_periodically,
+                    args=(weakref.ref(self), self.flush_interval,
+                          self._stopped))
+                flusher.daemon = True
+                flusher.start()
 
-    @classmethod
     def __save_dictionary(self, dictionary, path):
-        json_obj = JSONStore(path)
-        data = json_obj.to_dict()
-        data.update(dictionary)
-        json_obj.to_file(data)
-        return data
+        with self._lock:
+            if not self.buffered:
+                json_obj = JSONStore(path)
+                data = json_obj.to_dict()
+                data.update(dictionary)
+                json_obj.to_file(data)
+                return data
+            if path not in self._dictionaries:
+                self._dictionaries[path] = JSONStore(path).to_dict()
+            self._dictionaries[path].update(dictionary)
+            self._pending_paths.add(path)
+            data = self._dictionaries[path].copy()
+            self.__count_pending()
+            return data
+
+    def __count_pending(self):
+        self._pending_count += 1
+        if self._pending_count >= self.flush_size or \
+                time.time() - self._flushed_at >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered configs, results and metrics to file"""
+        with self._lock:
+            for path in self._pending_paths:
+                JSONStore(path).to_file(self._dictionaries[path])
+            if self._metric_store is not None:
+                self._metric_store.flush()
+            self._pending_paths = set()
+            self._pending_count = 0
+            self._flushed_at = time.time()
+
+    def close(self):
+        """Flush the buffered writes and stop flushing them in the background"""
+        self._stopped.set()
+        self.flush()
+
+    def __del__(self):
+        # Writes buffered by a logger no longer used are not lost
+        try:
+            self.close()
+        except Exception:
+            pass
 
     def log_config(self, config):
 
@@ -63,4 +176,36 @@ class Logger():
             if os.path.isdir(self.task_dir) else\
             os.path.join(os.getcwd(), "stats.json")
 
-        return self.__save_dictionary(results, results_path)
\ No newline at end of file
+        return self.__save_dictionary(results, results_path)
+
+    def log_metric(self, key, value, step=None):
+        """Append a value of a metric, e.g. the loss at each step of training. Values
+        are appended to the metric store of the run and earlier values are never
+        rewritten, so this can be called at every step
+
+        Parameters
+        ----------
+        key : str
+            name of the metric
+        value : float
+            value of the metric
+        step : int, optional
+            step of the value (default is the step after the last one logged for
+            the metric, starting at 0)
+
+        Returns
+        -------
+        int
+            step of the value
+        """
+        with self._lock:
+            if self._metric_store is None:
+                metrics_path = os.path.join(self.task_dir, "metrics") \
+                    if os.path.isdir(self.task_dir) else\
+                    os.path.join(os.getcwd(), "metrics")
+                self._metric_store = MetricStore(
+                    metrics_path, autoflush=not self.buffered)
+            step = self._metric_store.log(key, value, step=step)
+            if self.buffered:
+                self.__count_pending()
+            return step
@@ -2,13 +2,32 @@ import os
 import time
 import ast
 import json
-import psutil
 from datetime import datetime
 
 from datmo.config import Config
 from datmo.core.util.exceptions import InputError
-from datmo.core.util.misc_functions import bytes2human, slack_message
-from datmo.core.util.remote_api import RemoteAPI
+from datmo.core.util.misc_functions import slack_message, create_unique_hash
+from datmo.core.util.remote_api import get_remote_api
+from datmo.core.util.system_metrics import SystemMetricsSampler
+from datmo.core.util.timing import ContextLocal, Timer, LatencyReporter
+
+# Type of the records of the latency summaries, stored with the predictions
+LATENCY_SUMMARY_TYPE = "latency_summary"
+
+
+def decode_value(value):
+    """Return the value of a field stored as a json string, e.g. the input of a
+    prediction, or None if there is none"""
+    if value is None:
+        return None
+    try:
+        return json.loads(value)
+    except TypeError:
+        # Not a string, i.e. already decoded
+        return value
+    except ValueError:
+        # Not json, e.g. stored by an older client as a python literal
+        return ast.literal_eval(value)
 
 
 class Monitoring():
@@ -18,8 +37,34 @@ class Monitoring():
     ----------
     api_key : str
         credentials to access remote
-    home : str, optional
-        directory for the project, default is to pull from config
+    asynchronous : bool, optional
+        if True, tracked predictions are sent in batches from a background thread
+        and `track` returns an id generated here without waiting for the service
+        (default is False)
+    batch_size : int, optional
+        maximum number of tracked predictions sent per batch when asynchronous
+    flush_interval : float, optional
+        maximum time in seconds a tracked prediction waits for its batch when
+        asynchronous
+    spill_dirpath : str, optional
+        directory where tracked predictions are kept while the service is
+        unreachable when asynchronous (default is ~/.datmo/monitoring)
+    metrics_interval : float, optional
+        time in seconds between two samples of the system metrics sent with the
+        tracked predictions, taken in the background (default is 1)
+    process_metrics : bool, optional
+        if True, the memory (rss) and number of threads of the current process are
+        sent with the system metrics (default is False)
+    latency_histogram : bool, optional
+        if True, the histogram of the latencies tracked during the last metrics
+        interval is sent with the system metrics (default is False)
+    latency_summary_interval : float, optional
+        if set, the count, mean, max and p50/p90/p99 of the latencies of the
+        predictions tracked or timed with `timer` are sent every
+        latency_summary_interval seconds (default is None)
+    track_events : bool, optional
+        if False, predictions tracked are not sent one by one, only their latencies
+        being sent in the summaries (default is True)
 
     Attributes
     ----------
@@ -62,17 +107,67 @@ class Monitoring():
     >>> prediction = {"prediction": 1}
     >>> notes = "this is a note for trigger"
     >>> datmo_client.trigger(medium="slack", input=input, prediction=prediction, notes=notes)
+    ...
+    >>> # Tracking without waiting for the service
+    >>> datmo_client = Monitoring(api_key="my_data_api_key", asynchronous=True)
+    >>> datmo_id = datmo_client.track(input=x, prediction=y_predict)
+    >>> datmo_client.flush() # wait for the predictions tracked to be sent
+    ...
+    >>> # Timing predictions, with summaries of the latencies sent every minute
+    >>> datmo_client = Monitoring(api_key="my_data_api_key", latency_summary_interval=60,
+    >>>                           track_events=False)
+    >>> @datmo_client.timer()
+    >>> def predict(x):
+    >>>     return model_predict(x)
+    ...
+    >>> with datmo_client.timer(name="preprocess"):
+    >>>     x = preprocess(x)
     """
 
-    def __init__(self, api_key=None):
+    def __init__(self,
+                 api_key=None,
+                 asynchronous=False,
+                 batch_size=100,
+                 flush_interval=1,
+                 spill_dirpath=None,
+                 metrics_interval=1,
+                 process_metrics=False,
+                 latency_histogram=False,
+                 latency_summary_interval=None,
+                 track_events=True):
         if api_key is None:
             config = Config()
             _, self._api_key, _ = config.remote_credentials
         else:
             self._api_key = api_key
-        self.remote_api = RemoteAPI(self._api_key)
-        self._start_time, self._end_time, self._model_id, \
-        self._model_version_id, self._deployment_version_id = None, None, None, None, None
+        self.remote_api = get_remote_api(self._api_key)
+        self._transport = None
+        if asynchronous:
+            from datmo.core.util.event_transport import EventTransport
+            if spill_dirpath is None:
+                spill_dirpath = os.path.join(
+                    os.path.expanduser("~"), ".datmo", "monitoring")
+            self._transport = EventTransport(
+                self.remote_api.post_data,
+                spill_dirpath,
+                batch_size=batch_size,
+                flush_interval=flush_interval)
+        # Started on the first prediction tracked
+        self._sampler = SystemMetricsSampler(
+            interval=metrics_interval,
+            process_metrics=process_metrics,
+            latency_histogram=latency_histogram)
+        self._track_events = track_events
+        self._reporter = None
+        if latency_summary_interval is not None:
+            self._reporter = LatencyReporter(
+                self._send_latency_summaries,
+                interval=latency_summary_interval)
+        # Start and end times are local to each thread or asyncio task, as each
+        # handles its own predictions
+        self._context = ContextLocal()
+        self._model_id, self._model_version_id, \
+        self._deployment_version_id = None, None, None
 
     def __str__(self):
         pass
@@ -83,28 +178,55 @@ class Monitoring():
     @property
     def set_start_time(self):
         """
-        Set the start time
+        Set the start time, of the current thread or asyncio task
 
         Returns
         -------
         start_time : int
             start time in milliseconds
         """
-        self._start_time = int(round(time.time() * 1000))
-        return self._start_time
+        start_time = int(round(time.time() * 1000))
+        self._context.set("start_time", start_time)
+        return start_time
 
     @property
     def set_end_time(self):
         """
-        Set the end time
+        Set the end time, of the current thread or asyncio task
 
         Returns
         -------
         end_time : int
             end time in milliseconds
         """
-        self._end_time = int(round(time.time() * 1000))
-        return self._end_time
+        end_time = int(round(time.time() * 1000))
+        self._context.set("end_time", end_time)
+        return end_time
+
+    def timer(self, name="latency"):
+        """
+        Time a block of code as a context manager, or each call of a function as a
+        decorator, with a precision of a nanosecond. The next prediction tracked in
+        the same thread or asyncio task has the latency of the last one timed, and
+        the latencies are summarized by name if latency_summary_interval is set
+
+        Parameters
+        ----------
+        name : str, optional
+            name of the latency in the summaries (default is "latency")
+
+        Returns
+        -------
+        datmo.core.util.timing.Timer
+        """
+
+        def record(elapsed_ns):
+            latency = elapsed_ns / 1e6
+            self._context.set("latency", latency)
+            if self._reporter is not None:
+                self._reporter.record(latency, name=name)
+
+        return Timer(record)
 
     def set_model_id(self, id):
         """
@@ -154,30 +276,30 @@ class Monitoring():
         Returns
         -------
         id : str
-            the id of the tracked prediction
+            the id of the tracked prediction, generated here if asynchronous, or
+            None if track_events is False
         """
         if not (isinstance(input, dict) and isinstance(prediction, dict)):
             return None
-        if self._start_time and self._end_time:
-            latency = self._end_time - self._start_time
-        elif self._start_time and not self._end_time:
-            self._end_time = int(round(time.time() * 1000))
-            latency = self._end_time - self._start_time
-        else:
-            latency = None
-        self._start_time, self._end_time = None, None  # reset both for next data point
+        start_time = self._context.get("start_time")
+        end_time = self._context.get("end_time")
+        # The latency of the last block timed, else the start and end times
+        latency = self._context.get("latency")
+        if latency is None and start_time:
+            latency = (end_time or int(round(time.time() * 1000))) - start_time
+            # Latencies timed with timer are already summarized
+            if self._reporter is not None:
+                self._reporter.record(latency)
+        # reset all for next data point
+        for name in ["start_time", "end_time", "latency"]:
+            self._context.set(name, None)
         created_at = int(round(time.time() * 1000))
-        cpu_percent = psutil.cpu_percent()
-        memory_dict = {}
-        memory_object = psutil.virtual_memory()
-        for name in memory_object._fields:
-            value = getattr(memory_object, name)
-            if name != "percent":
-                value = bytes2human(value)
-            memory_dict[name] = value
-        system_metrics = dict()
-        system_metrics["cpu_percent"] = cpu_percent
-        system_metrics["memory_percent"] = memory_dict["percent"]
+        self._sampler.start()
+        system_metrics = dict(self._sampler.snapshot)
+        if latency is not None:
+            self._sampler.record_latency(latency)
+        if not self._track_events:
+            return None
 
         input_data = {
             "system_metrics": system_metrics,
@@ -192,10 +314,69 @@ class Monitoring():
             input_data['model_version_id'] = self._model_version_id
         if self._deployment_version_id is not None:
             input_data['deployment_version_id'] = self._deployment_version_id
+        if self._transport is not None:
+            input_data['id'] = create_unique_hash()
+            self._transport.put(input_data)
+            return input_data['id']
         response = self.remote_api.post_data(input_data)
 
         return response['body']['id']
 
+    def _send_latency_summaries(self, summaries):
+        # Tagged to be told apart from the predictions tracked, stored alongside
+        summary_data = {
+            "type": LATENCY_SUMMARY_TYPE,
+            "latency_summary": summaries,
+            "model_id": self._model_id,
+            "created_at": int(round(time.time() * 1000))
+        }
+        if self._model_version_id is not None:
+            summary_data['model_version_id'] = self._model_version_id
+        if self._deployment_version_id is not None:
+            summary_data['deployment_version_id'] = self._deployment_version_id
+        if self._transport is not None:
+            summary_data['id'] = create_unique_hash()
+            self._transport.put(summary_data)
+        else:
+            self.remote_api.post_data(summary_data)
+
+    def flush(self, timeout=None):
+        """
+        Wait until the predictions tracked are sent, or kept on disk if the service
+        is unreachable. Only needed when asynchronous
+
+        Parameters
+        ----------
+        timeout : float, optional
+            maximum time to wait in seconds (default is to wait until done)
+
+        Returns
+        -------
+        bool
+            True if done within the timeout
+        """
+        if self._transport is None:
+            return True
+        return self._transport.flush(timeout)
+
+    def close(self, timeout=None):
+        """
+        Stop sampling the system metrics, send the last summary of the latencies
+        and, when asynchronous, send the predictions tracked and stop the
+        background thread, also done at exit
+
+        Parameters
+        ----------
+        timeout : float, optional
+            maximum time to send in seconds, after which the predictions left are
+            kept on disk to be sent later (default is to wait until done)
+        """
+        self._sampler.stop()
+        if self._reporter is not None:
+            self._reporter.stop()
+        if self._transport is not None:
+            self._transport.close(timeout)
+
     def track_feedback(self, id, feedback):
         """
         Track feedback value (y) and other metrics after the prediction(y_hat)
@@ -296,18 +477,77 @@ class Monitoring():
         Returns
         -------
         list
-            list of data dictionary for predictions which were tracked
+            list of data dictionary for predictions which were tracked, without the
+            latency summaries
 
         Raises
         ------
         IncorrectType
         """
+        filter = self._get_search_filter(filter)
+        response = self.remote_api.get_data(filter)
+        return [
+            self._decode_metadata(meta_data) for meta_data in response['body']
+            if meta_data.get('type') != LATENCY_SUMMARY_TYPE
+        ]
+
+    def iter_metadata(self, filter, fields=None, page_size=100):
+        """
+        Iterate over the metadata from the remote storage, getting it page by page
+        so that only one page is held in memory however many predictions match
+
+        Parameters
+        ----------
+        filter : dict
+            dictionary to filter search results, as for `search_metadata`, where
+            count is the number of predictions yielded in all, and start the offset
+            of the first stored result read, the stored results including the
+            latency summaries
+        fields : list, optional
+            names of the fields of each result to return, e.g. ["input"], only
+            those being decoded (default is all fields)
+        page_size : int, optional
+            number of results got from the remote storage at once (default is 100)
+
+        Yields
+        ------
+        dict
+            data dictionary for a prediction which was tracked, the latency
+            summaries being skipped
+
+        Raises
+        ------
+        InputError
+        """
+        filter = self._get_search_filter(filter)
+        offset = int(filter.pop('start', None) or 0)
+        count = filter.pop('count', None)
+        # Pages are by index, so results sorted in descending order may repeat if
+        # predictions are tracked while iterating. The offset is that of the stored
+        # results, and pages are read until count predictions were yielded
+        yielded = 0
+        while count is None or yielded < count:
+            page_count = page_size if count is None else min(
+                page_size, count - yielded)
+            page_filter = dict(filter, start=offset, count=page_count)
+            page = self.remote_api.get_data(page_filter)['body']
+            offset += len(page)
+            for meta_data in page:
+                if meta_data.get('type') == LATENCY_SUMMARY_TYPE:
+                    continue
+                yield self._decode_metadata(meta_data, fields)
+                yielded += 1
+            if len(page) < page_count:
+                return
+
+    def _get_search_filter(self, filter):
         # Check if all input dictionary keys are valid
         if not all(key in [
                 "model_id", "model_version_id", "deployment_version_id", "id",
                 "start", "count", "sort_created_at"
         ] for key in filter.keys()):
             raise InputError
+        filter = dict(filter)
         filter['model_id'] = filter.get('model_id', self._model_id)
         if filter['model_id'] is None: del filter['model_id']
         filter['model_version_id'] = filter.get('model_version_id',
@@ -317,24 +557,15 @@ class Monitoring():
             'deployment_version_id', self._deployment_version_id)
         if filter['deployment_version_id'] is None:
             del filter['deployment_version_id']
-        response = self.remote_api.get_data(filter)
-        body = response['body']
-        meta_data_list = []
-        for meta_data in body:
-            input = meta_data.get('input')
-            prediction = meta_data.get('prediction')
-            feedback = meta_data.get('feedback')
-            updated_at = meta_data.get('updated_at')
-            meta_data['input'] = ast.literal_eval(
-                input) if input is not None else None
-            meta_data['prediction'] = ast.literal_eval(
-                prediction) if prediction is not None else None
-            meta_data['feedback'] = ast.literal_eval(
-                feedback) if feedback is not None else None
-            meta_data['updated_at'] = ast.literal_eval(
-                updated_at) if updated_at is not None else None
-            meta_data_list.append(meta_data)
-        return meta_data_list
+        return filter
+
+    def _decode_metadata(self, meta_data, fields=None):
+        if fields is not None:
+            meta_data = dict((field, meta_data.get(field)) for field in fields)
+        for field in ["input", "prediction", "feedback", "updated_at"]:
+            if fields is None or field in fields:
+                meta_data[field] = decode_value(meta_data.get(field))
+        return meta_data
 
     def delete_metadata(self, filter):
         """
@@ -258,8 +258,16 @@ def create(message,
         return client_snapshot_obj
 
 
-def ls(filter=None):
-    """List snapshots within a project
+def ls(filter=None,
+       label=None,
+       config=None,
+       stats=None,
+       created_after=None,
+       created_before=None,
+       limit=None,
+       offset=None,
+       cursor=None):
+    """List snapshots within a project, most recent first
 
     The project must be created before this is implemented. You can do that by using
     the following command::
@@ -272,6 +280,24 @@ def ls(filter=None):
     filter : str, optional
         a string to use to filter from message and label
         (default is to give all snapshots, unless provided a specific string. eg: best)
+    label : str, optional
+        only list snapshots with this label
+    config : dict, optional
+        only list snapshots with these config values, given either as a value or as a
+        (low, high) tuple for an inclusive range, where None is unbounded
+    stats : dict, optional
+        only list snapshots with these stats values, as for config
+    created_after : datetime.datetime, optional
+        only list snapshots created at or after this time
+    created_before : datetime.datetime, optional
+        only list snapshots created before this time
+    limit : int, optional
+        maximum number of snapshots to return (default is all)
+    offset : int, optional
+        number of snapshots to skip (default is 0)
+    cursor : datetime.datetime, optional
+        created_at time of the last snapshot of the previous page, to list the
+        snapshots which follow it
 
     Returns
     -------
@@ -284,34 +310,30 @@ def ls(filter=None):
 
     >>> import datmo
     >>> snapshots = datmo.snapshot.ls()
+    >>> next_snapshots = datmo.snapshot.ls(limit=10,
+    ...     cursor=snapshots[9].created_at)
     """
 
     snapshot_controller = SnapshotController()
 
-    # add arguments if they are not None
-
+    # Filtering and pagination are done by the database
     core_snapshot_objs = snapshot_controller.list(
-        visible=True, sort_key='created_at', sort_order='descending')
-
-    # Filtering Snapshots
-    # TODO: move to list function in SnapshotController
-    # Add in preliminary snapshots if no filter
-    filtered_core_snapshot_objs = [
-        core_snapshot_obj for core_snapshot_obj in core_snapshot_objs
-        if core_snapshot_obj.visible and not filter
-    ]
-    # If filter is present then use it and only add those that pass filter
-    for core_snapshot_obj in core_snapshot_objs:
-        if core_snapshot_obj.visible:
-            if filter and \
-                ((filter in core_snapshot_obj.message) \
-                    or (core_snapshot_obj.label != None and filter in core_snapshot_obj.label)):
-                filtered_core_snapshot_objs.append(core_snapshot_obj)
+        visible=True,
+        sort_key='created_at',
+        sort_order='descending',
+        filter=filter,
+        label=label,
+        config=config,
+        stats=stats,
+        created_after=created_after,
+        created_before=created_before,
+        limit=limit,
+        offset=offset,
+        cursor=cursor)
 
     # Return Snapshot entities
     return [
-        Snapshot(filtered_core_snapshot_obj)
-        for filtered_core_snapshot_obj in filtered_core_snapshot_objs
+        Snapshot(core_snapshot_obj) for core_snapshot_obj in core_snapshot_objs
     ]
 
 
@@ -0,0 +1,57 @@
+"""
+Tests for datmo/__init__.py
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import sys
+import json
+import pytest
+import subprocess
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 7),
+    reason="submodules are imported eagerly before python 3.7")
+class TestInit():
+    def get_imported(self, statement):
+        # A new process, as the tests have imported everything already. It runs
+        # from the root of the package, as earlier tests change directory
+        import datmo
+        root = os.path.dirname(
+            os.path.dirname(os.path.abspath(datmo.__file__)))
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            [root] + [path for path in [env.get("PYTHONPATH")] if path])
+        output = subprocess.check_output(
+            [
+                sys.executable, "-c",
+                "import sys, json; %s; print(json.dumps(sorted(sys.modules)))"
+                % statement
+            ],
+            cwd=root,
+            env=env)
+        return json.loads(output.decode("utf-8").splitlines()[-1])
+
+    def test_lazy_imports(self):
+        heavy_modules = [
+            "datmo.snapshot", "datmo.monitoring", "docker", "requests",
+            "flask", "blitzdb", "cerberus", "pytest"
+        ]
+        for statement in ["import datmo", "import datmo.cli.command.run"]:
+            imported = self.get_imported(statement)
+            assert [module for module in heavy_modules
+                    if module in imported] == []
+
+    def test_submodules(self):
+        imported = self.get_imported("import datmo; datmo.snapshot.create")
+        assert "datmo.snapshot" in imported
+        import datmo
+        failed = False
+        try:
+            datmo.does_not_exist
+        except AttributeError:
+            failed = True
+        assert failed
@@ -2,15 +2,21 @@
 """
 Tests for snapshot module
 """
+import gc
 import os
+import json
+import time
 import tempfile
 import platform
+import weakref
+import threading
 try:
     to_unicode = unicode
 except NameError:
     to_unicode = str
 
 from datmo.logger import Logger
+from datmo.core.util.metric_store import MetricStore
 
 
 class TestLoggerModule():
@@ -35,7 +41,6 @@ class TestLoggerModule():
         saved_config = self.logger.log_config(config)
         assert saved_config == {'a': 1, 'b': 2}
 
-
     def test_log_results(self):
         result = {'a': 1}
         saved_result = self.logger.log_result(result)
@@ -44,3 +49,96 @@ class TestLoggerModule():
         result = {'b': 2}
         saved_result = self.logger.log_result(result)
         assert saved_result == {'a': 1, 'b': 2}
+
+    def test_log_metric(self):
+        assert self.logger.log_metric("loss", 0.5) == 0
+        assert self.logger.log_metric("loss", 0.4) == 1
+        assert self.logger.log_metric("accuracy", 0.8, step=10) == 10
+
+        metric_store = MetricStore(os.path.join(self.temp_dir, "metrics"))
+        records = [(step, key, value)
+                   for step, _, key, value in metric_store.iter_records()]
+        assert records == [(0, "loss", 0.5), (1, "loss", 0.4), (10, "accuracy",
+                                                                0.8)]
+
+    def test_buffered(self):
+        logger = Logger(task_dir=self.temp_dir, buffered=True, flush_size=3)
+        config_path = os.path.join(self.temp_dir, "config.json")
+        results_path = os.path.join(self.temp_dir, "stats.json")
+
+        assert logger.log_config({'a': 1}) == {'a': 1}
+        assert logger.log_result({'b': 2}) == {'b': 2}
+        # Nothing is written until flushed
+        assert not os.path.exists(config_path)
+        assert not os.path.exists(results_path)
+
+        # Flushed once the buffer is full
+        assert logger.log_result({'c': 3}) == {'b': 2, 'c': 3}
+        with open(config_path) as f:
+            assert json.load(f) == {'a': 1}
+        with open(results_path) as f:
+            assert json.load(f) == {'b': 2, 'c': 3}
+
+        logger.log_config({'d': 4})
+        logger.log_metric("loss", 0.5)
+        logger.flush()
+        with open(config_path) as f:
+            assert json.load(f) == {'a': 1, 'd': 4}
+        metric_store = MetricStore(os.path.join(self.temp_dir, "metrics"))
+        assert len(list(metric_store.iter_records())) == 1
+        # Only files with updates are written again
+        os.remove(results_path)
+        logger.flush()
+        assert not os.path.exists(results_path)
+
+    def test_buffered_flush_interval(self):
+        logger = Logger(
+            task_dir=self.temp_dir, buffered=True, flush_interval=0)
+        logger.log_result({'a': 1})
+        with open(os.path.join(self.temp_dir, "stats.json")) as f:
+            assert json.load(f) == {'a': 1}
+
+    def test_buffered_timer(self):
+        logger = Logger(
+            task_dir=self.temp_dir, buffered=True, flush_interval=0.1)
+        logger.log_result({'a': 1})
+        results_path = os.path.join(self.temp_dir, "stats.json")
+        assert not os.path.exists(results_path)
+        # Flushed in the background without any further call
+        time.sleep(0.5)
+        with open(results_path) as f:
+            assert json.load(f) == {'a': 1}
+        logger.close()
+
+    def test_buffered_garbage_collected(self):
+        logger = Logger(task_dir=self.temp_dir, buffered=True)
+        logger.log_result({'a': 1})
+        logger_ref = weakref.ref(logger)
+        del logger
+        gc.collect()
+        # Loggers are not kept alive, and are flushed once collected
+        assert logger_ref() is None
+        with open(os.path.join(self.temp_dir, "stats.json")) as f:
+            assert json.load(f) == {'a': 1}
+
+    def test_buffered_threads(self):
+        logger = Logger(task_dir=self.temp_dir, buffered=True, flush_size=7)
+
+        def log_results(thread_index):
+            for i in range(100):
+                logger.log_result({"%d_%d" % (thread_index, i): i})
+                logger.log_metric("loss_%d" % thread_index, i)
+
+        threads = [
+            threading.Thread(target=log_results, args=(thread_index, ))
+            for thread_index in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        logger.flush()
+        with open(os.path.join(self.temp_dir, "stats.json")) as f:
+            assert len(json.load(f)) == 400
+        metric_store = MetricStore(os.path.join(self.temp_dir, "metrics"))
+        assert len(list(metric_store.iter_records())) == 400
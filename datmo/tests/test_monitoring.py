@@ -12,7 +12,7 @@ except NameError:
     basestring = str
 
 from datmo.core.util.exceptions import InputError
-from datmo.monitoring import Monitoring
+from datmo.monitoring import Monitoring, LATENCY_SUMMARY_TYPE
 
 
 class TestMonitoringModule():
@@ -193,3 +193,150 @@ class TestMonitoringModule():
         result = self.monitoring._get_datmo_deployment_cluster_info()
         assert isinstance(result, dict)
         assert isinstance(result['clusters'], list)
+
+
+class TestMonitoringLocal():
+    """Tests against the local backend of the remote API, which run offline"""
+
+    def setup_method(self):
+        tempfile.tempdir = "/tmp" if not platform.system(
+        ) == "Windows" else None
+        test_datmo_dir = os.environ.get('TEST_DATMO_DIR',
+                                        tempfile.gettempdir())
+        self.temp_dir = tempfile.mkdtemp(dir=test_datmo_dir)
+        os.environ["DATMO_REMOTE_BACKEND"] = "local"
+        os.environ["DATMO_REMOTE_DATABASE"] = os.path.join(
+            self.temp_dir, "remote.sqlite")
+        self.monitoring = Monitoring(api_key="api_key")
+        self.monitoring.set_model_id("model_id")
+        self.data_ids = [
+            self.monitoring.track(
+                input={"f1": i,
+                       "flag": i % 2 == 0}, prediction={
+                           "y": None
+                       }) for i in range(7)
+        ]
+
+    def teardown_method(self):
+        del os.environ["DATMO_REMOTE_BACKEND"]
+        del os.environ["DATMO_REMOTE_DATABASE"]
+
+    def test_search_metadata(self):
+        result = self.monitoring.search_metadata({"start": 1, "count": 2})
+        assert [datum["id"] for datum in result] == self.data_ids[1:3]
+        # Values which are json but not python literals are decoded
+        assert result[0]["input"] == {"f1": 1, "flag": False}
+        assert result[0]["prediction"] == {"y": None}
+        assert result[0]["feedback"] is None
+        assert result[0]["updated_at"] is None
+        # The filter given is not changed
+        filter = {"model_id": "model_id"}
+        self.monitoring.search_metadata(filter)
+        assert filter == {"model_id": "model_id"}
+
+    def test_iter_metadata(self):
+        iterator = self.monitoring.iter_metadata({}, page_size=3)
+        assert not isinstance(iterator, list)
+        result = list(iterator)
+        assert [datum["id"] for datum in result] == self.data_ids
+        assert result == self.monitoring.search_metadata({})
+        result = list(
+            self.monitoring.iter_metadata(
+                {
+                    "start": 2,
+                    "count": 4
+                }, page_size=3))
+        assert [datum["id"] for datum in result] == self.data_ids[2:6]
+        result = list(
+            self.monitoring.iter_metadata({
+                "sort_created_at": "desc",
+                "count": 2
+            }))
+        assert len(result) == 2
+        assert result[0]["created_at"] >= result[1]["created_at"]
+        result = list(self.monitoring.iter_metadata({"id": "missing_id"}))
+        assert result == []
+        failed = False
+        try:
+            list(self.monitoring.iter_metadata({"wrong_key": "value"}))
+        except InputError:
+            failed = True
+        assert failed
+
+    def test_iter_metadata_pages(self):
+        filters = []
+        get_data = self.monitoring.remote_api.get_data
+        self.monitoring.remote_api.get_data = lambda filter: (
+            filters.append(dict(filter)), get_data(filter))[1]
+        iterator = self.monitoring.iter_metadata({}, page_size=3)
+        next(iterator)
+        # Pages are only got as the results are iterated over
+        assert len(filters) == 1
+        list(iterator)
+        assert [(f["start"], f["count"]) for f in filters] == [(0, 3), (3, 3),
+                                                               (6, 3)]
+
+    def test_iter_metadata_fields(self):
+        self.monitoring.track_feedback(self.data_ids[0], {"real": 1})
+        result = list(
+            self.monitoring.iter_metadata(
+                {}, fields=["id", "input", "feedback", "missing"]))
+        assert result[0] == {
+            "id": self.data_ids[0],
+            "input": {
+                "f1": 0,
+                "flag": True
+            },
+            "feedback": {
+                "real": 1
+            },
+            "missing": None
+        }
+        assert result[1]["feedback"] is None
+
+    def test_latency_summaries(self):
+        monitoring = Monitoring(
+            api_key="api_key", latency_summary_interval=3600)
+        monitoring.set_model_id("model_id")
+        with monitoring.timer():
+            pass
+        monitoring.track(input={"f1": 7}, prediction={"y": 1})
+        monitoring._reporter.report()
+        summaries = [
+            datum for datum in monitoring.remote_api.get_data({})["body"]
+            if datum.get("type") == LATENCY_SUMMARY_TYPE
+        ]
+        assert len(summaries) == 1
+        assert summaries[0]["latency_summary"]["latency"]["count"] == 1
+        # Summaries are not returned with the predictions tracked
+        result = monitoring.search_metadata({})
+        assert len(result) == 8
+        assert all(isinstance(datum["input"], dict) for datum in result)
+        assert list(monitoring.iter_metadata({}, page_size=3)) == result
+        # Count is that of the predictions, whatever the summaries between them
+        with monitoring.timer():
+            pass
+        monitoring._reporter.report()
+        monitoring.track(input={"f1": 8}, prediction={"y": 0})
+        result = monitoring.search_metadata({})
+        assert len(result) == 9
+        for count in [1, 8, 9, 20]:
+            assert list(
+                monitoring.iter_metadata({
+                    "count": count
+                }, page_size=3)) == result[:count]
+        monitoring._reporter.stop()
+
+    def test_track_events_disabled(self):
+        monitoring = Monitoring(
+            api_key="api_key",
+            latency_summary_interval=3600,
+            track_events=False)
+        monitoring.set_model_id("model_id")
+        monitoring._context.set("start_time", int(time.time() * 1000) - 5)
+        # Only the latency is kept, to be sent in the summary
+        assert monitoring.track(input={"f1": 7}, prediction={"y": 1}) is None
+        assert len(monitoring.search_metadata({})) == 7
+        assert monitoring._reporter._histograms["latency"].count == 1
+        monitoring._reporter.stop()
+        assert len(monitoring.remote_api.get_data({})["body"]) == 8
@@ -0,0 +1,71 @@
+"""
+Benchmark of FileHasher.get_dirhash against checksumdir.dirhash for an increasing
+number of worker threads
+
+    $ python devtools/benchmarks/hashing.py --files 2000 --size 262144
+"""
+from __future__ import print_function
+
+import os
+import time
+import shutil
+import argparse
+import tempfile
+import multiprocessing
+
+import checksumdir
+
+from datmo.core.util.file_hasher import FileHasher
+
+
+def create_files(dirpath, num_files, file_size):
+    for i in range(num_files):
+        subdirpath = os.path.join(dirpath, str(i % 10))
+        if not os.path.isdir(subdirpath):
+            os.makedirs(subdirpath)
+        with open(os.path.join(subdirpath, "file_%d" % i), "wb") as f:
+            f.write(os.urandom(file_size))
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.time()
+        result = func()
+        timings.append(time.time() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--size", type=int, default=256 * 1024)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    dirpath = tempfile.mkdtemp()
+    try:
+        create_files(dirpath, args.files, args.size)
+        total_mb = args.files * args.size / (1024.0 * 1024.0)
+        print("%d files, %.1f MB, best of %d" % (args.files, total_mb,
+                                                 args.repeat))
+        baseline, expected = best_of(lambda: checksumdir.dirhash(dirpath),
+                                     args.repeat)
+        print("%-20s %8.3fs %8.1f MB/s" % ("checksumdir", baseline,
+                                           total_mb / baseline))
+        workers = 1
+        while workers <= multiprocessing.cpu_count() * 2:
+            file_hasher = FileHasher(workers=workers)
+            elapsed, result = best_of(lambda: file_hasher.get_dirhash(dirpath),
+                                      args.repeat)
+            assert result == expected
+            print("%-20s %8.3fs %8.1f MB/s %5.2fx" %
+                  ("workers=%d" % workers, elapsed, total_mb / elapsed,
+                   baseline / elapsed))
+            workers *= 2
+    finally:
+        shutil.rmtree(dirpath)
+
+
+if __name__ == "__main__":
+    main()
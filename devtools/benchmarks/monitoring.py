@@ -0,0 +1,58 @@
+"""
+Benchmark of datmo.monitoring against the local backend, offline: the time taken
+by track, synchronous and asynchronous, and by reading pages of the predictions
+tracked, which should not depend on how many there are
+
+    $ python devtools/benchmarks/monitoring.py --predictions 10000 --count 100
+"""
+from __future__ import print_function
+
+import os
+import time
+import shutil
+import argparse
+import tempfile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--predictions", type=int, default=10000)
+    parser.add_argument("--count", type=int, default=100)
+    args = parser.parse_args()
+
+    dirpath = tempfile.mkdtemp()
+    os.environ["DATMO_REMOTE_BACKEND"] = "local"
+    os.environ["DATMO_REMOTE_DATABASE"] = os.path.join(dirpath,
+                                                       "remote.sqlite")
+    from datmo.monitoring import Monitoring
+    try:
+        for asynchronous in [False, True]:
+            monitoring = Monitoring(
+                api_key="benchmark",
+                asynchronous=asynchronous,
+                spill_dirpath=os.path.join(dirpath, "spill"))
+            monitoring.set_model_id("model_id")
+            start = time.time()
+            for i in range(args.predictions):
+                monitoring.track(input={"x": i}, prediction={"y": i})
+            elapsed = time.time() - start
+            monitoring.close()
+            total = time.time() - start
+            print("track %-12s %8.1f us/prediction, %8.3fs until sent" %
+                  ("asynchronous" if asynchronous else "synchronous",
+                   elapsed / args.predictions * 1e6, total))
+        for start_index in [0, args.predictions // 2, args.predictions]:
+            start = time.time()
+            monitoring.search_metadata({
+                "model_id": "model_id",
+                "start": start_index,
+                "count": args.count
+            })
+            print("page at %-10d %8.3fms" % (start_index,
+                                             (time.time() - start) * 1e3))
+    finally:
+        shutil.rmtree(dirpath)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark of the cold import time of the datmo CLI and package, each measured in a
+new python process and compared to a budget
+
+    $ python devtools/benchmarks/startup.py --repeat 10 --budget 0.25
+
+Exits with status 1 if the best import time of a module is above the budget. With
+--profile, the slowest imports of each module are listed (python 3.7+).
+"""
+from __future__ import print_function
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+
+MODULES = ["datmo", "datmo.cli.main", "datmo.cli.command.run"]
+
+
+def get_env():
+    """Return the environment of the processes, with an absolute PYTHONPATH as they
+    run in another directory"""
+    env = dict(os.environ)
+    if env.get("PYTHONPATH"):
+        env["PYTHONPATH"] = os.pathsep.join(
+            os.path.abspath(path)
+            for path in env["PYTHONPATH"].split(os.pathsep))
+    return env
+
+
+def time_import(module, cwd):
+    """Return the time taken by a new python process to import the module, less the
+    time taken by one which imports nothing"""
+    timings = []
+    for statement in ["pass", "import %s" % module]:
+        start = time.time()
+        subprocess.check_call(
+            [sys.executable, "-c", statement], cwd=cwd, env=get_env())
+        timings.append(time.time() - start)
+    return timings[1] - timings[0]
+
+
+def best_of(func, repeat):
+    return min(func() for _ in range(repeat))
+
+
+def profile_import(module, cwd, top):
+    """Return the slowest imports of the module, as (cumulative us, module name)"""
+    output = subprocess.check_output(
+        [sys.executable, "-X", "importtime", "-c",
+         "import %s" % module],
+        cwd=cwd,
+        env=get_env(),
+        stderr=subprocess.STDOUT).decode("utf-8")
+    imports = []
+    for line in output.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[1].strip().isdigit():
+            imports.append((int(fields[1]), fields[2].strip()))
+    return sorted(imports, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=0.25,
+        help="maximum import time of each module, in seconds")
+    parser.add_argument("--profile", action="store_true")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    args = parser.parse_args()
+
+    # Imports run outside of a project, as `datmo --help` would
+    cwd = tempfile.mkdtemp()
+    over_budget = []
+    print("best of %d, budget %.3fs" % (args.repeat, args.budget))
+    for module in args.modules:
+        elapsed = best_of(lambda: time_import(module, cwd), args.repeat)
+        print("%-30s %8.3fs %s" % (module, elapsed, "OVER BUDGET"
+                                   if elapsed > args.budget else ""))
+        if elapsed > args.budget:
+            over_budget.append(module)
+        if args.profile and sys.version_info >= (3, 7):
+            for cumulative, name in profile_import(module, cwd, args.top):
+                print("    %-40s %8.3fs" % (name, cumulative / 1e6))
+    os.rmdir(cwd)
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())